@@ -0,0 +1,20 @@
+"""Latency benchmark for the Postgres RPCs behind search and the map.
+
+Seeds a database with synthetic listings, calls the listing search
+(``search_properties``, ``search_properties_page``), nearby and map RPCs with
+reproducible parameter mixes (see ``workloads.py``), and records
+p50/p95/p99 latency together with the plans (including the statements inside
+the plpgsql functions) for a few calls. Passing several ``--rows`` sizes
+prints how p95 scales with the table.
+
+    supabase start                                   # or any Postgres 15+ with PostGIS
+    cd perf-tests
+    python -m dbbench --migrate --rows 100000        # results/rpc-<commit>-100000.json
+    python -m dbbench --rows 1000000 --rpc get_map_clusters
+    python -m dbbench --rows 10000 100000 1000000 --rpc search_properties_nearby
+    python -m dbbench compare results/rpc-a.json results/rpc-b.json
+
+The database is taken from ``--dsn`` or ``DBBENCH_DSN`` and defaults to the
+local ``supabase start`` instance. Seeding truncates ``public.properties``;
+never point this at a database whose data you want to keep.
+"""
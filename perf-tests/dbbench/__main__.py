@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import db, runner
+from .seed import load_cities, seed, seeded_rows
+from .workloads import WORKLOADS
+
+RESULTS_DIR = db.PACKAGE_DIR.parent / "results"
+MIN_ROWS, MAX_ROWS = 10_000, 5_000_000
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=db.REPO_ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return out.stdout.strip()
+
+
+def run(args: argparse.Namespace) -> int:
+    if not all(MIN_ROWS <= rows <= MAX_ROWS for rows in args.rows):
+        print(f"--rows must be between {MIN_ROWS:,} and {MAX_ROWS:,}", file=sys.stderr)
+        return 2
+    selected = [w for name, w in WORKLOADS.items() if not args.rpc or w.function in args.rpc or name in args.rpc]
+    if not selected:
+        print(f"No workload matches {args.rpc}; known: {', '.join(WORKLOADS)}", file=sys.stderr)
+        return 2
+
+    conn = db.connect(args.dsn)
+    failures: dict[str, str] = {}
+    if args.migrate:
+        report = db.migrate(conn, strict=args.strict)
+        failures = report.failed
+        print(f"Applied {len(report.applied)} migrations, skipped {len(failures)}")
+        for name, error in failures.items():
+            print(f"  {name}: {error}")
+    missing = db.missing_functions(conn, sorted({w.function for w in selected}))
+    if missing:
+        print(f"Missing functions: {', '.join(missing)} (run with --migrate)", file=sys.stderr)
+        return 1
+
+    nested = runner.enable_auto_explain(conn)
+    if not nested:
+        print("auto_explain unavailable; plans show the outer function call only")
+
+    cities = load_cities()
+    commit = git_commit()
+    p95: dict[str, dict[int, float]] = {w.name: {} for w in selected}
+    for rows in args.rows:
+        if args.reseed or seeded_rows(conn) != (rows, args.seed):
+            print(f"Seeding {rows:,} listings (seed {args.seed})")
+            seed(conn, rows, args.seed)
+
+        results = []
+        for workload in selected:
+            result = runner.run(
+                conn, workload, cities, iterations=args.iterations, warmup=args.warmup, seed=args.seed, nested_plans=nested
+            )
+            results.append(asdict(result))
+            p95[workload.name][rows] = result.p95_ms
+            print(
+                f"{workload.name:<45} p50 {result.p50_ms:8.2f}  p95 {result.p95_ms:8.2f}  p99 {result.p99_ms:8.2f} ms"
+                f"  rows {result.mean_rows:7.1f}" + (f"  errors {result.errors}" if result.errors else "")
+            )
+
+        out = args.out if args.out and len(args.rows) == 1 else RESULTS_DIR / f"rpc-{commit}-{rows}.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "server_version": db.server_version(conn),
+            "rows": rows,
+            "seed": args.seed,
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "nested_plans": nested,
+            "migration_failures": failures,
+        }
+        out.write_text(json.dumps({"meta": meta, "results": results}, indent=2, default=str), encoding="utf-8")
+        print(f"Wrote {out}")
+
+    if len(args.rows) > 1:
+        print(f"\np95 ms by table size\n{'':<45}" + "".join(f"{rows:>12,}" for rows in args.rows))
+        for name, by_rows in p95.items():
+            print(f"{name:<45}" + "".join(f"{by_rows[rows]:>12.2f}" for rows in args.rows))
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    before, after = (json.loads(path.read_text(encoding="utf-8")) for path in (args.before, args.after))
+    old = {r["workload"]: r for r in before["results"]}
+    print(f"{before['meta']['commit']} -> {after['meta']['commit']} ({after['meta']['rows']:,} rows)")
+    regressed = False
+    for result in after["results"]:
+        base = old.get(result["workload"])
+        if base is None:
+            print(f"{result['workload']:<45} p95 {result['p95_ms']:8.2f} ms (new)")
+            continue
+        change = (result["p95_ms"] - base["p95_ms"]) / base["p95_ms"] * 100 if base["p95_ms"] else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag, regressed = "  REGRESSION", True
+        print(f"{result['workload']:<45} p95 {base['p95_ms']:8.2f} -> {result['p95_ms']:8.2f} ms ({change:+.1f}%){flag}")
+    return 1 if regressed else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m dbbench", description="Benchmark the search and map RPCs.")
+    sub = parser.add_subparsers(dest="command")
+
+    cmp = sub.add_parser("compare", help="compare p95 latency of two result files")
+    cmp.add_argument("before", type=Path)
+    cmp.add_argument("after", type=Path)
+    cmp.add_argument("--threshold", type=float, default=10.0, help="flag p95 increases above this percentage")
+
+    parser.add_argument("--dsn", default=db.DEFAULT_DSN)
+    parser.add_argument("--migrate", action="store_true", help="apply supabase/migrations before running")
+    parser.add_argument("--strict", action="store_true", help="stop at the first failing migration")
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[MIN_ROWS],
+        help=f"listings to seed ({MIN_ROWS:,}-{MAX_ROWS:,}); several sizes run one after another",
+    )
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--reseed", action="store_true", help="reseed even if the database already matches")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--rpc", nargs="*", help="function or workload names to run (default: all)")
+    parser.add_argument("--out", type=Path, help="result file for a single --rows (default: results/rpc-<commit>-<rows>.json)")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        return compare(args)
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+-- Tables that supabase/migrations alter but never create: they predate the
+-- migration history. Shapes follow src/integrations/supabase/types.ts, with
+-- the column types the search RPCs declare in their RETURNS TABLE clauses.
+
+CREATE TYPE public.app_role AS ENUM ('admin', 'moderator', 'user', 'manager', 'tech_team');
+
+CREATE TABLE IF NOT EXISTS public.properties (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id uuid NOT NULL,
+  title text NOT NULL,
+  description text,
+  property_type text NOT NULL,
+  price numeric NOT NULL,
+  price_type text DEFAULT 'monthly',
+  status text DEFAULT 'active',
+  available boolean DEFAULT true,
+  images text[] DEFAULT '{}',
+  bedrooms integer,
+  bathrooms integer,
+  area_sqft numeric,
+  address text,
+  city text NOT NULL,
+  area text NOT NULL,
+  pin_code text NOT NULL,
+  latitude numeric,
+  longitude numeric,
+  location geography(Point, 4326),
+  amenities text[] DEFAULT '{}',
+  contact_name text,
+  contact_phone text,
+  contact_email text,
+  created_by_name text,
+  created_by_email text,
+  business_metadata jsonb,
+  is_agent boolean DEFAULT false,
+  verified boolean DEFAULT false,
+  featured boolean DEFAULT false,
+  boosted boolean DEFAULT false,
+  promoted_level integer DEFAULT 0,
+  owner_plan_status text,
+  views integer DEFAULT 0,
+  created_at timestamptz DEFAULT now(),
+  updated_at timestamptz DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.favorites (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id uuid NOT NULL,
+  property_id uuid NOT NULL,
+  created_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.user_roles (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id uuid NOT NULL,
+  role public.app_role NOT NULL,
+  created_at timestamptz DEFAULT now(),
+  UNIQUE (user_id, role)
+);
+
+CREATE TABLE IF NOT EXISTS public.inquiries (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  property_id uuid NOT NULL,
+  sender_id uuid NOT NULL,
+  receiver_id uuid NOT NULL,
+  message text NOT NULL,
+  created_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.contact_reveals (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  property_id uuid NOT NULL,
+  revealed_to uuid NOT NULL,
+  revealed_at timestamptz DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.notifications (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id uuid NOT NULL,
+  type text NOT NULL,
+  title text NOT NULL,
+  message text NOT NULL,
+  link text,
+  read boolean DEFAULT false,
+  created_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.fcm_tokens (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id uuid,
+  token text NOT NULL,
+  device_type text,
+  created_at timestamptz DEFAULT now(),
+  updated_at timestamptz DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.rate_limits (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id uuid,
+  ip_address text NOT NULL,
+  endpoint text NOT NULL,
+  request_count integer DEFAULT 1,
+  window_start timestamptz DEFAULT now(),
+  created_at timestamptz DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.typing_indicators (
+  property_id uuid NOT NULL,
+  sender_id uuid NOT NULL,
+  receiver_id uuid NOT NULL,
+  is_typing boolean DEFAULT false,
+  updated_at timestamptz DEFAULT now(),
+  PRIMARY KEY (property_id, sender_id, receiver_id)
+);
+
+CREATE TABLE IF NOT EXISTS public.query_performance_logs (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  query_name text NOT NULL,
+  execution_time_ms numeric,
+  user_id uuid,
+  created_at timestamptz DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.usage_limits (
+  user_id uuid PRIMARY KEY,
+  listing_count integer DEFAULT 0,
+  boost_count integer DEFAULT 0,
+  lead_priority_enabled boolean DEFAULT false,
+  refresh_date timestamptz
+);
@@ -0,0 +1,160 @@
+"""Timing and plan capture for workloads."""
+
+from __future__ import annotations
+
+import json
+import math
+import statistics
+import time
+from dataclasses import dataclass, field
+from random import Random
+from typing import Any
+
+import psycopg
+
+from .seed import City
+from .workloads import Params, Workload
+
+EXPLAIN_SAMPLES = 3
+
+_AUTO_EXPLAIN = {
+    "auto_explain.log_analyze": "on",
+    "auto_explain.log_buffers": "on",
+    "auto_explain.log_nested_statements": "on",
+    "auto_explain.log_format": "json",
+    "auto_explain.log_level": "notice",
+}
+
+
+def percentile(sorted_samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    return sorted_samples[max(0, math.ceil(q * len(sorted_samples)) - 1)]
+
+
+@dataclass
+class PlanSummary:
+    params: Params
+    execution_ms: float | None
+    shared_hit_blocks: int
+    shared_read_blocks: int
+    node_types: list[str]
+    indexes: list[str]
+    plans: list[Any] = field(repr=False)
+
+
+@dataclass
+class WorkloadResult:
+    workload: str
+    function: str
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    max_ms: float
+    mean_rows: float
+    errors: int
+    plans: list[PlanSummary]
+
+
+def enable_auto_explain(conn: psycopg.Connection) -> bool:
+    """Load auto_explain so plans of statements inside plpgsql functions reach the client.
+
+    Needs superuser (true for local/`supabase start` databases). Without it,
+    only the outer ``Function Scan`` is visible.
+    """
+    try:
+        conn.execute("LOAD 'auto_explain'")
+    except psycopg.Error:
+        return False
+    for setting, value in _AUTO_EXPLAIN.items():
+        conn.execute(f"SET {setting} = {value}")
+    conn.execute("SET auto_explain.log_min_duration = -1")
+    return True
+
+
+def _walk(plan: dict[str, Any]) -> list[dict[str, Any]]:
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes += _walk(child)
+    return nodes
+
+
+def _summarize(params: Params, plans: list[dict[str, Any]]) -> PlanSummary:
+    nodes = [node for plan in plans for node in _walk(plan["Plan"])]
+    return PlanSummary(
+        params=params,
+        execution_ms=max((plan.get("Execution Time", 0) for plan in plans), default=None),
+        shared_hit_blocks=sum(plan["Plan"].get("Shared Hit Blocks", 0) for plan in plans),
+        shared_read_blocks=sum(plan["Plan"].get("Shared Read Blocks", 0) for plan in plans),
+        node_types=sorted({node["Node Type"] for node in nodes}),
+        indexes=sorted({node["Index Name"] for node in nodes if "Index Name" in node}),
+        plans=plans,
+    )
+
+
+def explain(conn: psycopg.Connection, workload: Workload, params: Params, nested: bool) -> PlanSummary:
+    if not nested:
+        row = conn.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {workload.sql}", params).fetchone()
+        return _summarize(params, row[0])
+
+    plans: list[dict[str, Any]] = []
+
+    def collect(diagnostic: psycopg.errors.Diagnostic) -> None:
+        message = diagnostic.message_primary or ""
+        if "plan:" in message:
+            plans.append(json.loads(message.split("plan:", 1)[1]))
+
+    conn.add_notice_handler(collect)
+    try:
+        conn.execute("SET auto_explain.log_min_duration = 0")
+        conn.execute(workload.sql, params).fetchall()
+    finally:
+        conn.execute("SET auto_explain.log_min_duration = -1")
+        conn.remove_notice_handler(collect)
+    return _summarize(params, plans)
+
+
+def run(
+    conn: psycopg.Connection,
+    workload: Workload,
+    cities: list[City],
+    *,
+    iterations: int,
+    warmup: int,
+    seed: int,
+    nested_plans: bool,
+) -> WorkloadResult:
+    rng = Random(f"{seed}:{workload.name}")
+    calls = [workload.params(rng, cities) for _ in range(warmup + iterations)]
+    samples: list[float] = []
+    rows: list[int] = []
+    errors = 0
+    for index, params in enumerate(calls):
+        started = time.perf_counter()
+        try:
+            count = len(conn.execute(workload.sql, params).fetchall())
+        except psycopg.Error:
+            errors += 1
+            continue
+        elapsed = (time.perf_counter() - started) * 1000
+        if index >= warmup:
+            samples.append(elapsed)
+            rows.append(count)
+    if not samples:
+        raise RuntimeError(f"{workload.name}: every call failed")
+    samples.sort()
+    return WorkloadResult(
+        workload=workload.name,
+        function=workload.function,
+        iterations=len(samples),
+        p50_ms=round(percentile(samples, 0.50), 3),
+        p95_ms=round(percentile(samples, 0.95), 3),
+        p99_ms=round(percentile(samples, 0.99), 3),
+        mean_ms=round(statistics.fmean(samples), 3),
+        max_ms=round(samples[-1], 3),
+        mean_rows=round(statistics.fmean(rows), 1),
+        errors=errors,
+        plans=[explain(conn, workload, params, nested_plans) for params in calls[warmup : warmup + EXPLAIN_SAMPLES]],
+    )
+
@@ -0,0 +1,229 @@
+"""Synthetic listings spread over the cities the app offers.
+
+Cities, areas and pin codes come from ``src/data/indianLocations.ts`` and
+categories from ``src/data/propertyTypes.ts``, so the generated data matches
+what the filters in the UI can ask for. Rows are generated server-side with
+``generate_series``, which keeps a 5M-row seed to one round trip per batch.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import psycopg
+
+from .db import REPO_ROOT
+
+LOCATIONS_TS = REPO_ROOT / "src" / "data" / "indianLocations.ts"
+PROPERTY_TYPES_TS = REPO_ROOT / "src" / "data" / "propertyTypes.ts"
+
+BATCH_ROWS = 200_000
+OWNERS = 500
+# Derived tables that triggers keep current; the seed bypasses triggers, so
+# they are rebuilt afterwards when the migrations that add them are applied.
+REFRESH_FUNCTIONS = ("refresh_map_cluster_tiles",)
+TIER1_WEIGHT = 4  # tier-1 cities get this many times the listings of a tier-2 city
+CITY_SPREAD_DEG = 0.25  # listings fall within roughly +/-14 km of the centre
+
+# City centres (lat, lng); indianLocations.ts only has names.
+CITY_CENTRES: dict[str, tuple[float, float]] = {
+    "Mumbai": (19.0760, 72.8777),
+    "Delhi": (28.6139, 77.2090),
+    "Bangalore": (12.9716, 77.5946),
+    "Hyderabad": (17.3850, 78.4867),
+    "Chennai": (13.0827, 80.2707),
+    "Kolkata": (22.5726, 88.3639),
+    "Pune": (18.5204, 73.8567),
+    "Ahmedabad": (23.0225, 72.5714),
+    "Jaipur": (26.9124, 75.7873),
+    "Lucknow": (26.8467, 80.9462),
+    "Kanpur": (26.4499, 80.3319),
+    "Nagpur": (21.1458, 79.0882),
+    "Indore": (22.7196, 75.8577),
+    "Thane": (19.2183, 72.9781),
+    "Bhopal": (23.2599, 77.4126),
+    "Visakhapatnam": (17.6868, 83.2185),
+    "Patna": (25.5941, 85.1376),
+    "Vadodara": (22.3072, 73.1812),
+    "Ghaziabad": (28.6692, 77.4538),
+    "Ludhiana": (30.9010, 75.8573),
+    "Agra": (27.1767, 78.0081),
+    "Nashik": (19.9975, 73.7898),
+    "Faridabad": (28.4089, 77.3178),
+    "Meerut": (28.9845, 77.7064),
+    "Rajkot": (22.3039, 70.8022),
+    "Varanasi": (25.3176, 82.9739),
+    "Srinagar": (34.0837, 74.7973),
+    "Aurangabad": (19.8762, 75.3433),
+    "Dhanbad": (23.7957, 86.4304),
+    "Amritsar": (31.6340, 74.8723),
+    "Allahabad": (25.4358, 81.8463),
+    "Ranchi": (23.3441, 85.3096),
+    "Howrah": (22.5958, 88.2636),
+    "Coimbatore": (11.0168, 76.9558),
+    "Jabalpur": (23.1815, 79.9864),
+    "Gwalior": (26.2183, 78.1828),
+    "Vijayawada": (16.5062, 80.6480),
+    "Jodhpur": (26.2389, 73.0243),
+    "Madurai": (9.9252, 78.1198),
+    "Raipur": (21.2514, 81.6296),
+    "Kota": (25.2138, 75.8648),
+}
+GENERIC_AREAS = ("Civil Lines", "MG Road", "Station Road", "Old City", "New Colony", "Sector 5", "Industrial Area")
+
+_ARRAY = re.compile(r"export const (\w+) = \[(.*?)\]", re.S)
+_QUOTED = re.compile(r"'([^']+)'")
+_GROUP = re.compile(r"//\s*(\w[\w ]*)\n(.*?)(?=\n\s*//|\Z)", re.S)
+
+
+@dataclass
+class City:
+    name: str
+    lat: float
+    lng: float
+    tier: int
+    areas: list[str]
+    pin_codes: list[str]
+
+
+def load_cities(path: Path = LOCATIONS_TS) -> list[City]:
+    arrays = {name: body for name, body in _ARRAY.findall(path.read_text(encoding="utf-8"))}
+    grouped: dict[str, dict[str, list[str]]] = {}
+    for key in ("areas", "pinCodes"):
+        grouped[key] = {city.strip(): _QUOTED.findall(body) for city, body in _GROUP.findall(arrays[key])}
+    cities = []
+    for tier, key in ((1, "tier1Cities"), (2, "tier2Cities")):
+        for index, name in enumerate(_QUOTED.findall(arrays[key])):
+            if name not in CITY_CENTRES:
+                raise ValueError(f"No centre for {name!r}; add it to CITY_CENTRES")
+            lat, lng = CITY_CENTRES[name]
+            areas = grouped["areas"].get(name) or [f"{name} {area}" for area in GENERIC_AREAS]
+            pins = grouped["pinCodes"].get(name) or [f"{9 - tier}{index:02d}{n:03d}" for n in range(1, 6)]
+            cities.append(City(name, lat, lng, tier, areas, pins))
+    return cities
+
+
+def load_property_types(path: Path = PROPERTY_TYPES_TS) -> list[str]:
+    return re.findall(r'type: "(\w+)"', path.read_text(encoding="utf-8"))
+
+
+def city_shares(cities: list[City], rows: int) -> list[int]:
+    weights = [TIER1_WEIGHT if city.tier == 1 else 1 for city in cities]
+    shares = [rows * w // sum(weights) for w in weights]
+    shares[0] += rows - sum(shares)
+    return shares
+
+
+_OWNERS_SQL = """
+INSERT INTO auth.users (id, email, raw_user_meta_data)
+SELECT gen_random_uuid(), 'bench-owner-' || n || '@example.com', jsonb_build_object('full_name', 'Bench Owner ' || n)
+FROM generate_series(1, %(owners)s) AS n
+ON CONFLICT (email) DO NOTHING
+"""
+
+_PROPERTIES_SQL = """
+INSERT INTO public.properties (
+  user_id, title, description, property_type, price, price_type, status, available, images,
+  bedrooms, bathrooms, area_sqft, address, city, area, pin_code, latitude, longitude, location,
+  amenities, verified, featured, views, created_at, updated_at
+)
+SELECT
+  g.user_id,
+  coalesce(g.bedrooms || ' BHK ', '') || initcap(g.property_type) || ' in ' || g.area,
+  'Synthetic ' || g.property_type || ' listing near ' || g.area || ', ' || %(city)s || '. Well connected, close to markets.',
+  g.property_type,
+  round((2000 + g.r * g.r * 198000)::numeric, -2),
+  CASE WHEN g.r < 0.7 THEN 'monthly' ELSE 'sale' END,
+  CASE WHEN g.r2 < 0.92 THEN 'active' ELSE 'inactive' END,
+  g.r2 < 0.97,
+  ARRAY['https://example.com/bench/' || g.n || '.jpg'],
+  g.bedrooms,
+  CASE WHEN g.bedrooms IS NULL THEN NULL ELSE greatest(1, g.bedrooms - 1) END,
+  round((300 + g.r2 * 2700)::numeric),
+  g.area || ', ' || %(city)s,
+  %(city)s,
+  g.area,
+  g.pin_code,
+  g.lat,
+  g.lng,
+  ST_SetSRID(ST_MakePoint(g.lng, g.lat), 4326)::geography,
+  ARRAY['parking', 'power backup'],
+  g.r2 < 0.3,
+  g.r2 > 0.98,
+  floor(g.r * 500)::int,
+  g.created_at,
+  g.created_at
+FROM (
+  SELECT
+    n,
+    round((%(lat)s + (random() - 0.5) * %(spread)s)::numeric, 6) AS lat,
+    round((%(lng)s + (random() - 0.5) * %(spread)s)::numeric, 6) AS lng,
+    (%(areas)s::text[])[1 + floor(random() * cardinality(%(areas)s::text[]))::int] AS area,
+    (%(pins)s::text[])[1 + floor(random() * cardinality(%(pins)s::text[]))::int] AS pin_code,
+    (%(types)s::text[])[1 + floor(random() * cardinality(%(types)s::text[]))::int] AS property_type,
+    (%(owners)s::uuid[])[1 + floor(random() * cardinality(%(owners)s::uuid[]))::int] AS user_id,
+    CASE WHEN random() < 0.6 THEN 1 + floor(random() * 4)::int END AS bedrooms,
+    random() AS r,
+    random() AS r2,
+    now() - random() * interval '365 days' AS created_at
+  FROM generate_series(1, %(count)s) AS n
+) g
+"""
+
+
+def seeded_rows(conn: psycopg.Connection) -> tuple[int, int] | None:
+    """(rows, seed) of the last completed seed, if any."""
+    conn.execute("CREATE TABLE IF NOT EXISTS public.dbbench_meta (key text PRIMARY KEY, value bigint NOT NULL)")
+    meta = dict(conn.execute("SELECT key, value FROM public.dbbench_meta").fetchall())
+    if "rows" in meta and "seed" in meta:
+        return meta["rows"], meta["seed"]
+    return None
+
+
+def seed(conn: psycopg.Connection, rows: int, seed_value: int = 2025, progress=print) -> None:
+    """Replace all listings with ``rows`` synthetic ones."""
+    cities = load_cities()
+    types = load_property_types()
+    conn.execute("SELECT setseed(%s)", ((seed_value % 1000) / 1000,))
+    conn.execute("TRUNCATE public.properties CASCADE")
+    conn.execute("DELETE FROM public.dbbench_meta")
+    conn.execute(_OWNERS_SQL, {"owners": OWNERS})
+    owners = [row[0] for row in conn.execute("SELECT id FROM auth.users WHERE email LIKE 'bench-owner-%'")]
+
+    # Row triggers (location sync, creator tracking, FK checks) would dominate a
+    # multi-million row load; location is computed inline instead.
+    conn.execute("SET session_replication_role = replica")
+    try:
+        done = 0
+        for city, share in zip(cities, city_shares(cities, rows)):
+            for start in range(0, share, BATCH_ROWS):
+                count = min(BATCH_ROWS, share - start)
+                conn.execute(
+                    _PROPERTIES_SQL,
+                    {
+                        "city": city.name,
+                        "lat": city.lat,
+                        "lng": city.lng,
+                        "spread": CITY_SPREAD_DEG,
+                        "areas": city.areas,
+                        "pins": city.pin_codes,
+                        "types": types,
+                        "owners": owners,
+                        "count": count,
+                    },
+                )
+                done += count
+            progress(f"  seeded {done:,}/{rows:,} ({city.name})")
+    finally:
+        conn.execute("SET session_replication_role = origin")
+
+    conn.execute("VACUUM (ANALYZE) public.properties")
+    for name in REFRESH_FUNCTIONS:
+        if conn.execute("SELECT to_regproc(%s)", (f"public.{name}",)).fetchone()[0] is not None:
+            progress(f"  {name}()")
+            conn.execute(f"SELECT public.{name}()")
+    conn.execute(
+        "INSERT INTO public.dbbench_meta (key, value) VALUES ('rows', %s), ('seed', %s)", (rows, seed_value)
+    )
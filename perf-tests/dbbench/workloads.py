@@ -0,0 +1,313 @@
+"""Parameter mixes for the benchmarked RPCs.
+
+A workload names one function and draws the arguments of each call from a
+seeded RNG, so a run is reproducible and comparable across commits. The mixes
+mirror how the app calls each function: search boxes and category chips in
+Listings/PropertyCategory, map viewports at different zoom levels.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from random import Random
+from typing import Any, Callable
+
+from .seed import City, load_property_types
+
+Params = dict[str, Any]
+
+PROPERTY_TYPES = load_property_types()
+SEARCH_TERMS = ("2 BHK", "apartment", "office space", "house for rent", "cafe", "warehouse", "farmland")
+
+
+@dataclass(frozen=True)
+class Workload:
+    name: str
+    function: str
+    # argument -> Postgres type, in call order; drives the casts in ``sql``
+    args: dict[str, str]
+    generate: Callable[[Random, list[City]], Params]
+    # Hand-written SQL instead of a call to ``function``, for baselines.
+    query: str | None = None
+
+    @property
+    def sql(self) -> str:
+        if self.query:
+            return self.query
+        named = ", ".join(f"{arg} => %({arg})s::{pg_type}" for arg, pg_type in self.args.items())
+        return f"SELECT * FROM public.{self.function}({named})"
+
+    def params(self, rng: Random, cities: list[City]) -> Params:
+        return {arg: None for arg in self.args} | self.generate(rng, cities)
+
+
+WORKLOADS: dict[str, Workload] = {}
+
+
+def workload(name: str, function: str, args: dict[str, str], query: str | None = None):
+    def register(generate: Callable[[Random, list[City]], Params]) -> Callable[[Random, list[City]], Params]:
+        WORKLOADS[name] = Workload(name, function, args, generate, query)
+        return generate
+
+    return register
+
+
+def _near(rng: Random, city: City, spread: float = 0.1) -> tuple[float, float]:
+    return city.lat + rng.uniform(-spread, spread), city.lng + rng.uniform(-spread, spread)
+
+
+def _box(rng: Random, city: City, size: float) -> Params:
+    lat, lng = _near(rng, city)
+    return {"min_lat": lat - size / 2, "max_lat": lat + size / 2, "min_lng": lng - size / 2, "max_lng": lng + size / 2}
+
+
+SEARCH_ARGS = {
+    "query_text": "text",
+    "category_filter": "text",
+    "city_filter": "text",
+    "area_filter": "text",
+    "pincode_filter": "text",
+    "min_price": "numeric",
+    "max_price": "numeric",
+    "user_lat": "numeric",
+    "user_lng": "numeric",
+    "radius_km": "numeric",
+    "page_number": "integer",
+    "page_size": "integer",
+}
+IN_VIEW_ARGS = {
+    "min_lat": "numeric",
+    "min_lng": "numeric",
+    "max_lat": "numeric",
+    "max_lng": "numeric",
+    "property_type_filter": "text",
+    "min_price": "numeric",
+    "max_price": "numeric",
+    "min_bedrooms": "integer",
+    "min_bathrooms": "integer",
+    "user_lat": "numeric",
+    "user_lng": "numeric",
+}
+NEARBY_ARGS = {
+    "user_lat": "double precision",
+    "user_lng": "double precision",
+    "radius_km": "double precision",
+    "limit_count": "integer",
+    "property_type_filter": "text",
+    "after_distance_m": "double precision",
+    "after_id": "uuid",
+}
+FILTER_ARGS = {
+    "query_text": "text",
+    "category_filter": "text",
+    "city_filter": "text",
+    "area_filter": "text",
+    "pincode_filter": "text",
+    "min_price": "numeric",
+    "max_price": "numeric",
+}
+GEO_ARGS = {"origin_lat": "double precision", "origin_lng": "double precision", "radius_km": "double precision"}
+PAGE_ARGS = FILTER_ARGS | {"sort_by": "text", "after_cursor": "text", "page_size": "integer"} | GEO_ARGS
+COUNT_ARGS = FILTER_ARGS | {"count_cap": "integer"} | GEO_ARGS
+CLUSTER_ARGS = {
+    "min_lat": "numeric",
+    "max_lat": "numeric",
+    "min_lng": "numeric",
+    "max_lng": "numeric",
+    "zoom_level": "integer",
+    "category_filter": "text",
+}
+
+
+@workload("search_properties/text", "search_properties", SEARCH_ARGS)
+def _search_text(rng: Random, cities: list[City]) -> Params:
+    city = rng.choice(cities)
+    query = rng.choice([city.name, rng.choice(city.areas), rng.choice(SEARCH_TERMS), f"{rng.choice(SEARCH_TERMS)} {city.name}"])
+    return {"query_text": query, "page_number": rng.choice((1, 1, 1, 2, 3)), "page_size": 20}
+
+
+@workload("search_properties/city_category", "search_properties", SEARCH_ARGS)
+def _search_city_category(rng: Random, cities: list[City]) -> Params:
+    low = rng.choice((None, 5000, 20000))
+    return {
+        "city_filter": rng.choice(cities).name,
+        "category_filter": rng.choice(PROPERTY_TYPES),
+        "min_price": low,
+        "max_price": None if low is None else low * rng.choice((2, 5, 10)),
+        "page_number": 1,
+        "page_size": 20,
+    }
+
+
+@workload("search_properties/near_me", "search_properties", SEARCH_ARGS)
+def _search_near_me(rng: Random, cities: list[City]) -> Params:
+    lat, lng = _near(rng, rng.choice(cities))
+    return {
+        "user_lat": lat,
+        "user_lng": lng,
+        "radius_km": rng.choice((2, 5, 10, 25)),
+        "category_filter": rng.choice((None, None, rng.choice(PROPERTY_TYPES))),
+        "page_number": 1,
+        "page_size": 20,
+    }
+
+
+@workload("search_properties/deep_page", "search_properties", SEARCH_ARGS)
+def _search_deep_page(rng: Random, cities: list[City]) -> Params:
+    return {"city_filter": rng.choice(cities[:8]).name, "page_number": rng.randint(20, 60), "page_size": 20}
+
+
+def _cursor(payload: dict[str, Any]) -> str:
+    """Same encoding as public.encode_cursor."""
+    return base64.b64encode(json.dumps(payload).encode()).decode()
+
+
+@workload("search_properties_page/first_page", "search_properties_page", PAGE_ARGS)
+def _page_first(rng: Random, cities: list[City]) -> Params:
+    return {
+        "city_filter": rng.choice((None, rng.choice(cities).name)),
+        "category_filter": rng.choice((None, rng.choice(PROPERTY_TYPES))),
+        "sort_by": rng.choice(("recent", "recent", "price-low", "price-high")),
+        "page_size": 24,
+    }
+
+
+@workload("search_properties_page/deep_cursor", "search_properties_page", PAGE_ARGS)
+def _page_deep(rng: Random, cities: list[City]) -> Params:
+    # Same depth as search_properties/deep_page, reached by cursor instead of OFFSET.
+    sort_by = rng.choice(("recent", "price-low", "price-high"))
+    # Descending sorts continue below the cursor id, ascending ones above it.
+    after_id = "00000000-0000-0000-0000-000000000000" if sort_by == "price-low" else "ffffffff-ffff-ffff-ffff-ffffffffffff"
+    if sort_by == "recent":
+        at = datetime.now(timezone.utc) - timedelta(days=rng.uniform(30, 300))
+        key: dict[str, Any] = {"sort": sort_by, "at": at.isoformat(), "id": after_id}
+    else:
+        key = {"sort": sort_by, "price": rng.randrange(5_000, 150_000, 100), "id": after_id}
+    return {"city_filter": rng.choice(cities[:8]).name, "sort_by": sort_by, "after_cursor": _cursor(key), "page_size": 24}
+
+
+def _misspell(rng: Random, word: str) -> str:
+    """Drop, double or swap one letter, like a hurried search box entry."""
+    if len(word) <= 2:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    return rng.choice((word[:i] + word[i + 1 :], word[:i] + word[i] + word[i:], word[: i - 1] + word[i] + word[i - 1] + word[i + 1 :]))
+
+
+@workload("search_properties_page/relevance", "search_properties_page", PAGE_ARGS)
+def _page_relevance(rng: Random, cities: list[City]) -> Params:
+    city = rng.choice(cities)
+    term = rng.choice([city.name, rng.choice(city.areas), rng.choice(SEARCH_TERMS)])
+    # Whole words, a misspelling (trigram match) or a partly typed word (prefix match)
+    query = rng.choice((term, _misspell(rng, term), term[: max(3, len(term) // 2)]))
+    return {"query_text": query, "sort_by": "relevance", "page_size": 24}
+
+
+@workload("search_properties_page/near_me", "search_properties_page", PAGE_ARGS)
+def _page_near_me(rng: Random, cities: list[City]) -> Params:
+    # Live-location listings: radius plus the search box, chips and sort menu.
+    lat, lng = _near(rng, rng.choice(cities))
+    return {
+        "origin_lat": lat,
+        "origin_lng": lng,
+        "radius_km": rng.choice((2, 5, 10, 25)),
+        "query_text": rng.choice((None, None, rng.choice(SEARCH_TERMS))),
+        "category_filter": rng.choice((None, None, rng.choice(PROPERTY_TYPES))),
+        "sort_by": rng.choice(("distance", "distance", "recent", "price-low")),
+        "page_size": 24,
+    }
+
+
+@workload("search_properties_count/capped", "search_properties_count", COUNT_ARGS)
+def _count(rng: Random, cities: list[City]) -> Params:
+    return {
+        "city_filter": rng.choice((None, rng.choice(cities).name)),
+        "category_filter": rng.choice((None, rng.choice(PROPERTY_TYPES))),
+        "query_text": rng.choice((None, None, rng.choice(SEARCH_TERMS))),
+    }
+
+
+@workload("search_properties_in_view/city", "search_properties_in_view", IN_VIEW_ARGS)
+def _in_view_city(rng: Random, cities: list[City]) -> Params:
+    city = rng.choice(cities)
+    lat, lng = _near(rng, city, 0.05)
+    return _box(rng, city, rng.uniform(0.02, 0.2)) | {
+        "property_type_filter": rng.choice((None, None, rng.choice(PROPERTY_TYPES))),
+        "min_bedrooms": rng.choice((None, None, 2)),
+        "user_lat": lat,
+        "user_lng": lng,
+    }
+
+
+@workload("search_properties_in_view/region", "search_properties_in_view", IN_VIEW_ARGS)
+def _in_view_region(rng: Random, cities: list[City]) -> Params:
+    return _box(rng, rng.choice(cities), rng.uniform(1, 3))
+
+
+@workload("get_map_clusters/country", "get_map_clusters", CLUSTER_ARGS)
+def _clusters_country(rng: Random, cities: list[City]) -> Params:
+    return {"min_lat": 6.0, "max_lat": 36.0, "min_lng": 68.0, "max_lng": 98.0, "zoom_level": rng.choice((4, 5, 6))}
+
+
+@workload("get_map_clusters/city", "get_map_clusters", CLUSTER_ARGS)
+def _clusters_city(rng: Random, cities: list[City]) -> Params:
+    return _box(rng, rng.choice(cities), rng.uniform(0.3, 1.0)) | {
+        "zoom_level": rng.choice((9, 10, 11)),
+        "category_filter": rng.choice((None, None, rng.choice(PROPERTY_TYPES))),
+    }
+
+
+@workload("get_map_clusters/street", "get_map_clusters", CLUSTER_ARGS)
+def _clusters_street(rng: Random, cities: list[City]) -> Params:
+    return _box(rng, rng.choice(cities), rng.uniform(0.02, 0.08)) | {"zoom_level": rng.choice((13, 14, 15))}
+
+
+@workload("search_properties_nearby/first_page", "search_properties_nearby", NEARBY_ARGS)
+def _nearby_first_page(rng: Random, cities: list[City]) -> Params:
+    lat, lng = _near(rng, rng.choice(cities))
+    return {
+        "user_lat": lat,
+        "user_lng": lng,
+        "radius_km": rng.choice((2, 5, 10, 25)),
+        "limit_count": rng.choice((20, 100)),
+        "property_type_filter": rng.choice((None, None, None, rng.choice(PROPERTY_TYPES))),
+    }
+
+
+@workload("search_properties_nearby/next_page", "search_properties_nearby", NEARBY_ARGS)
+def _nearby_next_page(rng: Random, cities: list[City]) -> Params:
+    # A cursor somewhere inside the radius, as if several pages had been read.
+    radius_km = rng.choice((5, 10, 25))
+    return _nearby_first_page(rng, cities) | {
+        "radius_km": radius_km,
+        "limit_count": 20,
+        "after_distance_m": rng.uniform(0.1, 0.6) * radius_km * 1000,
+        "after_id": "00000000-0000-0000-0000-000000000000",
+    }
+
+
+# The pre-KNN search_properties_nearby: haversine over every active listing, then sort.
+_HAVERSINE_SQL = """
+SELECT p.id, d.distance_km
+FROM public.properties p
+CROSS JOIN LATERAL (
+  SELECT 6371 * acos(least(1,
+    cos(radians(%(user_lat)s::float8)) * cos(radians(p.latitude::float8))
+    * cos(radians(p.longitude::float8) - radians(%(user_lng)s::float8))
+    + sin(radians(%(user_lat)s::float8)) * sin(radians(p.latitude::float8))
+  )) AS distance_km
+) d
+WHERE p.status = 'active' AND p.available = true
+  AND p.latitude IS NOT NULL AND p.longitude IS NOT NULL
+  AND d.distance_km <= %(radius_km)s::float8
+ORDER BY d.distance_km
+LIMIT %(limit_count)s::integer
+"""
+
+
+@workload("search_properties_nearby/haversine_baseline", "search_properties_nearby", NEARBY_ARGS, _HAVERSINE_SQL)
+def _nearby_baseline(rng: Random, cities: list[City]) -> Params:
+    return _nearby_first_page(rng, cities) | {"property_type_filter": None}
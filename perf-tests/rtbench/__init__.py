@@ -0,0 +1,30 @@
+"""Fan-out load test for the realtime channels on messages, favorites and properties.
+
+``20251112120000_enable_realtime_on_core_tables.sql`` publishes these tables
+to ``supabase_realtime``. This harness opens N websocket subscribers the way
+the hooks do (``messages-realtime``, ``favorites-live``, ``properties-live``),
+inserts rows at a fixed rate, and reports delivery latency percentiles,
+bandwidth per client and events that never arrived. Each table runs in two
+variants:
+
+* ``global``: every client subscribes to the whole table, and the server's
+  RLS check decides who gets each row (``properties-live`` today);
+* ``scoped``: every client filters on its own user id (``receiver_id`` for
+  messages, ``user_id`` for the others), so the server matches before it
+  authorises.
+
+    cd perf-tests
+    python -m rtbench --table messages --clients 2000 --rate 50 --duration 30
+    python -m rtbench --table properties --mode global --clients 5000 --rate 5
+    python -m rtbench --table favorites --no-rls        # a table without row security
+    python -m rtbench standin --port 4010               # the server alone, for --url
+
+By default each variant gets a fresh stand-in (``standin.py``) in a child
+process: it keeps Realtime's subscription matching, the per-subscriber RLS
+check (``--check-cost-us`` each), the change queue and per-socket send
+buffers, but has no database. Subscribers are spread over ``--processes``
+client processes (default: one per CPU) so the clients are not what
+saturates first. Results go to
+``results/realtime-<commit>-<table>.json``. Several thousand sockets need a
+matching ``ulimit -n``.
+"""
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator
+
+from . import standin
+from .harness import MODES, Run, RunConfig, RunResult
+from .tables import TABLES
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = PACKAGE_DIR.parent / "results"
+STARTUP_TIMEOUT_SECONDS = 10.0
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PACKAGE_DIR, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return out.stdout.strip()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def local_standin(args: argparse.Namespace) -> AsyncIterator[str]:
+    """A fresh stand-in in a child process, so its fan-out does not share a CPU with the clients."""
+    port = _free_port()
+    command = [
+        sys.executable, "-m", "rtbench", "standin", "--port", str(port),
+        "--check-cost-us", str(args.check_cost_us), "--send-buffer", str(args.send_buffer),
+        "--change-queue", str(args.change_queue),
+    ] + ([] if args.rls else ["--no-rls"])
+    proc = await asyncio.create_subprocess_exec(*command, cwd=PACKAGE_DIR.parent, stderr=subprocess.DEVNULL)
+    try:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + STARTUP_TIMEOUT_SECONDS
+        while True:
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.close()
+                break
+            except OSError:
+                if proc.returncode is not None or loop.time() > deadline:
+                    raise RuntimeError("realtime stand-in did not start") from None
+                await asyncio.sleep(0.1)
+        yield f"ws://127.0.0.1:{port}/realtime/v1/websocket?vsn=1.0.0"
+    finally:
+        if proc.returncode is None:
+            proc.terminate()
+        await proc.wait()
+
+
+def print_result(r: RunResult) -> None:
+    server = r.server
+    checks = server.get("authorization_checks", 0) / r.events if r.events else 0.0
+    print(
+        f"{r.table}/{r.mode:<7} {r.connected:,}/{r.clients:,} clients  {r.events:,} rows at {r.achieved_rate:g}/s"
+        f"  frames {r.frames_received:,}/{r.frames_expected:,}"
+    )
+    print(f"  latency      p50 {r.p50_ms:8.2f}  p95 {r.p95_ms:8.2f}  p99 {r.p99_ms:8.2f}  max {r.max_ms:8.2f} ms")
+    print(
+        f"  per client   mean {r.client_kbps_mean:8.2f}  p95 {r.client_kbps_p95:8.2f}  max {r.client_kbps_max:8.2f} KB/s"
+        f"  ({r.total_mb:,.1f} MB in total)"
+    )
+    dropped_pct = r.dropped / r.frames_expected * 100 if r.frames_expected else 0.0
+    print(
+        f"  dropped {r.dropped:,} ({dropped_pct:.2f}%)  unexpected {r.unexpected:,}"
+        f"  | server: {checks:,.1f} RLS checks/row, {server.get('changes_dropped', 0):,} rows and"
+        f" {server.get('frames_dropped', 0):,} frames dropped, max backlog {server.get('max_backlog', 0):,}"
+    )
+    if r.harness_cpu_pct > 90 or r.achieved_rate < 0.9 * r.target_rate:
+        print(
+            f"  harness CPU {r.harness_cpu_pct:.0f}% (busiest shard), {r.achieved_rate:g} of {r.target_rate:g} rows/s:"
+            " the clients are saturated and latencies include their own queueing; raise --processes"
+        )
+
+
+def print_comparison(results: list[RunResult]) -> None:
+    rows = (
+        ("p95 latency ms", lambda r: f"{r.p95_ms:.2f}"),
+        ("p99 latency ms", lambda r: f"{r.p99_ms:.2f}"),
+        ("KB/s per client (mean)", lambda r: f"{r.client_kbps_mean:.2f}"),
+        ("frames received", lambda r: f"{r.frames_received:,}"),
+        ("dropped", lambda r: f"{r.dropped:,}"),
+        ("RLS checks per row", lambda r: f"{r.server.get('authorization_checks', 0) / max(r.events, 1):,.1f}"),
+    )
+    print(f"\n{'':<26}" + "".join(f"{r.mode:>14}" for r in results))
+    for label, value in rows:
+        print(f"{label:<26}" + "".join(f"{value(r):>14}" for r in results))
+
+
+async def run_modes(args: argparse.Namespace) -> list[RunResult]:
+    results = []
+    for mode in MODES if args.mode == "both" else (args.mode,):
+        async with contextlib.AsyncExitStack() as stack:
+            url = args.url or await stack.enter_async_context(local_standin(args))
+            config = RunConfig(
+                table=args.table,
+                mode=mode,
+                url=url,
+                clients=args.clients,
+                users=args.users or args.clients,
+                rate=args.rate,
+                duration=args.duration,
+                drain=args.drain,
+                rls=args.rls,
+                seed=args.seed,
+                processes=args.processes,
+                connect_concurrency=args.connect_concurrency,
+            )
+            print(f"Connecting {args.clients:,} {mode} subscribers to {args.table}", flush=True)
+            result = await Run(config).run()
+        print_result(result)
+        results.append(result)
+    return results
+
+
+def run(args: argparse.Namespace) -> int:
+    if args.rate <= 0 or args.duration <= 0 or args.clients < 1 or args.processes < 1:
+        print("--rate, --duration, --clients and --processes must be positive", file=sys.stderr)
+        return 2
+    try:
+        results = asyncio.run(run_modes(args))
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    if len(results) > 1:
+        print_comparison(results)
+
+    commit = git_commit()
+    out = args.out or RESULTS_DIR / f"realtime-{commit}-{args.table}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "target": args.url or "stand-in",
+        "check_cost_us": args.check_cost_us,
+        "send_buffer": args.send_buffer,
+        "change_queue": args.change_queue,
+        "seed": args.seed,
+        "processes": args.processes,
+    }
+    out.write_text(json.dumps({"meta": meta, "results": [asdict(r) for r in results]}, indent=2), encoding="utf-8")
+    print(f"Wrote {out}")
+    return 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    server = standin.StandIn(
+        rls=args.rls, check_cost_us=args.check_cost_us, change_queue=args.change_queue, send_buffer=args.send_buffer
+    )
+    try:
+        asyncio.run(standin.serve_forever(args.host, args.port, server))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    server = argparse.ArgumentParser(add_help=False)
+    server.add_argument("--no-rls", dest="rls", action="store_false", help="deliver every matching row, unchecked")
+    server.add_argument(
+        "--check-cost-us", type=float, default=standin.CHECK_COST_US, help="server time per RLS check (microseconds)"
+    )
+    server.add_argument("--send-buffer", type=int, default=standin.SEND_BUFFER, help="frames queued per socket before drops")
+    server.add_argument("--change-queue", type=int, default=standin.CHANGE_QUEUE, help="rows queued before drops")
+
+    parser = argparse.ArgumentParser(
+        prog="python -m rtbench", description="Load-test realtime fan-out.", parents=[server]
+    )
+    sub = parser.add_subparsers(dest="command")
+
+    stand = sub.add_parser("standin", parents=[server], help="run the realtime stand-in alone")
+    stand.add_argument("--host", default="127.0.0.1")
+    stand.add_argument("--port", type=int, default=standin.DEFAULT_PORT)
+
+    parser.add_argument("--table", choices=sorted(TABLES), default="messages")
+    parser.add_argument("--mode", choices=(*MODES, "both"), default="both")
+    parser.add_argument("--clients", type=int, default=1000, help="websocket subscribers, one user each")
+    parser.add_argument("--users", type=int, help="users rows are drawn from (default: --clients); more means offline users")
+    parser.add_argument("--rate", type=float, default=20.0, help="inserted rows per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of inserts")
+    parser.add_argument("--drain", type=float, default=5.0, help="seconds to wait for late frames")
+    parser.add_argument(
+        "--processes", type=int, default=os.cpu_count() or 1, help="client processes the subscribers are spread over"
+    )
+    parser.add_argument("--connect-concurrency", type=int, default=200, help="joins in flight per process")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--url", help="an already running stand-in (counters accumulate across modes)")
+    parser.add_argument("--out", type=Path, help="result file (default: results/realtime-<commit>-<table>.json)")
+    args = parser.parse_args(argv)
+
+    if args.command == "standin":
+        return serve(args)
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
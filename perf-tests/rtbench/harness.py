@@ -0,0 +1,321 @@
+"""Subscribers, the insert driver, and what they measure.
+
+Every subscriber is its own websocket, as every open browser tab is. They
+run in ``processes`` child processes (shards), so parsing frames for
+thousands of sockets does not slow the driver down. The driver stamps each
+row with the wall clock at send time and shards take latency against the
+same clock. What each subscriber should receive is known up front (filter
+and RLS applied to the generated row), so anything missing after the drain
+is a dropped event.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import multiprocessing
+import statistics
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from random import Random
+from typing import Any
+
+try:
+    from websockets.asyncio.client import ClientConnection, connect
+    from websockets.exceptions import ConnectionClosed
+except ImportError as exc:  # pragma: no cover - depends on the environment
+    raise SystemExit("rtbench needs websockets 13+: pip install websockets") from exc
+
+from . import protocol
+from .tables import TABLES, Record
+
+MODES = ("global", "scoped")
+CONNECT_CONCURRENCY = 200
+CONNECT_TIMEOUT_SECONDS = 60.0
+# Added to every generated row; the stand-in passes records through untouched.
+SENT_AT = "_rtbench_sent_ns"
+
+
+def percentile(sorted_samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[max(0, math.ceil(q * len(sorted_samples)) - 1)]
+
+
+@dataclass
+class RunConfig:
+    table: str
+    mode: str
+    url: str
+    clients: int
+    users: int
+    rate: float
+    duration: float
+    drain: float
+    rls: bool
+    seed: int
+    processes: int = 1
+    connect_concurrency: int = CONNECT_CONCURRENCY
+
+
+@dataclass
+class RunResult:
+    table: str
+    mode: str
+    rls: bool
+    clients: int
+    connected: int
+    users: int
+    events: int
+    target_rate: float
+    achieved_rate: float
+    connect_s: float
+    frames_expected: int
+    frames_received: int
+    dropped: int
+    unexpected: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    client_kbps_mean: float
+    client_kbps_p95: float
+    client_kbps_max: float
+    total_mb: float
+    harness_cpu_pct: float
+    server: dict[str, Any]
+
+
+def user_ids(count: int, seed: int) -> list[str]:
+    rng = Random(f"{seed}:users")
+    return [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(count)]
+
+
+# -- shards (child processes) --------------------------------------------------
+
+
+@dataclass(eq=False)
+class Subscriber:
+    user_id: str
+    connected: bool = False
+    received: int = 0
+    bytes: int = 0
+    latencies_ms: list[float] = field(default_factory=list)
+
+
+class Shard:
+    """One process's subscribers. Talks to the parent over ``pipe``:
+
+    1. sends ``(connected, failed, first error)`` once every socket has joined;
+    2. receives ``{user_id: expected frames}`` and a drain timeout after the inserts;
+    3. sends ``([(user_id, received, bytes, latencies_ms), ...], cpu_pct)``.
+    """
+
+    def __init__(self, url: str, table: str, mode: str, users: list[str], connect_concurrency: int) -> None:
+        self.url = url
+        self.spec = TABLES[table]
+        self.mode = mode
+        self.subscribers = [Subscriber(user) for user in users]
+        self.connect_concurrency = connect_concurrency
+
+    async def _subscribe(self, subscriber: Subscriber, gate: asyncio.Semaphore, joined: asyncio.Future[None]) -> None:
+        topic = protocol.channel_topic(self.spec.channel)
+        filter_ = f"{self.spec.scoped_column}=eq.{subscriber.user_id}" if self.mode == "scoped" else None
+        join = protocol.frame(topic, protocol.PHX_JOIN, protocol.join_payload(self.spec.name, filter_, subscriber.user_id), "1")
+        ws: ClientConnection | None = None
+        try:
+            async with gate:
+                ws = await connect(self.url, compression=None, ping_interval=None, max_size=None, open_timeout=CONNECT_TIMEOUT_SECONDS)
+                await ws.send(join)
+                reply = json.loads(await ws.recv())
+                if reply.get("payload", {}).get("status") != "ok":
+                    raise RuntimeError(f"join refused: {reply.get('payload')}")
+        except Exception as exc:
+            if ws is not None:
+                await ws.close()
+            joined.set_exception(exc)
+            return
+        subscriber.connected = True
+        joined.set_result(None)
+        heartbeat = asyncio.create_task(self._heartbeat(ws))
+        try:
+            async for message in ws:
+                now = time.time_ns()
+                subscriber.bytes += len(message)
+                msg = json.loads(message)
+                if msg.get("event") != protocol.POSTGRES_CHANGES:
+                    continue
+                subscriber.received += 1
+                sent = msg["payload"]["data"]["record"].get(SENT_AT)
+                if sent is not None:
+                    subscriber.latencies_ms.append((now - sent) / 1e6)
+        except ConnectionClosed:
+            pass
+        finally:
+            heartbeat.cancel()
+            await ws.close()
+
+    @staticmethod
+    async def _heartbeat(ws: ClientConnection) -> None:
+        ref = 0
+        while True:
+            await asyncio.sleep(protocol.HEARTBEAT_SECONDS)
+            ref += 1
+            await ws.send(protocol.frame(protocol.PHOENIX_TOPIC, protocol.HEARTBEAT, {}, f"hb{ref}"))
+
+    async def run(self, pipe: Connection) -> None:
+        loop = asyncio.get_running_loop()
+        gate = asyncio.Semaphore(self.connect_concurrency)
+        joins = [loop.create_future() for _ in self.subscribers]
+        tasks = [asyncio.create_task(self._subscribe(s, gate, j)) for s, j in zip(self.subscribers, joins)]
+        outcomes = await asyncio.gather(*joins, return_exceptions=True)
+        errors = [repr(o) for o in outcomes if isinstance(o, BaseException)]
+        pipe.send((len(outcomes) - len(errors), len(errors), errors[0] if errors else None))
+
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        expected, drain = await loop.run_in_executor(None, pipe.recv)
+        deadline = loop.time() + drain
+        while loop.time() < deadline and any(s.received < expected.get(s.user_id, 0) for s in self.subscribers if s.connected):
+            await asyncio.sleep(0.05)
+        cpu_pct = (time.process_time() - cpu_started) / (time.perf_counter() - wall_started) * 100
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        pipe.send(([(s.user_id, s.received, s.bytes, s.latencies_ms) for s in self.subscribers if s.connected], cpu_pct))
+
+
+def _shard_main(pipe: Connection, url: str, table: str, mode: str, users: list[str], connect_concurrency: int) -> None:
+    asyncio.run(Shard(url, table, mode, users, connect_concurrency).run(pipe))
+
+
+# -- parent: driver and results ------------------------------------------------
+
+
+class Run:
+    def __init__(self, config: RunConfig) -> None:
+        if config.users < max(config.clients, 2):
+            raise ValueError("--users must be at least --clients (and 2)")
+        self.config = config
+        self.spec = TABLES[config.table]
+        self.users = user_ids(config.users, config.seed)
+        self.connected_users = set(self.users[: config.clients])
+        self.expected: Counter[str] = Counter()
+
+    def _expect(self, record: Record) -> None:
+        spec, config = self.spec, self.config
+        if config.mode == "scoped":
+            user = str(record.get(spec.scoped_column))
+            targets = [user] if user in self.connected_users and (not config.rls or spec.visible(record, user)) else []
+        else:
+            audience = spec.audience(record) if config.rls else None
+            targets = self.connected_users if audience is None else [u for u in audience if u in self.connected_users]
+        self.expected.update(targets)
+
+    async def _drive(self, control: ClientConnection) -> tuple[int, float]:
+        config = self.config
+        rng = Random(f"{config.seed}:{config.table}:rows")
+        loop = asyncio.get_running_loop()
+        events = max(1, round(config.rate * config.duration))
+        started = loop.time()
+        for i in range(events):
+            delay = started + i / config.rate - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            record = self.spec.make_record(rng, self.users)
+            self._expect(record)
+            record[SENT_AT] = time.time_ns()
+            await control.send(protocol.frame(protocol.CONTROL_TOPIC, protocol.INSERT, {"table": config.table, "record": record}))
+        return events, loop.time() - started
+
+    @staticmethod
+    async def _server_stats(control: ClientConnection) -> dict[str, Any]:
+        await control.send(protocol.frame(protocol.CONTROL_TOPIC, protocol.STATS, {}, "stats"))
+        async for message in control:
+            msg = json.loads(message)
+            if msg.get("ref") == "stats":
+                return msg["payload"]["response"]
+        return {}
+
+    async def run(self) -> RunResult:
+        config = self.config
+        loop = asyncio.get_running_loop()
+        clients = self.users[: config.clients]
+        shards = max(1, min(config.processes, len(clients)))
+        # spawn, not fork: the parent already runs an event loop.
+        context = multiprocessing.get_context("spawn")
+        pipes, procs = [], []
+        for i in range(shards):
+            parent, child = context.Pipe()
+            proc = context.Process(
+                target=_shard_main,
+                args=(child, config.url, config.table, config.mode, clients[i::shards], config.connect_concurrency),
+                daemon=True,
+            )
+            proc.start()
+            pipes.append(parent)
+            procs.append(proc)
+
+        try:
+            connect_started = time.perf_counter()
+            joined = await asyncio.gather(*(loop.run_in_executor(None, pipe.recv) for pipe in pipes))
+            connect_s = time.perf_counter() - connect_started
+            failed = sum(f for _, f, _ in joined)
+            if failed:
+                error = next(e for _, _, e in joined if e)
+                print(f"  {failed:,} subscribers failed to join, e.g. {error}", flush=True)
+
+            async with connect(config.url, compression=None, ping_interval=None, max_size=None) as control:
+                events, elapsed = await self._drive(control)
+                for i, pipe in enumerate(pipes):
+                    pipe.send(({u: self.expected[u] for u in clients[i::shards]}, config.drain))
+                reports = await asyncio.gather(*(loop.run_in_executor(None, pipe.recv) for pipe in pipes))
+                server = await self._server_stats(control)
+        finally:
+            for proc in procs:
+                proc.join(timeout=10)
+                if proc.is_alive():
+                    proc.terminate()
+
+        stats = [row for rows, _ in reports for row in rows]
+        return self._result(events, elapsed, connect_s, stats, max(cpu for _, cpu in reports), server)
+
+    def _result(
+        self, events: int, elapsed: float, connect_s: float, stats: list[tuple[str, int, int, list[float]]],
+        cpu_pct: float, server: dict[str, Any],
+    ) -> RunResult:
+        config = self.config
+        latencies = sorted(ms for *_, shard_ms in stats for ms in shard_ms)
+        kbps = sorted(nbytes / 1024 / elapsed for _, _, nbytes, _ in stats) if elapsed else []
+        expected = {user: self.expected[user] for user, *_ in stats}
+        return RunResult(
+            table=config.table,
+            mode=config.mode,
+            rls=config.rls,
+            clients=config.clients,
+            connected=len(stats),
+            users=config.users,
+            events=events,
+            target_rate=config.rate,
+            achieved_rate=round(events / elapsed, 2) if elapsed else 0.0,
+            connect_s=round(connect_s, 2),
+            frames_expected=sum(expected.values()),
+            frames_received=sum(received for _, received, _, _ in stats),
+            dropped=sum(max(0, expected[user] - received) for user, received, _, _ in stats),
+            unexpected=sum(max(0, received - expected[user]) for user, received, _, _ in stats),
+            p50_ms=round(percentile(latencies, 0.50), 3),
+            p95_ms=round(percentile(latencies, 0.95), 3),
+            p99_ms=round(percentile(latencies, 0.99), 3),
+            max_ms=round(latencies[-1], 3) if latencies else 0.0,
+            client_kbps_mean=round(statistics.fmean(kbps), 3) if kbps else 0.0,
+            client_kbps_p95=round(percentile(kbps, 0.95), 3),
+            client_kbps_max=round(kbps[-1], 3) if kbps else 0.0,
+            total_mb=round(sum(nbytes for _, _, nbytes, _ in stats) / 1024 / 1024, 3),
+            harness_cpu_pct=round(cpu_pct, 1),
+            server=server,
+        )
@@ -0,0 +1,59 @@
+"""The slice of Supabase Realtime's wire protocol the harness and stand-in speak.
+
+Realtime is a Phoenix server; supabase-js talks to it with the JSON v1
+serializer (``vsn=1.0.0``): every frame is ``{"topic", "event", "payload",
+"ref"}``. A client joins ``realtime:<channel name>`` with ``phx_join`` and a
+``postgres_changes`` config, then receives one ``postgres_changes`` frame per
+matching row change. Filters are a single ``column=eq.value``.
+
+The harness drives inserts over the same socket type, on ``CONTROL_TOPIC``;
+that part is the stand-in's own and does not exist on a real server.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+PHX_JOIN = "phx_join"
+PHX_LEAVE = "phx_leave"
+PHX_REPLY = "phx_reply"
+HEARTBEAT = "heartbeat"
+POSTGRES_CHANGES = "postgres_changes"
+PHOENIX_TOPIC = "phoenix"
+# supabase-js sends a heartbeat every 25 s; the server drops sockets silent for 60 s.
+HEARTBEAT_SECONDS = 25.0
+
+CONTROL_TOPIC = "rtbench:control"
+INSERT = "insert"
+STATS = "stats"
+
+
+def frame(topic: str, event: str, payload: dict[str, Any], ref: str | None = None) -> str:
+    return json.dumps({"topic": topic, "event": event, "payload": payload, "ref": ref}, separators=(",", ":"))
+
+
+def reply(topic: str, ref: str | None, response: dict[str, Any], status: str = "ok") -> str:
+    return frame(topic, PHX_REPLY, {"status": status, "response": response}, ref)
+
+
+def channel_topic(channel: str) -> str:
+    return f"realtime:{channel}"
+
+
+def join_payload(table: str, filter_: str | None, access_token: str) -> dict[str, Any]:
+    change: dict[str, Any] = {"event": "INSERT", "schema": "public", "table": table}
+    if filter_:
+        change["filter"] = filter_
+    return {
+        "config": {"broadcast": {"ack": False, "self": False}, "presence": {"key": ""}, "postgres_changes": [change]},
+        "access_token": access_token,
+    }
+
+
+def parse_filter(filter_: str) -> tuple[str, str]:
+    """``"receiver_id=eq.<uuid>"`` -> ``("receiver_id", "<uuid>")``."""
+    column, sep, rest = filter_.partition("=")
+    if not sep or not rest.startswith("eq.") or not column:
+        raise ValueError(f"unsupported filter {filter_!r}; only column=eq.value")
+    return column, rest[3:]
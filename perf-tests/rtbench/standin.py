@@ -0,0 +1,211 @@
+"""A local stand-in for the Realtime server's postgres_changes fan-out.
+
+It accepts supabase-js style sockets, keeps their subscriptions, and for
+every inserted row does what Realtime does per change:
+
+1. match the row against every subscription on its table (the filter);
+2. check RLS for each subscriber that matched (Realtime runs this as a query
+   per change, with one row per candidate subscriber);
+3. queue a ``postgres_changes`` frame on each authorised socket.
+
+Changes are handled one at a time, as they come off the WAL. The
+authorisation step costs ``check_cost_us`` per candidate (awaited, so a
+backlog builds up as it would on the server), a full change queue drops new
+changes, and a full per-socket send buffer drops frames for that socket.
+There is no database: the harness sends rows on ``CONTROL_TOPIC``, and
+``access_token`` is taken as the user id.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+try:
+    from websockets.asyncio.server import ServerConnection, serve
+    from websockets.exceptions import ConnectionClosed
+except ImportError as exc:  # pragma: no cover - depends on the environment
+    raise SystemExit("rtbench needs websockets 13+: pip install websockets") from exc
+
+from . import protocol
+from .tables import TABLES, Record
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PORT = 4010
+CHANGE_QUEUE = 10_000
+SEND_BUFFER = 1_000
+CHECK_COST_US = 20.0
+
+
+@dataclass
+class Counters:
+    changes: int = 0
+    changes_dropped: int = 0
+    filter_checks: int = 0
+    authorization_checks: int = 0
+    frames_queued: int = 0
+    frames_dropped: int = 0
+    bytes_sent: int = 0
+    max_backlog: int = 0
+    sockets: int = 0
+
+
+@dataclass(eq=False)
+class Subscription:
+    id: int
+    topic: str
+    table: str
+    filter: tuple[str, str] | None
+    user_id: str
+    socket: "Socket"
+
+
+@dataclass(eq=False)
+class Socket:
+    ws: ServerConnection
+    outbox: asyncio.Queue[str]
+    subscriptions: list[Subscription] = field(default_factory=list)
+
+
+class StandIn:
+    def __init__(
+        self, rls: bool = True, check_cost_us: float = CHECK_COST_US, change_queue: int = CHANGE_QUEUE, send_buffer: int = SEND_BUFFER
+    ) -> None:
+        self.rls = rls
+        self.check_cost_us = check_cost_us
+        self.send_buffer = send_buffer
+        self.changes: asyncio.Queue[tuple[str, Record]] = asyncio.Queue(change_queue)
+        self.subscriptions: dict[str, list[Subscription]] = {table: [] for table in TABLES}
+        self.counters = Counters()
+        self._next_id = 0
+
+    # -- sockets -------------------------------------------------------------
+
+    async def handle(self, ws: ServerConnection) -> None:
+        socket = Socket(ws, asyncio.Queue(self.send_buffer))
+        sender = asyncio.create_task(self._send(socket))
+        self.counters.sockets += 1
+        try:
+            async for message in ws:
+                msg = json.loads(message)
+                topic, event, ref = msg.get("topic"), msg.get("event"), msg.get("ref")
+                if topic == protocol.CONTROL_TOPIC:
+                    await self._control(ws, event, msg.get("payload") or {}, ref)
+                elif event == protocol.HEARTBEAT:
+                    await ws.send(protocol.reply(protocol.PHOENIX_TOPIC, ref, {}))
+                elif event == protocol.PHX_JOIN:
+                    await ws.send(self._join(socket, topic, msg.get("payload") or {}, ref))
+                elif event == protocol.PHX_LEAVE:
+                    self._leave(socket, topic)
+                    await ws.send(protocol.reply(topic, ref, {}))
+        except ConnectionClosed:
+            pass
+        finally:
+            self.counters.sockets -= 1
+            sender.cancel()
+            for topic in {s.topic for s in socket.subscriptions}:
+                self._leave(socket, topic)
+
+    def _join(self, socket: Socket, topic: str, payload: dict[str, Any], ref: str | None) -> str:
+        user_id = payload.get("access_token") or ""
+        accepted = []
+        for change in (payload.get("config") or {}).get("postgres_changes") or []:
+            table = change.get("table")
+            if table not in self.subscriptions:
+                return protocol.reply(topic, ref, {"reason": f"unknown table {table!r}"}, status="error")
+            try:
+                filter_ = protocol.parse_filter(change["filter"]) if change.get("filter") else None
+            except ValueError as exc:
+                return protocol.reply(topic, ref, {"reason": str(exc)}, status="error")
+            self._next_id += 1
+            subscription = Subscription(self._next_id, topic, table, filter_, user_id, socket)
+            socket.subscriptions.append(subscription)
+            self.subscriptions[table].append(subscription)
+            accepted.append({**change, "id": subscription.id})
+        return protocol.reply(topic, ref, {"postgres_changes": accepted})
+
+    def _leave(self, socket: Socket, topic: str) -> None:
+        for subscription in [s for s in socket.subscriptions if s.topic == topic]:
+            socket.subscriptions.remove(subscription)
+            self.subscriptions[subscription.table].remove(subscription)
+
+    async def _send(self, socket: Socket) -> None:
+        try:
+            while True:
+                message = await socket.outbox.get()
+                await socket.ws.send(message)
+                self.counters.bytes_sent += len(message)
+        except ConnectionClosed:
+            pass
+
+    async def _control(self, ws: ServerConnection, event: str | None, payload: dict[str, Any], ref: str | None) -> None:
+        if event == protocol.INSERT:
+            try:
+                self.changes.put_nowait((payload["table"], payload["record"]))
+            except asyncio.QueueFull:
+                self.counters.changes_dropped += 1
+            self.counters.max_backlog = max(self.counters.max_backlog, self.changes.qsize())
+        elif event == protocol.STATS:
+            await ws.send(protocol.reply(protocol.CONTROL_TOPIC, ref, asdict(self.counters)))
+
+    # -- fan-out -------------------------------------------------------------
+
+    async def fan_out(self) -> None:
+        while True:
+            table, record = await self.changes.get()
+            self.counters.changes += 1
+            spec = TABLES[table]
+
+            candidates = []
+            for subscription in self.subscriptions[table]:
+                self.counters.filter_checks += 1
+                if subscription.filter is None or str(record.get(subscription.filter[0])) == subscription.filter[1]:
+                    candidates.append(subscription)
+
+            if self.rls and candidates:
+                self.counters.authorization_checks += len(candidates)
+                if self.check_cost_us:
+                    await asyncio.sleep(len(candidates) * self.check_cost_us / 1e6)
+                candidates = [s for s in candidates if spec.visible(record, s.user_id)]
+
+            if not candidates:
+                continue
+            data = json.dumps(
+                {
+                    "columns": spec.column_metadata(),
+                    "commit_timestamp": datetime.now(timezone.utc).isoformat(),
+                    "errors": None,
+                    "record": record,
+                    "schema": "public",
+                    "table": table,
+                    "type": "INSERT",
+                },
+                separators=(",", ":"),
+            )
+            for subscription in candidates:
+                message = (
+                    f'{{"topic":{json.dumps(subscription.topic)},"event":"{protocol.POSTGRES_CHANGES}",'
+                    f'"payload":{{"data":{data},"ids":[{subscription.id}]}},"ref":null}}'
+                )
+                try:
+                    subscription.socket.outbox.put_nowait(message)
+                    self.counters.frames_queued += 1
+                except asyncio.QueueFull:
+                    self.counters.frames_dropped += 1
+
+
+async def serve_forever(host: str, port: int, standin: StandIn, ready: asyncio.Event | None = None) -> None:
+    fan_out = asyncio.create_task(standin.fan_out())
+    try:
+        async with serve(standin.handle, host, port, compression=None, ping_interval=None, max_queue=None):
+            log.info("realtime stand-in on ws://%s:%d/realtime/v1/websocket (rls %s)", host, port, "on" if standin.rls else "off")
+            if ready:
+                ready.set()
+            await asyncio.Future()
+    finally:
+        fan_out.cancel()
@@ -0,0 +1,158 @@
+"""The three realtime tables under test and how their rows are generated.
+
+Each spec mirrors the app: the channel name its hook opens, the column a
+per-user filter scopes on, the columns Realtime sends along with every
+record, and who may see a row under its RLS policies (the stand-in checks
+that per subscriber, as Realtime does).
+"""
+
+from __future__ import annotations
+
+import base64
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from random import Random
+from typing import Any, Callable
+
+Record = dict[str, Any]
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    name: str
+    channel: str
+    scoped_column: str
+    columns: tuple[tuple[str, str], ...]
+    make_record: Callable[[Random, list[str]], Record]
+    # RLS: the users who may see ``record``, or None for everyone.
+    audience: Callable[[Record], frozenset[str] | None]
+
+    def visible(self, record: Record, user_id: str) -> bool:
+        audience = self.audience(record)
+        return audience is None or user_id in audience
+
+    def column_metadata(self) -> list[dict[str, str]]:
+        return [{"name": name, "type": pg_type} for name, pg_type in self.columns]
+
+
+def _uuid(rng: Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _message(rng: Random, users: list[str]) -> Record:
+    sender, receiver = rng.sample(users, 2)
+    # Contents are encrypted client-side (src/utils/encryption.ts): base64 of iv + ciphertext.
+    content = base64.b64encode(rng.randbytes(12 + rng.randint(20, 240))).decode("ascii")
+    return {
+        "id": _uuid(rng),
+        "sender_id": sender,
+        "receiver_id": receiver,
+        "property_id": _uuid(rng) if rng.random() < 0.7 else None,
+        "content": content,
+        "read": False,
+        "deleted": False,
+        "edited": False,
+        "edited_at": None,
+        "created_at": _now(),
+        "sender_name": "Bench User",
+        "sender_email": f"{sender[:8]}@bench.invalid",
+    }
+
+
+def _favorite(rng: Random, users: list[str]) -> Record:
+    return {"id": _uuid(rng), "user_id": rng.choice(users), "property_id": _uuid(rng), "created_at": _now()}
+
+
+def _property(rng: Random, users: list[str]) -> Record:
+    now = _now()
+    return {
+        "id": _uuid(rng),
+        "user_id": rng.choice(users),
+        "title": f"{rng.randint(1, 4)} BHK apartment near metro station",
+        "description": " ".join(rng.choice(("spacious", "furnished", "sunny", "quiet", "gated", "parking")) for _ in range(60)),
+        "property_type": rng.choice(("apartment", "house", "office", "shop", "pg")),
+        "price": rng.randrange(8_000, 150_000, 500),
+        "price_type": "monthly",
+        "city": "Mumbai",
+        "area": "Andheri West",
+        "pin_code": "400058",
+        "address": "Lokhandwala Complex",
+        "latitude": round(19.13 + rng.random() / 50, 6),
+        "longitude": round(72.82 + rng.random() / 50, 6),
+        "bedrooms": rng.randint(1, 4),
+        "bathrooms": rng.randint(1, 3),
+        "area_sqft": rng.randint(350, 2200),
+        "images": [
+            f"http://127.0.0.1:54321/storage/v1/object/public/property-images/{_uuid(rng)}/{rng.getrandbits(40)}.jpg"
+            for _ in range(rng.randint(3, 8))
+        ],
+        "image_placeholders": {},
+        "amenities": ["parking", "lift", "security"],
+        "status": "active",
+        "available": True,
+        "verified": False,
+        "views": 0,
+        "contact_name": "Bench User",
+        "contact_phone": "+910000000000",
+        "contact_email": "owner@bench.invalid",
+        "is_agent": False,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _types(record: Record) -> tuple[tuple[str, str], ...]:
+    """Approximate column types; they only stand in for the bytes of Realtime's column list."""
+    def pg_type(value: Any) -> str:
+        if isinstance(value, bool):
+            return "bool"
+        if isinstance(value, int):
+            return "int4"
+        if isinstance(value, float):
+            return "numeric"
+        if isinstance(value, list):
+            return "_text"
+        if isinstance(value, dict):
+            return "jsonb"
+        return "text"
+
+    return tuple((name, pg_type(value)) for name, value in record.items())
+
+
+_SAMPLE_USERS = ["00000000-0000-4000-8000-000000000001", "00000000-0000-4000-8000-000000000002"]
+
+TABLES: dict[str, TableSpec] = {
+    spec.name: spec
+    for spec in (
+        TableSpec(
+            "messages",
+            "messages-realtime",
+            "receiver_id",
+            _types(_message(Random(0), _SAMPLE_USERS)),
+            _message,
+            lambda record: frozenset((record["sender_id"], record["receiver_id"])),
+        ),
+        TableSpec(
+            "favorites",
+            "favorites-live",
+            "user_id",
+            _types(_favorite(Random(0), _SAMPLE_USERS)),
+            _favorite,
+            lambda record: frozenset((record["user_id"],)),
+        ),
+        TableSpec(
+            "properties",
+            "properties-live",
+            "user_id",
+            _types(_property(Random(0), _SAMPLE_USERS)),
+            _property,
+            # Active listings are public.
+            lambda record: None,
+        ),
+    )
+}
@@ -0,0 +1,107 @@
+"""dbbench: workload parameters, cursors, percentiles and result comparison.
+
+Needs psycopg importable, not a database.
+
+    cd perf-tests
+    python -m unittest discover tests
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from random import Random
+
+from dbbench import __main__ as cli
+from dbbench.runner import percentile
+from dbbench.seed import city_shares, load_cities
+from dbbench.workloads import WORKLOADS, _cursor, _misspell
+
+
+class PercentileTest(unittest.TestCase):
+    def test_nearest_rank(self) -> None:
+        samples = [float(n) for n in range(1, 101)]
+        self.assertEqual(percentile(samples, 0.5), 50.0)
+        self.assertEqual(percentile(samples, 0.95), 95.0)
+        self.assertEqual(percentile(samples, 0.99), 99.0)
+        self.assertEqual(percentile([7.0], 0.99), 7.0)
+        self.assertEqual(percentile([1.0, 2.0], 0.0), 1.0)
+
+
+class CursorTest(unittest.TestCase):
+    def test_decodes_like_public_decode_cursor(self) -> None:
+        key = {"sort": "price-low", "price": 12000, "id": "00000000-0000-0000-0000-000000000000"}
+        token = _cursor(key)
+        self.assertNotIn("\n", token)
+        self.assertEqual(json.loads(base64.b64decode(token, validate=True)), key)
+
+    def test_deep_cursor_matches_its_sort(self) -> None:
+        cities = load_cities()
+        for seed in range(20):
+            params = WORKLOADS["search_properties_page/deep_cursor"].params(Random(seed), cities)
+            key = json.loads(base64.b64decode(params["after_cursor"]))
+            self.assertEqual(key["sort"], params["sort_by"])
+            self.assertIn("at" if key["sort"] == "recent" else "price", key)
+
+
+class WorkloadTest(unittest.TestCase):
+    def test_sql_casts_every_argument_in_order(self) -> None:
+        sql = WORKLOADS["search_properties_nearby/first_page"].sql
+        self.assertTrue(sql.startswith("SELECT * FROM public.search_properties_nearby(user_lat => %(user_lat)s::double"))
+        self.assertIn("after_id => %(after_id)s::uuid", sql)
+
+    def test_params_are_reproducible_and_cover_every_argument(self) -> None:
+        cities = load_cities()
+        for name, workload in WORKLOADS.items():
+            first = workload.params(Random(7), cities)
+            self.assertEqual(first, workload.params(Random(7), cities), name)
+            self.assertLessEqual(set(workload.args), set(first), name)
+
+    def test_misspelling_changes_one_letter(self) -> None:
+        rng = Random(3)
+        for word in ("Bangalore", "Koramangala", "office"):
+            typo = _misspell(rng, word)
+            self.assertNotEqual(typo, word)
+            self.assertLessEqual(abs(len(typo) - len(word)), 1)
+        self.assertEqual(_misspell(rng, "Go"), "Go")
+
+    def test_city_shares_add_up(self) -> None:
+        cities = load_cities()
+        shares = city_shares(cities, 10_001)
+        self.assertEqual(sum(shares), 10_001)
+        self.assertGreater(shares[0], shares[-1])
+
+
+class CompareTest(unittest.TestCase):
+    def run_compare(self, before: dict[str, float], after: dict[str, float]) -> tuple[int, str]:
+        with tempfile.TemporaryDirectory() as root:
+            paths = []
+            for name, p95 in (("before", before), ("after", after)):
+                path = Path(root) / f"{name}.json"
+                results = [{"workload": w, "p95_ms": ms} for w, ms in p95.items()]
+                path.write_text(json.dumps({"meta": {"commit": name, "rows": 1000}, "results": results}))
+                paths.append(path)
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                code = cli.compare(argparse.Namespace(before=paths[0], after=paths[1], threshold=10.0))
+        return code, out.getvalue()
+
+    def test_flags_p95_increases_above_the_threshold(self) -> None:
+        code, out = self.run_compare({"a": 10.0, "b": 10.0}, {"a": 10.5, "b": 12.0, "c": 1.0})
+        self.assertEqual(code, 1)
+        self.assertNotIn("REGRESSION", next(line for line in out.splitlines() if line.startswith("a ")))
+        self.assertIn("(+20.0%)  REGRESSION", out)
+        self.assertIn("(new)", out)
+
+    def test_faster_run_passes(self) -> None:
+        self.assertEqual(self.run_compare({"a": 10.0}, {"a": 5.0})[0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
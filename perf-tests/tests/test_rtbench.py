@@ -0,0 +1,113 @@
+"""rtbench: protocol helpers, expected deliveries and the stand-in's fan-out.
+
+Needs websockets importable, not a server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import unittest
+from random import Random
+
+from rtbench import protocol
+from rtbench.harness import Run, RunConfig, percentile, user_ids
+from rtbench.standin import Socket, StandIn
+from rtbench.tables import TABLES
+
+
+def config(table: str, mode: str, rls: bool = True, clients: int = 4) -> RunConfig:
+    return RunConfig(
+        table=table, mode=mode, url="ws://127.0.0.1:0", clients=clients, users=6, rate=1, duration=1, drain=1, rls=rls, seed=1
+    )
+
+
+class ProtocolTest(unittest.TestCase):
+    def test_filters(self) -> None:
+        self.assertEqual(protocol.parse_filter("receiver_id=eq.abc"), ("receiver_id", "abc"))
+        for bad in ("receiver_id", "receiver_id=neq.abc", "=eq.abc"):
+            with self.assertRaises(ValueError):
+                protocol.parse_filter(bad)
+
+    def test_join_payload_and_reply(self) -> None:
+        payload = protocol.join_payload("messages", "receiver_id=eq.u1", "token")
+        (change,) = payload["config"]["postgres_changes"]
+        self.assertEqual(change, {"event": "INSERT", "schema": "public", "table": "messages", "filter": "receiver_id=eq.u1"})
+        self.assertNotIn("filter", protocol.join_payload("properties", None, "t")["config"]["postgres_changes"][0])
+        reply = json.loads(protocol.reply("realtime:x", "1", {"ok": 1}, status="error"))
+        self.assertEqual(reply, {"topic": "realtime:x", "event": "phx_reply", "payload": {"status": "error", "response": {"ok": 1}}, "ref": "1"})
+
+    def test_percentile(self) -> None:
+        self.assertEqual(percentile([], 0.95), 0.0)
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0], 0.5), 2.0)
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0], 0.99), 4.0)
+
+
+class ExpectTest(unittest.TestCase):
+    def test_user_ids_are_seeded(self) -> None:
+        self.assertEqual(user_ids(3, 1), user_ids(3, 1))
+        self.assertNotEqual(user_ids(3, 1), user_ids(3, 2))
+
+    def test_scoped_messages_reach_only_a_connected_receiver(self) -> None:
+        run = Run(config("messages", "scoped"))
+        users = run.users
+        run._expect({"sender_id": users[5], "receiver_id": users[0]})
+        run._expect({"sender_id": users[0], "receiver_id": users[5]})  # receiver not connected
+        self.assertEqual(dict(run.expected), {users[0]: 1})
+
+    def test_broadcast_goes_through_rls_only_when_enabled(self) -> None:
+        run = Run(config("messages", "broadcast"))
+        users = run.users
+        run._expect({"sender_id": users[1], "receiver_id": users[2]})
+        self.assertEqual(dict(run.expected), {users[1]: 1, users[2]: 1})
+
+        open_run = Run(config("messages", "broadcast", rls=False))
+        open_run._expect({"sender_id": users[1], "receiver_id": users[2]})
+        self.assertEqual(sum(open_run.expected.values()), 4)
+
+        public = Run(config("properties", "broadcast"))
+        public._expect(TABLES["properties"].make_record(Random(0), public.users))
+        self.assertEqual(sum(public.expected.values()), 4)
+
+    def test_users_must_cover_clients(self) -> None:
+        with self.assertRaises(ValueError):
+            Run(config("messages", "scoped", clients=10))
+
+
+class FanOutTest(unittest.TestCase):
+    def test_filter_and_rls_pick_the_subscribers(self) -> None:
+        async def scenario() -> tuple[StandIn, list[int]]:
+            standin = StandIn(check_cost_us=0)
+            sockets = [Socket(None, asyncio.Queue()) for _ in range(3)]  # type: ignore[arg-type]
+            joins = [
+                ("u1", "receiver_id=eq.u1"),  # scoped to its own inbox
+                ("u2", None),  # whole table, RLS decides
+                ("u3", None),
+            ]
+            for socket, (user, filter_) in zip(sockets, joins):
+                reply = standin._join(socket, "realtime:messages-realtime", protocol.join_payload("messages", filter_, user), "1")
+                self.assertEqual(json.loads(reply)["payload"]["status"], "ok")
+            task = asyncio.create_task(standin.fan_out())
+            await standin.changes.put(("messages", {"sender_id": "u2", "receiver_id": "u1", "content": "hi"}))
+            while standin.counters.changes < 1 or not standin.changes.empty():
+                await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            task.cancel()
+            return standin, [socket.outbox.qsize() for socket in sockets]
+
+        standin, queued = asyncio.run(scenario())
+        self.assertEqual(queued, [1, 1, 0])
+        self.assertEqual(standin.counters.filter_checks, 3)
+        self.assertEqual(standin.counters.authorization_checks, 3)
+
+    def test_unknown_table_and_bad_filter_are_rejected(self) -> None:
+        standin = StandIn()
+        socket = Socket(None, asyncio.Queue())  # type: ignore[arg-type]
+        for table, filter_ in (("leads", None), ("messages", "receiver_id=in.(a,b)")):
+            reply = json.loads(standin._join(socket, "realtime:x", protocol.join_payload(table, filter_, "u1"), "1"))
+            self.assertEqual(reply["payload"]["status"], "error")
+        self.assertEqual(socket.subscriptions, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
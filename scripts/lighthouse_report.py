@@ -0,0 +1,427 @@
+"""Summarize, budget-check and diff Lighthouse JSON reports.
+
+    python scripts/lighthouse_report.py summary lighthouse-report.json
+    python scripts/lighthouse_report.py check lighthouse-report.json --budgets budgets.json
+    python scripts/lighthouse_report.py diff old.json new.json
+
+Reports are read incrementally. Screenshots, the full-page DOM snapshot,
+i18n strings and the other audits nobody acts on are skipped without being
+decoded, so only the handful of audits below are ever held in memory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Any, Iterator
+from urllib.parse import urlsplit
+
+CHUNK_SIZE = 64 * 1024
+
+METRICS = (
+    "first-contentful-paint",
+    "largest-contentful-paint",
+    "total-blocking-time",
+    "cumulative-layout-shift",
+    "speed-index",
+    "interactive",
+)
+IMAGE_AUDITS = ("modern-image-formats", "uses-optimized-images", "uses-responsive-images", "offscreen-images")
+WASTE_AUDITS = ("unused-javascript", "unused-css-rules", "render-blocking-resources", "unminified-javascript", *IMAGE_AUDITS)
+KEPT_AUDITS = frozenset(
+    {*METRICS, *WASTE_AUDITS, "mainthread-work-breakdown", "script-treemap-data", "total-byte-weight"}
+)
+KEPT_TOP_LEVEL = frozenset({"lighthouseVersion", "finalDisplayedUrl", "finalUrl", "fetchTime", "categories", "audits"})
+
+DEFAULT_BUDGETS: dict[str, dict[str, float]] = {
+    # Minimum category scores, 0-100.
+    "scores": {"performance": 90, "accessibility": 90, "best-practices": 90, "seo": 90},
+    # Maximum metric values (ms, CLS unitless).
+    "metrics": {"largest-contentful-paint": 2500, "total-blocking-time": 200, "cumulative-layout-shift": 0.1},
+    # Maximum bytes.
+    "bytes": {"total-byte-weight": 1_600_000, "script-total": 700_000, "largest-chunk": 250_000, "unused-javascript": 150_000},
+}
+
+# Vite emits ``assets/<name>-<hash>.js``; dropping the hash lets builds be compared.
+_VITE_HASH = re.compile(r"(?<=^assets/)(.+)-[A-Za-z0-9_-]{8}(?=\.(?:js|mjs|css)$)")
+_STRING_END = re.compile(r'["\\]')
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_SCALAR_END = re.compile(r"[\s,\]}]")
+
+
+class _Stream:
+    """Minimal pull reader over a JSON document that can skip values unparsed."""
+
+    def __init__(self, fh: IO[str]):
+        self.fh = fh
+        self.buf = ""
+        self.pos = 0
+        self._mark: int | None = None  # start of the value being captured
+
+    def _refill(self) -> bool:
+        """Append the next chunk, dropping consumed text unless it is being captured."""
+        chunk = self.fh.read(CHUNK_SIZE)
+        if not chunk:
+            return False
+        keep = self.pos if self._mark is None else self._mark
+        self.buf = self.buf[keep:] + chunk
+        self.pos -= keep
+        if self._mark is not None:
+            self._mark = 0
+        return True
+
+    def _char(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._refill():
+                raise ValueError("unexpected end of JSON")
+
+    def expect(self, char: str) -> None:
+        if self._char() != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos}, got {self.buf[self.pos]!r}")
+        self.pos += 1
+
+    def _scan_string(self) -> None:
+        """Advance past a string whose opening quote has been consumed."""
+        while True:
+            match = _STRING_END.search(self.buf, self.pos)
+            if match is None or (match.group() == "\\" and match.end() >= len(self.buf)):
+                self.pos = len(self.buf) if match is None else match.start()
+                if not self._refill():
+                    raise ValueError("unterminated string")
+                continue
+            if match.group() == "\\":
+                self.pos = match.end() + 1
+                continue
+            self.pos = match.end()
+            return
+
+    def skip(self) -> None:
+        first = self._char()
+        if first == '"':
+            self.pos += 1
+            self._scan_string()
+            return
+        if first not in "[{":
+            while (match := _SCALAR_END.search(self.buf, self.pos)) is None:
+                self.pos = len(self.buf)
+                if not self._refill():
+                    return
+            self.pos = match.start()
+            return
+        depth = 0
+        while True:
+            match = _STRUCTURE.search(self.buf, self.pos)
+            if match is None:
+                self.pos = len(self.buf)
+                if not self._refill():
+                    raise ValueError("unterminated container")
+                continue
+            self.pos = match.end()
+            token = match.group()
+            if token == '"':
+                self._scan_string()
+            elif token in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def value(self) -> Any:
+        self._char()
+        self._mark = self.pos
+        try:
+            self.skip()
+            text = self.buf[self._mark : self.pos]
+        finally:
+            self._mark = None
+        return json.loads(text)
+
+    def members(self) -> Iterator[str]:
+        """Yield the keys of the object at the cursor; the caller consumes each value."""
+        self.expect("{")
+        if self._char() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            separator = self._char()
+            self.pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"expected ',' or '}}' at offset {self.pos - 1}")
+
+
+def read_report(path: Path) -> dict[str, Any]:
+    """The top-level fields and audits this tool uses, nothing else."""
+    report: dict[str, Any] = {"audits": {}}
+    with path.open(encoding="utf-8") as fh:
+        stream = _Stream(fh)
+        for key in stream.members():
+            if key == "audits":
+                for audit_id in stream.members():
+                    if audit_id in KEPT_AUDITS:
+                        report["audits"][audit_id] = stream.value()
+                    else:
+                        stream.skip()
+            elif key in KEPT_TOP_LEVEL:
+                report[key] = stream.value()
+            else:
+                stream.skip()
+    return report
+
+
+def chunk_name(url: str) -> str:
+    parts = urlsplit(url)
+    return _VITE_HASH.sub(r"\1", parts.path.lstrip("/")) or url
+
+
+@dataclass
+class Summary:
+    url: str
+    fetch_time: str
+    lighthouse_version: str
+    scores: dict[str, float] = field(default_factory=dict)
+    metrics: dict[str, float] = field(default_factory=dict)
+    # audit id -> {resource: wasted bytes or ms}
+    waste: dict[str, dict[str, float]] = field(default_factory=dict)
+    main_thread: dict[str, float] = field(default_factory=dict)
+    # chunk name -> {"bytes": resource bytes, "unused": unused bytes}
+    chunks: dict[str, dict[str, float]] = field(default_factory=dict)
+    total_bytes: float = 0
+
+    @property
+    def script_bytes(self) -> float:
+        return sum(chunk["bytes"] for chunk in self.chunks.values())
+
+    def largest_chunks(self, limit: int = 10) -> list[tuple[str, dict[str, float]]]:
+        return sorted(self.chunks.items(), key=lambda item: -item[1]["bytes"])[:limit]
+
+    def wasted(self, audit_id: str) -> float:
+        return sum(self.waste.get(audit_id, {}).values())
+
+
+def _items(audit: dict[str, Any] | None) -> list[dict[str, Any]]:
+    return ((audit or {}).get("details") or {}).get("items") or []
+
+
+def summarize(report: dict[str, Any]) -> Summary:
+    audits = report["audits"]
+    summary = Summary(
+        url=report.get("finalDisplayedUrl") or report.get("finalUrl", ""),
+        fetch_time=report.get("fetchTime", ""),
+        lighthouse_version=report.get("lighthouseVersion", ""),
+        scores={
+            name: round(category["score"] * 100)
+            for name, category in report.get("categories", {}).items()
+            if category.get("score") is not None
+        },
+        metrics={
+            name: audits[name]["numericValue"]
+            for name in METRICS
+            if audits.get(name, {}).get("numericValue") is not None
+        },
+        total_bytes=audits.get("total-byte-weight", {}).get("numericValue") or 0,
+    )
+    for audit_id in WASTE_AUDITS:
+        waste: dict[str, float] = {}
+        for item in _items(audits.get(audit_id)):
+            amount = item.get("wastedBytes", item.get("wastedMs"))
+            if item.get("url") and amount:
+                waste[chunk_name(item["url"])] = waste.get(chunk_name(item["url"]), 0) + amount
+        if waste:
+            summary.waste[audit_id] = waste
+    for item in _items(audits.get("mainthread-work-breakdown")):
+        summary.main_thread[item.get("groupLabel", item.get("group", "?"))] = item["duration"]
+    for node in (audits.get("script-treemap-data", {}).get("details") or {}).get("nodes", []):
+        if not urlsplit(node["name"]).scheme:
+            continue  # inline scripts
+        name = chunk_name(node["name"])
+        chunk = summary.chunks.setdefault(name, {"bytes": 0, "unused": 0})
+        chunk["bytes"] += node.get("resourceBytes", 0)
+        chunk["unused"] += node.get("unusedBytes", 0)
+    return summary
+
+
+def load_summary(path: Path) -> Summary:
+    return summarize(read_report(path))
+
+
+def load_budgets(path: Path | None) -> dict[str, dict[str, float]]:
+    budgets = {section: dict(limits) for section, limits in DEFAULT_BUDGETS.items()}
+    if path is not None:
+        for section, limits in json.loads(path.read_text(encoding="utf-8")).items():
+            if section not in budgets:
+                raise ValueError(f"{path}: unknown budget section {section!r}; expected {sorted(budgets)}")
+            budgets[section].update(limits)
+    return budgets
+
+
+def check_budgets(summary: Summary, budgets: dict[str, dict[str, float]]) -> list[str]:
+    failures = []
+    for name, minimum in budgets["scores"].items():
+        score = summary.scores.get(name)
+        if score is not None and score < minimum:
+            failures.append(f"{name} score {score} < {minimum:g}")
+    for name, limit in budgets["metrics"].items():
+        value = summary.metrics.get(name)
+        if value is not None and value > limit:
+            failures.append(f"{name} {_metric(name, value)} > {_metric(name, limit)}")
+    largest = summary.largest_chunks(1)
+    actual = {
+        "total-byte-weight": summary.total_bytes,
+        "script-total": summary.script_bytes,
+        "largest-chunk": largest[0][1]["bytes"] if largest else 0,
+        "unused-javascript": summary.wasted("unused-javascript"),
+    }
+    for name, limit in budgets["bytes"].items():
+        if name not in actual:
+            raise ValueError(f"unknown byte budget {name!r}; expected {sorted(actual)}")
+        if actual[name] > limit:
+            detail = f" ({largest[0][0]})" if name == "largest-chunk" else ""
+            failures.append(f"{name} {_kib(actual[name])}{detail} > {_kib(limit)}")
+    return failures
+
+
+@dataclass
+class Change:
+    kind: str
+    name: str
+    before: float | None
+    after: float | None
+
+    @property
+    def delta(self) -> float:
+        return (self.after or 0) - (self.before or 0)
+
+
+def diff(old: Summary, new: Summary, min_bytes: float = 1024) -> list[Change]:
+    """Regressions from ``old`` to ``new``, worst first within each kind."""
+    changes: list[Change] = []
+    for name in sorted(set(old.scores) | set(new.scores)):
+        if new.scores.get(name, 0) < old.scores.get(name, 0):
+            changes.append(Change("score", name, old.scores.get(name), new.scores.get(name)))
+    for name in METRICS:
+        before, after = old.metrics.get(name), new.metrics.get(name)
+        if before is not None and after is not None and after > before * 1.05:
+            changes.append(Change("metric", name, before, after))
+    chunks = []
+    for name in set(old.chunks) | set(new.chunks):
+        before = old.chunks.get(name, {}).get("bytes")
+        after = new.chunks.get(name, {}).get("bytes")
+        if (after or 0) - (before or 0) >= min_bytes:
+            chunks.append(Change("chunk", name, before, after))
+    audits = []
+    for audit_id in WASTE_AUDITS:
+        before, after = old.wasted(audit_id), new.wasted(audit_id)
+        if after - before >= (min_bytes if audit_id != "render-blocking-resources" else 50):
+            audits.append(Change("audit", audit_id, before, after))
+    changes += sorted(chunks, key=lambda c: -c.delta) + sorted(audits, key=lambda c: -c.delta)
+    return changes
+
+
+def _kib(value: float) -> str:
+    return f"{value / 1024:,.0f} KiB"
+
+
+def _metric(name: str, value: float) -> str:
+    # Every metric but CLS is in milliseconds.
+    return f"{value:.3f}" if name == "cumulative-layout-shift" else f"{value:,.0f} ms"
+
+
+def _change_value(change: Change, value: float) -> str:
+    if change.kind == "score":
+        return f"{value:g}"
+    if change.kind == "metric":
+        return _metric(change.name, value)
+    if change.name == "render-blocking-resources":
+        return f"{value:,.0f} ms"
+    return _kib(value)
+
+
+def print_summary(summary: Summary, top: int) -> None:
+    print(f"{summary.url}  (Lighthouse {summary.lighthouse_version}, {summary.fetch_time})")
+    print("scores:  " + "  ".join(f"{name} {score}" for name, score in summary.scores.items()))
+    print("metrics: " + "  ".join(f"{name} {_metric(name, value)}" for name, value in summary.metrics.items()))
+    print(f"\ntransfer {_kib(summary.total_bytes)}, script {_kib(summary.script_bytes)}; largest chunks:")
+    for name, chunk in summary.largest_chunks(top):
+        print(f"  {_kib(chunk['bytes']):>10}  {_kib(chunk['unused']):>10} unused  {name}")
+    print("\nmain thread:")
+    for label, duration in sorted(summary.main_thread.items(), key=lambda item: -item[1]):
+        print(f"  {duration:8.0f} ms  {label}")
+    for audit_id, waste in summary.waste.items():
+        unit = "ms" if audit_id == "render-blocking-resources" else "bytes"
+        print(f"\n{audit_id}:")
+        for name, amount in sorted(waste.items(), key=lambda item: -item[1])[:top]:
+            print(f"  {amount:8.0f} ms  {name}" if unit == "ms" else f"  {_kib(amount):>10}  {name}")
+
+
+def print_diff(changes: list[Change]) -> None:
+    if not changes:
+        print("No regressions.")
+        return
+    for change in changes:
+        before = "-" if change.before is None else _change_value(change, change.before)
+        after = "-" if change.after is None else _change_value(change, change.after)
+        delta = ("+" if change.delta >= 0 else "-") + _change_value(change, abs(change.delta))
+        print(f"{change.kind:<7} {change.name:<60} {before:>12} -> {after:<12} ({delta})")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Summarize, budget-check and diff Lighthouse JSON reports.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    summary = commands.add_parser("summary", help="key audits of one report")
+    summary.add_argument("report", type=Path)
+    summary.add_argument("--top", type=int, default=10, help="rows per table (default: 10)")
+    summary.add_argument("--json", action="store_true", help="print the summary as JSON")
+
+    check = commands.add_parser("check", help="exit 1 if the report breaks a budget")
+    check.add_argument("report", type=Path)
+    check.add_argument("--budgets", type=Path, help="JSON overriding sections of the default budgets")
+
+    compare = commands.add_parser("diff", help="regressions between two reports; exit 1 if any")
+    compare.add_argument("old", type=Path)
+    compare.add_argument("new", type=Path)
+    compare.add_argument("--min-bytes", type=float, default=1024, help="ignore byte growth below this (default: 1024)")
+    compare.add_argument("--json", action="store_true", help="print the changes as JSON")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "summary":
+        summary = load_summary(args.report)
+        if args.json:
+            print(json.dumps(asdict(summary), indent=2))
+        else:
+            print_summary(summary, args.top)
+        return 0
+    if args.command == "check":
+        failures = check_budgets(load_summary(args.report), load_budgets(args.budgets))
+        for failure in failures:
+            print(f"over budget: {failure}")
+        if not failures:
+            print("All budgets met.")
+        return 1 if failures else 0
+    changes = diff(load_summary(args.old), load_summary(args.new), args.min_bytes)
+    if args.json:
+        print(json.dumps([asdict(change) for change in changes], indent=2))
+    else:
+        print_diff(changes)
+    return 1 if changes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+"""Typeahead service for the location search box.
+
+Keeps cities, areas, pin codes and ``search_suggestions`` in an in-memory
+prefix index (see ``index.py``) and answers ``GET /autocomplete?q=...`` with
+the same rows as the ``autocomplete_search`` RPC, so typing no longer costs a
+Postgres query per keystroke.
+
+Matching differs from the RPC. It took ``label ILIKE '%q%'``, any substring;
+here the query has to be a prefix of the label or of one of its later words
+("white" and "bangalore" find "Whitefield, Bangalore", "field" no longer
+does), and misspelt queries fall back to fuzzy matches. Results also include
+the cities, areas and pin codes themselves, not only rows of
+``search_suggestions``.
+
+The index follows the database through LISTEN/NOTIFY: a ``search_count``
+change is applied in place, and changes to the location tables reload it.
+``/healthz`` answers 200 only once the index is loaded and the thread
+following the database is running.
+
+    cd services
+    python -m autocomplete serve --port 8787      # VITE_AUTOCOMPLETE_URL=http://127.0.0.1:8787
+    python -m autocomplete bench                  # lookup latency against the live data
+
+The database is taken from ``--dsn`` or ``AUTOCOMPLETE_DSN`` and defaults to
+the local ``supabase start`` instance. The role needs SELECT on those tables.
+"""
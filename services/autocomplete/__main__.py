@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import time
+
+from . import source
+from .server import Autocomplete, serve
+
+
+def bench(args: argparse.Namespace) -> int:
+    """Time lookups against the loaded index: prefixes of real labels, some misspelt."""
+    with source.connect(args.dsn) as conn:
+        started = time.perf_counter()
+        index = source.load(conn)
+    print(f"Loaded {len(index):,} entries in {time.perf_counter() - started:.2f}s")
+
+    rng = random.Random(args.seed)
+    labels = [entry.label for entry in index.entries()]
+    if not labels:
+        print("No entries to query", file=sys.stderr)
+        return 1
+    queries = []
+    for _ in range(args.queries):
+        label = rng.choice(labels).lower()
+        query = label[: rng.randint(2, max(2, min(len(label), 12)))]
+        if len(query) > 4 and rng.random() < 0.2:
+            i = rng.randrange(1, len(query) - 1)
+            query = query[:i] + query[i + 1 :]
+        queries.append(query)
+
+    timings = []
+    for query in queries:
+        started = time.perf_counter_ns()
+        index.complete(query, 10)
+        timings.append((time.perf_counter_ns() - started) / 1000)
+    timings.sort()
+    for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+        print(f"{name} {timings[min(len(timings) - 1, int(q * len(timings)))]:8.1f} us")
+    print(f"max {timings[-1]:8.1f} us")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m autocomplete", description="Typeahead for cities, areas and pin codes.")
+    parser.add_argument("--dsn", default=source.DEFAULT_DSN)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    sub = parser.add_subparsers(dest="command")
+
+    run = sub.add_parser("serve", help="serve /autocomplete (default)")
+    run.add_argument("--host", default="127.0.0.1")
+    run.add_argument("--port", type=int, default=8787)
+    run.add_argument("--allow-origin", default="*", help="Access-Control-Allow-Origin for the web app")
+
+    timing = sub.add_parser("bench", help="load the index once and time lookups")
+    timing.add_argument("--queries", type=int, default=10_000)
+    timing.add_argument("--seed", type=int, default=2025)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.command == "bench":
+        return bench(args)
+    serve(Autocomplete(args.dsn), getattr(args, "host", "127.0.0.1"), getattr(args, "port", 8787), getattr(args, "allow_origin", "*"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+"""Prefix index over location labels.
+
+A radix tree (edges hold whole runs of characters, so a label costs about one
+node per word rather than one per character) keyed by normalised labels. Each
+node caches the ``TOP_K`` best entries of its subtree, so a prefix lookup is a
+walk down at most ``len(query)`` characters plus a slice. Changing an entry's
+popularity only recomputes the caches on the paths to its keys.
+
+Misspelt queries fall back to a bounded edit-distance walk of the same tree.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
+
+TOP_K = 10
+# Same ordering as the original autocomplete_search: cities, then areas, then the rest.
+TYPE_WEIGHT = {"city": 2.0, "area": 1.5}
+# Keys starting at a later word ("bangalore" in "koramangala bangalore") rank below
+# labels that start with the query.
+INNER_WORD_FACTOR = 0.8
+MAX_INNER_WORDS = 4
+FUZZY_MIN_LEN = 3
+FUZZY_FACTOR = 0.5  # per edit
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+Key = tuple[str, str]  # (type, normalised label)
+
+
+def normalise(text: str) -> str:
+    return _SEPARATORS.sub(" ", text.casefold()).strip()
+
+
+def max_edits(query: str) -> int:
+    if len(query) < FUZZY_MIN_LEN:
+        return 0
+    return 1 if len(query) <= 6 else 2
+
+
+@dataclass(slots=True)
+class Entry:
+    type: str
+    label: str
+    city_id: str | None = None
+    area_id: str | None = None
+    pincode: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    search_count: int = 0
+    # Set when a row in search_suggestions backs this entry.
+    suggestion_id: str | None = None
+    # True for entries built from cities/areas/pincodes, which outlive their suggestion row.
+    location: bool = False
+
+    @property
+    def key(self) -> Key:
+        return self.type, normalise(self.label)
+
+    @property
+    def weight(self) -> float:
+        return TYPE_WEIGHT.get(self.type, 1.0) + math.log1p(max(self.search_count, 0))
+
+    def keys(self) -> Iterator[tuple[str, float]]:
+        """Index keys with their scores: the whole label, then from each later word."""
+        words = normalise(self.label).split()
+        weight = self.weight
+        for i in range(min(len(words), MAX_INNER_WORDS + 1)):
+            yield " ".join(words[i:]), weight if i == 0 else weight * INNER_WORD_FACTOR
+
+    def as_json(self, relevance: float) -> dict[str, Any]:
+        """Same fields as a row of the autocomplete_search RPC."""
+        return {
+            "type": self.type,
+            "label": self.label,
+            "city_id": self.city_id,
+            "area_id": self.area_id,
+            "pincode": self.pincode,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "relevance": round(relevance, 4),
+        }
+
+
+class _Node:
+    __slots__ = ("edge", "children", "terminal", "top")
+
+    def __init__(self, edge: str = "") -> None:
+        self.edge = edge
+        self.children: dict[str, _Node] = {}
+        # entry id -> score, for keys that end exactly here
+        self.terminal: dict[int, float] | None = None
+        # best (score, entry id) pairs in this subtree, highest first
+        self.top: list[tuple[float, int]] = []
+
+
+def _best(scores: dict[int, float]) -> list[tuple[float, int]]:
+    return heapq.nlargest(TOP_K, ((score, eid) for eid, score in scores.items()), key=lambda t: (t[0], -t[1]))
+
+
+def _recompute(node: _Node) -> None:
+    scores = dict(node.terminal or {})
+    for child in node.children.values():
+        for score, eid in child.top:
+            if scores.get(eid, -1.0) < score:
+                scores[eid] = score
+    node.top = _best(scores)
+
+
+class PrefixIndex:
+    """Autocomplete index; not thread-safe, callers serialise writes."""
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._entries: list[Entry | None] = []
+        self._ids: dict[Key, int] = {}
+
+    @classmethod
+    def build(cls, entries: Iterable[Entry]) -> PrefixIndex:
+        """Bulk load, filling the per-node caches once at the end."""
+        index = cls()
+        for entry in entries:
+            if entry.key in index._ids:
+                continue
+            eid = index._store(entry)
+            for key, score in entry.keys():
+                terminal = index._insert(key)[-1].terminal
+                terminal[eid] = max(score, terminal.get(eid, 0.0))
+        index._recompute_all()
+        return index
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def entries(self) -> Iterator[Entry]:
+        return (entry for entry in self._entries if entry is not None)
+
+    def get(self, key: Key) -> Entry | None:
+        eid = self._ids.get(key)
+        return None if eid is None else self._entries[eid]
+
+    def upsert(self, entry: Entry) -> None:
+        """Add ``entry``, or replace the entry with the same key and rescore it."""
+        eid = self._ids.get(entry.key)
+        if eid is None:
+            eid = self._store(entry)
+        else:
+            self._entries[eid] = entry
+        for key, score in entry.keys():
+            path = self._insert(key)
+            path[-1].terminal[eid] = score
+            self._recompute_path(path)
+
+    def remove(self, key: Key) -> Entry | None:
+        eid = self._ids.pop(key, None)
+        if eid is None:
+            return None
+        entry, self._entries[eid] = self._entries[eid], None
+        for word_key, _ in entry.keys():
+            path = self._path(word_key)
+            if path is None or not path[-1].terminal:
+                continue
+            path[-1].terminal.pop(eid, None)
+            self._recompute_path(path)
+        return entry
+
+    def complete(self, query: str, limit: int = TOP_K) -> list[tuple[Entry, float]]:
+        """Best entries whose label (or a later word of it) starts with ``query``.
+
+        When fewer than ``limit`` labels match exactly, labels within
+        ``max_edits(query)`` edits of the query fill the rest, scored lower.
+        """
+        q = normalise(query)
+        if not q:
+            return []
+        limit = min(max(limit, 1), TOP_K)
+        hits: dict[int, float] = {}
+        node = self._locate(q)
+        if node is not None:
+            hits.update((eid, score) for score, eid in node.top[:limit])
+
+        edits = max_edits(q)
+        if len(hits) < limit and edits:
+            fuzzy: dict[int, float] = {}
+            for distance, match in self._fuzzy(q, edits):
+                factor = FUZZY_FACTOR**distance
+                for score, eid in match.top:
+                    if eid not in hits and fuzzy.get(eid, -1.0) < score * factor:
+                        fuzzy[eid] = score * factor
+            for score, eid in _best(fuzzy)[: limit - len(hits)]:
+                hits[eid] = score
+
+        # Exact prefix matches first; dict order keeps them ahead of the fuzzy ones.
+        return [(self._entries[eid], score) for eid, score in hits.items()]
+
+    def _store(self, entry: Entry) -> int:
+        eid = len(self._entries)
+        self._entries.append(entry)
+        self._ids[entry.key] = eid
+        return eid
+
+    def _insert(self, key: str) -> list[_Node]:
+        """Nodes from the root to the (possibly new) node where ``key`` ends."""
+        node, path, i = self._root, [self._root], 0
+        while i < len(key):
+            child = node.children.get(key[i])
+            if child is None:
+                child = _Node(key[i:])
+                node.children[key[i]] = child
+                i = len(key)
+            else:
+                edge = child.edge
+                common = 0
+                while common < len(edge) and i + common < len(key) and edge[common] == key[i + common]:
+                    common += 1
+                if common < len(edge):
+                    # Split the edge; the new node's subtree is the old child's.
+                    mid = _Node(edge[:common])
+                    child.edge = edge[common:]
+                    mid.children[child.edge[0]] = child
+                    mid.top = list(child.top)
+                    node.children[key[i]] = mid
+                    child = mid
+                i += common
+            node = child
+            path.append(node)
+        if node.terminal is None:
+            node.terminal = {}
+        return path
+
+    def _path(self, key: str) -> list[_Node] | None:
+        node, path, i = self._root, [self._root], 0
+        while i < len(key):
+            node = node.children.get(key[i])
+            if node is None or not key.startswith(node.edge, i):
+                return None
+            i += len(node.edge)
+            path.append(node)
+        return path
+
+    def _locate(self, prefix: str) -> _Node | None:
+        """The node whose subtree holds every key starting with ``prefix``."""
+        node, i = self._root, 0
+        while i < len(prefix):
+            node = node.children.get(prefix[i])
+            if node is None:
+                return None
+            n = min(len(node.edge), len(prefix) - i)
+            if node.edge[:n] != prefix[i : i + n]:
+                return None
+            i += n
+        return node
+
+    def _recompute_path(self, path: list[_Node]) -> None:
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            _recompute(node)
+            if depth and not node.children and not node.terminal:
+                del path[depth - 1].children[node.edge[0]]
+
+    def _recompute_all(self) -> None:
+        stack: list[tuple[_Node, bool]] = [(self._root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                _recompute(node)
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children.values())
+
+    def _fuzzy(self, query: str, edits: int) -> Iterator[tuple[int, _Node]]:
+        """Nodes whose prefix is within ``edits`` Levenshtein edits of ``query``.
+
+        Walks the tree carrying one row of the edit-distance table per
+        character and stops descending once every cell exceeds ``edits``.
+        """
+        first = list(range(len(query) + 1))
+        stack = [(child, first) for child in self._root.children.values()]
+        while stack:
+            node, row = stack.pop()
+            for ch in node.edge:
+                prev, row = row, [row[0] + 1]
+                for j, qc in enumerate(query, 1):
+                    row.append(min(row[j - 1] + 1, prev[j] + 1, prev[j - 1] + (qc != ch)))
+                if row[-1] <= edits:
+                    yield row[-1], node
+                    break
+                if min(row) > edits:
+                    break
+            else:
+                stack.extend((child, row) for child in node.children.values())
@@ -0,0 +1,149 @@
+"""HTTP front end and the thread that keeps the index in step with Postgres."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import psycopg
+
+from . import source
+from .index import TOP_K, PrefixIndex
+
+log = logging.getLogger("autocomplete")
+
+POLL_SECONDS = 1.0
+RETRY_SECONDS = (1, 2, 5, 10, 30)
+CACHE_SECONDS = 60
+
+
+class Autocomplete:
+    """The live index. Lookups and in-place updates share a lock; a full
+    reload builds a new index off to the side and swaps it in."""
+
+    def __init__(self, dsn: str) -> None:
+        self.dsn = dsn
+        self.ready = threading.Event()
+        self.loaded_at: datetime | None = None
+        self.follower: threading.Thread | None = None
+        self._index = PrefixIndex()
+        self._lock = threading.Lock()
+
+    def complete(self, query: str, limit: int = TOP_K) -> list[dict[str, Any]]:
+        with self._lock:
+            return [entry.as_json(score) for entry, score in self._index.complete(query, limit)]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries = len(self._index)
+        return {
+            "ready": self.ready.is_set(),
+            "following": self.follower is not None and self.follower.is_alive(),
+            "entries": entries,
+            "loaded_at": self.loaded_at.isoformat(timespec="seconds") if self.loaded_at else None,
+        }
+
+    def reload(self) -> None:
+        started = time.perf_counter()
+        with source.connect(self.dsn) as conn:
+            index = source.load(conn)
+        with self._lock:
+            self._index = index
+        self.loaded_at = datetime.now(timezone.utc)
+        self.ready.set()
+        log.info("loaded %d entries in %.1fs", len(index), time.perf_counter() - started)
+
+    def apply(self, payload: dict[str, Any]) -> None:
+        if payload.get("table") != source.SUGGESTIONS:
+            self.reload()
+            return
+        with self._lock:
+            source.apply_suggestion(self._index, payload["op"], payload.get("new"), payload.get("old"))
+
+    def follow(self, stop: threading.Event) -> None:
+        """LISTEN for changes until ``stop`` is set, reloading after every (re)connect
+        since notifications sent while disconnected are lost.
+
+        Any failure, not only a database one (a bad payload, a bug in
+        ``apply``), drops the connection and starts over from a full reload,
+        so the index never silently stops following.
+        """
+        attempt = 0
+        while not stop.is_set():
+            try:
+                with source.connect(self.dsn) as conn:
+                    conn.execute(f"LISTEN {source.CHANNEL}")
+                    self.reload()
+                    attempt = 0
+                    while not stop.is_set():
+                        for notify in conn.notifies(timeout=POLL_SECONDS):
+                            self.apply(json.loads(notify.payload))
+            except Exception as exc:
+                delay = RETRY_SECONDS[min(attempt, len(RETRY_SECONDS) - 1)]
+                attempt += 1
+                if isinstance(exc, psycopg.Error):
+                    log.warning("database unavailable (%s); retrying in %ss", str(exc).splitlines()[0], delay)
+                else:
+                    log.exception("follower failed; reconnecting in %ss", delay)
+                stop.wait(delay)
+
+
+def _handler(service: Autocomplete, allow_origin: str) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            url = urlsplit(self.path)
+            params = parse_qs(url.query)
+            if url.path == "/healthz":
+                stats = service.stats()
+                healthy = stats["ready"] and stats["following"]
+                self._send(HTTPStatus.OK if healthy else HTTPStatus.SERVICE_UNAVAILABLE, stats)
+            elif url.path == "/autocomplete":
+                if not service.ready.is_set():
+                    self._send(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "index is loading"})
+                    return
+                query = params.get("q", [""])[0]
+                try:
+                    limit = int(params.get("limit", [TOP_K])[0])
+                except ValueError:
+                    self._send(HTTPStatus.BAD_REQUEST, {"error": "limit must be an integer"})
+                    return
+                self._send(HTTPStatus.OK, service.complete(query, limit), cache=True)
+            else:
+                self._send(HTTPStatus.NOT_FOUND, {"error": "not found"})
+
+        def _send(self, status: HTTPStatus, body: Any, cache: bool = False) -> None:
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Access-Control-Allow-Origin", allow_origin)
+            self.send_header("Cache-Control", f"public, max-age={CACHE_SECONDS}" if cache else "no-store")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+            log.debug(format, *args)
+
+    return Handler
+
+
+def serve(service: Autocomplete, host: str, port: int, allow_origin: str = "*") -> None:
+    stop = threading.Event()
+    service.follower = threading.Thread(target=service.follow, args=(stop,), name="autocomplete-follow", daemon=True)
+    service.follower.start()
+    server = ThreadingHTTPServer((host, port), _handler(service, allow_origin))
+    log.info("listening on http://%s:%d/autocomplete", host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
@@ -0,0 +1,19 @@
+"""Maintenance job for the campaign analytics rollups.
+
+``ad_campaign_stats_hourly`` and ``ad_campaign_stats_daily`` are kept current
+by the database itself (see ``20251222160000_campaign_stats_rollups.sql``).
+This job covers what the triggers cannot:
+
+    cd services
+    python -m campaign_rollups backfill            # history from before the rollups existed
+    python -m campaign_rollups compact             # drop hourly rows past --keep-hourly-days
+    python -m campaign_rollups check               # rollups vs ad_campaigns and leads
+
+Backfill and compaction work one campaign or one batch per transaction, so
+they can run against the live database. Schedule ``compact`` daily and
+``check`` as often as you like; ``check`` exits 1 when it finds drift.
+
+The database is taken from ``--dsn`` or ``ROLLUPS_DSN`` and defaults to the
+local ``supabase start`` instance. It needs a role that can execute the
+service-only functions (``service_role`` or ``postgres``).
+"""
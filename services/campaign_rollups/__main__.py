@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import datetime
+
+from . import jobs
+
+
+def _progress(done: int, total: int) -> None:
+    if done == total or done % 100 == 0:
+        print(f"  {done:,}/{total:,} campaigns", flush=True)
+
+
+def backfill(args: argparse.Namespace) -> int:
+    with jobs.connect(args.dsn) as conn:
+        ids = args.campaign or jobs.campaign_ids(conn, args.since)
+        print(f"Backfilling {len(ids):,} campaigns")
+        jobs.backfill(conn, ids, _progress)
+    return 0
+
+
+def compact(args: argparse.Namespace) -> int:
+    with jobs.connect(args.dsn) as conn:
+        before = jobs.compact_before(conn, args.keep_hourly_days)
+        rows = jobs.compact(conn, before, args.batch_size, dry_run=args.dry_run)
+    print(f"{'Would delete' if args.dry_run else 'Deleted'} {rows:,} hourly rows before {before.isoformat()}")
+    return 0
+
+
+def check(args: argparse.Namespace) -> int:
+    with jobs.connect(args.dsn) as conn:
+        drift = jobs.check(conn, jobs.compact_before(conn, args.keep_hourly_days))
+    for d in drift:
+        print(f"{d.campaign_id}  {d.metric}: expected {d.expected:g}, rolled up {d.rolled_up:g}")
+    print(f"{len(drift)} mismatches" if drift else "Rollups match")
+    return 1 if drift else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m campaign_rollups", description="Maintain campaign analytics rollups.")
+    parser.add_argument("--dsn", default=jobs.DEFAULT_DSN)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    fill = sub.add_parser("backfill", help="recount leads and book counters from before the rollups")
+    fill.add_argument("--campaign", nargs="*", help="campaign ids (default: all)")
+    fill.add_argument("--since", type=datetime.fromisoformat, help="only campaigns updated since this time")
+    fill.set_defaults(run=backfill)
+
+    for name, run, help_text in (
+        ("compact", compact, "delete hourly rows older than the retention window"),
+        ("check", check, "compare rollups with ad_campaigns and leads"),
+    ):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("--keep-hourly-days", type=int, default=jobs.KEEP_HOURLY_DAYS)
+        cmd.set_defaults(run=run)
+        if name == "compact":
+            cmd.add_argument("--batch-size", type=int, default=jobs.COMPACT_BATCH)
+            cmd.add_argument("--dry-run", action="store_true")
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+"""Placeholders for listing images, stored on the listing itself.
+
+For every URL in ``properties.images`` this job stores a ~16px WebP data URI,
+the dominant colour and the aspect ratio in ``properties.image_placeholders``
+(see ``20251222200000_image_placeholders.sql``). Cards paint the blurred
+placeholder straight from the row they already have, so the first paint on
+Index and Listings needs no image request at all.
+
+    cd services
+    python -m image_placeholders backfill                 # every listing, in parallel
+    python -m image_placeholders backfill --workers 16    # more fetch/decode processes
+    python -m image_placeholders incremental              # catch up, then follow new uploads
+
+``backfill`` walks the catalogue in id order and skips images that already
+have a placeholder, so it can be stopped and rerun. ``incremental`` does the
+same pass once, then LISTENs on ``image_placeholders`` (sent when a listing's
+images change) and handles those listings as they arrive.
+
+Images are read from the thumbnail variant written by ``image_variants`` when
+there is one, and from the original otherwise. The database is taken from
+``--dsn`` or ``PLACEHOLDERS_DSN`` and defaults to the local ``supabase start``
+instance; the role needs ``set_image_placeholders`` (``service_role`` or
+``postgres``).
+"""
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from . import jobs
+
+
+def _progress(listings: int, images: int) -> None:
+    print(f"  {listings:,} listings, {images:,} placeholders", flush=True)
+
+
+def backfill(args: argparse.Namespace) -> int:
+    with jobs.connect(args.dsn) as conn, ProcessPoolExecutor(args.workers) as pool:
+        result = jobs.backfill(conn, pool, args.batch_size, _progress)
+    print(f"Stored {result.images:,} placeholders on {result.listings:,} listings"
+          + (f"; {len(result.failed):,} images failed" if result.failed else ""))
+    return 0
+
+
+def incremental(args: argparse.Namespace) -> int:
+    with ProcessPoolExecutor(args.workers) as pool:
+        jobs.follow(args.dsn, pool, args.batch_size)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m image_placeholders", description="Compute placeholders for listing images."
+    )
+    parser.add_argument("--dsn", default=jobs.DEFAULT_DSN)
+    parser.add_argument("--workers", type=int, help="fetch/decode processes (default: one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=jobs.BATCH_SIZE, help="listings per write")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("backfill", help="one pass over every listing, then exit").set_defaults(run=backfill)
+    sub.add_parser("incremental", help="catch up, then follow image changes").set_defaults(run=incremental)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Fetching one image and reducing it to a placeholder; runs in the worker processes."""
+
+from __future__ import annotations
+
+import base64
+import io
+import urllib.error
+import urllib.request
+from typing import Any
+
+try:
+    from PIL import Image, ImageOps
+except ImportError as exc:  # pragma: no cover - depends on the environment
+    raise SystemExit("image_placeholders needs Pillow: pip install Pillow") from exc
+
+# 16px wide keeps the data URI around 100-300 bytes; the browser blurs it up.
+LQIP_WIDTH = 16
+LQIP_QUALITY = 40
+PALETTE_SIZE = 5
+FETCH_TIMEOUT_SECONDS = 20
+MAX_IMAGE_BYTES = 25 * 1024 * 1024
+
+# Same layout as services/image_variants: variants/<path>/thumbnail.webp
+LISTING_IMAGES_PATH = "/storage/v1/object/public/property-images/"
+
+
+def thumbnail_url(url: str) -> str | None:
+    at = url.find(LISTING_IMAGES_PATH)
+    if at == -1:
+        return None
+    root = url[: at + len(LISTING_IMAGES_PATH)]
+    path = url[len(root):].split("?", 1)[0].split("#", 1)[0]
+    if not path or path.startswith("variants/"):
+        return None
+    return f"{root}variants/{path}/thumbnail.webp"
+
+
+def fetch(url: str) -> bytes:
+    request = urllib.request.Request(url, headers={"User-Agent": "image-placeholders/1"})
+    with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT_SECONDS) as response:
+        data = response.read(MAX_IMAGE_BYTES + 1)
+    if len(data) > MAX_IMAGE_BYTES:
+        raise ValueError(f"larger than {MAX_IMAGE_BYTES:,} bytes")
+    return data
+
+
+def compute(data: bytes) -> dict[str, Any]:
+    """``{"lqip": data URI, "color": "#rrggbb", "aspect_ratio": width / height}``."""
+    with Image.open(io.BytesIO(data)) as image:
+        # JPEGs can decode at 1/2 to 1/8 scale; nothing here needs more than 64px.
+        image.draft("RGB", (64, 64))
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
+            image = image.convert("RGBA")
+            flat = Image.new("RGB", image.size, "white")
+            flat.paste(image, mask=image.getchannel("A"))
+            image = flat
+        else:
+            image = image.convert("RGB")
+
+    width, height = image.size
+    tiny = image.resize((LQIP_WIDTH, max(1, round(LQIP_WIDTH * height / width))), Image.Resampling.BOX)
+    buf = io.BytesIO()
+    tiny.save(buf, "WEBP", quality=LQIP_QUALITY)
+
+    # Most common colour of a small palette, not the mean, which turns a blue
+    # sky over a red roof into grey-brown.
+    swatch = image.resize((32, 32), Image.Resampling.BOX).quantize(PALETTE_SIZE, method=Image.Quantize.MEDIANCUT)
+    _, index = max(swatch.getcolors())
+    r, g, b = swatch.getpalette()[index * 3 : index * 3 + 3]
+
+    return {
+        "lqip": "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode("ascii"),
+        "color": f"#{r:02x}{g:02x}{b:02x}",
+        "aspect_ratio": round(width / height, 4),
+    }
+
+
+def placeholder_for(url: str) -> tuple[str, dict[str, Any] | None, str | None]:
+    """``(url, placeholder, None)``, or ``(url, None, reason)`` when the image cannot be used."""
+    error = "not fetched"
+    for candidate in filter(None, (thumbnail_url(url), url)):
+        try:
+            return url, compute(fetch(candidate)), None
+        except (OSError, ValueError, Image.DecompressionBombError) as exc:
+            # urllib errors are OSErrors; a missing thumbnail falls through to the original.
+            error = f"{candidate}: {exc}"
+    return url, None, error
@@ -0,0 +1,35 @@
+"""Worker that renders listing photos into the sizes the cards and maps use.
+
+Uploads land in the ``property-images`` bucket at their original size (the
+browser only caps them at 1920px). This worker finds photos without variants
+and writes, next to the bucket's originals::
+
+    variants/<user id>/<file name>/thumbnail.webp   300px wide
+    variants/<user id>/<file name>/medium.webp      900px
+    variants/<user id>/<file name>/large.webp       1600px
+    variants/<user id>/<file name>/*.avif           when Pillow can encode AVIF
+    variants/<user id>/<file name>/manifest.json
+
+Variants are never wider than the original, so the manifest records the
+width each one came out at. The manifest is written last, so a photo with a
+manifest has all its variants. The formats and widths are also recorded with
+``set_image_variants`` (see ``20251222200500_image_variant_queue.sql``), which
+copies them into the listings' ``image_placeholders``;
+``src/utils/imageOptimization.ts`` builds the srcset from the row alone and
+shows the original for photos without that entry.
+
+    cd services
+    python -m image_variants run                   # one pass over the bucket
+    python -m image_variants watch                 # catch up, then follow new uploads
+    python -m image_variants run --local ./bucket  # a directory laid out like the bucket
+
+Photos without variants are found in ``storage.objects`` rather than by
+listing the bucket, and ``watch`` LISTENs on ``image_variants``, which an
+upload into the bucket sends. ``--local`` directories have no database, so
+there each pass lists the directory and ``watch --interval`` polls it.
+
+The bucket is reached through ``SUPABASE_URL`` and
+``SUPABASE_SERVICE_ROLE_KEY``, the database through ``--dsn`` or
+``VARIANTS_DSN`` (the local ``supabase start`` instance by default). Decoding and encoding run in a process pool (``--workers``); the
+main process does the reads and writes.
+"""
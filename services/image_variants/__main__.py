@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+
+from . import variants, worker
+from .store import DEFAULT_URL, LocalStore, Store, SupabaseStore
+
+
+def _progress(done: int, total: int) -> None:
+    if done == total or done % 50 == 0:
+        print(f"  {done:,}/{total:,} images", flush=True)
+
+
+def _store(args: argparse.Namespace) -> Store:
+    return LocalStore(args.local) if args.local else SupabaseStore(args.url, bucket=args.bucket)
+
+
+def _formats(args: argparse.Namespace) -> tuple[str, ...]:
+    formats = tuple(dict.fromkeys(args.formats))
+    if "avif" in formats and not variants.avif_supported():
+        logging.warning("this Pillow cannot encode AVIF (needs Pillow 11.3+ or pillow-avif-plugin); writing WebP only")
+        formats = tuple(f for f in formats if f != "avif")
+    return formats
+
+
+def run(args: argparse.Namespace) -> int:
+    if args.local:
+        result = worker.run_pass(_store(args), _formats(args), args.workers, force=args.force, progress=_progress)
+    else:
+        from . import queue
+
+        with queue.connect(args.dsn or queue.DEFAULT_DSN) as conn:
+            result = queue.backfill(
+                conn, _store(args), _formats(args), args.workers, args.bucket, force=args.force, progress=_progress
+            )
+    print(f"Rendered {result.rendered:,} images" + (f", {len(result.failed):,} failed" if result.failed else ""))
+    return 1 if result.failed else 0
+
+
+def watch(args: argparse.Namespace) -> int:
+    store = _store(args)
+    if args.local:
+        logging.info("watching %s every %gs", store.describe(), args.interval)
+        worker.watch(store, _formats(args), args.workers, args.interval)
+        return 0
+    from . import queue
+
+    logging.info("following uploads to %s", store.describe())
+    queue.follow(args.dsn or queue.DEFAULT_DSN, store, _formats(args), args.workers, args.bucket)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    # Shared options go on each subcommand so they can follow it on the command line.
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--url", default=DEFAULT_URL, help="Supabase API URL (default: $SUPABASE_URL or local)")
+    common.add_argument("--bucket", default="property-images")
+    common.add_argument("--dsn", default=None, help="Postgres DSN for the upload queue (default: $VARIANTS_DSN or local)")
+    common.add_argument("--local", metavar="DIR", help="use a directory laid out like the bucket instead")
+    common.add_argument("--workers", type=int, help="render processes (default: one per CPU)")
+    common.add_argument("--formats", nargs="+", choices=variants.FORMATS, default=list(variants.FORMATS))
+    common.add_argument("-v", "--verbose", action="store_true")
+
+    parser = argparse.ArgumentParser(prog="python -m image_variants", description="Render listing image variants.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    once = sub.add_parser("run", parents=[common], help="render every image without variants, then exit")
+    once.add_argument("--force", action="store_true", help="re-render images that already have variants")
+    once.set_defaults(run=run)
+
+    loop = sub.add_parser("watch", parents=[common], help="render new uploads as they arrive")
+    loop.add_argument("--interval", type=float, default=worker.WATCH_INTERVAL_SECONDS, help="seconds between passes (--local only)")
+    loop.set_defaults(run=watch)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""The ``property-images`` bucket, and a directory that stands in for it.
+
+Both stores speak object keys (``<user id>/<file name>``) and offer the same
+four calls, so the worker does not care which one it is given.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Protocol
+
+BUCKET = "property-images"
+# `supabase start` exposes the API here (supabase/config.toml [api] port).
+DEFAULT_URL = os.environ.get("SUPABASE_URL", "http://127.0.0.1:54321")
+LIST_PAGE = 1000
+# Variant keys never change content for a given source, so caches may keep them.
+CACHE_CONTROL = "31536000"
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    key: str
+    size: int
+
+
+class Store(Protocol):
+    def list(self, prefix: str = "") -> Iterator[StoredObject]: ...
+
+    def read(self, key: str) -> bytes: ...
+
+    def write(self, key: str, data: bytes, content_type: str) -> None: ...
+
+    def describe(self) -> str: ...
+
+
+class LocalStore:
+    """A directory laid out like the bucket: ``<root>/<user id>/<file name>``."""
+
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self.root = Path(root)
+
+    def list(self, prefix: str = "") -> Iterator[StoredObject]:
+        base = self.root / prefix if prefix else self.root
+        for path in sorted(base.rglob("*")):
+            if path.is_file() and not path.name.startswith("."):
+                yield StoredObject(path.relative_to(self.root).as_posix(), path.stat().st_size)
+
+    def read(self, key: str) -> bytes:
+        return (self.root / key).read_bytes()
+
+    def write(self, key: str, data: bytes, content_type: str) -> None:
+        # Write then rename, so a crash never leaves a truncated variant or
+        # manifest behind for the site to serve.
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def describe(self) -> str:
+        return str(self.root)
+
+
+class SupabaseStore:
+    """The bucket through the Storage REST API, authenticated as the service role."""
+
+    def __init__(self, url: str = DEFAULT_URL, service_key: str | None = None, bucket: str = BUCKET) -> None:
+        service_key = service_key or os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+        if not service_key:
+            raise SystemExit("image_variants needs SUPABASE_SERVICE_ROLE_KEY (or --local DIR)")
+        self.base = url.rstrip("/") + "/storage/v1"
+        self.bucket = bucket
+        self.headers = {"Authorization": f"Bearer {service_key}", "apikey": service_key}
+
+    def _request(self, method: str, path: str, body: bytes | None = None, headers: dict[str, str] | None = None) -> bytes:
+        request = urllib.request.Request(
+            self.base + path, data=body, method=method, headers={**self.headers, **(headers or {})}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                return response.read()
+        except urllib.error.HTTPError as exc:
+            raise OSError(f"{method} {path}: HTTP {exc.code} {exc.read()[:200]!r}") from exc
+
+    def _object_path(self, key: str) -> str:
+        return f"/object/{self.bucket}/{urllib.parse.quote(key)}"
+
+    def list(self, prefix: str = "") -> Iterator[StoredObject]:
+        # The list endpoint is one level deep: entries without an id are folders.
+        offset = 0
+        while True:
+            body = json.dumps(
+                {"prefix": prefix, "limit": LIST_PAGE, "offset": offset, "sortBy": {"column": "name", "order": "asc"}}
+            ).encode()
+            entries = json.loads(
+                self._request("POST", f"/object/list/{self.bucket}", body, {"Content-Type": "application/json"})
+            )
+            for entry in entries:
+                key = f"{prefix}/{entry['name']}" if prefix else entry["name"]
+                if entry.get("id") is None:
+                    yield from self.list(key)
+                elif not entry["name"].startswith("."):
+                    yield StoredObject(key, int((entry.get("metadata") or {}).get("size") or 0))
+            if len(entries) < LIST_PAGE:
+                return
+            offset += LIST_PAGE
+
+    def read(self, key: str) -> bytes:
+        return self._request("GET", self._object_path(key))
+
+    def write(self, key: str, data: bytes, content_type: str) -> None:
+        self._request(
+            "POST",
+            self._object_path(key),
+            data,
+            {"Content-Type": content_type, "Cache-Control": f"max-age={CACHE_CONTROL}", "x-upsert": "true"},
+        )
+
+    def describe(self) -> str:
+        return f"{self.base}/object/{self.bucket}"
@@ -0,0 +1,139 @@
+"""Variant sizes, where they live in the bucket, and rendering them.
+
+``render`` runs in the worker processes: it takes the original's bytes and
+returns the encoded variants, touching neither the store nor the network.
+"""
+
+from __future__ import annotations
+
+import io
+import posixpath
+from dataclasses import dataclass
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError as exc:  # pragma: no cover - depends on the environment
+    raise SystemExit("image_variants needs Pillow: pip install Pillow") from exc
+
+try:  # Pillow < 11.3 encodes AVIF through this plugin only.
+    import pillow_avif  # noqa: F401
+except ImportError:  # pragma: no cover - depends on the environment
+    pass
+
+
+@dataclass(frozen=True)
+class Variant:
+    name: str
+    max_width: int
+    quality: int
+
+
+# Keep in step with IMAGE_VARIANTS in src/utils/imageOptimization.ts.
+VARIANTS = (
+    Variant("thumbnail", 300, 70),
+    Variant("medium", 900, 75),
+    Variant("large", 1600, 80),
+)
+
+FORMATS = ("webp", "avif")
+CONTENT_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tiff")
+VARIANTS_DIR = "variants"
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def avif_supported() -> bool:
+    return "AVIF" in Image.SAVE or bool(features.check("avif"))
+
+
+def is_source(key: str) -> bool:
+    return not key.startswith(VARIANTS_DIR + "/") and key.lower().endswith(SOURCE_EXTENSIONS)
+
+
+def variant_dir(source_key: str) -> str:
+    """``<user id>/<file name>`` -> ``variants/<user id>/<file name>``.
+
+    The extension stays in the key: ``a.jpg`` and ``a.png`` are different photos.
+    """
+    return posixpath.join(VARIANTS_DIR, source_key)
+
+
+def manifest_key(source_key: str) -> str:
+    return posixpath.join(variant_dir(source_key), MANIFEST)
+
+
+def variant_key(source_key: str, name: str, fmt: str) -> str:
+    return posixpath.join(variant_dir(source_key), f"{name}.{fmt}")
+
+
+@dataclass
+class Rendered:
+    width: int
+    height: int
+    # (variant, format) -> encoded bytes, plus the size each variant came out at.
+    files: dict[tuple[str, str], bytes]
+    sizes: dict[str, tuple[int, int]]
+
+
+def render(data: bytes, formats: tuple[str, ...] = FORMATS) -> Rendered:
+    """Decode an original and encode every variant in ``formats``.
+
+    Phones store rotation in EXIF, so the image is turned upright first; the
+    EXIF block itself (with any GPS position) is not copied to the variants.
+    Variants are never wider than the original, and each is scaled down from
+    the next larger one, which is cheaper than going back to the full photo.
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        original.seek(0)
+        image = ImageOps.exif_transpose(original)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info else "RGB")
+    width, height = image.size
+
+    files: dict[tuple[str, str], bytes] = {}
+    sizes: dict[str, tuple[int, int]] = {}
+    current = image
+    for variant in sorted(VARIANTS, key=lambda v: v.max_width, reverse=True):
+        if current.width > variant.max_width:
+            target = (variant.max_width, max(1, round(current.height * variant.max_width / current.width)))
+            current = current.resize(target, Image.Resampling.LANCZOS)
+        sizes[variant.name] = current.size
+        for fmt in formats:
+            files[variant.name, fmt] = _encode(current, fmt, variant.quality)
+    return Rendered(width, height, files, sizes)
+
+
+def _encode(image: Image.Image, fmt: str, quality: int) -> bytes:
+    buf = io.BytesIO()
+    if fmt == "webp":
+        image.save(buf, "WEBP", quality=quality, method=4)
+    elif fmt == "avif":
+        # AVIF holds up at lower settings than WebP for the same look.
+        image.save(buf, "AVIF", quality=max(quality - 20, 30), speed=6)
+    else:
+        raise ValueError(f"unknown format {fmt!r}")
+    return buf.getvalue()
+
+
+def summary(rendered: Rendered, formats: tuple[str, ...]) -> dict:
+    """What the listing row keeps per photo: the URLs follow from the source key."""
+    return {"formats": list(formats), "widths": {v.name: rendered.sizes[v.name][0] for v in VARIANTS}}
+
+
+def manifest(source_key: str, source_size: int, rendered: Rendered, formats: tuple[str, ...]) -> dict:
+    return {
+        "version": MANIFEST_VERSION,
+        "source": source_key,
+        "source_size": source_size,
+        "width": rendered.width,
+        "height": rendered.height,
+        "formats": list(formats),
+        "variants": {
+            v.name: {
+                "width": rendered.sizes[v.name][0],
+                "height": rendered.sizes[v.name][1],
+                **{fmt: variant_key(source_key, v.name, fmt) for fmt in formats},
+            }
+            for v in VARIANTS
+        },
+    }
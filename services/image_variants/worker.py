@@ -0,0 +1,137 @@
+"""Finding originals without variants and rendering them in a process pool."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable
+
+from . import variants
+from .store import Store, StoredObject
+
+log = logging.getLogger(__name__)
+
+# Originals are up to ~1920px / a few MB; keep the pool fed without holding
+# the whole backlog in memory.
+IN_FLIGHT_PER_WORKER = 2
+WATCH_INTERVAL_SECONDS = 30.0
+
+Progress = Callable[[int, int], None]
+
+
+@dataclass
+class PassResult:
+    rendered: int = 0
+    failed: list[str] = field(default_factory=list)
+    # source key -> variants.summary(), for set_image_variants
+    variants: dict[str, dict] = field(default_factory=dict)
+
+
+def pending(store: Store, force: bool = False) -> list[StoredObject]:
+    """Originals that have no manifest yet (all of them with ``force``)."""
+    sources: list[StoredObject] = []
+    done: set[str] = set()
+    for obj in store.list():
+        if variants.is_source(obj.key):
+            sources.append(obj)
+        elif obj.key.endswith("/" + variants.MANIFEST):
+            done.add(obj.key)
+    if force:
+        return sources
+    return [obj for obj in sources if variants.manifest_key(obj.key) not in done]
+
+
+def _store_variants(store: Store, source: StoredObject, rendered: variants.Rendered, formats: tuple[str, ...]) -> None:
+    for (name, fmt), data in rendered.files.items():
+        store.write(variants.variant_key(source.key, name, fmt), data, variants.CONTENT_TYPES[fmt])
+    # Last, so a manifest always means every variant it lists is in place.
+    body = json.dumps(variants.manifest(source.key, source.size, rendered, formats), indent=2).encode()
+    store.write(variants.manifest_key(source.key), body, "application/json")
+
+
+def process(
+    store: Store,
+    sources: list[StoredObject],
+    formats: tuple[str, ...] = variants.FORMATS,
+    workers: int | None = None,
+    progress: Progress | None = None,
+) -> PassResult:
+    """Render ``sources``; reads and writes happen here, decoding in the pool.
+
+    A photo that cannot be decoded is logged and skipped; it has no manifest, so
+    the next ``run`` tries it again.
+    """
+    result = PassResult()
+    if not sources:
+        return result
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        limit = IN_FLIGHT_PER_WORKER * workers
+        queue = iter(sources)
+        in_flight: dict[Future[variants.Rendered], StoredObject] = {}
+        finished = 0
+
+        def submit() -> None:
+            for source in queue:
+                try:
+                    data = store.read(source.key)
+                except OSError as exc:
+                    log.warning("could not read %s: %s", source.key, exc)
+                    result.failed.append(source.key)
+                    continue
+                in_flight[pool.submit(variants.render, data, formats)] = source
+                return
+
+        for _ in range(limit):
+            submit()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                source = in_flight.pop(future)
+                try:
+                    rendered = future.result()
+                    _store_variants(store, source, rendered, formats)
+                    result.variants[source.key] = variants.summary(rendered, formats)
+                    result.rendered += 1
+                except Exception as exc:  # a corrupt upload must not stop the pass
+                    log.warning("could not render %s: %s", source.key, exc)
+                    result.failed.append(source.key)
+                finished += 1
+                if progress:
+                    progress(finished, len(sources))
+                submit()
+    return result
+
+
+def run_pass(
+    store: Store,
+    formats: tuple[str, ...],
+    workers: int | None = None,
+    force: bool = False,
+    skip: set[str] | None = None,
+    progress: Progress | None = None,
+) -> PassResult:
+    sources = [obj for obj in pending(store, force) if not skip or obj.key not in skip]
+    if sources:
+        log.info("%d images without variants in %s", len(sources), store.describe())
+    return process(store, sources, formats, workers, progress)
+
+
+def watch(store: Store, formats: tuple[str, ...], workers: int | None, interval: float = WATCH_INTERVAL_SECONDS) -> None:
+    """Poll the store forever. Photos that failed are not retried until restart.
+
+    Each pass lists the whole store, which is fine for a local directory; the
+    bucket is followed through the database instead (``queue.follow``).
+    """
+    failed: set[str] = set()
+    while True:
+        started = time.monotonic()
+        result = run_pass(store, formats, workers, skip=failed)
+        failed.update(result.failed)
+        if result.rendered or result.failed:
+            log.info("rendered %d, failed %d", result.rendered, len(result.failed))
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
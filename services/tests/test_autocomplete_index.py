@@ -0,0 +1,86 @@
+"""PrefixIndex: inserts, removals and ranking, without a database.
+
+    cd services
+    python -m unittest discover tests
+"""
+
+from __future__ import annotations
+
+import unittest
+
+from autocomplete.index import Entry, PrefixIndex
+
+
+def labels(index: PrefixIndex, query: str, limit: int = 10) -> list[str]:
+    return [entry.label for entry, _ in index.complete(query, limit)]
+
+
+class PrefixIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = PrefixIndex.build(
+            [
+                Entry("city", "Bangalore", location=True),
+                Entry("area", "Koramangala, Bangalore", location=True),
+                Entry("area", "Kormangala Extension, Bangalore", location=True),
+                Entry("pincode", "PIN 560034 - Koramangala, Bangalore", pincode="560034", location=True),
+                Entry("place", "Kora Lake", search_count=3),
+            ]
+        )
+
+    def test_prefix_of_label_and_of_later_words(self) -> None:
+        self.assertEqual(labels(self.index, "bang")[0], "Bangalore")
+        self.assertIn("Koramangala, Bangalore", labels(self.index, "bang"))
+        self.assertIn("PIN 560034 - Koramangala, Bangalore", labels(self.index, "5600"))
+
+    def test_substring_inside_a_word_does_not_match(self) -> None:
+        index = PrefixIndex.build([Entry("area", "Whitefield, Bangalore")])
+        self.assertEqual(labels(index, "field"), [])
+        self.assertEqual(labels(index, "white"), ["Whitefield, Bangalore"])
+
+    def test_label_start_ranks_above_later_word(self) -> None:
+        ranked = labels(self.index, "kora")
+        self.assertLess(ranked.index("Koramangala, Bangalore"), ranked.index("PIN 560034 - Koramangala, Bangalore"))
+
+    def test_city_outranks_area_unless_searched_more(self) -> None:
+        index = PrefixIndex.build(
+            [
+                Entry("area", "Mysore Road, Bangalore"),
+                Entry("city", "Mysore"),
+                Entry("place", "Mysore Palace"),
+                Entry("place", "Mysore Zoo", search_count=50),
+            ]
+        )
+        self.assertEqual(labels(index, "mys"), ["Mysore Zoo", "Mysore", "Mysore Road, Bangalore", "Mysore Palace"])
+
+    def test_upsert_rescores_in_place(self) -> None:
+        self.index.upsert(Entry("place", "Kora Lake", search_count=10_000))
+        self.assertEqual(labels(self.index, "kora")[0], "Kora Lake")
+        self.assertEqual(len(self.index), 5)
+
+    def test_upsert_adds_and_remove_drops_every_key(self) -> None:
+        self.index.upsert(Entry("place", "Indiranagar Metro"))
+        self.assertEqual(labels(self.index, "metro"), ["Indiranagar Metro"])
+        removed = self.index.remove(("place", "indiranagar metro"))
+        self.assertEqual(removed.label, "Indiranagar Metro")
+        self.assertEqual(labels(self.index, "indira"), [])
+        self.assertEqual(labels(self.index, "metro"), [])
+        self.assertIsNone(self.index.remove(("place", "indiranagar metro")))
+
+    def test_remove_keeps_entries_sharing_a_prefix(self) -> None:
+        self.index.remove(("place", "kora lake"))
+        self.assertIn("Koramangala, Bangalore", labels(self.index, "kora"))
+        self.assertNotIn("Kora Lake", labels(self.index, "kora"))
+
+    def test_misspelling_falls_back_to_fuzzy_matches_ranked_last(self) -> None:
+        self.assertEqual(labels(self.index, "banglore")[0], "Bangalore")
+        ranked = labels(self.index, "koramang")
+        self.assertEqual(ranked[0], "Koramangala, Bangalore")
+        self.assertEqual(ranked[-1], "Kormangala Extension, Bangalore")
+
+    def test_limit_and_blank_query(self) -> None:
+        self.assertEqual(len(labels(self.index, "b", limit=1)), 1)
+        self.assertEqual(labels(self.index, "  ,"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""campaign_rollups jobs against a scripted connection: batching and drift reports.
+
+The bucketing itself (IST hours and days) lives in the SQL functions; these
+tests cover what the Python loops do with their results. Needs psycopg
+importable, not a database.
+"""
+
+from __future__ import annotations
+
+import unittest
+from contextlib import nullcontext
+from datetime import date, datetime, timezone
+from typing import Any
+from unittest import mock
+
+from campaign_rollups import jobs
+
+
+class ScriptedConnection:
+    """Answers ``execute`` by the first entry of ``script`` whose key the SQL contains."""
+
+    def __init__(self, script: dict[str, list[Any]]) -> None:
+        self.script = script
+        self.calls: list[tuple[str, Any]] = []
+
+    def execute(self, sql: str, params: Any = None) -> ScriptedConnection:
+        self.calls.append((sql, params))
+        for key, results in self.script.items():
+            if key in sql:
+                self._rows = results.pop(0) if results else []
+                return self
+        self._rows = []
+        return self
+
+    def fetchone(self) -> Any:
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self) -> list[Any]:
+        return list(self._rows)
+
+    def __iter__(self) -> Any:
+        return iter(self._rows)
+
+    def transaction(self) -> nullcontext[None]:
+        return nullcontext()
+
+    def called(self, key: str) -> list[Any]:
+        return [params for sql, params in self.calls if key in sql]
+
+
+BEFORE = datetime(2025, 11, 1, tzinfo=timezone.utc)
+
+
+class CompactTest(unittest.TestCase):
+    def test_flushes_first_then_deletes_until_a_short_batch(self) -> None:
+        conn = ScriptedConnection({"compact_campaign_stats": [[(100,)], [(100,)], [(7,)]]})
+        with mock.patch.object(jobs.time, "sleep") as sleep:
+            self.assertEqual(jobs.compact(conn, BEFORE, batch_size=100), 207)
+        self.assertIn("flush_campaign_counters", conn.calls[0][0])
+        self.assertEqual(conn.called("compact_campaign_stats"), [(BEFORE, 100)] * 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_dry_run_only_counts(self) -> None:
+        conn = ScriptedConnection({"count(*)": [[(42,)]]})
+        self.assertEqual(jobs.compact(conn, BEFORE, dry_run=True), 42)
+        self.assertEqual(conn.called("flush_campaign_counters"), [])
+        self.assertEqual(conn.called("compact_campaign_stats"), [])
+
+
+class BackfillTest(unittest.TestCase):
+    def test_one_call_per_campaign_with_progress(self) -> None:
+        conn = ScriptedConnection({})
+        seen: list[tuple[int, int]] = []
+        self.assertEqual(jobs.backfill(conn, ["a", "b"], lambda done, total: seen.append((done, total))), 2)
+        self.assertEqual(conn.called("backfill_campaign_stats"), [("a",), ("b",)])
+        self.assertEqual(seen, [(1, 2), (2, 2)])
+
+
+class CheckTest(unittest.TestCase):
+    def test_reports_each_metric_that_differs(self) -> None:
+        conn = ScriptedConnection(
+            {
+                "FROM public.ad_campaigns": [
+                    [
+                        ("in-step", 10, 10, 2, 2, 50, 50, 1, 1, 0, 0),
+                        ("behind", 12, 10, 2, 2, 50, 45, 1, 1, 1, 0),
+                    ]
+                ],
+                "ad_campaign_stats_hourly": [[("behind", date(2025, 11, 20), 5, 4, 1, 1, 0, 0)]],
+            }
+        )
+        drift = jobs.check(conn, BEFORE)
+        self.assertEqual(
+            [(d.campaign_id, d.metric, d.expected, d.rolled_up) for d in drift],
+            [
+                ("behind", "impressions", 12.0, 10.0),
+                ("behind", "spend", 50.0, 45.0),
+                ("behind", "paid_leads", 1.0, 0.0),
+                ("behind", "impressions on 2025-11-20 (daily vs hourly)", 5.0, 4.0),
+            ],
+        )
+        self.assertEqual(conn.called("ad_campaign_stats_hourly"), [(BEFORE,)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""image_placeholders: what ``compute`` stores, where thumbnails are read, and
+how ``follow`` recovers.
+
+Needs Pillow and psycopg importable, not the network or a database.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import unittest
+from unittest import mock
+
+import psycopg
+from PIL import Image
+
+from image_placeholders import jobs
+from image_placeholders.placeholder import LQIP_WIDTH, compute, thumbnail_url
+
+BUCKET = "https://x.supabase.co/storage/v1/object/public/property-images/"
+
+
+def encoded(image: Image.Image, fmt: str) -> bytes:
+    buf = io.BytesIO()
+    image.save(buf, fmt)
+    return buf.getvalue()
+
+
+class ComputeTest(unittest.TestCase):
+    def test_shape_of_a_placeholder(self) -> None:
+        result = compute(encoded(Image.new("RGB", (800, 600), (10, 90, 200)), "JPEG"))
+        self.assertEqual(set(result), {"lqip", "color", "aspect_ratio"})
+        self.assertEqual(result["aspect_ratio"], round(800 / 600, 4))
+        self.assertRegex(result["color"], r"^#[0-9a-f]{6}$")
+
+        self.assertTrue(result["lqip"].startswith("data:image/webp;base64,"))
+        lqip = base64.b64decode(result["lqip"].split(",", 1)[1])
+        with Image.open(io.BytesIO(lqip)) as tiny:
+            self.assertEqual(tiny.format, "WEBP")
+            self.assertEqual(tiny.size, (LQIP_WIDTH, 12))
+
+    def test_dominant_colour_not_the_mean(self) -> None:
+        image = Image.new("RGB", (100, 100), (220, 30, 30))
+        image.paste((30, 30, 220), (0, 0, 100, 30))
+        self.assertEqual(compute(encoded(image, "PNG"))["color"], "#dc1e1e")
+
+    def test_transparency_is_flattened_on_white(self) -> None:
+        result = compute(encoded(Image.new("RGBA", (40, 80), (0, 0, 0, 0)), "PNG"))
+        self.assertEqual(result["color"], "#ffffff")
+        self.assertEqual(result["aspect_ratio"], 0.5)
+
+
+class ThumbnailUrlTest(unittest.TestCase):
+    def test_variant_keys_keep_the_extension(self) -> None:
+        self.assertEqual(thumbnail_url(BUCKET + "u1/a.jpg?t=1"), BUCKET + "variants/u1/a.jpg/thumbnail.webp")
+
+    def test_only_originals_in_the_listing_bucket(self) -> None:
+        self.assertIsNone(thumbnail_url(BUCKET + "variants/u1/a.jpg/large.webp"))
+        self.assertIsNone(thumbnail_url("https://example.com/a.jpg"))
+
+
+class Stop(BaseException):
+    pass
+
+
+class FollowTest(unittest.TestCase):
+    def test_any_failure_reconnects_with_backoff(self) -> None:
+        failures = [psycopg.OperationalError("connection refused"), ValueError("bad payload"), psycopg.OperationalError("x")]
+        with mock.patch.object(jobs, "connect", side_effect=failures) as connect, mock.patch.object(
+            jobs.time, "sleep", side_effect=[None, None, Stop()]
+        ) as sleep, self.assertLogs(jobs.log, "WARNING") as logs, self.assertRaises(Stop):
+            jobs.follow("postgresql://", pool=None)  # type: ignore[arg-type]
+        self.assertEqual(connect.call_count, 3)
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], list(jobs.RETRY_SECONDS[:3]))
+        self.assertIn("follower failed", logs.output[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
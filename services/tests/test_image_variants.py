@@ -0,0 +1,83 @@
+"""image_variants: keys, rendering and the manifest, against a local store.
+
+Needs Pillow, not the bucket.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import unittest
+
+from PIL import Image
+
+from image_variants import variants, worker
+from image_variants.store import LocalStore
+
+
+def photo(width: int, height: int, fmt: str = "JPEG") -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 120, 40)).save(buf, fmt)
+    return buf.getvalue()
+
+
+class KeysTest(unittest.TestCase):
+    def test_extension_is_part_of_the_key(self) -> None:
+        self.assertEqual(variants.variant_dir("u1/a.jpg"), "variants/u1/a.jpg")
+        self.assertNotEqual(variants.manifest_key("u1/a.jpg"), variants.manifest_key("u1/a.png"))
+        self.assertEqual(variants.variant_key("u1/a.png", "medium", "webp"), "variants/u1/a.png/medium.webp")
+
+    def test_sources_exclude_variants_and_other_files(self) -> None:
+        self.assertTrue(variants.is_source("u1/a.JPG"))
+        self.assertFalse(variants.is_source("variants/u1/a.jpg/large.webp"))
+        self.assertFalse(variants.is_source("u1/notes.txt"))
+
+
+class RenderTest(unittest.TestCase):
+    def test_variants_are_never_wider_than_the_original(self) -> None:
+        rendered = variants.render(photo(1200, 800), ("webp",))
+        self.assertEqual((rendered.width, rendered.height), (1200, 800))
+        self.assertEqual(rendered.sizes, {"large": (1200, 800), "medium": (900, 600), "thumbnail": (300, 200)})
+        self.assertEqual(set(rendered.files), {(v.name, "webp") for v in variants.VARIANTS})
+
+    def test_manifest_records_actual_widths_and_keys(self) -> None:
+        rendered = variants.render(photo(1200, 800), ("webp",))
+        manifest = variants.manifest("u1/a.jpg", 1234, rendered, ("webp",))
+        self.assertEqual(manifest["source"], "u1/a.jpg")
+        self.assertEqual(manifest["formats"], ["webp"])
+        self.assertEqual(
+            manifest["variants"]["large"], {"width": 1200, "height": 800, "webp": "variants/u1/a.jpg/large.webp"}
+        )
+        self.assertEqual(manifest["variants"]["thumbnail"]["width"], 300)
+
+    def test_summary_is_what_the_listing_row_needs(self) -> None:
+        rendered = variants.render(photo(640, 480), ("webp",))
+        self.assertEqual(
+            variants.summary(rendered, ("webp",)),
+            {"formats": ["webp"], "widths": {"thumbnail": 300, "medium": 640, "large": 640}},
+        )
+
+
+class WorkerTest(unittest.TestCase):
+    def test_pass_writes_manifests_and_skips_done_photos(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            store = LocalStore(root)
+            store.write("u1/a.jpg", photo(640, 480), "image/jpeg")
+            store.write("u1/a.png", photo(320, 240, "PNG"), "image/png")
+
+            self.assertEqual(len(worker.pending(store)), 2)
+            result = worker.process(store, worker.pending(store), ("webp",), workers=1)
+            self.assertEqual((result.rendered, result.failed), (2, []))
+            self.assertEqual(worker.pending(store), [])
+            self.assertEqual(set(result.variants), {"u1/a.jpg", "u1/a.png"})
+            self.assertEqual(result.variants["u1/a.png"]["widths"]["large"], 320)
+
+            manifest = json.loads(store.read("variants/u1/a.png/manifest.json"))
+            self.assertEqual(manifest["source"], "u1/a.png")
+            self.assertEqual(manifest["variants"]["large"]["width"], 320)
+            self.assertTrue(store.read(manifest["variants"]["medium"]["webp"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
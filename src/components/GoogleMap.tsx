@@ -215,6 +215,8 @@ const GoogleMapContent = ({
                                                 <OptimizedImage
                                                     src={property.images?.[0] || '/placeholder.svg'}
                                                     alt={property.title}
+                                                    width={300}
+                                                    sizes="280px"
                                                     className="object-cover w-full h-full"
                                                 />
                                                 {property.verified && (
@@ -262,6 +262,8 @@ export const LeafletMap = ({
                                             <OptimizedImage
                                                 src={property.images?.[0] || '/placeholder.svg'}
                                                 alt={property.title}
+                                                width={300}
+                                                sizes="280px"
                                                 className="object-cover w-full h-full rounded-lg"
                                             />
                                             {property.verified && (
@@ -1,5 +1,7 @@
 import { useState, useRef } from 'react';
 import { cn } from '@/lib/utils';
+import { getImageVariantSources, getImageVariantUrl } from '@/utils/imageOptimization';
+import type { ImagePlaceholder } from '@/types/database';
 
 interface OptimizedImageProps {
   src: string;
@@ -12,6 +14,8 @@ interface OptimizedImageProps {
   quality?: number;
   sizes?: string;
   rounded?: boolean;
+  // Painted from the listing row while the image loads, without a request
+  placeholder?: ImagePlaceholder;
   onLoad?: () => void;
   onError?: (e: React.SyntheticEvent<HTMLImageElement>) => void;
 }
@@ -35,11 +39,6 @@ const getOptimizedUrl = (src: string, width?: number, quality: number = 70): str
   return src;
 };
 
-// Generate srcset for responsive images - disabled for now to simplify
-const generateSrcSet = (_src: string, _quality: number): string => {
-  // Return empty string to avoid srcset issues
-  return '';
-};
 
 export const OptimizedImage = ({
   src,
@@ -52,19 +51,30 @@ export const OptimizedImage = ({
   quality = 70,
   sizes = '100vw',
   rounded = false,
+  placeholder,
   onLoad,
   onError,
 }: OptimizedImageProps) => {
   const [isLoaded, setIsLoaded] = useState(false);
   const [error, setError] = useState(false);
+  // Variants appear a little after upload; the listing row says which ones exist,
+  // and the original is loaded until it does. A variant that fails falls back to it.
+  const [variantFailedFor, setVariantFailedFor] = useState<string | null>(null);
   const imgRef = useRef<HTMLImageElement>(null);
 
+  const variantSrc = getImageVariantUrl(src, placeholder?.variants, width || 800);
+  const useVariant = variantSrc !== null && variantFailedFor !== src;
+
   const handleLoad = () => {
     setIsLoaded(true);
     onLoad?.();
   };
 
   const handleError = (e: React.SyntheticEvent<HTMLImageElement>) => {
+    if (useVariant) {
+      setVariantFailedFor(src);
+      return;
+    }
     setIsLoaded(true);
     setError(true);
     onError?.(e);
@@ -76,8 +86,9 @@ export const OptimizedImage = ({
     auto: '',
   }[aspectRatio];
 
-  const optimizedSrc = getOptimizedUrl(src, width, quality);
-  const srcSet = generateSrcSet(src, quality);
+  const optimizedSrc = useVariant ? variantSrc : getOptimizedUrl(src, width, quality);
+  // AVIF first; browsers without it take the WebP source, or the <img> itself
+  const sources = useVariant ? getImageVariantSources(src, placeholder?.variants) : [];
 
   return (
     <div
@@ -92,11 +103,21 @@ export const OptimizedImage = ({
           ? { aspectRatio: '1 / 1', width: '100%' }
           : width && height
             ? { aspectRatio: `${width}/${height}` }
-            : undefined
+            : aspectRatio === 'auto' && placeholder?.aspect_ratio
+              // The photo's own shape, known from the listing row, so nothing shifts when it loads
+              ? { aspectRatio: String(placeholder.aspect_ratio) }
+              : undefined
       }
     >
+      {/* Precomputed placeholder: dominant colour and a blurred 16px preview */}
+      {placeholder?.lqip && !error && (
+        <div className="absolute inset-0" style={{ backgroundColor: placeholder.color }} aria-hidden="true">
+          <img src={placeholder.lqip} alt="" className="w-full h-full object-cover blur-lg scale-110" />
+        </div>
+      )}
+
       {/* Shimmer loading placeholder */}
-      {!isLoaded && !error && (
+      {!placeholder?.lqip && !isLoaded && !error && (
         <div className="absolute inset-0 animate-pulse bg-gradient-to-br from-muted via-muted-foreground/10 to-muted">
           <div className="absolute inset-0 -translate-x-full animate-[shimmer_2s_infinite] bg-gradient-to-r from-transparent via-white/10 to-transparent" />
         </div>
@@ -112,25 +133,29 @@ export const OptimizedImage = ({
       )}
 
       {!error && (
-        <img
-          ref={imgRef}
-          src={optimizedSrc}
-          srcSet={srcSet || undefined}
-          sizes={sizes}
-          alt={alt}
-          width={aspectRatio === 'square' ? 1 : width}
-          height={aspectRatio === 'square' ? 1 : height}
-          className={cn(
-            'absolute inset-0 w-full h-full object-cover transition-opacity duration-300',
-            isLoaded ? 'opacity-100' : 'opacity-0'
-          )}
-          loading={priority ? 'eager' : 'lazy'}
-          decoding="async"
-          onLoad={handleLoad}
-          onError={handleError}
-          draggable={false}
-          crossOrigin="anonymous"
-        />
+        // `contents` keeps the <img> positioned against the wrapper as before
+        <picture className="contents">
+          {sources.map((source) => (
+            <source key={source.type} type={source.type} srcSet={source.srcSet} sizes={sizes} />
+          ))}
+          <img
+            ref={imgRef}
+            src={optimizedSrc}
+            alt={alt}
+            width={aspectRatio === 'square' ? 1 : width}
+            height={aspectRatio === 'square' ? 1 : height}
+            className={cn(
+              'absolute inset-0 w-full h-full object-cover transition-opacity duration-300',
+              isLoaded ? 'opacity-100' : 'opacity-0'
+            )}
+            loading={priority ? 'eager' : 'lazy'}
+            decoding="async"
+            onLoad={handleLoad}
+            onError={handleError}
+            draggable={false}
+            crossOrigin="anonymous"
+          />
+        </picture>
       )}
     </div>
   );
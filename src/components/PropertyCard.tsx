@@ -7,10 +7,12 @@ import { OptimizedImage } from "./OptimizedImage";
 import { toast } from "sonner";
 import { formatDistance } from "@/utils/geocoding";
 import { useOwnerRating } from "@/hooks/useOwnerRating";
+import type { ImagePlaceholder } from "@/types/database";
 
 interface PropertyCardProps {
   id: string;
   image: string;
+  imagePlaceholder?: ImagePlaceholder;
   title: string;
   type: string;
   propertyType?: string;
@@ -31,6 +33,7 @@ interface PropertyCardProps {
 const PropertyCard = ({
   id,
   image,
+  imagePlaceholder,
   title,
   type,
   propertyType,
@@ -81,6 +84,7 @@ const PropertyCard = ({
       <div className="relative">
         <OptimizedImage
           src={image}
+          placeholder={imagePlaceholder}
           alt={title}
           aspectRatio="square"
           width={600}
@@ -1,4 +1,4 @@
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { supabase } from '@/integrations/supabase/client';
 import { toast } from 'sonner';
 
@@ -32,6 +32,10 @@ interface AdminStats {
   }>;
 }
 
+// Snapshot metrics (today/this week, views, averages, top lists) are recomputed on
+// demand; counters are kept current by triggers and always report as_of = now.
+const STALE_AFTER_MS = 10 * 60 * 1000;
+
 export function useAdminStats() {
   const [stats, setStats] = useState<AdminStats>({
     totalUsers: 0,
@@ -57,7 +61,10 @@ export function useAdminStats() {
     topCities: {},
     recentActivity: [],
   });
+  const [asOf, setAsOf] = useState<Record<string, string>>({});
   const [loading, setLoading] = useState(true);
+  const [refreshing, setRefreshing] = useState(false);
+  const lastAutoRefresh = useRef(0);
 
   const fetchStats = async () => {
     try {
@@ -93,6 +100,16 @@ export function useAdminStats() {
           topCities: statsData.top_cities || {},
           recentActivity: statsData.recent_activity || [],
         });
+        setAsOf(statsData.as_of || {});
+
+        const staleBefore = Date.now() - STALE_AFTER_MS;
+        const stale = Object.entries<string | null>(statsData.as_of || {})
+          .filter(([, at]) => !at || new Date(at).getTime() < staleBefore)
+          .map(([metric]) => metric);
+        if (stale.length > 0 && Date.now() - lastAutoRefresh.current > STALE_AFTER_MS) {
+          lastAutoRefresh.current = Date.now();
+          refresh(stale, { silent: true });
+        }
       }
     } catch (error: any) {
       console.error('Error fetching admin stats:', error);
@@ -102,6 +119,21 @@ export function useAdminStats() {
     }
   };
 
+  // Recompute snapshot metrics (all, or the named ones) and reload
+  const refresh = async (metrics?: string[], { silent = false } = {}) => {
+    try {
+      setRefreshing(true);
+      const { error } = await supabase.rpc('refresh_admin_stats', metrics ? { metrics } : {});
+      if (error) throw error;
+      await fetchStats();
+    } catch (error: any) {
+      console.error('Error refreshing admin stats:', error);
+      if (!silent) toast.error('Failed to refresh admin statistics');
+    } finally {
+      setRefreshing(false);
+    }
+  };
+
   useEffect(() => {
     fetchStats();
 
@@ -141,5 +173,5 @@ export function useAdminStats() {
     };
   }, []);
 
-  return { stats, loading, refetch: fetchStats };
+  return { stats, asOf, loading, refreshing, refetch: fetchStats, refresh };
 }
@@ -12,6 +12,22 @@ export interface AutocompleteResult {
   relevance: number;
 }
 
+// services/autocomplete answers from memory; without it, typeahead falls back to the RPC.
+const AUTOCOMPLETE_URL = import.meta.env.VITE_AUTOCOMPLETE_URL as string | undefined;
+const LIMIT = 10;
+
+async function fetchFromService(query: string): Promise<AutocompleteResult[] | null> {
+  if (!AUTOCOMPLETE_URL) return null;
+  try {
+    const params = new URLSearchParams({ q: query, limit: String(LIMIT) });
+    const response = await fetch(`${AUTOCOMPLETE_URL}/autocomplete?${params}`);
+    if (!response.ok) return null;
+    return (await response.json()) as AutocompleteResult[];
+  } catch {
+    return null;
+  }
+}
+
 export function useAutocomplete(query: string, enabled = true) {
   return useQuery({
     queryKey: ["autocomplete", query] as const,
@@ -20,10 +36,13 @@ export function useAutocomplete(query: string, enabled = true) {
         return [] as AutocompleteResult[];
       }
 
+      const served = await fetchFromService(query);
+      if (served) return served;
+
       // @ts-expect-error - Fix type error - RPC function not in generated types yet
       const { data, error } = await supabase.rpc("autocomplete_search", {
         query_text: query,
-        limit_count: 10,
+        limit_count: LIMIT,
       });
 
       if (error) {
@@ -10,8 +10,26 @@ interface CampaignAnalytics {
   cpl: number;
 }
 
-export const useCampaignAnalytics = (campaignId: string | null) => {
+interface CampaignCounters {
+  impressions: number;
+  clicks: number;
+}
+
+export interface CampaignStatsPoint {
+  bucket: string;
+  impressions: number;
+  clicks: number;
+  leads: number;
+  paid_leads: number;
+  spend: number;
+}
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+export const useCampaignAnalytics = (campaignId: string | null, rangeDays = 30) => {
   const [analytics, setAnalytics] = useState<CampaignAnalytics | null>(null);
+  const [counters, setCounters] = useState<CampaignCounters | null>(null);
+  const [series, setSeries] = useState<CampaignStatsPoint[]>([]);
   const [loading, setLoading] = useState(true);
 
   const fetchAnalytics = useCallback(async () => {
@@ -39,8 +57,40 @@ export const useCampaignAnalytics = (campaignId: string | null) => {
     }
   }, [campaignId]);
 
+  // Impressions/clicks including events not yet flushed into ad_campaigns
+  const fetchCounters = useCallback(async () => {
+    if (!campaignId) return;
+
+    const { data, error } = await supabase.rpc('get_campaign_counters', { campaign_ids: [campaignId] });
+    if (error) {
+      console.error('Error fetching campaign counters:', error);
+      return;
+    }
+    if (data && data.length > 0) {
+      setCounters({ impressions: data[0].impressions, clicks: data[0].clicks });
+    }
+  }, [campaignId]);
+
+  // Daily series from the rollup tables; cost depends on rangeDays, not on traffic
+  const fetchSeries = useCallback(async () => {
+    if (!campaignId) return;
+
+    const { data, error } = await supabase.rpc('get_campaign_stats', {
+      p_campaign_id: campaignId,
+      from_ts: new Date(Date.now() - rangeDays * DAY_MS).toISOString(),
+      granularity: 'day',
+    });
+    if (error) {
+      console.error('Error fetching campaign stats:', error);
+      return;
+    }
+    setSeries((data ?? []) as CampaignStatsPoint[]);
+  }, [campaignId, rangeDays]);
+
   useEffect(() => {
     fetchAnalytics();
+    fetchCounters();
+    fetchSeries();
 
     // Realtime subscription for campaign updates
     if (campaignId) {
@@ -53,6 +103,17 @@ export const useCampaignAnalytics = (campaignId: string | null) => {
           filter: `campaign_id=eq.${campaignId}`
         }, () => {
           fetchAnalytics();
+          fetchSeries();
+        })
+        .on('postgres_changes', {
+          event: 'UPDATE',
+          schema: 'public',
+          table: 'ad_campaigns',
+          filter: `id=eq.${campaignId}`
+        }, () => {
+          // Counter flushes land here every few seconds while the campaign is shown
+          fetchCounters();
+          fetchSeries();
         })
         .subscribe();
 
@@ -60,10 +121,12 @@ export const useCampaignAnalytics = (campaignId: string | null) => {
         supabase.removeChannel(channel);
       };
     }
-  }, [campaignId, fetchAnalytics]);
+  }, [campaignId, fetchAnalytics, fetchCounters, fetchSeries]);
 
   return {
     analytics,
+    counters,
+    series,
     loading,
     refetch: fetchAnalytics
   };
@@ -1,18 +1,27 @@
 import { useEffect } from 'react';
-import { preloadImage } from '@/utils/imageOptimization';
+import type { ImagePlaceholder } from '@/types/database';
+import { getImageVariantUrl, preloadImage } from '@/utils/imageOptimization';
 
 /**
- * Preload critical images for faster page rendering
+ * Preload critical images for faster page rendering. Pass the listing's
+ * image_placeholders to fetch the variant OptimizedImage will ask for at
+ * `width` rather than the full-size original.
  */
-export const useImagePreload = (images: string[]) => {
+export const useImagePreload = (
+  images: string[],
+  width = 600,
+  placeholders?: Record<string, ImagePlaceholder>
+) => {
   useEffect(() => {
     const preloadPromises = images
       .filter(Boolean)
       .slice(0, 3) // Only preload first 3 images
-      .map((src) => preloadImage(src).catch(console.error));
+      .map((src) =>
+        preloadImage(getImageVariantUrl(src, placeholders?.[src]?.variants, width) ?? src).catch(console.error)
+      );
 
     Promise.all(preloadPromises);
-  }, [images]);
+  }, [images, width, placeholders]);
 };
 
 /**
@@ -6,6 +6,7 @@ export interface MapCluster {
   cluster_lng: number;
   property_count: number;
   avg_price: number;
+  // At most 16 ids, the listings nearest the cluster centre
   property_ids: string[];
 }
 
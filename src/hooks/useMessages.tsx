@@ -1,4 +1,4 @@
-import { useEffect, useState, useCallback } from 'react';
+import { useEffect, useState, useCallback, useRef } from 'react';
 import { supabase } from '@/integrations/supabase/client';
 import { toast } from 'sonner';
 import { z } from 'zod';
@@ -13,107 +13,151 @@ const messageSchema = z.object({
   property_id: z.string().uuid({ message: "Invalid property ID" }).optional(),
 });
 
+const CONVERSATIONS_PAGE_SIZE = 20;
+const MESSAGES_PAGE_SIZE = 50;
+
+async function decryptRow<T extends { content: string; sender_id: string; receiver_id: string }>(msg: T): Promise<T> {
+  try {
+    return { ...msg, content: await decryptMessage(msg.content, msg.sender_id, msg.receiver_id) };
+  } catch (error) {
+    console.error('Failed to decrypt message:', error);
+    return msg;
+  }
+}
+
+// Add a page to what is loaded; entries from the page replace ones with the same key.
+function mergeBy<T>(current: T[], incoming: T[], key: (item: T) => string) {
+  const byKey = new Map(current.map((item) => [key(item), item]));
+  incoming.forEach((item) => byKey.set(key(item), item));
+  return Array.from(byKey.values());
+}
+
 export function useMessages(userId: string | undefined) {
   const [conversations, setConversations] = useState<any[]>([]);
+  const [totalConversations, setTotalConversations] = useState(0);
+  // undefined until the first page is in; null once there are no more pages
+  const [conversationsCursor, setConversationsCursor] = useState<string | null | undefined>(undefined);
   const [loading, setLoading] = useState(true);
-
-  const fetchConversations = useCallback(async () => {
+  const [activeUserId, setActiveUserId] = useState<string | null>(null);
+  const activeUserRef = useRef<string | null>(null);
+  const [messages, setMessages] = useState<any[]>([]);
+  const [messagesCursor, setMessagesCursor] = useState<string | null | undefined>(undefined);
+  const [loadingMessages, setLoadingMessages] = useState(false);
+
+  // One inbox page from the conversations index. Without a cursor it refreshes the top
+  // of the list and keeps any later pages already loaded.
+  const fetchConversations = useCallback(async (afterCursor?: string) => {
     if (!userId) {
       setLoading(false);
       return;
     }
 
     try {
-      setLoading(true);
-      const { data, error } = await supabase
-        .from('messages')
-        .select('*')
-        .or(`sender_id.eq.${userId},receiver_id.eq.${userId}`)
-        .order('created_at', { ascending: false });
+      const { data, error } = await supabase.rpc('get_conversations_page', {
+        page_size: CONVERSATIONS_PAGE_SIZE,
+        after_cursor: afterCursor,
+      });
 
       if (error) throw error;
 
-      // Fetch sender and receiver profiles separately
-      const userIds = new Set<string>();
-      (data || []).forEach((msg: any) => {
-        userIds.add(msg.sender_id);
-        userIds.add(msg.receiver_id);
-      });
+      const rows = data || [];
+      const page = await Promise.all(rows.map(async (row) => ({
+        user: { id: row.peer_id, full_name: row.peer_name, email: row.peer_email },
+        lastMessage: await decryptRow({
+          id: row.last_message_id,
+          sender_id: row.last_sender_id,
+          receiver_id: row.last_sender_id === userId ? row.peer_id : userId,
+          content: row.last_content,
+          property_id: row.last_property_id,
+          created_at: row.last_message_at,
+        }),
+        unreadCount: row.unread_count,
+      })));
+      const nextCursor = rows.length === CONVERSATIONS_PAGE_SIZE ? rows[rows.length - 1].cursor : null;
+
+      setConversations((prev) =>
+        mergeBy(prev, page, (conv: any) => conv.user.id).sort((a: any, b: any) =>
+          new Date(b.lastMessage.created_at).getTime() - new Date(a.lastMessage.created_at).getTime()
+        )
+      );
+      setConversationsCursor((prev) => (afterCursor || prev === undefined ? nextCursor : prev));
+
+      if (!afterCursor) {
+        const { count } = await supabase
+          .from('conversations')
+          .select('*', { count: 'exact', head: true })
+          .eq('user_id', userId);
+        setTotalConversations(count || 0);
+      }
+    } catch (error: any) {
+      console.error('Error fetching messages:', error);
+      toast.error('Failed to load messages');
+    } finally {
+      setLoading(false);
+    }
+  }, [userId]);
 
-      const { data: profilesData } = await supabase
-        .from('profiles')
-        .select('id, full_name, email')
-        .in('id', Array.from(userIds));
+  const loadMoreConversations = useCallback(() => {
+    if (conversationsCursor) fetchConversations(conversationsCursor);
+  }, [conversationsCursor, fetchConversations]);
 
-      const profilesMap = new Map(
-        (profilesData || []).map(p => [p.id, p])
-      );
+  // One thread page, newest first from the server, kept oldest first for display.
+  // Without a cursor it refreshes the newest page and keeps older ones already loaded.
+  const fetchMessages = useCallback(async (otherUserId: string, afterCursor?: string) => {
+    if (!userId) return;
 
-      // Enrich and decrypt messages with profile data
-      const enrichedData = await Promise.all(
-        (data || []).map(async (msg: any) => {
-          let decryptedContent = msg.content;
-
-          // Decrypt message content
-          try {
-            decryptedContent = await decryptMessage(
-              msg.content,
-              msg.sender_id,
-              msg.receiver_id
-            );
-          } catch (error) {
-            console.error('Failed to decrypt message:', error);
-          }
+    try {
+      setLoadingMessages(true);
+      const { data, error } = await supabase.rpc('get_conversation_messages', {
+        other_user_id: otherUserId,
+        page_size: MESSAGES_PAGE_SIZE,
+        after_cursor: afterCursor,
+      });
 
-          return {
-            ...msg,
-            content: decryptedContent,
-            sender: profilesMap.get(msg.sender_id),
-            receiver: profilesMap.get(msg.receiver_id)
-          };
-        })
-      );
+      if (error) throw error;
+      if (activeUserRef.current !== otherUserId) return;
 
-      // Group messages by conversation
-      const grouped = (enrichedData || []).reduce((acc: any, msg: any) => {
-        const otherUserId = msg.sender_id === userId ? msg.receiver_id : msg.sender_id;
-        if (!acc[otherUserId]) {
-          acc[otherUserId] = {
-            user: msg.sender_id === userId ? msg.receiver : msg.sender,
-            messages: [],
-            lastMessage: msg,
-            unreadCount: 0,
-          };
-        }
-        acc[otherUserId].messages.push(msg);
-        if (!msg.read && msg.receiver_id === userId) {
-          acc[otherUserId].unreadCount++;
-        }
-        return acc;
-      }, {});
+      const rows = data || [];
+      const page = await Promise.all(rows.map(decryptRow));
+      const nextCursor = rows.length === MESSAGES_PAGE_SIZE ? rows[rows.length - 1].cursor : null;
 
-      // Sort messages within each conversation (oldest first for chat display)
-      Object.values(grouped).forEach((conv: any) => {
-        conv.messages.sort((a: any, b: any) =>
+      setMessages((prev) =>
+        mergeBy(prev, page, (msg: any) => msg.id).sort((a: any, b: any) =>
           new Date(a.created_at).getTime() - new Date(b.created_at).getTime()
-        );
-      });
-
-      setConversations(Object.values(grouped));
+        )
+      );
+      setMessagesCursor((prev) => (afterCursor || prev === undefined ? nextCursor : prev));
     } catch (error: any) {
-      console.error('Error fetching messages:', error);
-      toast.error('Failed to load messages');
+      console.error('Error fetching conversation:', error);
+      toast.error('Failed to load conversation');
     } finally {
-      setLoading(false);
+      setLoadingMessages(false);
     }
   }, [userId]);
 
+  const openConversation = useCallback((otherUserId: string | null) => {
+    activeUserRef.current = otherUserId;
+    setActiveUserId(otherUserId);
+    setMessages([]);
+    setMessagesCursor(undefined);
+    if (otherUserId) fetchMessages(otherUserId);
+  }, [fetchMessages]);
+
+  const loadOlderMessages = useCallback(() => {
+    if (activeUserId && messagesCursor) fetchMessages(activeUserId, messagesCursor);
+  }, [activeUserId, messagesCursor, fetchMessages]);
+
   useEffect(() => {
     fetchConversations();
 
     if (!userId) return;
 
-    // Real-time subscription for instant message updates
+    // The user's conversations rows change on every message to or from them, on reads,
+    // on deletes and when the last message is edited; other edits by the other side
+    // arrive as messages updates.
+    const refreshThread = (peerId: string | undefined) => {
+      if (peerId && peerId === activeUserRef.current) fetchMessages(peerId);
+    };
     const channel = supabase
       .channel('messages-realtime')
       .on(
@@ -121,20 +165,36 @@ export function useMessages(userId: string | undefined) {
         {
           event: '*',
           schema: 'public',
-          table: 'messages',
-          filter: `or(sender_id.eq.${userId},receiver_id.eq.${userId})`
+          table: 'conversations',
+          filter: `user_id=eq.${userId}`
         },
-        () => {
-          // Instant updates without throttling
-          fetchConversations();
+        (payload: any) => {
+          if (payload.eventType === 'DELETE') {
+            if (payload.old?.user_id !== userId) return;
+            setConversations((prev) => prev.filter((conv) => conv.user?.id !== payload.old.peer_id));
+            setTotalConversations((count) => Math.max(count - 1, 0));
+          } else {
+            fetchConversations();
+          }
+          refreshThread(payload.new?.peer_id || payload.old?.peer_id);
         }
       )
+      .on(
+        'postgres_changes',
+        {
+          event: 'UPDATE',
+          schema: 'public',
+          table: 'messages',
+          filter: `receiver_id=eq.${userId}`
+        },
+        (payload: any) => refreshThread(payload.new?.sender_id)
+      )
       .subscribe();
 
     return () => {
       supabase.removeChannel(channel);
     };
-  }, [userId, fetchConversations]);
+  }, [userId, fetchConversations, fetchMessages]);
 
   const sendMessage = async (receiverId: string, content: string, propertyId?: string) => {
     if (!userId) {
@@ -179,22 +239,21 @@ export function useMessages(userId: string | undefined) {
     }
   };
 
-  const markAsRead = async (conversationUserId: string) => {
+  const markAsRead = useCallback(async (conversationUserId: string) => {
     if (!userId) return;
 
     try {
-      const { error } = await supabase
-        .from('messages')
-        .update({ read: true })
-        .eq('receiver_id', userId)
-        .eq('sender_id', conversationUserId)
-        .eq('read', false);
+      // The messages UPDATE policy only admits senders; the RPC clears the receiver's
+      // unread flags and the conversations trigger resets the unread count.
+      const { error } = await supabase.rpc('mark_conversation_read', {
+        other_user_id: conversationUserId,
+      });
 
       if (error) throw error;
     } catch (error) {
       console.error('Error marking messages as read:', error);
     }
-  };
+  }, [userId]);
 
   const deleteMessage = async (messageId: string) => {
     if (!userId) {
@@ -220,14 +279,9 @@ export function useMessages(userId: string | undefined) {
 
       toast.success('Message deleted');
 
-      // Immediately update local state for instant UI update
-      setConversations(prevConvs =>
-        prevConvs.map(conv => ({
-          ...conv,
-          messages: conv.messages.filter((msg: any) => msg.id !== messageId),
-          lastMessage: conv.messages.filter((msg: any) => msg.id !== messageId)[0]
-        })).filter(conv => conv.messages.length > 0)
-      );
+      // Immediately update local state for instant UI update; the conversations row
+      // (last message) follows through the realtime subscription
+      setMessages(prevMessages => prevMessages.filter((msg: any) => msg.id !== messageId));
     } catch (error: any) {
       console.error('Error deleting message:', error);
       toast.error(error.message || 'Failed to delete message');
@@ -285,15 +339,19 @@ export function useMessages(userId: string | undefined) {
       toast.success('Message updated');
 
       // Immediately update local state for instant UI update
+      setMessages(prevMessages =>
+        prevMessages.map((msg: any) =>
+          msg.id === messageId
+            ? { ...msg, content: validatedData.content, edited: true, edited_at: new Date().toISOString() }
+            : msg
+        )
+      );
       setConversations(prevConvs =>
-        prevConvs.map(conv => ({
-          ...conv,
-          messages: conv.messages.map((msg: any) =>
-            msg.id === messageId
-              ? { ...msg, content: validatedData.content, edited: true, edited_at: new Date().toISOString() }
-              : msg
-          )
-        }))
+        prevConvs.map(conv =>
+          conv.lastMessage?.id === messageId
+            ? { ...conv, lastMessage: { ...conv.lastMessage, content: validatedData.content } }
+            : conv
+        )
       );
     } catch (error: any) {
       if (error instanceof z.ZodError) {
@@ -345,6 +403,7 @@ export function useMessages(userId: string | undefined) {
       setConversations(prevConvs =>
         prevConvs.filter(conv => conv.user?.id !== conversationUserId)
       );
+      if (activeUserRef.current === conversationUserId) setMessages([]);
     } catch (error: any) {
       console.error('Error deleting conversation:', error);
       toast.error(error.message || 'Failed to delete conversation');
@@ -353,7 +412,15 @@ export function useMessages(userId: string | undefined) {
 
   return {
     conversations,
+    totalConversations,
+    hasMoreConversations: !!conversationsCursor,
+    loadMoreConversations,
     loading,
+    messages,
+    hasMoreMessages: !!messagesCursor,
+    loadingMessages,
+    openConversation,
+    loadOlderMessages,
     sendMessage,
     markAsRead,
     deleteMessage,
@@ -4,6 +4,8 @@ import type { Property } from "@/types/database";
 
 export interface NearbyProperty extends Property {
   distance_km: number;
+  // Exact distance; pass with the row id as the cursor for the next page.
+  distance_m: number;
 }
 
 export function useNearbyProperties(
@@ -21,7 +23,6 @@ export function useNearbyProperties(
         return [] as NearbyProperty[];
       }
 
-      // @ts-expect-error - Fix type error - RPC function not in generated types yet
       const { data, error } = await supabase.rpc("search_properties_nearby", {
         user_lat: latitude,
         user_lng: longitude,
@@ -1,4 +1,4 @@
-import { useEffect, useState, useCallback } from 'react';
+import { useEffect, useState, useCallback, useMemo, useRef } from 'react';
 import { App as CapacitorApp } from '@capacitor/app';
 import type { PluginListenerHandle } from '@capacitor/core';
 import { supabase } from '@/integrations/supabase/client';
@@ -15,125 +15,133 @@ interface PropertyFilters {
   longitude?: number;
   radiusKm?: number;
   searchQuery?: string;
-  sortBy?: 'recent' | 'price-low' | 'price-high';
+  sortBy?: 'recent' | 'relevance' | 'price-low' | 'price-high' | 'distance';
+}
+
+export interface PropertiesTotal {
+  count: number;
+  // More listings match than were counted; show as "1000+"
+  capped: boolean;
+}
+
+const PAGE_SIZE = 24;
+// search_properties_page returns at most this many rows per call
+const MAX_PAGE_SIZE = 100;
+
+type PropertyPageRow = Property & { cursor: string };
+
+function searchArgs(filters: PropertyFilters) {
+  return {
+    query_text: filters.searchQuery?.trim() || null,
+    category_filter: filters.propertyType || null,
+    city_filter: filters.city?.trim() || null,
+    area_filter: filters.area?.trim() || null,
+    pincode_filter: filters.pinCode?.trim() || null,
+    origin_lat: filters.latitude ?? null,
+    origin_lng: filters.longitude ?? null,
+    radius_km: filters.radiusKm ?? null,
+  };
+}
+
+function pageArgs(filters: PropertyFilters, pageSize: number, afterCursor: string | null = null) {
+  return {
+    ...searchArgs(filters),
+    sort_by: filters.sortBy || 'recent',
+    after_cursor: afterCursor,
+    page_size: pageSize,
+  };
 }
 
 export function useProperties(filters?: PropertyFilters) {
   const [properties, setProperties] = useState<Property[]>([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [total, setTotal] = useState<PropertiesTotal | null>(null);
   const { location } = useLocation();
+  // Bumped on every reload so pages requested for older filters are dropped
+  const generationRef = useRef(0);
+  const loadedRef = useRef(0);
+  const loadingMoreRef = useRef(false);
+
+  const effectiveFilters = useMemo(() => {
+    const effective: PropertyFilters = { ...filters };
+
+    // Apply location context
+    if (location.method === 'city' && location.value) {
+      effective.city = location.value;
+    } else if (location.method === 'area' && location.value) {
+      effective.area = location.value;
+    } else if (location.method === 'pincode' && location.value) {
+      effective.pinCode = location.value;
+    } else if (location.method === 'live' && location.coordinates) {
+      effective.latitude = location.coordinates.lat;
+      effective.longitude = location.coordinates.lng;
+      effective.radiusKm = effective.radiusKm || 10;
+    }
+    return effective;
+  }, [filters, location.method, location.value, location.coordinates]);
 
-  const fetchProperties = useCallback(async () => {
+  // `refresh` keeps as many rows as are already loaded (visibility, network and
+  // realtime revalidation) instead of collapsing the list back to one page.
+  const fetchProperties = useCallback(async (refresh = false) => {
+    const generation = ++generationRef.current;
     try {
       setLoading(true);
 
-      // Use location context if no filters provided
-      const effectiveFilters = { ...filters };
-
-      // Apply location context
-      if (location.method === 'city' && location.value) {
-        effectiveFilters.city = location.value;
-      } else if (location.method === 'area' && location.value) {
-        effectiveFilters.area = location.value;
-      } else if (location.method === 'pincode' && location.value) {
-        effectiveFilters.pinCode = location.value;
-      } else if (location.method === 'live' && location.coordinates) {
-        effectiveFilters.latitude = location.coordinates.lat;
-        effectiveFilters.longitude = location.coordinates.lng;
-        effectiveFilters.radiusKm = effectiveFilters.radiusKm || 10;
-      }
-
-      // Location-aware querying
-      // 1) If we have live coordinates, use the geospatial RPC for distance filtering
-      // (Note: RPC needs update to support text search if we want robust search + geo, 
-      // but standard approach: filter by geo first)
-      if (effectiveFilters.latitude && effectiveFilters.longitude) {
-        const { data, error } = await supabase.rpc('search_properties_by_location', {
-          search_city: effectiveFilters.city || null,
-          search_area: effectiveFilters.area || null,
-          search_pin_code: effectiveFilters.pinCode || null,
-          search_latitude: effectiveFilters.latitude,
-          search_longitude: effectiveFilters.longitude,
-          radius_km: effectiveFilters.radiusKm || 10,
-          property_type_filter: effectiveFilters.propertyType || null,
-        });
-
-        if (error) throw error;
-        // Client-side sort/filter for RPC results (limitation of current RPC)
-        let filtered = (data || []) as unknown as Property[];
-
-        if (effectiveFilters.searchQuery) {
-          const q = effectiveFilters.searchQuery.toLowerCase();
-          filtered = filtered.filter(p =>
-            p.title.toLowerCase().includes(q) ||
-            p.city.toLowerCase().includes(q) ||
-            p.area.toLowerCase().includes(q)
-          );
-        }
-
-        if (effectiveFilters.sortBy) {
-          if (effectiveFilters.sortBy === 'price-low') filtered.sort((a, b) => a.price - b.price);
-          else if (effectiveFilters.sortBy === 'price-high') filtered.sort((a, b) => b.price - a.price);
-          // recent is default
-        }
-
-        setProperties(filtered);
+      // Cursor-paginated search (text, filters and, with live coordinates, the
+      // radius and distance sort all server-side): one page now, more via loadMore()
+      const pageSize = refresh ? Math.min(Math.max(loadedRef.current, PAGE_SIZE), MAX_PAGE_SIZE) : PAGE_SIZE;
+      // The total is counted once per filter set; revalidations (realtime, focus,
+      // reconnect) only refetch the rows and keep it.
+      const [page, count] = await Promise.all([
+        supabase.rpc('search_properties_page', pageArgs(effectiveFilters, pageSize)),
+        refresh ? null : supabase.rpc('search_properties_count', searchArgs(effectiveFilters)),
+      ]);
+
+      if (page.error) throw page.error;
+      if (count?.error) throw count.error;
+      if (generation !== generationRef.current) return;
+
+      const rows = (page.data || []) as unknown as PropertyPageRow[];
+      setProperties(rows);
+      setNextCursor(rows.length === pageSize ? rows[rows.length - 1].cursor : null);
+      if (count) {
+        const [countRow] = count.data || [];
+        setTotal(countRow ? { count: Number(countRow.total_count), capped: countRow.capped } : null);
       }
-      // 2) Standard Database Query
-      else {
-        let query = supabase
-          .from('properties')
-          .select('id, title, price, price_type, city, area, pin_code, property_type, status, available, verified, images, bedrooms, bathrooms, area_sqft, created_at, latitude, longitude')
-          .eq('status', 'active')
-          .eq('available', true);
-
-        // Text Search (Server Side)
-        if (effectiveFilters.searchQuery) {
-          const q = effectiveFilters.searchQuery;
-          // Use search across multiple columns
-          query = query.or(`title.ilike.%${q}%,city.ilike.%${q}%,area.ilike.%${q}%,pin_code.ilike.%${q}%`);
-        }
-
-        if (effectiveFilters.city) {
-          query = query.ilike('city', `%${(effectiveFilters.city || '').trim()}%`);
-        }
-        if (effectiveFilters.area) {
-          query = query.ilike('area', `%${(effectiveFilters.area || '').trim()}%`);
-        }
-        if (effectiveFilters.pinCode) {
-          const pin = (effectiveFilters.pinCode || '').trim();
-          query = pin.length === 6 ? query.eq('pin_code', pin) : query.ilike('pin_code', `${pin}%`);
-        }
-        if (effectiveFilters.propertyType) {
-          query = query.eq('property_type', effectiveFilters.propertyType);
-        }
+      loadedRef.current = rows.length;
+    } catch (error) {
+      console.error('Error fetching properties:', error);
+      toast.error('Failed to load properties');
+    } finally {
+      if (generation === generationRef.current) setLoading(false);
+    }
+  }, [effectiveFilters]);
 
-        // Sorting
-        if (effectiveFilters.sortBy === 'price-low') {
-          query = query.order('price', { ascending: true });
-        } else if (effectiveFilters.sortBy === 'price-high') {
-          query = query.order('price', { ascending: false });
-        } else {
-          query = query.order('created_at', { ascending: false });
-        }
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMoreRef.current) return;
+    const generation = generationRef.current;
+    loadingMoreRef.current = true;
+    setLoadingMore(true);
+    try {
+      const { data, error } = await supabase.rpc('search_properties_page', pageArgs(effectiveFilters, PAGE_SIZE, nextCursor));
 
-        const { data, error } = await query.limit(100);
+      if (error) throw error;
+      if (generation !== generationRef.current) return;
 
-        if (error) throw error;
-        setProperties((data || []) as unknown as Property[]);
-      }
+      const rows = (data || []) as unknown as PropertyPageRow[];
+      setProperties(prev => [...prev, ...rows]);
+      setNextCursor(rows.length === PAGE_SIZE ? rows[rows.length - 1].cursor : null);
+      loadedRef.current += rows.length;
     } catch (error) {
-      console.error('Error fetching properties:', error);
-      toast.error('Failed to load properties');
+      console.error('Error loading more properties:', error);
+      toast.error('Failed to load more properties');
     } finally {
-      setLoading(false);
+      loadingMoreRef.current = false;
+      setLoadingMore(false);
     }
-  }, [
-    location.method,
-    location.value,
-    location.coordinates,
-    filters, // Re-fetch when filters change
-  ]);
+  }, [effectiveFilters, nextCursor]);
 
   useEffect(() => {
     fetchProperties();
@@ -141,13 +149,13 @@ export function useProperties(filters?: PropertyFilters) {
     // 1) Revalidate when app/tab becomes active again
     const onVisibility = () => {
       if (document.visibilityState === 'visible') {
-        fetchProperties();
+        fetchProperties(true);
       }
     };
     document.addEventListener('visibilitychange', onVisibility);
 
     // 2) Revalidate when network returns
-    const onOnline = () => fetchProperties();
+    const onOnline = () => fetchProperties(true);
     window.addEventListener('online', onOnline);
 
     // 3) Revalidate when app comes to foreground (native builds)
@@ -156,7 +164,7 @@ export function useProperties(filters?: PropertyFilters) {
       try {
         if (CapacitorApp?.addListener) {
           removeAppListener = await CapacitorApp.addListener('appStateChange', ({ isActive }) => {
-            if (isActive) fetchProperties();
+            if (isActive) fetchProperties(true);
           });
         }
       } catch {
@@ -174,7 +182,7 @@ export function useProperties(filters?: PropertyFilters) {
         { event: '*', schema: 'public', table: 'properties' },
         () => {
           clearTimeout(updateTimeout);
-          updateTimeout = setTimeout(() => fetchProperties(), 1000);
+          updateTimeout = setTimeout(() => fetchProperties(true), 1000);
         }
       )
       .subscribe();
@@ -190,7 +198,15 @@ export function useProperties(filters?: PropertyFilters) {
     };
   }, [fetchProperties]);
 
-  return { properties, loading, refetch: fetchProperties };
+  return {
+    properties,
+    loading,
+    loadingMore,
+    hasMore: nextCursor !== null,
+    total,
+    loadMore,
+    refetch: fetchProperties,
+  };
 }
 
 export function useProperty(id: string | undefined) {
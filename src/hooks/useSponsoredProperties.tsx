@@ -1,5 +1,5 @@
 import { useState, useEffect, useCallback } from 'react';
-import { supabase } from '@/integrations/supabase/client';
+import { supabase, SUPABASE_URL, SUPABASE_PUBLISHABLE_KEY } from '@/integrations/supabase/client';
 import { Property } from '@/types/database';
 import { App as CapacitorApp } from '@capacitor/app';
 import type { PluginListenerHandle } from '@capacitor/core';
@@ -17,6 +17,90 @@ interface LocationFilter {
   };
 }
 
+// Impressions and clicks are summed per campaign and sent in one record_campaign_events
+// call every few seconds (and when the page is hidden), instead of one RPC per event.
+const FLUSH_INTERVAL_MS = 5000;
+const RECORD_EVENTS_URL = `${SUPABASE_URL}/rest/v1/rpc/record_campaign_events`;
+const pendingEvents = new Map<string, { impressions: number; clicks: number }>();
+let flushTimer: ReturnType<typeof setTimeout> | undefined;
+
+// Kept current so the keepalive fetch below records events as the signed-in user,
+// the same as supabase.rpc does; it cannot await getSession() while the page unloads.
+let accessToken: string | undefined;
+supabase.auth.getSession().then(({ data }) => {
+  accessToken = data.session?.access_token;
+});
+supabase.auth.onAuthStateChange((_event, session) => {
+  accessToken = session?.access_token;
+});
+
+type CampaignEvent = { campaign_id: string; impressions: number; clicks: number };
+
+// Put a batch that failed to send back in the queue so the next flush retries it.
+const requeueCampaignEvents = (events: CampaignEvent[]) => {
+  for (const { campaign_id, impressions, clicks } of events) {
+    const counts = pendingEvents.get(campaign_id) ?? { impressions: 0, clicks: 0 };
+    counts.impressions += impressions;
+    counts.clicks += clicks;
+    pendingEvents.set(campaign_id, counts);
+  }
+  if (!flushTimer) flushTimer = setTimeout(() => flushCampaignEvents(), FLUSH_INTERVAL_MS);
+};
+
+// `unloading`: the page is going away, so a promise-based RPC may be cancelled with it.
+// A keepalive fetch outlives the page.
+const flushCampaignEvents = (unloading = false) => {
+  if (flushTimer) {
+    clearTimeout(flushTimer);
+    flushTimer = undefined;
+  }
+  if (pendingEvents.size === 0) return;
+
+  const events: CampaignEvent[] = Array.from(pendingEvents, ([campaign_id, counts]) => ({ campaign_id, ...counts }));
+  pendingEvents.clear();
+  if (unloading) {
+    fetch(RECORD_EVENTS_URL, {
+      method: 'POST',
+      keepalive: true,
+      headers: {
+        apikey: SUPABASE_PUBLISHABLE_KEY,
+        Authorization: `Bearer ${accessToken ?? SUPABASE_PUBLISHABLE_KEY}`,
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ events }),
+    })
+      .then((response) => {
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+      })
+      .catch((error) => {
+        // Runs only if the page survived (it was just hidden); the next flush retries.
+        console.error('Error recording campaign events:', error);
+        requeueCampaignEvents(events);
+      });
+    return;
+  }
+  supabase.rpc('record_campaign_events', { events }).then(({ error }) => {
+    if (error) {
+      console.error('Error recording campaign events:', error);
+      requeueCampaignEvents(events);
+    }
+  });
+};
+
+const queueCampaignEvent = (campaignId: string, kind: 'impressions' | 'clicks') => {
+  const counts = pendingEvents.get(campaignId) ?? { impressions: 0, clicks: 0 };
+  counts[kind] += 1;
+  pendingEvents.set(campaignId, counts);
+  if (!flushTimer) flushTimer = setTimeout(() => flushCampaignEvents(), FLUSH_INTERVAL_MS);
+};
+
+if (typeof window !== 'undefined') {
+  window.addEventListener('pagehide', () => flushCampaignEvents(true));
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') flushCampaignEvents(true);
+  });
+}
+
 // Updated: fetch sponsored properties unconditionally (active campaigns) used on Listings page only.
 export const useSponsoredProperties = (location?: LocationFilter) => {
   const [sponsoredProperties, setSponsoredProperties] = useState<SponsoredProperty[]>([]);
@@ -163,23 +247,15 @@ export const useSponsoredProperties = (location?: LocationFilter) => {
     };
   }, [fetchSponsoredProperties]);
 
-  const incrementImpressions = (campaignId: string) => {
-    // Fire and forget - don't await to prevent blocking UI
-    supabase.rpc('increment_campaign_impressions', {
-      campaign_id: campaignId
-    }).then(({ error }) => {
-      if (error) console.error('Error incrementing impressions:', error);
-    });
-  };
+  const incrementImpressions = useCallback((campaignId: string) => {
+    queueCampaignEvent(campaignId, 'impressions');
+  }, []);
 
-  const incrementClicks = (campaignId: string) => {
-    // Fire and forget - don't await to prevent blocking navigation
-    supabase.rpc('increment_campaign_clicks', {
-      campaign_id: campaignId
-    }).then(({ error }) => {
-      if (error) console.error('Error incrementing clicks:', error);
-    });
-  };
+  const incrementClicks = useCallback((campaignId: string) => {
+    queueCampaignEvent(campaignId, 'clicks');
+    // A click usually navigates away; send it now rather than on the timer.
+    flushCampaignEvents();
+  }, []);
 
   return {
     sponsoredProperties,
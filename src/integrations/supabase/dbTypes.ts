@@ -570,6 +570,7 @@ export type Database = {
       has_role: { Args: { _user_id: string; _role: Database["public"]["Enums"]["app_role"] }; Returns: boolean }
       get_user_role: { Args: { _user_id: string }; Returns: Database["public"]["Enums"]["app_role"] | null }
       get_admin_dashboard_stats: { Args: Record<string, never>; Returns: Json }
+      refresh_admin_stats: { Args: { metrics?: string[] }; Returns: number }
       get_admin_users_list: {
         Args: Record<string, never>
         Returns: {
@@ -612,6 +613,7 @@ export type Database = {
           bathrooms: number | null
           area_sqft: number | null
           images: string[] | null
+          image_placeholders: Json | null
           amenities: string[] | null
           status: string | null
           verified: boolean | null
@@ -661,6 +663,15 @@ export type Database = {
       }
       increment_campaign_impressions: { Args: { campaign_id: string }; Returns: void }
       increment_campaign_clicks: { Args: { campaign_id: string }; Returns: void }
+      record_campaign_events: { Args: { events: Json }; Returns: void }
+      get_campaign_counters: {
+        Args: { campaign_ids: string[] }
+        Returns: {
+          campaign_id: string
+          impressions: number
+          clicks: number
+        }[]
+      }
       get_report_stats: { Args: Record<string, never>; Returns: Json }
       apply_admin_action: { 
         Args: { 
@@ -671,6 +682,148 @@ export type Database = {
         }
         Returns: void 
       }
+      search_properties_nearby: {
+        Args: {
+          user_lat: number
+          user_lng: number
+          radius_km?: number
+          limit_count?: number
+          property_type_filter?: string
+          after_distance_m?: number
+          after_id?: string
+        }
+        Returns: {
+          id: string
+          title: string
+          description: string | null
+          property_type: string
+          price: number
+          price_type: string | null
+          city: string
+          area: string
+          pin_code: string
+          images: string[] | null
+          amenities: string[] | null
+          latitude: number | null
+          longitude: number | null
+          bedrooms: number | null
+          bathrooms: number | null
+          area_sqft: number | null
+          status: string | null
+          verified: boolean | null
+          available: boolean | null
+          user_id: string
+          created_at: string
+          distance_km: number
+          distance_m: number
+        }[]
+      }
+      get_conversations_page: {
+        Args: {
+          page_size?: number
+          after_cursor?: string
+        }
+        Returns: {
+          peer_id: string
+          peer_name: string | null
+          peer_email: string | null
+          unread_count: number
+          last_message_id: string
+          last_message_at: string
+          last_sender_id: string
+          last_content: string
+          last_property_id: string | null
+          cursor: string
+        }[]
+      }
+      get_conversation_messages: {
+        Args: {
+          other_user_id: string
+          page_size?: number
+          after_cursor?: string
+        }
+        Returns: {
+          id: string
+          sender_id: string
+          receiver_id: string
+          property_id: string | null
+          content: string
+          read: boolean | null
+          edited: boolean | null
+          edited_at: string | null
+          created_at: string
+          cursor: string
+        }[]
+      }
+      mark_conversation_read: { Args: { other_user_id: string }; Returns: number }
+      search_properties_page: {
+        Args: {
+          query_text?: string
+          category_filter?: string
+          city_filter?: string
+          area_filter?: string
+          pincode_filter?: string
+          min_price?: number
+          max_price?: number
+          sort_by?: string
+          after_cursor?: string
+          page_size?: number
+          origin_lat?: number
+          origin_lng?: number
+          radius_km?: number
+        }
+        Returns: {
+          id: string
+          title: string
+          description: string | null
+          price: number
+          price_type: string | null
+          property_type: string
+          status: string | null
+          available: boolean | null
+          images: string[] | null
+          image_placeholders: Json | null
+          bedrooms: number | null
+          bathrooms: number | null
+          area_sqft: number | null
+          address: string | null
+          city: string
+          area: string
+          pin_code: string
+          latitude: number | null
+          longitude: number | null
+          amenities: string[] | null
+          user_id: string
+          created_at: string
+          updated_at: string
+          views: number | null
+          verified: boolean | null
+          featured: boolean | null
+          relevance_score: number | null
+          distance_m: number | null
+          distance_km: number | null
+          cursor: string
+        }[]
+      }
+      search_properties_count: {
+        Args: {
+          query_text?: string
+          category_filter?: string
+          city_filter?: string
+          area_filter?: string
+          pincode_filter?: string
+          min_price?: number
+          max_price?: number
+          count_cap?: number
+          origin_lat?: number
+          origin_lng?: number
+          radius_km?: number
+        }
+        Returns: {
+          total_count: number
+          capped: boolean
+        }[]
+      }
     }
     Enums: {
       app_role: "admin" | "moderator" | "user"
@@ -128,6 +128,7 @@ export type Database = {
           ip_address: string | null
           new_data: Json | null
           old_data: Json | null
+          record_data: Json | null
           record_id: string | null
           table_name: string | null
           user_agent: string | null
@@ -140,6 +141,7 @@ export type Database = {
           ip_address?: string | null
           new_data?: Json | null
           old_data?: Json | null
+          record_data?: Json | null
           record_id?: string | null
           table_name?: string | null
           user_agent?: string | null
@@ -152,6 +154,7 @@ export type Database = {
           ip_address?: string | null
           new_data?: Json | null
           old_data?: Json | null
+          record_data?: Json | null
           record_id?: string | null
           table_name?: string | null
           user_agent?: string | null
@@ -215,6 +218,33 @@ export type Database = {
           },
         ]
       }
+      conversations: {
+        Row: {
+          last_message_at: string
+          last_message_edited_at: string | null
+          last_message_id: string
+          peer_id: string
+          unread_count: number
+          user_id: string
+        }
+        Insert: {
+          last_message_at: string
+          last_message_edited_at?: string | null
+          last_message_id: string
+          peer_id: string
+          unread_count?: number
+          user_id: string
+        }
+        Update: {
+          last_message_at?: string
+          last_message_edited_at?: string | null
+          last_message_id?: string
+          peer_id?: string
+          unread_count?: number
+          user_id?: string
+        }
+        Relationships: []
+      }
       crm_clients: {
         Row: {
           created_at: string
@@ -751,6 +781,7 @@ export type Database = {
           created_by_name: string | null
           description: string | null
           id: string
+          image_placeholders: Json
           images: string[] | null
           is_agent: boolean | null
           latitude: number | null
@@ -788,6 +819,7 @@ export type Database = {
           created_by_name?: string | null
           description?: string | null
           id?: string
+          image_placeholders?: Json
           images?: string[] | null
           is_agent?: boolean | null
           latitude?: number | null
@@ -825,6 +857,7 @@ export type Database = {
           created_by_name?: string | null
           description?: string | null
           id?: string
+          image_placeholders?: Json
           images?: string[] | null
           is_agent?: boolean | null
           latitude?: number | null
@@ -1706,6 +1739,10 @@ export type Database = {
             Returns: string
           }
       enablelongtransactions: { Args: never; Returns: string }
+      ensure_audit_log_partitions: {
+        Args: { first_month?: string; months_ahead?: number }
+        Returns: number
+      }
       equals: { Args: { geom1: unknown; geom2: unknown }; Returns: boolean }
       geometry: { Args: { "": string }; Returns: unknown }
       geometry_above: {
@@ -1829,6 +1866,64 @@ export type Database = {
           total_leads: number
         }[]
       }
+      get_campaign_counters: {
+        Args: { campaign_ids: string[] }
+        Returns: {
+          campaign_id: string
+          clicks: number
+          impressions: number
+        }[]
+      }
+      get_campaign_stats: {
+        Args: {
+          from_ts: string
+          granularity?: string
+          p_campaign_id: string
+          to_ts?: string
+        }
+        Returns: {
+          bucket: string
+          clicks: number
+          impressions: number
+          leads: number
+          paid_leads: number
+          spend: number
+        }[]
+      }
+      get_conversation_messages: {
+        Args: {
+          after_cursor?: string
+          other_user_id: string
+          page_size?: number
+        }
+        Returns: {
+          content: string
+          created_at: string
+          cursor: string
+          edited: boolean
+          edited_at: string
+          id: string
+          property_id: string
+          read: boolean
+          receiver_id: string
+          sender_id: string
+        }[]
+      }
+      get_conversations_page: {
+        Args: { after_cursor?: string; page_size?: number }
+        Returns: {
+          cursor: string
+          last_content: string
+          last_message_at: string
+          last_message_id: string
+          last_property_id: string
+          last_sender_id: string
+          peer_email: string
+          peer_id: string
+          peer_name: string
+          unread_count: number
+        }[]
+      }
       get_current_user_id: { Args: never; Returns: string }
       get_dashboard_stats: { Args: { user_id: string }; Returns: Json }
       get_map_clusters: {
@@ -1973,6 +2068,7 @@ export type Database = {
           description: string
           distance_km: number
           id: string
+          image_placeholders: Json
           images: string[]
           is_agent: boolean
           latitude: number
@@ -2076,6 +2172,10 @@ export type Database = {
         Returns: boolean
       }
       longtransactionsenabled: { Args: never; Returns: boolean }
+      mark_conversation_read: {
+        Args: { other_user_id: string }
+        Returns: number
+      }
       populate_geometry_columns:
         | { Args: { use_typmod?: boolean }; Returns: string }
         | { Args: { tbl_oid: unknown; use_typmod?: boolean }; Returns: number }
@@ -2120,6 +2220,8 @@ export type Database = {
         Args: { retention_days?: number }
         Returns: undefined
       }
+      record_campaign_events: { Args: { events: Json }; Returns: undefined }
+      refresh_admin_stats: { Args: { metrics?: string[] }; Returns: number }
       reject_property: { Args: { property_id: string }; Returns: undefined }
       reveal_property_contact: {
         Args: { p_property_id: string }
@@ -2232,6 +2334,25 @@ export type Database = {
               verified: boolean
             }[]
           }
+      search_properties_count: {
+        Args: {
+          area_filter?: string
+          category_filter?: string
+          city_filter?: string
+          count_cap?: number
+          max_price?: number
+          min_price?: number
+          origin_lat?: number
+          origin_lng?: number
+          pincode_filter?: string
+          query_text?: string
+          radius_km?: number
+        }
+        Returns: {
+          capped: boolean
+          total_count: number
+        }[]
+      }
       search_properties_in_view: {
         Args: {
           max_lat: number
@@ -2259,6 +2380,7 @@ export type Database = {
           description: string
           distance_km: number
           id: string
+          image_placeholders: Json
           images: string[]
           latitude: number
           longitude: number
@@ -2276,71 +2398,92 @@ export type Database = {
           views: number
         }[]
       }
-      search_properties_nearby:
-        | {
-            Args: {
-              limit_count?: number
-              radius_km?: number
-              user_lat: number
-              user_lng: number
-            }
-            Returns: {
-              amenities: string[]
-              area: string
-              area_sqft: number
-              available: boolean
-              bathrooms: number
-              bedrooms: number
-              city: string
-              created_at: string
-              description: string
-              distance_km: number
-              id: string
-              images: string[]
-              latitude: number
-              longitude: number
-              pin_code: string
-              price: number
-              price_type: string
-              property_type: string
-              status: string
-              title: string
-              user_id: string
-              verified: boolean
-            }[]
-          }
-        | {
-            Args: {
-              limit_count?: number
-              radius_km?: number
-              user_lat: number
-              user_lng: number
-            }
-            Returns: {
-              amenities: string[]
-              area: string
-              area_sqft: number
-              available: boolean
-              bathrooms: number
-              bedrooms: number
-              city: string
-              created_at: string
-              description: string
-              distance_km: number
-              id: string
-              images: string[]
-              latitude: number
-              longitude: number
-              pin_code: string
-              price: number
-              price_type: string
-              property_type: string
-              status: string
-              title: string
-              user_id: string
-              verified: boolean
-            }[]
-          }
+      search_properties_nearby: {
+        Args: {
+          after_distance_m?: number
+          after_id?: string
+          limit_count?: number
+          property_type_filter?: string
+          radius_km?: number
+          user_lat: number
+          user_lng: number
+        }
+        Returns: {
+          amenities: string[]
+          area: string
+          area_sqft: number
+          available: boolean
+          bathrooms: number
+          bedrooms: number
+          city: string
+          created_at: string
+          description: string
+          distance_km: number
+          distance_m: number
+          id: string
+          images: string[]
+          latitude: number
+          longitude: number
+          pin_code: string
+          price: number
+          price_type: string
+          property_type: string
+          status: string
+          title: string
+          user_id: string
+          verified: boolean
+        }[]
+      }
+      search_properties_page: {
+        Args: {
+          after_cursor?: string
+          area_filter?: string
+          category_filter?: string
+          city_filter?: string
+          max_price?: number
+          min_price?: number
+          origin_lat?: number
+          origin_lng?: number
+          page_size?: number
+          pincode_filter?: string
+          query_text?: string
+          radius_km?: number
+          sort_by?: string
+        }
+        Returns: {
+          address: string
+          amenities: string[]
+          area: string
+          area_sqft: number
+          available: boolean
+          bathrooms: number
+          bedrooms: number
+          city: string
+          created_at: string
+          cursor: string
+          description: string
+          distance_km: number
+          distance_m: number
+          featured: boolean
+          id: string
+          image_placeholders: Json
+          images: string[]
+          latitude: number
+          longitude: number
+          pin_code: string
+          price: number
+          price_type: string
+          property_type: string
+          relevance_score: number
+          status: string
+          title: string
+          updated_at: string
+          user_id: string
+          verified: boolean
+          views: number
+        }[]
+      }
+      set_image_placeholders: { Args: { updates: Json }; Returns: number }
       show_limit: { Args: never; Returns: number }
       show_trgm: { Args: { "": string }; Returns: string[] }
       st_3dclosestpoint: {
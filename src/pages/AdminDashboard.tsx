@@ -1,6 +1,6 @@
 import { useState } from "react";
 import { useNavigate } from "react-router-dom";
-import { ArrowLeft, Users, Home, MessageSquare, Heart, Eye, CheckCircle, XCircle, Clock, Shield, TrendingUp, Activity, DollarSign, Bell, AlertTriangle } from "lucide-react";
+import { ArrowLeft, Users, Home, MessageSquare, Heart, Eye, CheckCircle, XCircle, Clock, Shield, TrendingUp, Activity, DollarSign, Bell, AlertTriangle, RefreshCw } from "lucide-react";
 import { useAdminCheck } from "@/hooks/useAdminCheck";
 import { useAdminStats } from "@/hooks/useAdminStats";
 import { useAdminProperties } from "@/hooks/useAdminProperties";
@@ -27,11 +27,12 @@ import { TakeActionDialog } from "@/components/admin/TakeActionDialog";
 const AdminDashboard = () => {
   const navigate = useNavigate();
   const { isAdmin, loading } = useAdminCheck();
-  const { stats, loading: statsLoading } = useAdminStats();
+  const { stats, asOf, loading: statsLoading, refreshing: statsRefreshing, refresh: refreshStats } = useAdminStats();
   const { properties, loading: propertiesLoading, approveProperty, rejectProperty } = useAdminProperties();
   const { users, loading: usersLoading } = useAdminUsers();
   const { reports, loading: reportsLoading, applyAdminAction } = useAdminReports();
   const [selectedReportId, setSelectedReportId] = useState<string | null>(null);
+  const statsAsOf = Object.values(asOf).filter(Boolean).sort()[0];
 
   // Show loading state
   if (loading) {
@@ -90,6 +91,15 @@ const AdminDashboard = () => {
             <Activity className="h-3 w-3 animate-pulse text-green-500" />
             <span>Live Updates Active</span>
           </Badge>
+          {statsAsOf && (
+            <span className="text-xs text-muted-foreground">
+              Stats as of {formatDistanceToNow(new Date(statsAsOf), { addSuffix: true })}
+            </span>
+          )}
+          <Button variant="ghost" size="sm" onClick={() => refreshStats()} disabled={statsRefreshing} className="ml-auto gap-2">
+            <RefreshCw className={`h-4 w-4 ${statsRefreshing ? "animate-spin" : ""}`} />
+            Refresh
+          </Button>
         </div>
 
         {/* Main Stats Grid */}
@@ -6,6 +6,8 @@ import { Skeleton } from '@/components/ui/skeleton';
 import { useAdCampaigns } from '@/hooks/useAdCampaigns';
 import { useCampaignAnalytics } from '@/hooks/useCampaignAnalytics';
 import { useLeads } from '@/hooks/useLeads';
+import { ChartContainer, ChartTooltip, ChartTooltipContent, type ChartConfig } from '@/components/ui/chart';
+import { CartesianGrid, Line, LineChart, XAxis, YAxis } from 'recharts';
 import { 
   ArrowLeft, 
   TrendingUp, 
@@ -16,11 +18,17 @@ import {
   Activity
 } from 'lucide-react';
 
+const chartConfig = {
+  impressions: { label: 'Impressions', color: 'hsl(190 90% 45%)' },
+  clicks: { label: 'Clicks', color: 'hsl(330 80% 55%)' },
+  leads: { label: 'Leads', color: 'hsl(220 90% 55%)' },
+} satisfies ChartConfig;
+
 export default function CampaignAnalytics() {
   const { campaignId } = useParams<{ campaignId: string }>();
   const navigate = useNavigate();
   const { campaigns, loading: campaignsLoading } = useAdCampaigns();
-  const { analytics, loading: analyticsLoading } = useCampaignAnalytics(campaignId || null);
+  const { analytics, counters, series, loading: analyticsLoading } = useCampaignAnalytics(campaignId || null);
   const { leads, loading: leadsLoading } = useLeads();
 
   const campaign = campaigns.find(c => c.id === campaignId);
@@ -88,14 +96,14 @@ export default function CampaignAnalytics() {
     },
     {
       title: 'Impressions',
-      value: campaign.impressions || 0,
+      value: counters?.impressions ?? campaign.impressions ?? 0,
       icon: Eye,
       color: 'text-cyan-500',
       bgColor: 'bg-cyan-500/10'
     },
     {
       title: 'Clicks',
-      value: campaign.clicks || 0,
+      value: counters?.clicks ?? campaign.clicks ?? 0,
       icon: MousePointer,
       color: 'text-pink-500',
       bgColor: 'bg-pink-500/10'
@@ -147,6 +155,32 @@ export default function CampaignAnalytics() {
         ))}
       </div>
 
+      <Card className="mb-8">
+        <CardHeader>
+          <CardTitle>Last 30 Days</CardTitle>
+          <CardDescription>Daily impressions, clicks and leads</CardDescription>
+        </CardHeader>
+        <CardContent>
+          <ChartContainer config={chartConfig} className="h-64 w-full">
+            <LineChart data={series} margin={{ left: 8, right: 8 }}>
+              <CartesianGrid vertical={false} />
+              <XAxis
+                dataKey="bucket"
+                tickLine={false}
+                axisLine={false}
+                minTickGap={24}
+                tickFormatter={(value: string) => new Date(value).toLocaleDateString(undefined, { day: 'numeric', month: 'short' })}
+              />
+              <YAxis tickLine={false} axisLine={false} width={40} />
+              <ChartTooltip content={<ChartTooltipContent />} />
+              <Line dataKey="impressions" type="monotone" stroke="var(--color-impressions)" dot={false} />
+              <Line dataKey="clicks" type="monotone" stroke="var(--color-clicks)" dot={false} />
+              <Line dataKey="leads" type="monotone" stroke="var(--color-leads)" dot={false} />
+            </LineChart>
+          </ChartContainer>
+        </CardContent>
+      </Card>
+
       <Card>
         <CardHeader>
           <CardTitle>Recent Leads from this Campaign</CardTitle>
@@ -1,4 +1,4 @@
-import { useState, useEffect, useRef } from "react";
+import { useState, useEffect, useRef, useMemo } from "react";
 import { useNavigate } from "react-router-dom";
 
 import PropertyCard from "@/components/PropertyCard";
@@ -19,51 +19,24 @@ const Index = () => {
   const [displayedCount, setDisplayedCount] = useState(12);
   const [sortBy, setSortBy] = useState("recent");
   const navigate = useNavigate();
-  const { properties } = useProperties();
+  const filters = useMemo(() => ({
+    sortBy: sortBy as 'recent' | 'price-low' | 'price-high'
+  }), [sortBy]);
+  const { properties, hasMore, total, loadMore } = useProperties(filters);
   const { location } = useLocation();
   const loadMoreRef = useRef<HTMLDivElement>(null);
 
-  // Determine which properties to show
-  const displayProperties = properties;
-
-  // Filter properties based on location
-  const filteredProperties = displayProperties.filter(property => {
-    // Location filter
-    if (location.method && location.value) {
-      const searchValue = location.value.toLowerCase();
-      switch (location.method) {
-        case 'city':
-          return property.city?.toLowerCase().includes(searchValue);
-        case 'area':
-          return property.area?.toLowerCase().includes(searchValue);
-        case 'pincode':
-          return property.pin_code?.includes(location.value);
-        case 'live':
-          return true;
-        default:
-          return true;
-      }
-    }
-    return true;
-  });
-
-  // Sort properties
-  const sortedProperties = [...filteredProperties].sort((a, b) => {
-    if (sortBy === "price-low") {
-      return a.price - b.price;
-    }
-    if (sortBy === "price-high") {
-      return b.price - a.price;
-    }
-    return 0; // recent (default order from DB)
-  });
-  const displayedProperties = sortedProperties.slice(0, displayedCount);
+  // Location and sort are applied server-side by useProperties, page by page
+  const displayedProperties = properties.slice(0, displayedCount);
+  const totalLabel = total ? `${total.count}${total.capped ? '+' : ''}` : properties.length;
 
   // Infinite scroll observer
   useEffect(() => {
     const observer = new IntersectionObserver(entries => {
-      if (entries[0].isIntersecting && displayedCount < sortedProperties.length) {
-        setDisplayedCount(prev => Math.min(prev + 12, sortedProperties.length));
+      if (entries[0].isIntersecting && displayedCount < properties.length) {
+        setDisplayedCount(prev => Math.min(prev + 12, properties.length));
+      } else if (entries[0].isIntersecting && hasMore) {
+        loadMore();
       }
     }, {
       threshold: 0.1
@@ -72,7 +45,7 @@ const Index = () => {
       observer.observe(loadMoreRef.current);
     }
     return () => observer.disconnect();
-  }, [displayedCount, sortedProperties.length]);
+  }, [displayedCount, properties.length, hasMore, loadMore]);
   return <div className="min-h-screen bg-background overflow-x-hidden max-w-full">
     {/* Hero Section */}
     <div className="relative h-[280px] md:h-[400px] overflow-hidden">
@@ -142,7 +115,7 @@ const Index = () => {
             All Properties
           </h2>
           <span className="text-sm text-muted-foreground">
-            Showing {displayedProperties.length} of {sortedProperties.length}
+            Showing {displayedProperties.length} of {totalLabel}
           </span>
         </div>
 
@@ -150,11 +123,11 @@ const Index = () => {
           No properties found in this location
         </div> : <>
           <div className="grid grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-3 md:gap-4 max-w-full">
-            {displayedProperties.map(property => <PropertyCard key={property.id} id={property.id} image={property.images[0] || '/placeholder.svg'} title={property.title} type={propertyTypes.find(t => t.type === property.property_type)?.icon || '🏠'} propertyType={property.property_type} price={`₹${property.price.toLocaleString()}`} priceType={property.price_type} location={`${property.area}, ${property.city}`} bedrooms={property.bedrooms || undefined} bathrooms={property.bathrooms || undefined} area={property.area_sqft ? `${property.area_sqft} sq.ft` : undefined} verified={property.verified} distance={'distance_km' in property ? (property as any).distance_km : undefined} userId={property.user_id} onClick={() => navigate(`/property/${property.id}`)} />)}
+            {displayedProperties.map(property => <PropertyCard key={property.id} id={property.id} image={property.images[0] || '/placeholder.svg'} imagePlaceholder={property.image_placeholders?.[property.images[0]]} title={property.title} type={propertyTypes.find(t => t.type === property.property_type)?.icon || '🏠'} propertyType={property.property_type} price={`₹${property.price.toLocaleString()}`} priceType={property.price_type} location={`${property.area}, ${property.city}`} bedrooms={property.bedrooms || undefined} bathrooms={property.bathrooms || undefined} area={property.area_sqft ? `${property.area_sqft} sq.ft` : undefined} verified={property.verified} distance={'distance_km' in property ? (property as any).distance_km : undefined} userId={property.user_id} onClick={() => navigate(`/property/${property.id}`)} />)}
           </div>
 
           {/* Load More Trigger */}
-          {displayedCount < sortedProperties.length && <div ref={loadMoreRef} className="py-8 text-center">
+          {(displayedCount < properties.length || hasMore) && <div ref={loadMoreRef} className="py-8 text-center">
             <div className="text-muted-foreground">Loading more properties...</div>
           </div>}
         </>}
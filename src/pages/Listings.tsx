@@ -41,14 +41,13 @@ const Listings = () => {
   const [selectedType, setSelectedType] = useState("all");
   const [sortBy, setSortBy] = useState("recent");
   const [locationDialogOpen, setLocationDialogOpen] = useState(false);
-  const [displayedCount, setDisplayedCount] = useState(12);
   const filters = useMemo(() => ({
     searchQuery: searchQuery,
     propertyType: selectedType === 'all' ? undefined : selectedType,
-    sortBy: sortBy as 'recent' | 'price-low' | 'price-high'
+    sortBy: sortBy as 'recent' | 'relevance' | 'price-low' | 'price-high' | 'distance'
   }), [searchQuery, selectedType, sortBy]);
 
-  const { properties, loading } = useProperties(filters);
+  const { properties, loading, hasMore, total, loadMore } = useProperties(filters);
   const { location } = useLocation();
   const { sponsoredProperties: rawSponsoredProperties, loading: sponsoredLoading, incrementClicks, incrementImpressions } = useSponsoredProperties(location);
   const sponsoredRefs = useRef<Map<string, HTMLDivElement>>(new Map());
@@ -97,17 +96,16 @@ const Listings = () => {
   // Client-side filtering removed in favor of Server-Side Search (for scalability)
   // We strictly rely on 'properties' returned from the hook which now respects filters.
 
-  // Local pagination (slicing) just for UI rendering performance (infinite scroll)
-  // Ideally this should also be server-side, but cutting to client-side limit of 100 first.
-  const displayedProperties = properties.slice(0, displayedCount);
+  const totalLabel = total ? `${total.count}${total.capped ? '+' : ''}` : properties.length;
 
-
-  // Infinite scroll observer
+  // Infinite scroll: fetch the next server page when the trigger comes into view
   useEffect(() => {
+    if (!hasMore) return;
+
     const observer = new IntersectionObserver(
       (entries) => {
-        if (entries[0].isIntersecting && displayedCount < properties.length) {
-          setDisplayedCount(prev => Math.min(prev + 12, properties.length));
+        if (entries[0].isIntersecting) {
+          loadMore();
         }
       },
       { threshold: 0.1 }
@@ -118,12 +116,7 @@ const Listings = () => {
     }
 
     return () => observer.disconnect();
-  }, [displayedCount, properties.length]);
-
-  // Reset displayed count when filters change
-  useEffect(() => {
-    setDisplayedCount(12);
-  }, [selectedType, searchQuery, sortBy, location.value]);
+  }, [hasMore, loadMore]);
 
   return (
     <div className="min-h-screen bg-background pb-4 md:pb-0 overflow-x-hidden max-w-full">
@@ -219,14 +212,16 @@ const Listings = () => {
               </SelectTrigger>
               <SelectContent>
                 <SelectItem value="recent">Most Recent</SelectItem>
+                <SelectItem value="relevance">Best Match</SelectItem>
                 <SelectItem value="price-low">Price: Low to High</SelectItem>
                 <SelectItem value="price-high">Price: High to Low</SelectItem>
+                {location.method === 'live' && <SelectItem value="distance">Nearest First</SelectItem>}
               </SelectContent>
             </Select>
           </div>
 
           <p className="text-sm text-muted-foreground px-1">
-            {loading ? 'Loading...' : `Showing ${displayedProperties.length} of ${properties.length} properties`}
+            {loading ? 'Loading...' : `Showing ${properties.length} of ${totalLabel} properties`}
           </p>
         </div>
       </div>
@@ -268,6 +263,7 @@ const Listings = () => {
                       <PropertyCard
                         id={property.id}
                         image={property.images[0] || '/placeholder.svg'}
+                        imagePlaceholder={property.image_placeholders?.[property.images[0]]}
                         title={property.title}
                         type={propertyTypes.find(t => t.type === property.property_type)?.icon || '🏠'}
                         propertyType={property.property_type}
@@ -302,15 +298,16 @@ const Listings = () => {
           <div className="flex justify-center py-20">
             <LoadingSpinner size={40} />
           </div>
-        ) : displayedProperties.length > 0 ? (
+        ) : properties.length > 0 ? (
           <div>
             <h2 className="text-lg font-semibold mb-3">All Properties</h2>
             <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-3 md:gap-4 max-w-full">
-              {displayedProperties.map((property) => (
+              {properties.map((property) => (
                 <PropertyCard
                   key={property.id}
                   id={property.id}
                   image={property.images[0] || '/placeholder.svg'}
+                  imagePlaceholder={property.image_placeholders?.[property.images[0]]}
                   title={property.title}
                   type={propertyTypes.find(t => t.type === property.property_type)?.icon || '🏠'}
                   propertyType={property.property_type}
@@ -328,7 +325,7 @@ const Listings = () => {
             </div>
 
             {/* Load More Trigger */}
-            {displayedCount < properties.length && (
+            {hasMore && (
               <div ref={loadMoreRef} className="py-8 text-center flex justify-center">
                 <LoadingSpinner size={24} />
               </div>
@@ -33,7 +33,22 @@ const Messages = () => {
   const navigate = useNavigate();
   const [searchParams] = useSearchParams();
   const { user } = useAuth();
-  const { conversations, loading, sendMessage, markAsRead, deleteMessage, editMessage, deleteConversation } = useMessages(user?.id);
+  const {
+    conversations,
+    hasMoreConversations,
+    loadMoreConversations,
+    loading,
+    messages,
+    hasMoreMessages,
+    loadingMessages,
+    openConversation,
+    loadOlderMessages,
+    sendMessage,
+    markAsRead,
+    deleteMessage,
+    editMessage,
+    deleteConversation,
+  } = useMessages(user?.id);
   const [selectedConversation, setSelectedConversation] = useState<any>(null);
   const [messageText, setMessageText] = useState("");
   const [searchQuery, setSearchQuery] = useState("");
@@ -53,6 +68,8 @@ const Messages = () => {
     }
   };
 
+  const conversationPropertyId = messages[0]?.property_id ?? selectedConversation?.lastMessage?.property_id ?? undefined;
+
   const handleSendMessage = async () => {
     if (!messageText.trim() || !selectedConversation) return;
 
@@ -61,13 +78,13 @@ const Messages = () => {
       messageSchema.parse({
         content: messageText,
         receiver_id: selectedConversation.user.id,
-        property_id: selectedConversation.messages[0]?.property_id
+        property_id: conversationPropertyId
       });
 
       await sendMessage(
         selectedConversation.user.id,
         messageText,
-        selectedConversation.messages[0]?.property_id
+        conversationPropertyId
       );
       setMessageText("");
       setTimeout(() => scrollToBottom("auto"), 50);
@@ -110,21 +127,29 @@ const Messages = () => {
     }
   };
 
-  // Auto-scroll when messages change or conversation selected
+  // Load the thread of the selected conversation, one page at a time
+  const selectedUserId = selectedConversation?.user?.id ?? null;
   useEffect(() => {
-    if (selectedConversation) {
-      // Immediate scroll for new conversation, slight delay for new messages
-      const delay = selectedConversation.messages.length === 0 ? 50 : 100;
-      setTimeout(() => scrollToBottom("auto"), delay);
+    openConversation(selectedUserId);
+  }, [selectedUserId, openConversation]);
+
+  // Auto-scroll when a conversation is selected or a newer message arrives
+  // (not when older pages are prepended)
+  const newestMessageId = messages[messages.length - 1]?.id;
+  useEffect(() => {
+    if (selectedUserId) {
+      setTimeout(() => scrollToBottom("auto"), 100);
     }
-  }, [selectedConversation]);
+  }, [selectedUserId, newestMessageId]);
 
   // Mark messages as read when viewing conversation
+  // (the live count from the inbox, so messages arriving in the open thread clear too)
+  const selectedUnreadCount = conversations.find(c => c.user?.id === selectedUserId)?.unreadCount ?? 0;
   useEffect(() => {
-    if (selectedConversation?.user?.id && selectedConversation.unreadCount > 0) {
-      markAsRead(selectedConversation.user.id);
+    if (selectedUserId && selectedUnreadCount > 0) {
+      markAsRead(selectedUserId);
     }
-  }, [selectedConversation?.user?.id, selectedConversation?.unreadCount, markAsRead]);
+  }, [selectedUserId, selectedUnreadCount, markAsRead]);
 
   const filteredConversations = conversations.filter(
     (conv) =>
@@ -140,8 +165,16 @@ const Messages = () => {
 
       if (!targetUserId || !user || loadingNewChat) return;
 
-      // Check if conversation already exists
+      // Check if conversation already exists (it may be beyond the loaded inbox pages)
       const existingConv = conversations.find(c => c.user?.id === targetUserId);
+      const { data: existingRow } = existingConv
+        ? { data: null }
+        : await supabase
+            .from('conversations')
+            .select('peer_id')
+            .eq('user_id', user.id)
+            .eq('peer_id', targetUserId)
+            .maybeSingle();
 
       if (existingConv) {
         setSelectedConversation(existingConv);
@@ -161,14 +194,13 @@ const Messages = () => {
             // Create a new conversation object
             const newConv = {
               user: profile,
-              messages: [],
               lastMessage: null,
               unreadCount: 0
             };
             setSelectedConversation(newConv);
 
             // Send initial greeting
-            if (propertyId) {
+            if (propertyId && !existingRow) {
               await sendMessage(targetUserId, "Hi! I'm interested in your property.", propertyId);
             }
           }
@@ -261,6 +293,13 @@ const Messages = () => {
                   </div>
                 </button>
               ))}
+              {hasMoreConversations && (
+                <div className="p-4 flex justify-center">
+                  <Button variant="ghost" size="sm" onClick={loadMoreConversations}>
+                    Load more conversations
+                  </Button>
+                </div>
+              )}
             </div>
           ) : (
             <div className="flex flex-col items-center justify-center h-full text-center p-8">
@@ -313,9 +352,16 @@ const Messages = () => {
 
           {/* Messages */}
           <ScrollArea className="flex-1 p-4" ref={scrollAreaRef}>
-            {selectedConversation.messages.length > 0 ? (
+            {messages.length > 0 ? (
               <div className="space-y-4">
-                {selectedConversation.messages.map((message: any) => {
+                {hasMoreMessages && (
+                  <div className="flex justify-center">
+                    <Button variant="ghost" size="sm" onClick={loadOlderMessages} disabled={loadingMessages}>
+                      {loadingMessages ? "Loading..." : "Load earlier messages"}
+                    </Button>
+                  </div>
+                )}
+                {messages.map((message: any) => {
                   const isOwn = message.sender_id === user?.id;
                   const isEditing = editingMessageId === message.id;
 
@@ -15,7 +15,7 @@ const Profile = () => {
   const { user, signOut } = useAuth();
   const navigate = useNavigate();
   const { properties } = useMyListings(user?.id);
-  const { conversations } = useMessages(user?.id);
+  const { totalConversations } = useMessages(user?.id);
   const [profile, setProfile] = useState<{ full_name: string | null; phone: string | null } | null>(null);
   const { isAdmin } = useAdminCheck();
 
@@ -103,7 +103,7 @@ const Profile = () => {
               <div className="text-sm text-muted-foreground mt-1">Listings</div>
             </div>
             <div className="text-center">
-              <div className="text-3xl font-bold text-primary">{conversations.length}</div>
+              <div className="text-3xl font-bold text-primary">{totalConversations}</div>
               <div className="text-sm text-muted-foreground mt-1">Chats</div>
             </div>
           </div>
@@ -31,7 +31,6 @@ const PropertyCategory = () => {
     const [searchQuery, setSearchQuery] = useState("");
     const [sortBy, setSortBy] = useState("recent");
     const [locationDialogOpen, setLocationDialogOpen] = useState(false);
-    const [displayedCount, setDisplayedCount] = useState(12);
 
     // Derive the current type object for labels/icons
     const currentType = propertyTypes.find((t) => t.type === type);
@@ -39,10 +38,10 @@ const PropertyCategory = () => {
     const filters = useMemo(() => ({
         searchQuery: searchQuery,
         propertyType: type === 'all' ? undefined : type, // Handle 'all' to show everything
-        sortBy: sortBy as 'recent' | 'price-low' | 'price-high'
+        sortBy: sortBy as 'recent' | 'relevance' | 'price-low' | 'price-high' | 'distance'
     }), [searchQuery, type, sortBy]);
 
-    const { properties, loading } = useProperties(filters);
+    const { properties, loading, hasMore, total, loadMore } = useProperties(filters);
     const { location } = useLocation();
     const { sponsoredProperties: rawSponsoredProperties, loading: sponsoredLoading, incrementClicks, incrementImpressions } = useSponsoredProperties(location);
     const sponsoredRefs = useRef<Map<string, HTMLDivElement>>(new Map());
@@ -88,14 +87,16 @@ const PropertyCategory = () => {
         }
     }, []);
 
-    const displayedProperties = properties.slice(0, displayedCount);
+    const totalLabel = total ? `${total.count}${total.capped ? '+' : ''}` : properties.length;
 
-    // Infinite scroll
+    // Infinite scroll: fetch the next server page
     useEffect(() => {
+        if (!hasMore) return;
+
         const observer = new IntersectionObserver(
             (entries) => {
-                if (entries[0].isIntersecting && displayedCount < properties.length) {
-                    setDisplayedCount(prev => Math.min(prev + 12, properties.length));
+                if (entries[0].isIntersecting) {
+                    loadMore();
                 }
             },
             { threshold: 0.1 }
@@ -106,12 +107,7 @@ const PropertyCategory = () => {
         }
 
         return () => observer.disconnect();
-    }, [displayedCount, properties.length]);
-
-    // Reset count on filter change
-    useEffect(() => {
-        setDisplayedCount(12);
-    }, [type, searchQuery, sortBy, location.value]);
+    }, [hasMore, loadMore]);
 
     if (!currentType && type !== 'all') {
         // Fallback for invalid types? Or let it show empty.
@@ -172,8 +168,10 @@ const PropertyCategory = () => {
                             </SelectTrigger>
                             <SelectContent>
                                 <SelectItem value="recent">Most Recent</SelectItem>
+                                <SelectItem value="relevance">Best Match</SelectItem>
                                 <SelectItem value="price-low">Price: Low to High</SelectItem>
                                 <SelectItem value="price-high">Price: High to Low</SelectItem>
+                                {location.method === 'live' && <SelectItem value="distance">Nearest First</SelectItem>}
                             </SelectContent>
                         </Select>
                     </div>
@@ -181,7 +179,7 @@ const PropertyCategory = () => {
                     <LocationSelector open={locationDialogOpen} onOpenChange={setLocationDialogOpen} />
 
                     <p className="text-sm text-muted-foreground px-1">
-                        {loading ? 'Loading...' : `Showing ${displayedProperties.length} of ${properties.length} ${currentType?.label || 'properties'}`}
+                        {loading ? 'Loading...' : `Showing ${properties.length} of ${totalLabel} ${currentType?.label || 'properties'}`}
                     </p>
                 </div>
             </div>
@@ -249,6 +247,7 @@ const PropertyCategory = () => {
                                             <PropertyCard
                                                 id={property.id}
                                                 image={property.images[0] || '/placeholder.svg'}
+                                                imagePlaceholder={property.image_placeholders?.[property.images[0]]}
                                                 title={property.title}
                                                 type={propertyTypes.find(t => t.type === property.property_type)?.icon || '🏠'}
                                                 propertyType={property.property_type}
@@ -283,14 +282,15 @@ const PropertyCategory = () => {
                     <div className="flex justify-center py-20">
                         <LoadingSpinner size={40} />
                     </div>
-                ) : displayedProperties.length > 0 ? (
+                ) : properties.length > 0 ? (
                     <div>
                         <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-3 md:gap-4 max-w-full">
-                            {displayedProperties.map((property) => (
+                            {properties.map((property) => (
                                 <PropertyCard
                                     key={property.id}
                                     id={property.id}
                                     image={property.images[0] || '/placeholder.svg'}
+                                    imagePlaceholder={property.image_placeholders?.[property.images[0]]}
                                     title={property.title}
                                     type={propertyTypes.find(t => t.type === property.property_type)?.icon || '🏠'}
                                     propertyType={property.property_type}
@@ -308,7 +308,7 @@ const PropertyCategory = () => {
                         </div>
 
                         {/* Load More Trigger */}
-                        {displayedCount < properties.length && (
+                        {hasMore && (
                             <div ref={loadMoreRef} className="py-8 text-center flex justify-center">
                                 <LoadingSpinner size={24} />
                             </div>
@@ -8,6 +8,21 @@ export interface Profile {
   updated_at: string;
 }
 
+// Variants services/image_variants rendered for a photo; the URLs follow from the photo's own
+export interface ImageVariants {
+  formats: ('webp' | 'avif')[];
+  widths: Record<'thumbnail' | 'medium' | 'large', number>; // actual widths, never above the original's
+}
+
+// Stored per image URL in properties.image_placeholders (services/image_placeholders and
+// services/image_variants); either part may be missing until its job reaches the photo
+export interface ImagePlaceholder {
+  lqip?: string; // ~16px WebP data URI
+  color?: string; // dominant colour, #rrggbb
+  aspect_ratio?: number;
+  variants?: ImageVariants;
+}
+
 export interface Property {
   id: string;
   user_id: string;
@@ -28,6 +43,7 @@ export interface Property {
   bathrooms: number | null;
   area_sqft: number | null;
   images: string[];
+  image_placeholders?: Record<string, ImagePlaceholder>;
   amenities: string[];
   business_metadata?: any;
   // Status
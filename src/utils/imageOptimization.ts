@@ -3,6 +3,8 @@
  * Handles image compression, WebP conversion, and upload optimization
  */
 
+import type { ImageVariants } from '@/types/database';
+
 export interface CompressedImage {
   file: File;
   dataUrl: string;
@@ -163,6 +165,66 @@ export const getSupabaseImageUrl = (
   return `${baseUrl}?${params.toString()}`;
 };
 
+const LISTING_IMAGES_PATH = '/storage/v1/object/public/property-images/';
+
+// Best first: browsers take the first <source> whose type they support
+const VARIANT_FORMATS = ['avif', 'webp'] as const;
+
+/**
+ * Bucket root and object key of a listing image original, or null for
+ * anything that is not an original in that bucket
+ */
+const parseListingImage = (src: string): { root: string; key: string } | null => {
+  const at = src.indexOf(LISTING_IMAGES_PATH);
+  if (at === -1) return null;
+
+  const root = src.slice(0, at + LISTING_IMAGES_PATH.length);
+  const key = src.slice(root.length).split(/[?#]/)[0];
+  if (!key || key.startsWith('variants/')) return null;
+  return { root, key };
+};
+
+/**
+ * Variants of a photo in one format, narrowest first, one per distinct width.
+ * services/image_variants writes them at variants/<key>/<size>.<format>; the
+ * sizes and widths come from the listing row, so nothing is fetched to find them.
+ */
+const variantUrls = (src: string, variants: ImageVariants | undefined, format: 'webp' | 'avif') => {
+  const image = parseListingImage(src);
+  if (!image || !variants?.formats.includes(format)) return [];
+  const byWidth = new Map<number, string>();
+  (Object.entries(variants.widths) as [string, number][])
+    .sort(([, a], [, b]) => a - b)
+    .forEach(([name, width]) => {
+      if (!byWidth.has(width)) byWidth.set(width, `${image.root}variants/${image.key}/${name}.${format}`);
+    });
+  return Array.from(byWidth, ([width, url]) => ({ width, url }));
+};
+
+/**
+ * URL of the narrowest WebP variant at least `width` pixels wide (the widest
+ * one when none is), or null when the photo has no variants yet
+ */
+export const getImageVariantUrl = (src: string, variants: ImageVariants | undefined, width: number): string | null => {
+  const available = variantUrls(src, variants, 'webp');
+  return (available.find((v) => v.width >= width) ?? available[available.length - 1])?.url ?? null;
+};
+
+/**
+ * <source> entries for a <picture>, AVIF first, with each variant's actual
+ * width; empty when the photo has no variants yet
+ */
+export const getImageVariantSources = (
+  src: string,
+  variants: ImageVariants | undefined
+): { type: string; srcSet: string }[] =>
+  VARIANT_FORMATS.map((format) => ({
+    type: `image/${format}`,
+    srcSet: variantUrls(src, variants, format)
+      .map((v) => `${v.url} ${v.width}w`)
+      .join(', '),
+  })).filter((source) => source.srcSet);
+
 /**
  * Preload critical images
  */
@@ -0,0 +1,114 @@
+-- Migration: Nearest-first search backed by the GIST index
+-- Description: search_properties_nearby computed the haversine distance for every
+-- active listing and sorted the whole set. It now walks the geography GIST index
+-- in distance order (KNN `<->`), pruned by ST_DWithin, so a page costs roughly the
+-- same at 10k or 5M listings. Pages are keyset-paginated on (distance_m, id).
+
+-- Two overloads (float and numeric) with identical argument names made the RPC
+-- ambiguous for PostgREST; replace both with a single definition.
+DROP FUNCTION IF EXISTS public.search_properties_nearby(double precision, double precision, double precision, integer);
+DROP FUNCTION IF EXISTS public.search_properties_nearby(numeric, numeric, numeric, integer);
+
+-- KNN scans only visit rows in the index, so index just the listings the search
+-- can return instead of filtering inactive ones out after the fact.
+CREATE INDEX IF NOT EXISTS idx_properties_location_active_gist
+  ON public.properties USING GIST (location)
+  WHERE status = 'active' AND available = true;
+
+-- Superseded by the GIST index; the btree on (latitude, longitude) cannot serve
+-- distance ordering or radius checks.
+DROP INDEX IF EXISTS public.idx_properties_location_active;
+
+CREATE FUNCTION public.search_properties_nearby(
+  user_lat double precision,
+  user_lng double precision,
+  radius_km double precision DEFAULT 5,
+  limit_count integer DEFAULT 50,
+  property_type_filter text DEFAULT NULL,
+  after_distance_m double precision DEFAULT NULL,
+  after_id uuid DEFAULT NULL
+)
+RETURNS TABLE (
+  id uuid,
+  title text,
+  description text,
+  property_type text,
+  price numeric,
+  price_type text,
+  city text,
+  area text,
+  pin_code text,
+  images text[],
+  amenities text[],
+  latitude numeric,
+  longitude numeric,
+  bedrooms integer,
+  bathrooms integer,
+  area_sqft numeric,
+  status text,
+  verified boolean,
+  available boolean,
+  user_id uuid,
+  created_at timestamptz,
+  distance_km numeric,
+  distance_m double precision
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  origin geography := ST_SetSRID(ST_MakePoint(user_lng, user_lat), 4326)::geography;
+  -- Cap the work per call at 100 rows within 100 km (useNearbyProperties asks for 100).
+  radius_m double precision := least(greatest(coalesce(radius_km, 5), 0), 100) * 1000;
+  page_limit integer := least(greatest(coalesce(limit_count, 50), 1), 100);
+BEGIN
+  RETURN QUERY
+  SELECT
+    p.id,
+    p.title,
+    p.description,
+    p.property_type,
+    p.price,
+    p.price_type,
+    p.city,
+    p.area,
+    p.pin_code,
+    p.images,
+    p.amenities,
+    p.latitude,
+    p.longitude,
+    p.bedrooms,
+    p.bathrooms,
+    p.area_sqft::numeric,
+    p.status,
+    p.verified,
+    p.available,
+    p.user_id,
+    p.created_at,
+    round(((p.location <-> origin) / 1000)::numeric, 2) AS distance_km,
+    p.location <-> origin AS distance_m
+  FROM properties p
+  WHERE
+    p.status = 'active'
+    AND p.available = true
+    AND p.location IS NOT NULL
+    -- Radius pruning: an index condition on the same GIST index that orders the scan.
+    AND ST_DWithin(p.location, origin, radius_m, false)
+    AND (property_type_filter IS NULL OR p.property_type = property_type_filter)
+    -- Keyset cursor: the last (distance_m, id) of the previous page.
+    AND (
+      after_distance_m IS NULL
+      OR (p.location <-> origin) > after_distance_m
+      OR ((p.location <-> origin) = after_distance_m AND p.id > after_id)
+    )
+  ORDER BY p.location <-> origin, p.id
+  LIMIT page_limit;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.search_properties_nearby(double precision, double precision, double precision, integer, text, double precision, uuid) TO authenticated, anon;
+
+COMMENT ON FUNCTION public.search_properties_nearby(double precision, double precision, double precision, integer, text, double precision, uuid) IS
+  'Nearest-first listings within radius_km of (user_lat, user_lng), using a KNN scan of idx_properties_location_active_gist. Pass the last row''s distance_m and id as after_distance_m/after_id for the next page.';
@@ -0,0 +1,252 @@
+-- Migration: Keyset (cursor) pagination for listing search
+-- Description: search_properties pages with OFFSET and adds COUNT(*) OVER() to every
+-- row, so each page (the first included) materialises and sorts the whole match set.
+-- search_properties_page instead seeks past an opaque cursor on an index that already
+-- matches the sort order, so every page costs the same. Totals come from a separate,
+-- capped search_properties_count that the client fetches once per filter set.
+
+-- 1. Cursor encoding, shared by paginated RPCs.
+-- Cursors are base64 JSON, opaque to the client; callers validate the fields they need.
+CREATE OR REPLACE FUNCTION public.encode_cursor(payload jsonb)
+RETURNS text
+LANGUAGE sql
+IMMUTABLE
+SET search_path = public
+AS $$
+  SELECT translate(encode(convert_to(payload::text, 'UTF8'), 'base64'), E'\n', '');
+$$;
+
+CREATE OR REPLACE FUNCTION public.decode_cursor(token text)
+RETURNS jsonb
+LANGUAGE plpgsql
+IMMUTABLE
+SET search_path = public
+AS $$
+BEGIN
+  RETURN convert_from(decode(token, 'base64'), 'UTF8')::jsonb;
+EXCEPTION WHEN others THEN
+  RAISE EXCEPTION 'Invalid pagination cursor' USING ERRCODE = '22023';
+END;
+$$;
+
+-- 2. Indexes in sort order, limited to the rows search can return.
+CREATE INDEX IF NOT EXISTS idx_properties_active_recent
+  ON public.properties (created_at DESC, id DESC)
+  WHERE status = 'active' AND available = true;
+CREATE INDEX IF NOT EXISTS idx_properties_active_price
+  ON public.properties (price, id)
+  WHERE status = 'active' AND available = true;
+CREATE INDEX IF NOT EXISTS idx_properties_active_type_recent
+  ON public.properties (property_type, created_at DESC, id DESC)
+  WHERE status = 'active' AND available = true;
+CREATE INDEX IF NOT EXISTS idx_properties_active_type_price
+  ON public.properties (property_type, price, id)
+  WHERE status = 'active' AND available = true;
+-- City and area match anywhere in the name ("bangalore" finds "Bangalore Urban"),
+-- which only a trigram index can serve.
+CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public;
+CREATE INDEX IF NOT EXISTS idx_properties_active_city_trgm
+  ON public.properties USING GIN (city gin_trgm_ops)
+  WHERE status = 'active' AND available = true;
+CREATE INDEX IF NOT EXISTS idx_properties_active_area_trgm
+  ON public.properties USING GIN (area gin_trgm_ops)
+  WHERE status = 'active' AND available = true;
+
+-- 3. Shared filter. Plain SQL without SECURITY DEFINER or SET so the planner inlines it
+-- into the callers below and sees the filters, ORDER BY and LIMIT as one query.
+-- Not callable from the API: it runs with the caller's rights.
+CREATE OR REPLACE FUNCTION public.search_properties_matches(
+  query_text text,
+  category_filter text,
+  city_filter text,
+  area_filter text,
+  pincode_filter text,
+  min_price numeric,
+  max_price numeric
+)
+RETURNS TABLE (
+  id uuid,
+  title text,
+  description text,
+  price numeric,
+  price_type text,
+  property_type text,
+  status text,
+  available boolean,
+  images text[],
+  bedrooms integer,
+  bathrooms integer,
+  area_sqft numeric,
+  address text,
+  city text,
+  area text,
+  pin_code text,
+  latitude numeric,
+  longitude numeric,
+  amenities text[],
+  user_id uuid,
+  created_at timestamptz,
+  updated_at timestamptz,
+  views integer,
+  verified boolean,
+  featured boolean
+)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT
+    p.id, p.title, p.description, p.price, p.price_type, p.property_type, p.status, p.available,
+    p.images, p.bedrooms, p.bathrooms, p.area_sqft::numeric, p.address, p.city, p.area, p.pin_code,
+    p.latitude, p.longitude, p.amenities, p.user_id, p.created_at, p.updated_at, p.views,
+    p.verified, p.featured
+  FROM public.properties p
+  WHERE
+    p.status = 'active'
+    AND p.available = true
+    AND (nullif(trim(query_text), '') IS NULL OR p.fts @@ websearch_to_tsquery('english', query_text))
+    AND (category_filter IS NULL OR p.property_type = category_filter)
+    AND (city_filter IS NULL OR p.city ILIKE '%' || city_filter || '%')
+    AND (area_filter IS NULL OR p.area ILIKE '%' || area_filter || '%')
+    -- A full 6-digit PIN matches exactly; a shorter one matches as a prefix.
+    AND (pincode_filter IS NULL OR p.pin_code LIKE pincode_filter || '%')
+    AND (min_price IS NULL OR p.price >= min_price)
+    AND (max_price IS NULL OR p.price <= max_price)
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.search_properties_matches(text, text, text, text, text, numeric, numeric) FROM PUBLIC, anon, authenticated;
+
+-- 4. One page of results after `after_cursor` (NULL for the first page).
+-- Each row carries the cursor that continues after it; pass the last row's cursor
+-- to get the next page. A page shorter than page_size is the last one.
+CREATE OR REPLACE FUNCTION public.search_properties_page(
+  query_text text DEFAULT NULL,
+  category_filter text DEFAULT NULL,
+  city_filter text DEFAULT NULL,
+  area_filter text DEFAULT NULL,
+  pincode_filter text DEFAULT NULL,
+  min_price numeric DEFAULT NULL,
+  max_price numeric DEFAULT NULL,
+  sort_by text DEFAULT 'recent',
+  after_cursor text DEFAULT NULL,
+  page_size integer DEFAULT 24
+)
+RETURNS TABLE (
+  id uuid,
+  title text,
+  description text,
+  price numeric,
+  price_type text,
+  property_type text,
+  status text,
+  available boolean,
+  images text[],
+  bedrooms integer,
+  bathrooms integer,
+  area_sqft numeric,
+  address text,
+  city text,
+  area text,
+  pin_code text,
+  latitude numeric,
+  longitude numeric,
+  amenities text[],
+  user_id uuid,
+  created_at timestamptz,
+  updated_at timestamptz,
+  views integer,
+  verified boolean,
+  featured boolean,
+  cursor text
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+-- Plan each call with its actual arguments so the `x IS NULL OR ...` filters fold
+-- away and the matching index is chosen; a cached generic plan cannot do either.
+SET plan_cache_mode = force_custom_plan
+AS $$
+DECLARE
+  page_limit integer := least(greatest(coalesce(page_size, 24), 1), 100);
+  sort_key text := coalesce(sort_by, 'recent');
+  after_key jsonb;
+  after_id uuid;
+BEGIN
+  IF sort_key NOT IN ('recent', 'price-low', 'price-high') THEN
+    RAISE EXCEPTION 'Unknown sort_by %', sort_by USING ERRCODE = '22023';
+  END IF;
+
+  IF after_cursor IS NOT NULL THEN
+    after_key := public.decode_cursor(after_cursor);
+    IF after_key->>'sort' IS DISTINCT FROM sort_key OR after_key->>'id' IS NULL THEN
+      RAISE EXCEPTION 'Cursor does not belong to this search' USING ERRCODE = '22023';
+    END IF;
+    after_id := (after_key->>'id')::uuid;
+  END IF;
+
+  IF sort_key = 'recent' THEN
+    RETURN QUERY
+    SELECT m.*, public.encode_cursor(jsonb_build_object('sort', sort_key, 'at', m.created_at, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price) m
+    WHERE after_key IS NULL OR (m.created_at, m.id) < ((after_key->>'at')::timestamptz, after_id)
+    ORDER BY m.created_at DESC, m.id DESC
+    LIMIT page_limit;
+  ELSIF sort_key = 'price-low' THEN
+    RETURN QUERY
+    SELECT m.*, public.encode_cursor(jsonb_build_object('sort', sort_key, 'price', m.price, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price) m
+    WHERE after_key IS NULL OR (m.price, m.id) > ((after_key->>'price')::numeric, after_id)
+    ORDER BY m.price ASC, m.id ASC
+    LIMIT page_limit;
+  ELSE
+    RETURN QUERY
+    SELECT m.*, public.encode_cursor(jsonb_build_object('sort', sort_key, 'price', m.price, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price) m
+    WHERE after_key IS NULL OR (m.price, m.id) < ((after_key->>'price')::numeric, after_id)
+    ORDER BY m.price DESC, m.id DESC
+    LIMIT page_limit;
+  END IF;
+END;
+$$;
+
+-- 5. Total for a filter set, counted up to count_cap + 1 rows so a broad search
+-- stays cheap. capped = true means "more than total_count" (show "1000+").
+CREATE OR REPLACE FUNCTION public.search_properties_count(
+  query_text text DEFAULT NULL,
+  category_filter text DEFAULT NULL,
+  city_filter text DEFAULT NULL,
+  area_filter text DEFAULT NULL,
+  pincode_filter text DEFAULT NULL,
+  min_price numeric DEFAULT NULL,
+  max_price numeric DEFAULT NULL,
+  count_cap integer DEFAULT 1000
+)
+RETURNS TABLE (total_count bigint, capped boolean)
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+SET plan_cache_mode = force_custom_plan
+AS $$
+DECLARE
+  cap integer := least(greatest(coalesce(count_cap, 1000), 1), 10000);
+  matched bigint;
+BEGIN
+  SELECT count(*) INTO matched
+  FROM (
+    SELECT 1
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price)
+    LIMIT cap + 1
+  ) limited;
+
+  RETURN QUERY SELECT least(matched, cap::bigint), matched > cap;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.search_properties_page(text, text, text, text, text, numeric, numeric, text, text, integer) TO authenticated, anon;
+GRANT EXECUTE ON FUNCTION public.search_properties_count(text, text, text, text, text, numeric, numeric, integer) TO authenticated, anon;
+
+COMMENT ON FUNCTION public.search_properties_page(text, text, text, text, text, numeric, numeric, text, text, integer) IS
+  'Cursor-paginated listing search. sort_by: recent | price-low | price-high. Pass the last row''s cursor as after_cursor for the next page.';
+COMMENT ON FUNCTION public.search_properties_count(text, text, text, text, text, numeric, numeric, integer) IS
+  'Number of listings matching the search_properties_page filters, counted up to count_cap.';
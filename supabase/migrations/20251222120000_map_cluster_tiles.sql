@@ -0,0 +1,287 @@
+-- Migration: Precomputed cluster tiles for the map
+-- Description: get_map_clusters grouped every active listing in the viewport on each pan
+-- and returned every id (array_agg), so the zoomed-out India view scanned and shipped the
+-- whole table. Clusters now come from a tile pyramid kept current by triggers: a pan reads
+-- only the tiles in view. property_ids is capped at the 16 listings nearest each cluster's
+-- centre, read from the location GIST index rather than stored in the tiles.
+--
+-- Tiles are square cells of 360 / 2^(zoom + 2) degrees, about 64px at that zoom,
+-- stored for zooms 3-13 (MapView switches to individual markers above 13). Each tile has
+-- a row for all categories (category = '') and one per property_type.
+
+-- 1. Tile table
+CREATE TABLE IF NOT EXISTS public.map_cluster_tiles (
+  zoom smallint NOT NULL,
+  category text NOT NULL,
+  tile_x integer NOT NULL,
+  tile_y integer NOT NULL,
+  property_count integer NOT NULL,
+  -- Sums rather than averages so changes can be applied as deltas (numeric: no drift)
+  lat_sum numeric NOT NULL,
+  lng_sum numeric NOT NULL,
+  -- Over listings with a price only, so unpriced ones do not pull avg_price down
+  price_sum numeric NOT NULL,
+  price_count integer NOT NULL,
+  PRIMARY KEY (zoom, category, tile_x, tile_y)
+);
+
+-- Only read and written through the SECURITY DEFINER functions below.
+ALTER TABLE public.map_cluster_tiles ENABLE ROW LEVEL SECURITY;
+
+-- 2. Applying changes
+-- `changes` rows are listings entering (sign +1) or leaving (-1) the map. Changes are
+-- aggregated per tile first, so a bulk import costs one upsert per touched tile.
+CREATE OR REPLACE FUNCTION public.map_cluster_deltas(changes jsonb)
+RETURNS TABLE (
+  zoom smallint,
+  category text,
+  tile_x integer,
+  tile_y integer,
+  property_count integer,
+  lat_sum numeric,
+  lng_sum numeric,
+  price_sum numeric,
+  price_count integer
+)
+LANGUAGE sql
+IMMUTABLE
+SET search_path = public
+AS $$
+  SELECT
+    z.zoom::smallint,
+    cat.category,
+    floor((c.longitude + 180) / (360.0 / (4 << z.zoom)))::integer,
+    floor((c.latitude + 90) / (360.0 / (4 << z.zoom)))::integer,
+    sum(c.sign)::integer,
+    sum(c.sign * c.latitude),
+    sum(c.sign * c.longitude),
+    coalesce(sum(c.sign * c.price), 0),
+    coalesce(sum(c.sign) FILTER (WHERE c.price IS NOT NULL), 0)::integer
+  FROM jsonb_to_recordset(changes) AS c(id uuid, latitude numeric, longitude numeric, property_type text, price numeric, sign integer)
+  -- Keep in step with refresh_map_cluster_tiles and get_map_clusters
+  CROSS JOIN generate_series(3, 13) AS z(zoom)
+  CROSS JOIN LATERAL (
+    SELECT ''::text
+    UNION
+    SELECT c.property_type WHERE coalesce(c.property_type, '') <> ''
+  ) AS cat(category)
+  GROUP BY 1, 2, 3, 4;
+$$;
+
+CREATE OR REPLACE FUNCTION public.apply_map_cluster_changes(changes jsonb)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  INSERT INTO public.map_cluster_tiles AS t
+    (zoom, category, tile_x, tile_y, property_count, lat_sum, lng_sum, price_sum, price_count)
+  SELECT d.zoom, d.category, d.tile_x, d.tile_y, d.property_count, d.lat_sum, d.lng_sum, d.price_sum, d.price_count
+  FROM public.map_cluster_deltas(changes) d
+  -- Fixed lock order: concurrent writers touching the same tiles cannot deadlock.
+  ORDER BY d.zoom, d.category, d.tile_x, d.tile_y
+  ON CONFLICT (zoom, category, tile_x, tile_y) DO UPDATE SET
+    property_count = t.property_count + EXCLUDED.property_count,
+    lat_sum = t.lat_sum + EXCLUDED.lat_sum,
+    lng_sum = t.lng_sum + EXCLUDED.lng_sum,
+    price_sum = t.price_sum + EXCLUDED.price_sum,
+    price_count = t.price_count + EXCLUDED.price_count;
+
+  -- Tiles whose last listing left
+  DELETE FROM public.map_cluster_tiles t
+  USING public.map_cluster_deltas(changes) d
+  WHERE d.property_count < 0
+    AND (t.zoom, t.category, t.tile_x, t.tile_y) = (d.zoom, d.category, d.tile_x, d.tile_y)
+    AND t.property_count <= 0;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.map_cluster_deltas(jsonb) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.apply_map_cluster_changes(jsonb) FROM PUBLIC, anon, authenticated;
+
+-- 3. Triggers: statement-level with transition tables, one per event
+-- (transition tables cannot be combined with multiple events or column lists).
+CREATE OR REPLACE FUNCTION public.sync_map_cluster_tiles()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  changes jsonb;
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    SELECT jsonb_agg(jsonb_build_object(
+      'id', n.id, 'latitude', n.latitude, 'longitude', n.longitude,
+      'property_type', n.property_type, 'price', n.price, 'sign', 1))
+    INTO changes
+    FROM new_rows n
+    WHERE n.status = 'active' AND n.available AND n.latitude IS NOT NULL AND n.longitude IS NOT NULL;
+  ELSIF TG_OP = 'DELETE' THEN
+    SELECT jsonb_agg(jsonb_build_object(
+      'id', o.id, 'latitude', o.latitude, 'longitude', o.longitude,
+      'property_type', o.property_type, 'price', o.price, 'sign', -1))
+    INTO changes
+    FROM old_rows o
+    WHERE o.status = 'active' AND o.available AND o.latitude IS NOT NULL AND o.longitude IS NOT NULL;
+  ELSE
+    -- Listings that entered, left, moved or were repriced leave their old tiles and
+    -- enter the new ones (a repriced listing nets to a price-only change, and gaining
+    -- or losing a price moves price_count too). views/updated_at bumps are skipped.
+    WITH moved AS (
+      SELECT n.id
+      FROM new_rows n
+      JOIN old_rows o ON o.id = n.id
+      WHERE (n.status, n.available, n.latitude, n.longitude, n.property_type, n.price)
+        IS DISTINCT FROM (o.status, o.available, o.latitude, o.longitude, o.property_type, o.price)
+    )
+    SELECT jsonb_agg(change)
+    INTO changes
+    FROM (
+      SELECT jsonb_build_object(
+        'id', o.id, 'latitude', o.latitude, 'longitude', o.longitude,
+        'property_type', o.property_type, 'price', o.price, 'sign', -1) AS change
+      FROM old_rows o JOIN moved USING (id)
+      WHERE o.status = 'active' AND o.available AND o.latitude IS NOT NULL AND o.longitude IS NOT NULL
+      UNION ALL
+      SELECT jsonb_build_object(
+        'id', n.id, 'latitude', n.latitude, 'longitude', n.longitude,
+        'property_type', n.property_type, 'price', n.price, 'sign', 1)
+      FROM new_rows n JOIN moved USING (id)
+      WHERE n.status = 'active' AND n.available AND n.latitude IS NOT NULL AND n.longitude IS NOT NULL
+    ) c;
+  END IF;
+
+  IF changes IS NOT NULL THEN
+    PERFORM public.apply_map_cluster_changes(changes);
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_map_cluster_tiles_insert ON public.properties;
+CREATE TRIGGER trg_map_cluster_tiles_insert
+AFTER INSERT ON public.properties
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION public.sync_map_cluster_tiles();
+
+DROP TRIGGER IF EXISTS trg_map_cluster_tiles_update ON public.properties;
+CREATE TRIGGER trg_map_cluster_tiles_update
+AFTER UPDATE ON public.properties
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION public.sync_map_cluster_tiles();
+
+DROP TRIGGER IF EXISTS trg_map_cluster_tiles_delete ON public.properties;
+CREATE TRIGGER trg_map_cluster_tiles_delete
+AFTER DELETE ON public.properties
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION public.sync_map_cluster_tiles();
+
+-- 4. Full rebuild: initial backfill, and to repair the tiles should they ever drift.
+-- Blocks writes to properties while it runs.
+CREATE OR REPLACE FUNCTION public.refresh_map_cluster_tiles()
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  LOCK TABLE public.properties IN SHARE MODE;
+  DELETE FROM public.map_cluster_tiles;
+
+  INSERT INTO public.map_cluster_tiles
+    (zoom, category, tile_x, tile_y, property_count, lat_sum, lng_sum, price_sum, price_count)
+  SELECT
+    z.zoom,
+    cat.category,
+    floor((p.longitude + 180) / (360.0 / (4 << z.zoom)))::integer,
+    floor((p.latitude + 90) / (360.0 / (4 << z.zoom)))::integer,
+    count(*),
+    sum(p.latitude),
+    sum(p.longitude),
+    coalesce(sum(p.price), 0),
+    count(p.price)
+  FROM public.properties p
+  CROSS JOIN generate_series(3, 13) AS z(zoom)
+  CROSS JOIN LATERAL (
+    SELECT ''::text
+    UNION
+    SELECT p.property_type WHERE coalesce(p.property_type, '') <> ''
+  ) AS cat(category)
+  WHERE p.status = 'active' AND p.available AND p.latitude IS NOT NULL AND p.longitude IS NOT NULL
+  GROUP BY 1, 2, 3, 4;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.refresh_map_cluster_tiles() FROM PUBLIC, anon, authenticated;
+
+SELECT public.refresh_map_cluster_tiles();
+
+-- 5. Serve clusters from the tiles in view (same signature as before; dropped first
+-- because the result columns change). property_ids holds a sample: the ids nearest the
+-- cluster's centre, found by a KNN walk of the GIST index that stops after sample_cap
+-- rows, so a cluster of a million listings costs the same as one of twenty.
+DROP FUNCTION IF EXISTS public.get_map_clusters(numeric, numeric, numeric, numeric, integer, text);
+
+CREATE FUNCTION public.get_map_clusters(
+  min_lat numeric,
+  max_lat numeric,
+  min_lng numeric,
+  max_lng numeric,
+  zoom_level integer DEFAULT 10,
+  category_filter text DEFAULT NULL
+)
+RETURNS TABLE (
+  cluster_lat numeric,
+  cluster_lng numeric,
+  property_count bigint,
+  avg_price numeric,
+  property_ids uuid[]
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  z integer := least(greatest(coalesce(zoom_level, 10), 3), 13);
+  cell numeric := 360.0 / (4 << z);
+  sample_cap constant integer := 16;
+BEGIN
+  RETURN QUERY
+  SELECT
+    t.lat_sum / nullif(t.property_count, 0),
+    t.lng_sum / nullif(t.property_count, 0),
+    t.property_count::bigint,
+    round(t.price_sum / nullif(t.price_count, 0), 2),
+    ARRAY(
+      SELECT p.id
+      FROM public.properties p
+      WHERE p.status = 'active' AND p.available = true
+        -- Index condition: the tile padded by half a cell, since geography box edges are
+        -- great circles; the exact tile test below drops the padding.
+        AND p.location && ST_MakeEnvelope(
+          greatest((t.tile_x - 0.5) * cell - 180, -180), greatest((t.tile_y - 0.5) * cell - 90, -90),
+          least((t.tile_x + 1.5) * cell - 180, 180), least((t.tile_y + 1.5) * cell - 90, 90),
+          4326
+        )::geography
+        AND floor((p.longitude + 180) / cell) = t.tile_x
+        AND floor((p.latitude + 90) / cell) = t.tile_y
+        AND (coalesce(category_filter, '') = '' OR p.property_type = category_filter)
+      ORDER BY p.location <-> ST_SetSRID(
+        ST_MakePoint(t.lng_sum / t.property_count, t.lat_sum / t.property_count), 4326
+      )::geography
+      LIMIT sample_cap
+    )
+  FROM public.map_cluster_tiles t
+  WHERE t.zoom = z
+    AND t.property_count > 0
+    AND t.category = coalesce(category_filter, '')
+    AND t.tile_x BETWEEN floor((min_lng + 180) / cell) AND floor((max_lng + 180) / cell)
+    AND t.tile_y BETWEEN floor((min_lat + 90) / cell) AND floor((max_lat + 90) / cell);
+END;
+$$;
+
+COMMENT ON FUNCTION public.get_map_clusters(numeric, numeric, numeric, numeric, integer, text) IS
+  'Map clusters for the viewport from map_cluster_tiles.';
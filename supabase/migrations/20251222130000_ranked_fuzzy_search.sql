@@ -0,0 +1,381 @@
+-- Migration: Ranked, typo-tolerant keyword search
+-- Description: Keyword search matched whole stemmed words only (websearch_to_tsquery on
+-- the fts column), so "mumbay", "apartm" or "koramangla" returned nothing, and the
+-- paginated search could not order by relevance. This adds:
+--   * search_text, a generated lower-case "title area city" column with a trigram GIN
+--     index, for misspellings (word similarity);
+--   * search_tsquery(), which turns input into prefix terms so partly typed words match;
+--   * search_score(), one relevance score (FTS rank + trigram similarity) used for
+--     both search_properties and search_properties_page (new 'relevance' sort).
+-- Both fts and search_text are generated columns, so Postgres keeps them current on
+-- every insert/update without a trigger to maintain.
+
+-- 1. Trigram column and index (adding the stored column rewrites properties once)
+CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public;
+
+ALTER TABLE public.properties ADD COLUMN IF NOT EXISTS search_text text
+GENERATED ALWAYS AS (
+  lower(coalesce(title, '') || ' ' || coalesce(area, '') || ' ' || coalesce(city, ''))
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_properties_search_text_trgm
+  ON public.properties USING GIN (search_text gin_trgm_ops);
+
+-- 2. Query helpers
+-- "2bhk apartm bandra" -> '2bhk':* & 'apartm':* & 'bandra':*
+CREATE OR REPLACE FUNCTION public.search_tsquery(query_text text)
+RETURNS tsquery
+LANGUAGE sql
+IMMUTABLE
+SET search_path = public
+AS $$
+  SELECT to_tsquery('english', string_agg(word || ':*', ' & '))
+  FROM regexp_split_to_table(lower(coalesce(query_text, '')), '[^[:alnum:]]+') AS word
+  WHERE word <> '';
+$$;
+
+CREATE OR REPLACE FUNCTION public.search_score(fts tsvector, search_text text, query_text text)
+RETURNS double precision
+LANGUAGE sql
+IMMUTABLE
+SET search_path = public
+AS $$
+  SELECT coalesce(ts_rank(fts, public.search_tsquery(query_text)), 0)::double precision
+       + word_similarity(lower(query_text), search_text)::double precision;
+$$;
+
+-- 3. Shared filter for the paginated search, now with a relevance column
+-- (0 without a query). Dropped first because the result columns change; the
+-- plpgsql callers are recreated below.
+DROP FUNCTION IF EXISTS public.search_properties_matches(text, text, text, text, text, numeric, numeric);
+
+CREATE FUNCTION public.search_properties_matches(
+  query_text text,
+  category_filter text,
+  city_filter text,
+  area_filter text,
+  pincode_filter text,
+  min_price numeric,
+  max_price numeric
+)
+RETURNS TABLE (
+  id uuid,
+  title text,
+  description text,
+  price numeric,
+  price_type text,
+  property_type text,
+  status text,
+  available boolean,
+  images text[],
+  bedrooms integer,
+  bathrooms integer,
+  area_sqft numeric,
+  address text,
+  city text,
+  area text,
+  pin_code text,
+  latitude numeric,
+  longitude numeric,
+  amenities text[],
+  user_id uuid,
+  created_at timestamptz,
+  updated_at timestamptz,
+  views integer,
+  verified boolean,
+  featured boolean,
+  relevance_score double precision
+)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT
+    p.id, p.title, p.description, p.price, p.price_type, p.property_type, p.status, p.available,
+    p.images, p.bedrooms, p.bathrooms, p.area_sqft::numeric, p.address, p.city, p.area, p.pin_code,
+    p.latitude, p.longitude, p.amenities, p.user_id, p.created_at, p.updated_at, p.views,
+    p.verified, p.featured,
+    CASE WHEN nullif(trim(query_text), '') IS NULL THEN 0
+         ELSE public.search_score(p.fts, p.search_text, query_text) END
+  FROM public.properties p
+  WHERE
+    p.status = 'active'
+    AND p.available = true
+    -- Word/prefix match on the fts GIN index, or a close spelling on the trigram index
+    AND (
+      nullif(trim(query_text), '') IS NULL
+      OR p.fts @@ public.search_tsquery(query_text)
+      OR lower(query_text) <% p.search_text
+    )
+    AND (category_filter IS NULL OR p.property_type = category_filter)
+    AND (city_filter IS NULL OR p.city ILIKE '%' || city_filter || '%')
+    AND (area_filter IS NULL OR p.area ILIKE '%' || area_filter || '%')
+    -- A full 6-digit PIN matches exactly; a shorter one matches as a prefix.
+    AND (pincode_filter IS NULL OR p.pin_code LIKE pincode_filter || '%')
+    AND (min_price IS NULL OR p.price >= min_price)
+    AND (max_price IS NULL OR p.price <= max_price)
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.search_properties_matches(text, text, text, text, text, numeric, numeric) FROM PUBLIC, anon, authenticated;
+
+-- 4. Paginated search with a 'relevance' sort (score, id). Without a query every
+-- score is 0, so 'relevance' falls back to 'recent'.
+DROP FUNCTION IF EXISTS public.search_properties_page(text, text, text, text, text, numeric, numeric, text, text, integer);
+
+CREATE FUNCTION public.search_properties_page(
+  query_text text DEFAULT NULL,
+  category_filter text DEFAULT NULL,
+  city_filter text DEFAULT NULL,
+  area_filter text DEFAULT NULL,
+  pincode_filter text DEFAULT NULL,
+  min_price numeric DEFAULT NULL,
+  max_price numeric DEFAULT NULL,
+  sort_by text DEFAULT 'recent',
+  after_cursor text DEFAULT NULL,
+  page_size integer DEFAULT 24
+)
+RETURNS TABLE (
+  id uuid,
+  title text,
+  description text,
+  price numeric,
+  price_type text,
+  property_type text,
+  status text,
+  available boolean,
+  images text[],
+  bedrooms integer,
+  bathrooms integer,
+  area_sqft numeric,
+  address text,
+  city text,
+  area text,
+  pin_code text,
+  latitude numeric,
+  longitude numeric,
+  amenities text[],
+  user_id uuid,
+  created_at timestamptz,
+  updated_at timestamptz,
+  views integer,
+  verified boolean,
+  featured boolean,
+  relevance_score double precision,
+  cursor text
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+-- Plan each call with its actual arguments so the `x IS NULL OR ...` filters fold
+-- away and the matching index is chosen; a cached generic plan cannot do either.
+SET plan_cache_mode = force_custom_plan
+-- One-letter typos in short words ("mumbay") score about 0.55; the default is 0.6.
+SET pg_trgm.word_similarity_threshold = 0.5
+AS $$
+DECLARE
+  page_limit integer := least(greatest(coalesce(page_size, 24), 1), 100);
+  sort_key text := coalesce(sort_by, 'recent');
+  after_key jsonb;
+  after_id uuid;
+BEGIN
+  IF sort_key NOT IN ('recent', 'relevance', 'price-low', 'price-high') THEN
+    RAISE EXCEPTION 'Unknown sort_by %', sort_by USING ERRCODE = '22023';
+  END IF;
+  IF sort_key = 'relevance' AND nullif(trim(query_text), '') IS NULL THEN
+    sort_key := 'recent';
+  END IF;
+
+  IF after_cursor IS NOT NULL THEN
+    after_key := public.decode_cursor(after_cursor);
+    IF after_key->>'sort' IS DISTINCT FROM sort_key OR after_key->>'id' IS NULL THEN
+      RAISE EXCEPTION 'Cursor does not belong to this search' USING ERRCODE = '22023';
+    END IF;
+    after_id := (after_key->>'id')::uuid;
+  END IF;
+
+  IF sort_key = 'recent' THEN
+    RETURN QUERY
+    SELECT m.*, public.encode_cursor(jsonb_build_object('sort', sort_key, 'at', m.created_at, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price) m
+    WHERE after_key IS NULL OR (m.created_at, m.id) < ((after_key->>'at')::timestamptz, after_id)
+    ORDER BY m.created_at DESC, m.id DESC
+    LIMIT page_limit;
+  ELSIF sort_key = 'relevance' THEN
+    -- Scores are computed for every match, but there is no OFFSET to re-read.
+    RETURN QUERY
+    SELECT m.*, public.encode_cursor(jsonb_build_object('sort', sort_key, 'score', m.relevance_score, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price) m
+    WHERE after_key IS NULL OR (m.relevance_score, m.id) < ((after_key->>'score')::double precision, after_id)
+    ORDER BY m.relevance_score DESC, m.id DESC
+    LIMIT page_limit;
+  ELSIF sort_key = 'price-low' THEN
+    RETURN QUERY
+    SELECT m.*, public.encode_cursor(jsonb_build_object('sort', sort_key, 'price', m.price, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price) m
+    WHERE after_key IS NULL OR (m.price, m.id) > ((after_key->>'price')::numeric, after_id)
+    ORDER BY m.price ASC, m.id ASC
+    LIMIT page_limit;
+  ELSE
+    RETURN QUERY
+    SELECT m.*, public.encode_cursor(jsonb_build_object('sort', sort_key, 'price', m.price, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price) m
+    WHERE after_key IS NULL OR (m.price, m.id) < ((after_key->>'price')::numeric, after_id)
+    ORDER BY m.price DESC, m.id DESC
+    LIMIT page_limit;
+  END IF;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.search_properties_page(text, text, text, text, text, numeric, numeric, text, text, integer) TO authenticated, anon;
+
+COMMENT ON FUNCTION public.search_properties_page(text, text, text, text, text, numeric, numeric, text, text, integer) IS
+  'Cursor-paginated listing search. sort_by: recent | relevance | price-low | price-high. Pass the last row''s cursor as after_cursor for the next page.';
+
+-- Counts must use the same similarity threshold as the pages.
+ALTER FUNCTION public.search_properties_count(text, text, text, text, text, numeric, numeric, integer)
+  SET pg_trgm.word_similarity_threshold = 0.5;
+
+-- 5. search_properties: same matching and score (signature and columns unchanged)
+CREATE OR REPLACE FUNCTION public.search_properties(
+  query_text text DEFAULT NULL,
+  category_filter text DEFAULT NULL,
+  city_filter text DEFAULT NULL,
+  area_filter text DEFAULT NULL,
+  pincode_filter text DEFAULT NULL,
+  min_price numeric DEFAULT NULL,
+  max_price numeric DEFAULT NULL,
+  user_lat numeric DEFAULT NULL,
+  user_lng numeric DEFAULT NULL,
+  radius_km numeric DEFAULT NULL,
+  page_number integer DEFAULT 1,
+  page_size integer DEFAULT 20
+)
+RETURNS TABLE (
+  id uuid,
+  title text,
+  description text,
+  price numeric,
+  price_type text,
+  property_type text,
+  status text,
+  available boolean,
+  images text[],
+  bedrooms integer,
+  bathrooms integer,
+  area_sqft numeric,
+  address text,
+  city text,
+  area text,
+  pin_code text,
+  latitude numeric,
+  longitude numeric,
+  amenities text[],
+  user_id uuid,
+  created_at timestamptz,
+  updated_at timestamptz,
+  views integer,
+  verified boolean,
+  featured boolean,
+  distance_km numeric,
+  relevance_score numeric,
+  total_count bigint
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+SET pg_trgm.word_similarity_threshold = 0.5
+AS $$
+DECLARE
+  offset_val integer;
+  search_query text;
+BEGIN
+  offset_val := (page_number - 1) * page_size;
+  search_query := nullif(trim(query_text), '');
+
+  RETURN QUERY
+  SELECT
+    p.id,
+    p.title,
+    p.description,
+    p.price,
+    p.price_type,
+    p.property_type,
+    p.status,
+    p.available,
+    p.images,
+    p.bedrooms,
+    p.bathrooms,
+    p.area_sqft,
+    p.address,
+    p.city,
+    p.area,
+    p.pin_code,
+    p.latitude,
+    p.longitude,
+    p.amenities,
+    p.user_id,
+    p.created_at,
+    p.updated_at,
+    p.views,
+    p.verified,
+    p.featured,
+    -- Calculate distance if user location is provided
+    CASE
+      WHEN user_lat IS NOT NULL AND user_lng IS NOT NULL AND p.location IS NOT NULL THEN
+        ROUND((ST_Distance(
+          p.location,
+          ST_SetSRID(ST_MakePoint(user_lng, user_lat), 4326)::geography
+        ) / 1000)::numeric, 2)
+      ELSE NULL
+    END as distance_km,
+    -- Relevance score (FTS rank + spelling similarity if query provided, else 0)
+    CASE
+      WHEN search_query IS NOT NULL THEN public.search_score(p.fts, p.search_text, search_query)::numeric
+      ELSE 0.0
+    END as relevance_score,
+    COUNT(*) OVER() as total_count
+  FROM properties p
+  WHERE
+    p.status = 'active'
+    AND p.available = true
+    -- Text Filter (FTS prefix match, or a close spelling via trigrams)
+    AND (
+      search_query IS NULL
+      OR p.fts @@ public.search_tsquery(search_query)
+      OR lower(search_query) <% p.search_text
+    )
+    -- Other Filters
+    AND (category_filter IS NULL OR p.property_type = category_filter)
+    AND (city_filter IS NULL OR p.city ILIKE city_filter)
+    AND (area_filter IS NULL OR p.area ILIKE area_filter)
+    AND (pincode_filter IS NULL OR p.pin_code = pincode_filter)
+    AND (min_price IS NULL OR p.price >= min_price)
+    AND (max_price IS NULL OR p.price <= max_price)
+    -- Geo Filter (PostGIS)
+    AND (
+      radius_km IS NULL OR user_lat IS NULL OR user_lng IS NULL OR
+      (
+        p.location IS NOT NULL AND
+        ST_DWithin(
+          p.location,
+          ST_SetSRID(ST_MakePoint(user_lng, user_lat), 4326)::geography,
+          radius_km * 1000
+        )
+      )
+    )
+  ORDER BY
+    -- Sort by relevance if searching text
+    CASE WHEN search_query IS NOT NULL THEN public.search_score(p.fts, p.search_text, search_query) ELSE 0 END DESC,
+    -- Then by featured/verified
+    p.featured DESC,
+    p.verified DESC,
+    -- Then distance if location provided
+    CASE WHEN user_lat IS NOT NULL AND user_lng IS NOT NULL THEN
+       ST_Distance(p.location, ST_SetSRID(ST_MakePoint(user_lng, user_lat), 4326)::geography)
+    ELSE 0 END ASC,
+    -- Finally recency
+    p.created_at DESC
+  LIMIT page_size
+  OFFSET offset_val;
+END;
+$$;
@@ -0,0 +1,79 @@
+-- Migration: Change notifications for the autocomplete service
+-- Description: services/autocomplete keeps cities, areas, pincodes and search_suggestions
+-- in memory and answers typeahead without querying Postgres. These triggers tell it
+-- what changed on channel 'autocomplete_changes':
+--   * search_suggestions: one message per row with the new/old row, applied in place
+--     (so a search_count bump re-ranks without a reload);
+--   * cities, areas, pincodes: one message per statement; the service reloads.
+-- NOTIFY is transactional, so listeners only see committed changes.
+
+-- 1. Per-row messages for search_suggestions
+CREATE OR REPLACE FUNCTION public.notify_search_suggestion_change()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  new_row jsonb;
+  old_row jsonb;
+BEGIN
+  IF TG_OP <> 'DELETE' THEN
+    new_row := jsonb_build_object(
+      'id', NEW.id, 'type', NEW.type, 'label', NEW.label, 'city_id', NEW.city_id, 'area_id', NEW.area_id,
+      'pincode', NEW.pincode, 'latitude', NEW.latitude, 'longitude', NEW.longitude, 'search_count', NEW.search_count
+    );
+  END IF;
+  IF TG_OP <> 'INSERT' THEN
+    old_row := jsonb_build_object('id', OLD.id, 'type', OLD.type, 'label', OLD.label);
+  END IF;
+
+  PERFORM pg_notify(
+    'autocomplete_changes',
+    jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'new', new_row, 'old', old_row)::text
+  );
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS notify_search_suggestion_change ON public.search_suggestions;
+CREATE TRIGGER notify_search_suggestion_change
+  AFTER INSERT OR DELETE OR UPDATE OF type, label, city_id, area_id, pincode, latitude, longitude, search_count
+  ON public.search_suggestions
+  FOR EACH ROW EXECUTE FUNCTION public.notify_search_suggestion_change();
+
+-- 2. Per-statement messages for the location tables
+CREATE OR REPLACE FUNCTION public.notify_location_change()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  PERFORM pg_notify('autocomplete_changes', jsonb_build_object('table', TG_TABLE_NAME)::text);
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS notify_location_change ON public.cities;
+CREATE TRIGGER notify_location_change
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.cities
+  FOR EACH STATEMENT EXECUTE FUNCTION public.notify_location_change();
+
+DROP TRIGGER IF EXISTS notify_location_change ON public.areas;
+CREATE TRIGGER notify_location_change
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.areas
+  FOR EACH STATEMENT EXECUTE FUNCTION public.notify_location_change();
+
+DROP TRIGGER IF EXISTS notify_location_change ON public.pincodes;
+CREATE TRIGGER notify_location_change
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.pincodes
+  FOR EACH STATEMENT EXECUTE FUNCTION public.notify_location_change();
+
+REVOKE EXECUTE ON FUNCTION public.notify_search_suggestion_change() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.notify_location_change() FROM PUBLIC, anon, authenticated;
+
+COMMENT ON FUNCTION public.notify_search_suggestion_change() IS
+  'Sends search_suggestions row changes to the autocomplete service (channel autocomplete_changes).';
+COMMENT ON FUNCTION public.notify_location_change() IS
+  'Tells the autocomplete service to reload after cities/areas/pincodes change.';
@@ -0,0 +1,169 @@
+-- Migration: Batched campaign impression and click counters
+-- Description: increment_campaign_impressions/clicks updated ad_campaigns once per event,
+-- so every sponsored card shown took the row lock of its campaign, popular campaigns
+-- serialised their viewers on it, and each bump fanned out as an ad_campaigns realtime
+-- change. Events are now appended to ad_campaign_event_queue (no lock on ad_campaigns)
+-- and folded into ad_campaigns as one UPDATE per campaign: by pg_cron every minute
+-- where the extension is installed, by the next ingest once the queue is 5 seconds
+-- old, and by get_campaign_counters, which also adds anything still queued so owners
+-- see exact totals.
+
+-- 1. Append-only queue of counter deltas. No foreign key: the FK check would take a
+-- KEY SHARE lock on the campaign row for every event, which is the lock we are avoiding.
+CREATE TABLE IF NOT EXISTS public.ad_campaign_event_queue (
+  id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  campaign_id uuid NOT NULL,
+  impressions integer NOT NULL DEFAULT 0 CHECK (impressions >= 0),
+  clicks integer NOT NULL DEFAULT 0 CHECK (clicks >= 0),
+  created_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_ad_campaign_event_queue_campaign
+  ON public.ad_campaign_event_queue (campaign_id);
+
+-- Written and read only through the functions below.
+ALTER TABLE public.ad_campaign_event_queue ENABLE ROW LEVEL SECURITY;
+
+-- 2. Fold queued events into ad_campaigns. One flusher at a time (the advisory lock);
+-- callers that find it taken return immediately. Events inserted while the DELETE runs
+-- are outside its snapshot and stay queued for the next flush.
+CREATE OR REPLACE FUNCTION public.flush_campaign_counters()
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  flushed integer;
+BEGIN
+  IF NOT pg_try_advisory_xact_lock(hashtext('flush_campaign_counters')) THEN
+    RETURN 0;
+  END IF;
+
+  WITH drained AS (
+    DELETE FROM ad_campaign_event_queue
+    RETURNING campaign_id, impressions, clicks
+  ),
+  totals AS (
+    SELECT campaign_id, sum(impressions) AS impressions, sum(clicks) AS clicks
+    FROM drained
+    GROUP BY campaign_id
+  )
+  UPDATE ad_campaigns a
+  SET impressions = a.impressions + t.impressions,
+      clicks = a.clicks + t.clicks
+  FROM totals t
+  WHERE a.id = t.campaign_id;
+
+  GET DIAGNOSTICS flushed = ROW_COUNT;
+  RETURN flushed;
+END;
+$$;
+
+-- 3. Bulk ingest: events = [{"campaign_id": ..., "impressions": n, "clicks": n}, ...],
+-- already summed per campaign by the client. Counts per entry are capped so one call
+-- cannot inflate a campaign. Flushes when the oldest queued event is over 5 seconds old.
+CREATE OR REPLACE FUNCTION public.record_campaign_events(events jsonb)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  oldest timestamptz;
+BEGIN
+  IF jsonb_typeof(events) IS DISTINCT FROM 'array' THEN
+    RAISE EXCEPTION 'events must be a JSON array' USING ERRCODE = '22023';
+  END IF;
+
+  INSERT INTO ad_campaign_event_queue (campaign_id, impressions, clicks)
+  SELECT e.campaign_id, least(greatest(coalesce(e.impressions, 0), 0), 100), least(greatest(coalesce(e.clicks, 0), 0), 100)
+  FROM jsonb_to_recordset(events) AS e(campaign_id uuid, impressions integer, clicks integer)
+  WHERE e.campaign_id IS NOT NULL
+    AND (coalesce(e.impressions, 0) > 0 OR coalesce(e.clicks, 0) > 0)
+    AND EXISTS (SELECT 1 FROM ad_campaigns a WHERE a.id = e.campaign_id)
+  LIMIT 200;
+
+  SELECT q.created_at INTO oldest FROM ad_campaign_event_queue q ORDER BY q.id LIMIT 1;
+  IF oldest < now() - interval '5 seconds' THEN
+    PERFORM flush_campaign_counters();
+  END IF;
+END;
+$$;
+
+-- 4. The single-event RPCs keep their signatures for older app builds.
+CREATE OR REPLACE FUNCTION public.increment_campaign_impressions(campaign_id uuid)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  PERFORM record_campaign_events(jsonb_build_array(jsonb_build_object('campaign_id', campaign_id, 'impressions', 1)));
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.increment_campaign_clicks(campaign_id uuid)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  PERFORM record_campaign_events(jsonb_build_array(jsonb_build_object('campaign_id', campaign_id, 'clicks', 1)));
+END;
+$$;
+
+-- 5. Live totals for the owner (or an admin): flushed counts plus queued events.
+-- Folds the queue first, so a campaign nobody is viewing still has its counts moved
+-- into ad_campaigns when its owner looks; events queued meanwhile are added on top.
+CREATE OR REPLACE FUNCTION public.get_campaign_counters(campaign_ids uuid[])
+RETURNS TABLE (campaign_id uuid, impressions bigint, clicks bigint)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  PERFORM flush_campaign_counters();
+
+  RETURN QUERY
+  SELECT
+    a.id,
+    a.impressions + coalesce(q.impressions, 0),
+    a.clicks + coalesce(q.clicks, 0)
+  FROM ad_campaigns a
+  LEFT JOIN (
+    SELECT eq.campaign_id, sum(eq.impressions) AS impressions, sum(eq.clicks) AS clicks
+    FROM ad_campaign_event_queue eq
+    WHERE eq.campaign_id = ANY (campaign_ids)
+    GROUP BY eq.campaign_id
+  ) q ON q.campaign_id = a.id
+  WHERE a.id = ANY (campaign_ids)
+    AND (a.user_id = auth.uid() OR has_role(auth.uid(), 'admin'::app_role));
+END;
+$$;
+
+-- 6. Fold on a schedule too, so the queue drains when traffic stops. pg_cron is
+-- optional (enable it under Database > Extensions); without it the ingest and the
+-- counters read above are the only flushers.
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+    PERFORM cron.schedule('flush-campaign-counters', '* * * * *', 'SELECT public.flush_campaign_counters()');
+  END IF;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.flush_campaign_counters() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.flush_campaign_counters() TO service_role;
+GRANT EXECUTE ON FUNCTION public.record_campaign_events(jsonb) TO authenticated, anon;
+GRANT EXECUTE ON FUNCTION public.get_campaign_counters(uuid[]) TO authenticated;
+
+COMMENT ON TABLE public.ad_campaign_event_queue IS
+  'Impression/click deltas waiting to be folded into ad_campaigns by flush_campaign_counters().';
+COMMENT ON FUNCTION public.record_campaign_events(jsonb) IS
+  'Queue impression/click counts for campaigns: [{"campaign_id", "impressions", "clicks"}]. Replaces per-event increments.';
+COMMENT ON FUNCTION public.flush_campaign_counters() IS
+  'Adds queued campaign events to ad_campaigns, one UPDATE per campaign. Returns the number of campaigns updated.';
+COMMENT ON FUNCTION public.get_campaign_counters(uuid[]) IS
+  'Impressions and clicks including events not yet flushed, for campaigns the caller owns (or any, for admins).';
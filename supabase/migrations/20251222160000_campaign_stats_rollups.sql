@@ -0,0 +1,338 @@
+-- Migration: Hourly and daily campaign analytics rollups
+-- Description: Campaign analytics only had lifetime counters on ad_campaigns and raw lead
+-- rows, so any time series meant re-aggregating history on every dashboard load. This
+-- keeps per-campaign hourly and daily rollups of impressions, clicks, leads and spend,
+-- updated as events arrive:
+--   * impressions/clicks when flush_campaign_counters() drains the event queue;
+--   * leads by a trigger on leads;
+--   * spend by a trigger on ad_campaigns.spent.
+-- get_campaign_stats() serves any range from the rollups, so its cost depends on the
+-- number of buckets, not on event volume. Buckets follow India time (Asia/Kolkata),
+-- so a day is an IST calendar day and the hourly buckets add up to it exactly.
+-- services/campaign_rollups backfills history and drops old hourly rows.
+
+-- 1. Rollup tables
+CREATE TABLE IF NOT EXISTS public.ad_campaign_stats_hourly (
+  campaign_id uuid NOT NULL REFERENCES public.ad_campaigns(id) ON DELETE CASCADE,
+  bucket timestamptz NOT NULL, -- start of the IST hour
+  impressions bigint NOT NULL DEFAULT 0,
+  clicks bigint NOT NULL DEFAULT 0,
+  leads integer NOT NULL DEFAULT 0,
+  paid_leads integer NOT NULL DEFAULT 0,
+  spend numeric NOT NULL DEFAULT 0,
+  PRIMARY KEY (campaign_id, bucket)
+);
+
+CREATE TABLE IF NOT EXISTS public.ad_campaign_stats_daily (
+  campaign_id uuid NOT NULL REFERENCES public.ad_campaigns(id) ON DELETE CASCADE,
+  day date NOT NULL, -- IST calendar day
+  impressions bigint NOT NULL DEFAULT 0,
+  clicks bigint NOT NULL DEFAULT 0,
+  leads integer NOT NULL DEFAULT 0,
+  paid_leads integer NOT NULL DEFAULT 0,
+  spend numeric NOT NULL DEFAULT 0,
+  PRIMARY KEY (campaign_id, day)
+);
+
+-- For compaction, which deletes old hourly rows across campaigns.
+CREATE INDEX IF NOT EXISTS idx_ad_campaign_stats_hourly_bucket ON public.ad_campaign_stats_hourly (bucket);
+
+-- Read through get_campaign_stats() only.
+ALTER TABLE public.ad_campaign_stats_hourly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.ad_campaign_stats_daily ENABLE ROW LEVEL SECURITY;
+
+-- 2. Add deltas to both rollups for one campaign at one moment.
+CREATE OR REPLACE FUNCTION public.bump_campaign_stats(
+  p_campaign_id uuid,
+  occurred_at timestamptz,
+  impressions bigint DEFAULT 0,
+  clicks bigint DEFAULT 0,
+  leads integer DEFAULT 0,
+  paid_leads integer DEFAULT 0,
+  spend numeric DEFAULT 0
+)
+RETURNS void
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  INSERT INTO ad_campaign_stats_hourly AS s (campaign_id, bucket, impressions, clicks, leads, paid_leads, spend)
+  VALUES (p_campaign_id, date_trunc('hour', occurred_at, 'Asia/Kolkata'), impressions, clicks, leads, paid_leads, spend)
+  ON CONFLICT (campaign_id, bucket) DO UPDATE
+  SET impressions = s.impressions + EXCLUDED.impressions,
+      clicks = s.clicks + EXCLUDED.clicks,
+      leads = s.leads + EXCLUDED.leads,
+      paid_leads = s.paid_leads + EXCLUDED.paid_leads,
+      spend = s.spend + EXCLUDED.spend;
+
+  INSERT INTO ad_campaign_stats_daily AS s (campaign_id, day, impressions, clicks, leads, paid_leads, spend)
+  VALUES (p_campaign_id, (occurred_at AT TIME ZONE 'Asia/Kolkata')::date, impressions, clicks, leads, paid_leads, spend)
+  ON CONFLICT (campaign_id, day) DO UPDATE
+  SET impressions = s.impressions + EXCLUDED.impressions,
+      clicks = s.clicks + EXCLUDED.clicks,
+      leads = s.leads + EXCLUDED.leads,
+      paid_leads = s.paid_leads + EXCLUDED.paid_leads,
+      spend = s.spend + EXCLUDED.spend;
+$$;
+
+-- 3. Impressions/clicks: the counter flush now also writes the rollups, in the hour
+-- each event was queued. Same statement, so the rollups and ad_campaigns move together.
+CREATE OR REPLACE FUNCTION public.flush_campaign_counters()
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  flushed integer;
+BEGIN
+  IF NOT pg_try_advisory_xact_lock(hashtext('flush_campaign_counters')) THEN
+    RETURN 0;
+  END IF;
+
+  WITH drained AS (
+    DELETE FROM ad_campaign_event_queue
+    RETURNING campaign_id, impressions, clicks, created_at
+  ),
+  hourly AS (
+    SELECT d.campaign_id, date_trunc('hour', d.created_at, 'Asia/Kolkata') AS bucket,
+           sum(d.impressions) AS impressions, sum(d.clicks) AS clicks
+    FROM drained d
+    WHERE EXISTS (SELECT 1 FROM ad_campaigns a WHERE a.id = d.campaign_id)
+    GROUP BY 1, 2
+  ),
+  to_hourly AS (
+    INSERT INTO ad_campaign_stats_hourly AS s (campaign_id, bucket, impressions, clicks)
+    SELECT campaign_id, bucket, impressions, clicks FROM hourly ORDER BY 1, 2
+    ON CONFLICT (campaign_id, bucket) DO UPDATE
+    SET impressions = s.impressions + EXCLUDED.impressions,
+        clicks = s.clicks + EXCLUDED.clicks
+  ),
+  to_daily AS (
+    INSERT INTO ad_campaign_stats_daily AS s (campaign_id, day, impressions, clicks)
+    SELECT campaign_id, (bucket AT TIME ZONE 'Asia/Kolkata')::date, sum(impressions), sum(clicks)
+    FROM hourly
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    ON CONFLICT (campaign_id, day) DO UPDATE
+    SET impressions = s.impressions + EXCLUDED.impressions,
+        clicks = s.clicks + EXCLUDED.clicks
+  )
+  UPDATE ad_campaigns a
+  SET impressions = a.impressions + t.impressions,
+      clicks = a.clicks + t.clicks
+  FROM (
+    SELECT campaign_id, sum(impressions) AS impressions, sum(clicks) AS clicks
+    FROM hourly
+    GROUP BY campaign_id
+  ) t
+  WHERE a.id = t.campaign_id;
+
+  GET DIAGNOSTICS flushed = ROW_COUNT;
+  RETURN flushed;
+END;
+$$;
+
+-- 4. Leads, counted in the hour the lead was created.
+CREATE OR REPLACE FUNCTION public.track_campaign_lead_stats()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.campaign_id IS NOT NULL
+     AND EXISTS (SELECT 1 FROM ad_campaigns WHERE id = OLD.campaign_id) THEN
+    PERFORM bump_campaign_stats(
+      OLD.campaign_id, OLD.created_at,
+      leads => -1, paid_leads => CASE WHEN OLD.lead_type = 'paid' THEN -1 ELSE 0 END
+    );
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.campaign_id IS NOT NULL THEN
+    PERFORM bump_campaign_stats(
+      NEW.campaign_id, NEW.created_at,
+      leads => 1, paid_leads => CASE WHEN NEW.lead_type = 'paid' THEN 1 ELSE 0 END
+    );
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS leads_campaign_stats_trigger ON public.leads;
+CREATE TRIGGER leads_campaign_stats_trigger
+  AFTER INSERT OR DELETE OR UPDATE OF campaign_id, lead_type ON public.leads
+  FOR EACH ROW EXECUTE FUNCTION public.track_campaign_lead_stats();
+
+-- 5. Spend, as the change in ad_campaigns.spent when it happens.
+CREATE OR REPLACE FUNCTION public.track_campaign_spend_stats()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  PERFORM bump_campaign_stats(NEW.id, now(), spend => NEW.spent - OLD.spent);
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS ad_campaigns_spend_stats_trigger ON public.ad_campaigns;
+CREATE TRIGGER ad_campaigns_spend_stats_trigger
+  AFTER UPDATE OF spent ON public.ad_campaigns
+  FOR EACH ROW
+  WHEN (NEW.spent IS DISTINCT FROM OLD.spent)
+  EXECUTE FUNCTION public.track_campaign_spend_stats();
+
+-- 6. Backfill for one campaign (run by services/campaign_rollups, campaign by campaign).
+-- Leads are recounted from the leads table. Impressions, clicks and spend counted
+-- before rollups existed have no timestamps, so whatever the rollups do not already
+-- account for is booked at the campaign's start.
+CREATE OR REPLACE FUNCTION public.backfill_campaign_stats(p_campaign_id uuid)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  campaign ad_campaigns%ROWTYPE;
+  rolled record;
+BEGIN
+  -- Keep counter flushes out while the totals are compared.
+  PERFORM pg_advisory_xact_lock(hashtext('flush_campaign_counters'));
+  SELECT * INTO campaign FROM ad_campaigns WHERE id = p_campaign_id FOR UPDATE;
+  IF NOT FOUND THEN
+    RETURN;
+  END IF;
+
+  UPDATE ad_campaign_stats_hourly SET leads = 0, paid_leads = 0 WHERE campaign_id = p_campaign_id;
+  UPDATE ad_campaign_stats_daily SET leads = 0, paid_leads = 0 WHERE campaign_id = p_campaign_id;
+  PERFORM bump_campaign_stats(
+    p_campaign_id, l.bucket, leads => l.leads::integer, paid_leads => l.paid_leads::integer
+  )
+  FROM (
+    SELECT date_trunc('hour', created_at, 'Asia/Kolkata') AS bucket,
+           count(*) AS leads,
+           count(*) FILTER (WHERE lead_type = 'paid') AS paid_leads
+    FROM leads
+    WHERE campaign_id = p_campaign_id
+    GROUP BY 1
+    ORDER BY 1
+  ) l;
+
+  SELECT coalesce(sum(impressions), 0) AS impressions, coalesce(sum(clicks), 0) AS clicks, coalesce(sum(spend), 0) AS spend
+  INTO rolled
+  FROM ad_campaign_stats_daily
+  WHERE campaign_id = p_campaign_id;
+
+  IF campaign.impressions > rolled.impressions OR campaign.clicks > rolled.clicks OR campaign.spent <> rolled.spend THEN
+    PERFORM bump_campaign_stats(
+      p_campaign_id, campaign.start_date,
+      impressions => greatest(campaign.impressions - rolled.impressions, 0),
+      clicks => greatest(campaign.clicks - rolled.clicks, 0),
+      spend => campaign.spent - rolled.spend
+    );
+  END IF;
+END;
+$$;
+
+-- 7. Range query. One row per bucket in [from_ts, to_ts), zero-filled.
+-- granularity 'hour' covers at most 31 days and only as far back as the hourly rows
+-- are kept (see services/campaign_rollups); 'day' covers up to 10 years.
+CREATE OR REPLACE FUNCTION public.get_campaign_stats(
+  p_campaign_id uuid,
+  from_ts timestamptz,
+  to_ts timestamptz DEFAULT now(),
+  granularity text DEFAULT 'day'
+)
+RETURNS TABLE (
+  bucket timestamptz,
+  impressions bigint,
+  clicks bigint,
+  leads bigint,
+  paid_leads bigint,
+  spend numeric
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  IF granularity NOT IN ('hour', 'day') THEN
+    RAISE EXCEPTION 'Unknown granularity %', granularity USING ERRCODE = '22023';
+  END IF;
+  IF from_ts IS NULL OR to_ts IS NULL OR to_ts <= from_ts
+     OR to_ts - from_ts > CASE granularity WHEN 'hour' THEN interval '31 days' ELSE interval '3660 days' END THEN
+    RAISE EXCEPTION 'Invalid range for granularity %', granularity USING ERRCODE = '22023';
+  END IF;
+  IF NOT EXISTS (
+    SELECT 1 FROM ad_campaigns a
+    WHERE a.id = p_campaign_id
+      AND (a.user_id = auth.uid() OR has_role(auth.uid(), 'admin'::app_role))
+  ) THEN
+    RETURN;
+  END IF;
+
+  IF granularity = 'hour' THEN
+    RETURN QUERY
+    SELECT b.bucket, coalesce(s.impressions, 0), coalesce(s.clicks, 0),
+           coalesce(s.leads, 0)::bigint, coalesce(s.paid_leads, 0)::bigint, coalesce(s.spend, 0)
+    FROM generate_series(date_trunc('hour', from_ts, 'Asia/Kolkata'), to_ts - interval '1 microsecond', interval '1 hour') AS b(bucket)
+    LEFT JOIN ad_campaign_stats_hourly s ON s.campaign_id = p_campaign_id AND s.bucket = b.bucket
+    ORDER BY b.bucket;
+  ELSE
+    RETURN QUERY
+    SELECT d.day AT TIME ZONE 'Asia/Kolkata', coalesce(s.impressions, 0), coalesce(s.clicks, 0),
+           coalesce(s.leads, 0)::bigint, coalesce(s.paid_leads, 0)::bigint, coalesce(s.spend, 0)
+    FROM generate_series(
+      (from_ts AT TIME ZONE 'Asia/Kolkata')::date::timestamp,
+      ((to_ts - interval '1 microsecond') AT TIME ZONE 'Asia/Kolkata')::date::timestamp,
+      interval '1 day'
+    ) AS d(day)
+    LEFT JOIN ad_campaign_stats_daily s ON s.campaign_id = p_campaign_id AND s.day = d.day::date
+    ORDER BY 1;
+  END IF;
+END;
+$$;
+
+-- 8. Compaction: drop hourly rows older than `before`, a batch at a time so the job
+-- never holds many row locks. The daily rollups keep those days.
+CREATE OR REPLACE FUNCTION public.compact_campaign_stats(before timestamptz, batch_size integer DEFAULT 10000)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  deleted integer;
+BEGIN
+  DELETE FROM ad_campaign_stats_hourly h
+  WHERE (h.campaign_id, h.bucket) IN (
+    SELECT campaign_id, bucket FROM ad_campaign_stats_hourly
+    WHERE bucket < before
+    LIMIT batch_size
+  );
+  GET DIAGNOSTICS deleted = ROW_COUNT;
+  RETURN deleted;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.bump_campaign_stats(uuid, timestamptz, bigint, bigint, integer, integer, numeric) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.track_campaign_lead_stats() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.track_campaign_spend_stats() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.backfill_campaign_stats(uuid) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.compact_campaign_stats(timestamptz, integer) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.backfill_campaign_stats(uuid) TO service_role;
+GRANT EXECUTE ON FUNCTION public.compact_campaign_stats(timestamptz, integer) TO service_role;
+GRANT EXECUTE ON FUNCTION public.get_campaign_stats(uuid, timestamptz, timestamptz, text) TO authenticated;
+
+COMMENT ON TABLE public.ad_campaign_stats_hourly IS
+  'Per-campaign impressions, clicks, leads and spend per IST hour. Old hours are compacted away; see ad_campaign_stats_daily.';
+COMMENT ON TABLE public.ad_campaign_stats_daily IS
+  'Per-campaign impressions, clicks, leads and spend per IST day.';
+COMMENT ON FUNCTION public.get_campaign_stats(uuid, timestamptz, timestamptz, text) IS
+  'Campaign time series from the rollups: one zero-filled row per hour or day in [from_ts, to_ts). Owner or admin only.';
+
+-- 9. Initial backfill. Large projects can skip this and run
+-- `python -m campaign_rollups backfill` instead, one campaign per transaction.
+SELECT public.backfill_campaign_stats(id) FROM public.ad_campaigns ORDER BY id;
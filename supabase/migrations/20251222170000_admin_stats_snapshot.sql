@@ -0,0 +1,318 @@
+-- Migration: Materialized admin dashboard stats
+-- Description: get_admin_dashboard_stats() counted and summed whole tables (profiles,
+-- properties, messages, favorites, inquiries, ad_campaigns) on every AdminDashboard
+-- load and on every realtime change it received, so the dashboard slowed down with
+-- the data. The numbers now live in admin_stats, one row per metric:
+--   * counters (totals, unread, pending...) are kept exact by triggers that append
+--     +/- deltas to admin_stat_deltas, folded into admin_stats every few seconds; they
+--     keep the predicates of the old function (active = status 'active');
+--   * time-window and aggregate metrics (today/this week, views, averages, top lists)
+--     are snapshots recomputed by refresh_admin_stats(), which the dashboard calls when
+--     a snapshot is older than it tolerates; each row records when it was computed.
+-- get_admin_dashboard_stats() reads ~20 rows plus the pending deltas, independent of
+-- table sizes, and reports per metric how current the value is ('as_of').
+
+-- 1. One row per metric. A counter names its table and a row filter; a snapshot
+-- carries the query that computes it. Both are only run by the functions below.
+CREATE TABLE IF NOT EXISTS public.admin_stats (
+  metric text PRIMARY KEY,
+  source_table text,
+  filter text,
+  query text,
+  value jsonb NOT NULL DEFAULT '0'::jsonb,
+  refreshed_at timestamptz,
+  CHECK ((source_table IS NOT NULL AND filter IS NOT NULL AND query IS NULL)
+      OR (source_table IS NULL AND filter IS NULL AND query IS NOT NULL))
+);
+
+-- 2. Append-only counter deltas, so concurrent writers never wait on an admin_stats row.
+CREATE TABLE IF NOT EXISTS public.admin_stat_deltas (
+  id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  metric text NOT NULL,
+  delta bigint NOT NULL,
+  created_at timestamptz NOT NULL DEFAULT now()
+);
+
+-- Definitions are executed by SECURITY DEFINER functions: no access outside them.
+ALTER TABLE public.admin_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.admin_stat_deltas ENABLE ROW LEVEL SECURITY;
+REVOKE ALL ON public.admin_stats, public.admin_stat_deltas FROM anon, authenticated;
+
+INSERT INTO public.admin_stats (metric, source_table, filter) VALUES
+  ('total_users', 'profiles', 'true'),
+  ('total_properties', 'properties', 'true'),
+  ('active_properties', 'properties', 'status = ''active'''),
+  ('pending_properties', 'properties', 'verified = false'),
+  ('verified_properties', 'properties', 'verified = true'),
+  ('total_messages', 'messages', 'true'),
+  ('unread_messages', 'messages', 'read = false'),
+  ('total_favorites', 'favorites', 'true'),
+  ('total_inquiries', 'inquiries', 'true'),
+  ('pending_reports', 'reports', 'status = ''new'''),
+  ('total_campaigns', 'ad_campaigns', 'true'),
+  ('active_campaigns', 'ad_campaigns', 'status = ''active''')
+ON CONFLICT (metric) DO UPDATE
+  SET source_table = EXCLUDED.source_table, filter = EXCLUDED.filter, query = NULL;
+
+INSERT INTO public.admin_stats (metric, query) VALUES
+  ('new_users_today', 'SELECT to_jsonb(count(*)) FROM profiles WHERE created_at >= CURRENT_DATE'),
+  ('new_users_this_week', 'SELECT to_jsonb(count(*)) FROM profiles WHERE created_at >= CURRENT_DATE - interval ''7 days'''),
+  ('new_properties_today', 'SELECT to_jsonb(count(*)) FROM properties WHERE created_at >= CURRENT_DATE'),
+  ('messages_today', 'SELECT to_jsonb(count(*)) FROM messages WHERE created_at >= CURRENT_DATE'),
+  ('favorites_today', 'SELECT to_jsonb(count(*)) FROM favorites WHERE created_at >= CURRENT_DATE'),
+  ('inquiries_today', 'SELECT to_jsonb(count(*)) FROM inquiries WHERE created_at >= CURRENT_DATE'),
+  ('total_views', 'SELECT to_jsonb(coalesce(sum(views), 0)) FROM properties'),
+  ('avg_property_price', 'SELECT to_jsonb(round(coalesce(avg(price), 0), 2)) FROM properties WHERE status = ''active'''),
+  ('properties_by_type', 'SELECT coalesce(jsonb_object_agg(property_type, n), ''{}'') FROM (
+      SELECT property_type, count(*) AS n FROM properties WHERE status = ''active''
+      GROUP BY property_type ORDER BY n DESC LIMIT 10) t'),
+  ('top_cities', 'SELECT coalesce(jsonb_object_agg(city, n), ''{}'') FROM (
+      SELECT city, count(*) AS n FROM properties WHERE status = ''active''
+      GROUP BY city ORDER BY n DESC LIMIT 10) t')
+ON CONFLICT (metric) DO UPDATE
+  SET source_table = NULL, filter = NULL, query = EXCLUDED.query;
+
+-- 3. Fold deltas into admin_stats. One folder at a time (the advisory lock); callers
+-- that find it taken return immediately. Deltas committed after the DELETE's snapshot
+-- stay queued for the next fold.
+CREATE OR REPLACE FUNCTION public.fold_admin_stat_deltas()
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  folded integer;
+BEGIN
+  IF NOT pg_try_advisory_xact_lock(hashtext('admin_stats')) THEN
+    RETURN 0;
+  END IF;
+
+  WITH drained AS (
+    DELETE FROM admin_stat_deltas
+    RETURNING metric, delta
+  ),
+  totals AS (
+    SELECT metric, sum(delta) AS delta
+    FROM drained
+    GROUP BY metric
+  )
+  UPDATE admin_stats s
+  SET value = to_jsonb(s.value::bigint + t.delta::bigint)
+  FROM totals t
+  WHERE s.metric = t.metric;
+
+  GET DIAGNOSTICS folded = ROW_COUNT;
+  RETURN folded;
+END;
+$$;
+
+-- 4. Statement triggers: count the rows entering and leaving each counter's filter in the
+-- transition tables and queue the difference. One trigger per operation because INSERT
+-- has no old rows and DELETE no new ones. Folds when the oldest delta is 10 s old.
+CREATE OR REPLACE FUNCTION public.track_admin_stat_counters()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  deltas text;
+  oldest timestamptz;
+BEGIN
+  SELECT string_agg(format(
+    'SELECT %L AS metric, %s - %s AS delta',
+    s.metric,
+    CASE WHEN TG_OP = 'DELETE' THEN '0' ELSE format('(SELECT count(*) FROM new_rows WHERE %s)', s.filter) END,
+    CASE WHEN TG_OP = 'INSERT' THEN '0' ELSE format('(SELECT count(*) FROM old_rows WHERE %s)', s.filter) END
+  ), ' UNION ALL ')
+  INTO deltas
+  FROM admin_stats s
+  WHERE s.source_table = TG_TABLE_NAME;
+
+  IF deltas IS NULL THEN
+    RETURN NULL;
+  END IF;
+
+  EXECUTE format('INSERT INTO admin_stat_deltas (metric, delta) SELECT metric, delta FROM (%s) d WHERE delta <> 0', deltas);
+
+  SELECT d.created_at INTO oldest FROM admin_stat_deltas d ORDER BY d.id LIMIT 1;
+  IF oldest < now() - interval '10 seconds' THEN
+    PERFORM fold_admin_stat_deltas();
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- properties is updated on every listing view (views = views + 1). Its UPDATE trigger is
+-- per row instead, so it can skip those: UPDATE OF and WHEN need a row trigger (statement
+-- triggers with transition tables take neither). The columns are the ones the properties
+-- counters filter on.
+CREATE OR REPLACE FUNCTION public.track_admin_stat_row_update()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  s record;
+  delta bigint;
+  oldest timestamptz;
+BEGIN
+  FOR s IN SELECT metric, filter FROM admin_stats WHERE source_table = TG_TABLE_NAME LOOP
+    EXECUTE format(
+      'SELECT (SELECT count(*) FROM (SELECT ($1).*) r WHERE %1$s) - (SELECT count(*) FROM (SELECT ($2).*) r WHERE %1$s)',
+      s.filter
+    ) INTO delta USING NEW, OLD;
+    IF delta <> 0 THEN
+      INSERT INTO admin_stat_deltas (metric, delta) VALUES (s.metric, delta);
+    END IF;
+  END LOOP;
+
+  SELECT d.created_at INTO oldest FROM admin_stat_deltas d ORDER BY d.id LIMIT 1;
+  IF oldest < now() - interval '10 seconds' THEN
+    PERFORM fold_admin_stat_deltas();
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DO $$
+DECLARE
+  tbl text;
+BEGIN
+  FOREACH tbl IN ARRAY ARRAY['profiles', 'properties', 'messages', 'favorites', 'inquiries', 'reports', 'ad_campaigns'] LOOP
+    EXECUTE format('DROP TRIGGER IF EXISTS track_admin_stats_insert ON public.%I', tbl);
+    EXECUTE format('DROP TRIGGER IF EXISTS track_admin_stats_update ON public.%I', tbl);
+    EXECUTE format('DROP TRIGGER IF EXISTS track_admin_stats_delete ON public.%I', tbl);
+    EXECUTE format('CREATE TRIGGER track_admin_stats_insert AFTER INSERT ON public.%I
+      REFERENCING NEW TABLE AS new_rows
+      FOR EACH STATEMENT EXECUTE FUNCTION public.track_admin_stat_counters()', tbl);
+    IF tbl <> 'properties' THEN
+      EXECUTE format('CREATE TRIGGER track_admin_stats_update AFTER UPDATE ON public.%I
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION public.track_admin_stat_counters()', tbl);
+    END IF;
+    EXECUTE format('CREATE TRIGGER track_admin_stats_delete AFTER DELETE ON public.%I
+      REFERENCING OLD TABLE AS old_rows
+      FOR EACH STATEMENT EXECUTE FUNCTION public.track_admin_stat_counters()', tbl);
+  END LOOP;
+
+  CREATE TRIGGER track_admin_stats_update AFTER UPDATE OF status, verified ON public.properties
+    FOR EACH ROW
+    WHEN (OLD.status IS DISTINCT FROM NEW.status OR OLD.verified IS DISTINCT FROM NEW.verified)
+    EXECUTE FUNCTION public.track_admin_stat_row_update();
+END;
+$$;
+
+-- 5. Forced refresh: recompute the given metrics (default: all). Counters are recounted
+-- exactly and their queued deltas dropped in the same statement, so both come from one
+-- snapshot; the advisory lock keeps a concurrent fold from adding deltas the recount
+-- already includes. Admins only (or service-role/cron callers, which have no auth.uid()).
+CREATE OR REPLACE FUNCTION public.refresh_admin_stats(metrics text[] DEFAULT NULL)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  s record;
+  refreshed integer := 0;
+BEGIN
+  IF auth.uid() IS NOT NULL AND NOT has_role(auth.uid(), 'admin'::app_role) THEN
+    RAISE EXCEPTION 'Only admins can refresh dashboard stats' USING ERRCODE = '42501';
+  END IF;
+
+  PERFORM pg_advisory_xact_lock(hashtext('admin_stats'));
+
+  FOR s IN
+    SELECT * FROM admin_stats
+    WHERE metrics IS NULL OR metric = ANY (metrics)
+    ORDER BY metric
+  LOOP
+    IF s.query IS NOT NULL THEN
+      EXECUTE format('UPDATE admin_stats SET value = (%s), refreshed_at = now() WHERE metric = $1', s.query)
+        USING s.metric;
+    ELSE
+      EXECUTE format(
+        'WITH drained AS (DELETE FROM admin_stat_deltas WHERE metric = $1)
+         UPDATE admin_stats SET value = (SELECT to_jsonb(count(*)) FROM %I WHERE %s), refreshed_at = now()
+         WHERE metric = $1',
+        s.source_table, s.filter
+      ) USING s.metric;
+    END IF;
+    refreshed := refreshed + 1;
+  END LOOP;
+
+  RETURN refreshed;
+END;
+$$;
+
+-- 6. Dashboard read: stored values plus pending counter deltas. Counters are current
+-- ('as_of' = now); snapshots report when they were computed. Admins only, as for
+-- refresh_admin_stats.
+CREATE OR REPLACE FUNCTION public.get_admin_dashboard_stats()
+RETURNS json
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  stats json;
+BEGIN
+  IF auth.uid() IS NOT NULL AND NOT has_role(auth.uid(), 'admin'::app_role) THEN
+    RAISE EXCEPTION 'Only admins can read dashboard stats' USING ERRCODE = '42501';
+  END IF;
+
+  WITH pending AS (
+    SELECT metric, sum(delta) AS delta
+    FROM admin_stat_deltas
+    GROUP BY metric
+  )
+  SELECT (
+    jsonb_object_agg(
+      s.metric,
+      CASE WHEN p.delta IS NULL THEN s.value ELSE to_jsonb(s.value::bigint + p.delta::bigint) END
+    )
+    || jsonb_build_object(
+      'as_of', jsonb_object_agg(s.metric, CASE WHEN s.query IS NULL THEN now() ELSE s.refreshed_at END),
+      'recent_activity', (
+        SELECT jsonb_agg(activity)
+        FROM (
+          SELECT 'property' AS type, title AS description, created_at, user_id
+          FROM properties
+          ORDER BY created_at DESC
+          LIMIT 10
+        ) activity
+      )
+    )
+  )::json
+  INTO stats
+  FROM admin_stats s
+  LEFT JOIN pending p ON p.metric = s.metric;
+
+  RETURN stats;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.fold_admin_stat_deltas() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.track_admin_stat_counters() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.track_admin_stat_row_update() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.get_admin_dashboard_stats() FROM PUBLIC, anon;
+REVOKE EXECUTE ON FUNCTION public.refresh_admin_stats(text[]) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION public.fold_admin_stat_deltas() TO service_role;
+GRANT EXECUTE ON FUNCTION public.refresh_admin_stats(text[]) TO authenticated, service_role;
+GRANT EXECUTE ON FUNCTION public.get_admin_dashboard_stats() TO authenticated, service_role;
+
+COMMENT ON TABLE public.admin_stats IS
+  'Admin dashboard metrics: trigger-maintained counters and periodically refreshed snapshots, with refreshed_at per metric.';
+COMMENT ON TABLE public.admin_stat_deltas IS
+  'Counter deltas waiting to be folded into admin_stats by fold_admin_stat_deltas().';
+COMMENT ON FUNCTION public.refresh_admin_stats(text[]) IS
+  'Recompute admin dashboard metrics (all, or the named ones). Counters are recounted exactly. Returns the number refreshed.';
+COMMENT ON FUNCTION public.get_admin_dashboard_stats() IS
+  'Admin dashboard metrics from admin_stats, with per-metric as_of timestamps. Cost does not depend on table sizes.';
+
+-- 7. Initial values
+SELECT public.refresh_admin_stats();
@@ -0,0 +1,381 @@
+-- Migration: Conversation index and paged inbox/thread RPCs
+-- Description: The Messages page selected every message the user ever sent or received
+-- and grouped them into conversations in the browser. With only (sender_id, receiver_id)
+-- and created_at indexes, "latest message per conversation" meant reading the whole
+-- history in both directions. conversations keeps one row per participant and peer
+-- (last message, unread count), maintained by triggers on messages, so:
+--   * get_conversations_page() seeks an (user_id, last_message_at) index;
+--   * get_conversation_messages() reads one page of a thread from a
+--     (sender_id, receiver_id, created_at) index, one branch per direction;
+-- both cost O(page) regardless of how long the user's history is.
+
+-- 1. Columns the app already writes on edit (present in the generated types)
+ALTER TABLE public.messages
+  ADD COLUMN IF NOT EXISTS edited boolean DEFAULT false,
+  ADD COLUMN IF NOT EXISTS edited_at timestamptz;
+
+-- 2. Thread index, newest first; it also covers (sender_id, receiver_id) lookups.
+CREATE INDEX IF NOT EXISTS idx_messages_thread
+  ON public.messages (sender_id, receiver_id, created_at DESC, id DESC);
+DROP INDEX IF EXISTS public.idx_messages_conversation;
+
+-- 3. One row per (user, peer): both participants of a pair have their own row, so an
+-- inbox is a range of the primary key's leading column and unread counts are per side.
+-- Participants reference auth.users, as messages.sender_id/receiver_id do. No foreign key
+-- on last_message_id: the delete trigger repoints it after the statement.
+-- last_message_edited_at only exists so that editing the last message changes the row
+-- and both inboxes hear about it over realtime; the preview itself is read from messages.
+CREATE TABLE IF NOT EXISTS public.conversations (
+  user_id uuid NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+  peer_id uuid NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+  last_message_id uuid NOT NULL,
+  last_message_at timestamptz NOT NULL,
+  last_message_edited_at timestamptz,
+  unread_count integer NOT NULL DEFAULT 0 CHECK (unread_count >= 0),
+  PRIMARY KEY (user_id, peer_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_conversations_inbox
+  ON public.conversations (user_id, last_message_at DESC, peer_id DESC);
+
+-- Written only by the triggers below; users can read (and subscribe to) their own rows.
+ALTER TABLE public.conversations ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view their own conversations" ON public.conversations;
+CREATE POLICY "Users can view their own conversations"
+ON public.conversations FOR SELECT
+USING (auth.uid() = user_id);
+
+DO $$ BEGIN
+  ALTER PUBLICATION supabase_realtime ADD TABLE public.conversations;
+EXCEPTION WHEN duplicate_object THEN NULL; END $$;
+
+-- 4. New message: upsert both sides. Rows are written in (user_id, peer_id) order so two
+-- people messaging each other at the same moment lock them in the same order; DISTINCT
+-- ON folds the two sides of a message to oneself into one row.
+CREATE OR REPLACE FUNCTION public.track_conversation_message()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  INSERT INTO conversations (user_id, peer_id, last_message_id, last_message_at, unread_count)
+  SELECT DISTINCT ON (side.user_id, side.peer_id) side.user_id, side.peer_id, NEW.id, NEW.created_at, side.unread
+  FROM (VALUES
+    (NEW.sender_id, NEW.receiver_id, 0),
+    (NEW.receiver_id, NEW.sender_id, CASE WHEN coalesce(NEW.read, false) THEN 0 ELSE 1 END)
+  ) AS side(user_id, peer_id, unread)
+  ORDER BY side.user_id, side.peer_id, side.unread
+  ON CONFLICT (user_id, peer_id) DO UPDATE
+  SET last_message_id = CASE
+        WHEN (EXCLUDED.last_message_at, EXCLUDED.last_message_id) > (conversations.last_message_at, conversations.last_message_id)
+        THEN EXCLUDED.last_message_id ELSE conversations.last_message_id
+      END,
+      last_message_at = greatest(conversations.last_message_at, EXCLUDED.last_message_at),
+      unread_count = conversations.unread_count + EXCLUDED.unread_count;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS track_conversation_message ON public.messages;
+CREATE TRIGGER track_conversation_message
+  AFTER INSERT ON public.messages
+  FOR EACH ROW EXECUTE FUNCTION public.track_conversation_message();
+
+-- 5. Read flags: one UPDATE per conversation side for a whole "mark as read" statement.
+-- Edits: touch both sides of conversations whose last message changed content, so the
+-- inbox previews refresh.
+CREATE OR REPLACE FUNCTION public.track_conversation_updates()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  UPDATE conversations c
+  SET last_message_edited_at = coalesce(n.edited_at, now())
+  FROM old_rows o
+  JOIN new_rows n ON n.id = o.id
+  WHERE c.last_message_id = n.id
+    AND (c.user_id, c.peer_id) IN ((n.sender_id, n.receiver_id), (n.receiver_id, n.sender_id))
+    AND o.content IS DISTINCT FROM n.content;
+
+  UPDATE conversations c
+  SET unread_count = greatest(c.unread_count + r.delta, 0)
+  FROM (
+    SELECT n.receiver_id, n.sender_id,
+           sum(CASE WHEN coalesce(n.read, false) THEN -1 ELSE 1 END) AS delta
+    FROM old_rows o
+    JOIN new_rows n ON n.id = o.id
+    WHERE coalesce(o.read, false) IS DISTINCT FROM coalesce(n.read, false)
+    GROUP BY n.receiver_id, n.sender_id
+  ) r
+  WHERE c.user_id = r.receiver_id
+    AND c.peer_id = r.sender_id
+    AND r.delta <> 0;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS track_conversation_updates ON public.messages;
+CREATE TRIGGER track_conversation_updates
+  AFTER UPDATE ON public.messages
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.track_conversation_updates();
+
+-- 6. Deletes: take unread messages off the count, then repoint sides whose last message
+-- went away at the newest remaining one (two LIMIT 1 index probes), or drop them.
+CREATE OR REPLACE FUNCTION public.track_conversation_deletes()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  UPDATE conversations c
+  SET unread_count = greatest(c.unread_count - r.unread, 0)
+  FROM (
+    SELECT o.receiver_id, o.sender_id, count(*) AS unread
+    FROM old_rows o
+    WHERE NOT coalesce(o.read, false)
+    GROUP BY o.receiver_id, o.sender_id
+  ) r
+  WHERE c.user_id = r.receiver_id
+    AND c.peer_id = r.sender_id;
+
+  WITH sides AS (
+    SELECT DISTINCT c.user_id, c.peer_id
+    FROM old_rows o
+    JOIN conversations c
+      ON c.last_message_id = o.id
+     AND (c.user_id, c.peer_id) IN ((o.sender_id, o.receiver_id), (o.receiver_id, o.sender_id))
+  ),
+  latest AS (
+    SELECT s.user_id, s.peer_id, m.id, m.created_at
+    FROM sides s
+    LEFT JOIN LATERAL (
+      SELECT x.id, x.created_at
+      FROM (
+        (SELECT mm.id, mm.created_at FROM messages mm
+         WHERE mm.sender_id = s.user_id AND mm.receiver_id = s.peer_id
+         ORDER BY mm.created_at DESC, mm.id DESC LIMIT 1)
+        UNION ALL
+        (SELECT mm.id, mm.created_at FROM messages mm
+         WHERE mm.sender_id = s.peer_id AND mm.receiver_id = s.user_id
+         ORDER BY mm.created_at DESC, mm.id DESC LIMIT 1)
+      ) x
+      ORDER BY x.created_at DESC, x.id DESC
+      LIMIT 1
+    ) m ON true
+  ),
+  emptied AS (
+    DELETE FROM conversations c
+    USING latest l
+    WHERE l.id IS NULL AND c.user_id = l.user_id AND c.peer_id = l.peer_id
+  )
+  UPDATE conversations c
+  SET last_message_id = l.id, last_message_at = l.created_at
+  FROM latest l
+  WHERE l.id IS NOT NULL AND c.user_id = l.user_id AND c.peer_id = l.peer_id;
+
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS track_conversation_deletes ON public.messages;
+CREATE TRIGGER track_conversation_deletes
+  AFTER DELETE ON public.messages
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.track_conversation_deletes();
+
+-- 7. Inbox page, most recent conversation first. The cursor is (last_message_at, peer_id)
+-- of the last row; a conversation that receives a message moves to the top of page one.
+CREATE OR REPLACE FUNCTION public.get_conversations_page(
+  page_size integer DEFAULT 20,
+  after_cursor text DEFAULT NULL
+)
+RETURNS TABLE (
+  peer_id uuid,
+  peer_name text,
+  peer_email text,
+  unread_count integer,
+  last_message_id uuid,
+  last_message_at timestamptz,
+  last_sender_id uuid,
+  last_content text,
+  last_property_id uuid,
+  cursor text
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+SET plan_cache_mode = force_custom_plan
+AS $$
+DECLARE
+  page_limit integer := least(greatest(coalesce(page_size, 20), 1), 100);
+  me uuid := auth.uid();
+  after_key jsonb;
+BEGIN
+  IF me IS NULL THEN
+    RAISE EXCEPTION 'Authentication required';
+  END IF;
+
+  IF after_cursor IS NOT NULL THEN
+    after_key := public.decode_cursor(after_cursor);
+    IF after_key->>'at' IS NULL OR after_key->>'peer' IS NULL THEN
+      RAISE EXCEPTION 'Cursor does not belong to this inbox' USING ERRCODE = '22023';
+    END IF;
+  END IF;
+
+  RETURN QUERY
+  SELECT c.peer_id, p.full_name, p.email, c.unread_count,
+         m.id, m.created_at, m.sender_id, m.content, m.property_id,
+         public.encode_cursor(jsonb_build_object('at', c.last_message_at, 'peer', c.peer_id))
+  FROM conversations c
+  JOIN messages m ON m.id = c.last_message_id
+  LEFT JOIN profiles p ON p.id = c.peer_id
+  WHERE c.user_id = me
+    AND (after_key IS NULL
+      OR (c.last_message_at, c.peer_id) < ((after_key->>'at')::timestamptz, (after_key->>'peer')::uuid))
+  ORDER BY c.last_message_at DESC, c.peer_id DESC
+  LIMIT page_limit;
+END;
+$$;
+
+-- 8. Thread page, newest first (the client reverses it for display). Each direction is
+-- a separate index range; merging two LIMITed branches keeps the page O(page_size).
+CREATE OR REPLACE FUNCTION public.get_conversation_messages(
+  other_user_id uuid,
+  page_size integer DEFAULT 50,
+  after_cursor text DEFAULT NULL
+)
+RETURNS TABLE (
+  id uuid,
+  sender_id uuid,
+  receiver_id uuid,
+  property_id uuid,
+  content text,
+  read boolean,
+  edited boolean,
+  edited_at timestamptz,
+  created_at timestamptz,
+  cursor text
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+SET plan_cache_mode = force_custom_plan
+AS $$
+DECLARE
+  page_limit integer := least(greatest(coalesce(page_size, 50), 1), 200);
+  me uuid := auth.uid();
+  after_key jsonb;
+  after_at timestamptz;
+  after_id uuid;
+BEGIN
+  IF me IS NULL THEN
+    RAISE EXCEPTION 'Authentication required';
+  END IF;
+
+  IF after_cursor IS NOT NULL THEN
+    after_key := public.decode_cursor(after_cursor);
+    IF after_key->>'at' IS NULL OR after_key->>'id' IS NULL THEN
+      RAISE EXCEPTION 'Cursor does not belong to this thread' USING ERRCODE = '22023';
+    END IF;
+    after_at := (after_key->>'at')::timestamptz;
+    after_id := (after_key->>'id')::uuid;
+  END IF;
+
+  RETURN QUERY
+  SELECT t.id, t.sender_id, t.receiver_id, t.property_id, t.content, t.read, t.edited, t.edited_at, t.created_at,
+         public.encode_cursor(jsonb_build_object('at', t.created_at, 'id', t.id))
+  FROM (
+    (SELECT m.id, m.sender_id, m.receiver_id, m.property_id, m.content, m.read, m.edited, m.edited_at, m.created_at
+     FROM messages m
+     WHERE m.sender_id = me AND m.receiver_id = other_user_id
+       AND (after_key IS NULL OR (m.created_at, m.id) < (after_at, after_id))
+     ORDER BY m.created_at DESC, m.id DESC
+     LIMIT page_limit)
+    UNION ALL
+    (SELECT m.id, m.sender_id, m.receiver_id, m.property_id, m.content, m.read, m.edited, m.edited_at, m.created_at
+     FROM messages m
+     WHERE m.sender_id = other_user_id AND m.receiver_id = me AND other_user_id <> me
+       AND (after_key IS NULL OR (m.created_at, m.id) < (after_at, after_id))
+     ORDER BY m.created_at DESC, m.id DESC
+     LIMIT page_limit)
+  ) t
+  ORDER BY t.created_at DESC, t.id DESC
+  LIMIT page_limit;
+END;
+$$;
+
+-- 9. Mark a conversation read. The messages UPDATE policy only admits the sender, so
+-- receivers could not clear their own unread flags directly.
+CREATE OR REPLACE FUNCTION public.mark_conversation_read(other_user_id uuid)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  marked integer;
+BEGIN
+  IF auth.uid() IS NULL THEN
+    RAISE EXCEPTION 'Authentication required';
+  END IF;
+
+  UPDATE messages m
+  SET read = true
+  WHERE m.receiver_id = auth.uid()
+    AND m.sender_id = other_user_id
+    AND m.read = false;
+
+  GET DIAGNOSTICS marked = ROW_COUNT;
+  RETURN marked;
+END;
+$$;
+
+-- 10. Existing history. CREATE TRIGGER above holds a lock that blocks concurrent writes
+-- to messages until this migration commits, so nothing is counted twice or missed.
+INSERT INTO public.conversations (user_id, peer_id, last_message_id, last_message_at, unread_count)
+SELECT DISTINCT ON (m.user_id, m.peer_id) m.user_id, m.peer_id, m.id, m.created_at, 0
+FROM (
+  SELECT sender_id AS user_id, receiver_id AS peer_id, id, created_at FROM public.messages
+  UNION ALL
+  SELECT receiver_id, sender_id, id, created_at FROM public.messages
+) m
+ORDER BY m.user_id, m.peer_id, m.created_at DESC, m.id DESC
+ON CONFLICT (user_id, peer_id) DO NOTHING;
+
+UPDATE public.conversations c
+SET unread_count = u.unread
+FROM (
+  SELECT receiver_id, sender_id, count(*) AS unread
+  FROM public.messages
+  WHERE read = false
+  GROUP BY receiver_id, sender_id
+) u
+WHERE c.user_id = u.receiver_id
+  AND c.peer_id = u.sender_id;
+
+REVOKE EXECUTE ON FUNCTION public.track_conversation_message() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.track_conversation_updates() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.track_conversation_deletes() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.get_conversations_page(integer, text) FROM PUBLIC, anon;
+REVOKE EXECUTE ON FUNCTION public.get_conversation_messages(uuid, integer, text) FROM PUBLIC, anon;
+REVOKE EXECUTE ON FUNCTION public.mark_conversation_read(uuid) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION public.get_conversations_page(integer, text) TO authenticated;
+GRANT EXECUTE ON FUNCTION public.get_conversation_messages(uuid, integer, text) TO authenticated;
+GRANT EXECUTE ON FUNCTION public.mark_conversation_read(uuid) TO authenticated;
+
+COMMENT ON TABLE public.conversations IS
+  'One row per user and peer: last message and unread count, maintained by triggers on messages.';
+COMMENT ON FUNCTION public.get_conversations_page(integer, text) IS
+  'Inbox of the calling user, most recent first, keyset-paginated via the cursor column.';
+COMMENT ON FUNCTION public.get_conversation_messages(uuid, integer, text) IS
+  'Messages between the calling user and other_user_id, newest first, keyset-paginated via the cursor column.';
+COMMENT ON FUNCTION public.mark_conversation_read(uuid) IS
+  'Marks messages from other_user_id to the calling user as read. Returns the number marked.';
@@ -0,0 +1,281 @@
+-- Migration: One paginated search for text, filters, radius and sort
+-- Description: With live coordinates, useProperties called search_properties_by_location,
+-- which returned every listing in the radius, then filtered the query text with
+-- includes() and sorted by price in the browser, refetching the whole radius on each
+-- keystroke. search_properties_matches (and so search_properties_page and
+-- search_properties_count) now take an optional origin and radius:
+--   * ST_DWithin on the geography GIST index bounds the candidates to the radius,
+--     combined with the fts/trigram, category, location and price filters;
+--   * a 'distance' sort walks the same index nearest-first (KNN `<->`), keyset
+--     paginated on (distance_m, id) like search_properties_nearby;
+--   * every sort (recent, relevance, price, distance) returns one bounded page.
+-- Radius defaults to 10 km and is capped at 100 km, as for search_properties_nearby.
+
+-- 1. Shared filter with the origin arguments and a distance column (NULL without an
+-- origin). Inlined into the callers, so with constant arguments the CASE folds to the
+-- bare `location <-> origin` expression the KNN scan orders by.
+DROP FUNCTION IF EXISTS public.search_properties_matches(text, text, text, text, text, numeric, numeric);
+
+CREATE FUNCTION public.search_properties_matches(
+  query_text text,
+  category_filter text,
+  city_filter text,
+  area_filter text,
+  pincode_filter text,
+  min_price numeric,
+  max_price numeric,
+  origin_lat double precision,
+  origin_lng double precision,
+  radius_km double precision
+)
+RETURNS TABLE (
+  id uuid,
+  title text,
+  description text,
+  price numeric,
+  price_type text,
+  property_type text,
+  status text,
+  available boolean,
+  images text[],
+  bedrooms integer,
+  bathrooms integer,
+  area_sqft numeric,
+  address text,
+  city text,
+  area text,
+  pin_code text,
+  latitude numeric,
+  longitude numeric,
+  amenities text[],
+  user_id uuid,
+  created_at timestamptz,
+  updated_at timestamptz,
+  views integer,
+  verified boolean,
+  featured boolean,
+  relevance_score double precision,
+  distance_m double precision
+)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT
+    p.id, p.title, p.description, p.price, p.price_type, p.property_type, p.status, p.available,
+    p.images, p.bedrooms, p.bathrooms, p.area_sqft::numeric, p.address, p.city, p.area, p.pin_code,
+    p.latitude, p.longitude, p.amenities, p.user_id, p.created_at, p.updated_at, p.views,
+    p.verified, p.featured,
+    CASE WHEN nullif(trim(query_text), '') IS NULL THEN 0
+         ELSE public.search_score(p.fts, p.search_text, query_text) END,
+    CASE WHEN origin_lat IS NULL OR origin_lng IS NULL THEN NULL::double precision
+         ELSE p.location <-> ST_SetSRID(ST_MakePoint(origin_lng, origin_lat), 4326)::geography END
+  FROM public.properties p
+  WHERE
+    p.status = 'active'
+    AND p.available = true
+    -- Word/prefix match on the fts GIN index, or a close spelling on the trigram index
+    AND (
+      nullif(trim(query_text), '') IS NULL
+      OR p.fts @@ public.search_tsquery(query_text)
+      OR lower(query_text) <% p.search_text
+    )
+    AND (category_filter IS NULL OR p.property_type = category_filter)
+    AND (city_filter IS NULL OR p.city ILIKE '%' || city_filter || '%')
+    AND (area_filter IS NULL OR p.area ILIKE '%' || area_filter || '%')
+    -- A full 6-digit PIN matches exactly; a shorter one matches as a prefix.
+    AND (pincode_filter IS NULL OR p.pin_code LIKE pincode_filter || '%')
+    AND (min_price IS NULL OR p.price >= min_price)
+    AND (max_price IS NULL OR p.price <= max_price)
+    -- Radius on idx_properties_location_active_gist (sphere distance, as `<->`)
+    AND (
+      origin_lat IS NULL OR origin_lng IS NULL
+      OR (
+        p.location IS NOT NULL
+        AND ST_DWithin(
+          p.location,
+          ST_SetSRID(ST_MakePoint(origin_lng, origin_lat), 4326)::geography,
+          least(greatest(coalesce(radius_km, 10), 0), 100) * 1000,
+          false
+        )
+      )
+    )
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.search_properties_matches(text, text, text, text, text, numeric, numeric, double precision, double precision, double precision) FROM PUBLIC, anon, authenticated;
+
+-- 2. Paginated search with a 'distance' sort. Without an origin, 'distance' falls back
+-- to 'recent' (as 'relevance' does without a query).
+DROP FUNCTION IF EXISTS public.search_properties_page(text, text, text, text, text, numeric, numeric, text, text, integer);
+
+CREATE FUNCTION public.search_properties_page(
+  query_text text DEFAULT NULL,
+  category_filter text DEFAULT NULL,
+  city_filter text DEFAULT NULL,
+  area_filter text DEFAULT NULL,
+  pincode_filter text DEFAULT NULL,
+  min_price numeric DEFAULT NULL,
+  max_price numeric DEFAULT NULL,
+  sort_by text DEFAULT 'recent',
+  after_cursor text DEFAULT NULL,
+  page_size integer DEFAULT 24,
+  origin_lat double precision DEFAULT NULL,
+  origin_lng double precision DEFAULT NULL,
+  radius_km double precision DEFAULT NULL
+)
+RETURNS TABLE (
+  id uuid,
+  title text,
+  description text,
+  price numeric,
+  price_type text,
+  property_type text,
+  status text,
+  available boolean,
+  images text[],
+  bedrooms integer,
+  bathrooms integer,
+  area_sqft numeric,
+  address text,
+  city text,
+  area text,
+  pin_code text,
+  latitude numeric,
+  longitude numeric,
+  amenities text[],
+  user_id uuid,
+  created_at timestamptz,
+  updated_at timestamptz,
+  views integer,
+  verified boolean,
+  featured boolean,
+  relevance_score double precision,
+  distance_m double precision,
+  distance_km numeric,
+  cursor text
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+-- Plan each call with its actual arguments so the `x IS NULL OR ...` filters fold
+-- away and the matching index is chosen; a cached generic plan cannot do either.
+SET plan_cache_mode = force_custom_plan
+-- One-letter typos in short words ("mumbay") score about 0.55; the default is 0.6.
+SET pg_trgm.word_similarity_threshold = 0.5
+AS $$
+DECLARE
+  page_limit integer := least(greatest(coalesce(page_size, 24), 1), 100);
+  sort_key text := coalesce(sort_by, 'recent');
+  after_key jsonb;
+  after_id uuid;
+BEGIN
+  IF sort_key NOT IN ('recent', 'relevance', 'price-low', 'price-high', 'distance') THEN
+    RAISE EXCEPTION 'Unknown sort_by %', sort_by USING ERRCODE = '22023';
+  END IF;
+  IF sort_key = 'relevance' AND nullif(trim(query_text), '') IS NULL THEN
+    sort_key := 'recent';
+  END IF;
+  IF sort_key = 'distance' AND (origin_lat IS NULL OR origin_lng IS NULL) THEN
+    sort_key := 'recent';
+  END IF;
+
+  IF after_cursor IS NOT NULL THEN
+    after_key := public.decode_cursor(after_cursor);
+    IF after_key->>'sort' IS DISTINCT FROM sort_key OR after_key->>'id' IS NULL THEN
+      RAISE EXCEPTION 'Cursor does not belong to this search' USING ERRCODE = '22023';
+    END IF;
+    after_id := (after_key->>'id')::uuid;
+  END IF;
+
+  IF sort_key = 'recent' THEN
+    RETURN QUERY
+    SELECT m.*, round((m.distance_m / 1000)::numeric, 2),
+           public.encode_cursor(jsonb_build_object('sort', sort_key, 'at', m.created_at, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price, origin_lat, origin_lng, radius_km) m
+    WHERE after_key IS NULL OR (m.created_at, m.id) < ((after_key->>'at')::timestamptz, after_id)
+    ORDER BY m.created_at DESC, m.id DESC
+    LIMIT page_limit;
+  ELSIF sort_key = 'relevance' THEN
+    -- Scores are computed for every match, but there is no OFFSET to re-read.
+    RETURN QUERY
+    SELECT m.*, round((m.distance_m / 1000)::numeric, 2),
+           public.encode_cursor(jsonb_build_object('sort', sort_key, 'score', m.relevance_score, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price, origin_lat, origin_lng, radius_km) m
+    WHERE after_key IS NULL OR (m.relevance_score, m.id) < ((after_key->>'score')::double precision, after_id)
+    ORDER BY m.relevance_score DESC, m.id DESC
+    LIMIT page_limit;
+  ELSIF sort_key = 'distance' THEN
+    -- Nearest first from the KNN scan, pruned by the radius.
+    RETURN QUERY
+    SELECT m.*, round((m.distance_m / 1000)::numeric, 2),
+           public.encode_cursor(jsonb_build_object('sort', sort_key, 'dist', m.distance_m, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price, origin_lat, origin_lng, radius_km) m
+    WHERE after_key IS NULL OR (m.distance_m, m.id) > ((after_key->>'dist')::double precision, after_id)
+    ORDER BY m.distance_m ASC, m.id ASC
+    LIMIT page_limit;
+  ELSIF sort_key = 'price-low' THEN
+    RETURN QUERY
+    SELECT m.*, round((m.distance_m / 1000)::numeric, 2),
+           public.encode_cursor(jsonb_build_object('sort', sort_key, 'price', m.price, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price, origin_lat, origin_lng, radius_km) m
+    WHERE after_key IS NULL OR (m.price, m.id) > ((after_key->>'price')::numeric, after_id)
+    ORDER BY m.price ASC, m.id ASC
+    LIMIT page_limit;
+  ELSE
+    RETURN QUERY
+    SELECT m.*, round((m.distance_m / 1000)::numeric, 2),
+           public.encode_cursor(jsonb_build_object('sort', sort_key, 'price', m.price, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price, origin_lat, origin_lng, radius_km) m
+    WHERE after_key IS NULL OR (m.price, m.id) < ((after_key->>'price')::numeric, after_id)
+    ORDER BY m.price DESC, m.id DESC
+    LIMIT page_limit;
+  END IF;
+END;
+$$;
+
+-- 3. Capped total with the same origin arguments
+DROP FUNCTION IF EXISTS public.search_properties_count(text, text, text, text, text, numeric, numeric, integer);
+
+CREATE FUNCTION public.search_properties_count(
+  query_text text DEFAULT NULL,
+  category_filter text DEFAULT NULL,
+  city_filter text DEFAULT NULL,
+  area_filter text DEFAULT NULL,
+  pincode_filter text DEFAULT NULL,
+  min_price numeric DEFAULT NULL,
+  max_price numeric DEFAULT NULL,
+  count_cap integer DEFAULT 1000,
+  origin_lat double precision DEFAULT NULL,
+  origin_lng double precision DEFAULT NULL,
+  radius_km double precision DEFAULT NULL
+)
+RETURNS TABLE (total_count bigint, capped boolean)
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+SET plan_cache_mode = force_custom_plan
+SET pg_trgm.word_similarity_threshold = 0.5
+AS $$
+DECLARE
+  cap integer := least(greatest(coalesce(count_cap, 1000), 1), 10000);
+  matched bigint;
+BEGIN
+  SELECT count(*) INTO matched
+  FROM (
+    SELECT 1
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price, origin_lat, origin_lng, radius_km)
+    LIMIT cap + 1
+  ) limited;
+
+  RETURN QUERY SELECT least(matched, cap::bigint), matched > cap;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.search_properties_page(text, text, text, text, text, numeric, numeric, text, text, integer, double precision, double precision, double precision) TO authenticated, anon;
+GRANT EXECUTE ON FUNCTION public.search_properties_count(text, text, text, text, text, numeric, numeric, integer, double precision, double precision, double precision) TO authenticated, anon;
+
+COMMENT ON FUNCTION public.search_properties_page(text, text, text, text, text, numeric, numeric, text, text, integer, double precision, double precision, double precision) IS
+  'Cursor-paginated listing search, optionally within radius_km of (origin_lat, origin_lng). sort_by: recent | relevance | price-low | price-high | distance. Pass the last row''s cursor as after_cursor for the next page.';
+COMMENT ON FUNCTION public.search_properties_count(text, text, text, text, text, numeric, numeric, integer, double precision, double precision, double precision) IS
+  'Number of listings search_properties_page can return for the same filters, counted up to count_cap.';
@@ -0,0 +1,533 @@
+-- Migration: Placeholders for listing images
+-- Description: Cards showed a grey shimmer until the full photo arrived, so the largest
+-- paint on Index and Listings waited on an image download. services/image_placeholders
+-- now stores, per image URL, a ~16px WebP data URI, the dominant colour and the shape:
+--   properties.image_placeholders = {"<url>": {"lqip": "data:image/webp;base64,...",
+--                                             "color": "#8a7b6c", "aspect_ratio": 1.3333}}
+-- (aspect_ratio = width / height, so a card can reserve the photo's box before it loads)
+-- It comes back with the listing row (select *, search_properties_page, the map's
+-- search_properties_in_view and get_sponsored_properties), so the first paint needs
+-- no extra request. Entries for URLs no longer in images are dropped
+-- on write; changes to images are announced on channel 'image_placeholders' for the
+-- job's incremental mode.
+
+-- 1. Column, kept to the URLs in images
+ALTER TABLE public.properties
+  ADD COLUMN IF NOT EXISTS image_placeholders jsonb NOT NULL DEFAULT '{}'::jsonb;
+
+CREATE OR REPLACE FUNCTION public.prune_image_placeholders()
+RETURNS trigger
+LANGUAGE plpgsql
+SET search_path = public
+AS $$
+BEGIN
+  IF NEW.image_placeholders <> '{}'::jsonb THEN
+    NEW.image_placeholders := (
+      SELECT coalesce(jsonb_object_agg(e.key, e.value), '{}'::jsonb)
+      FROM jsonb_each(NEW.image_placeholders) e
+      WHERE e.key = ANY (coalesce(NEW.images, '{}'))
+    );
+  END IF;
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS prune_image_placeholders ON public.properties;
+CREATE TRIGGER prune_image_placeholders
+  BEFORE INSERT OR UPDATE OF images, image_placeholders ON public.properties
+  FOR EACH ROW EXECUTE FUNCTION public.prune_image_placeholders();
+
+-- 2. Tell the job about new or changed images. NOTIFY is transactional, and
+-- duplicate payloads within one transaction are folded into one.
+CREATE OR REPLACE FUNCTION public.notify_property_images_change()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  PERFORM pg_notify('image_placeholders', NEW.id::text);
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS notify_property_images_insert ON public.properties;
+CREATE TRIGGER notify_property_images_insert
+  AFTER INSERT ON public.properties
+  FOR EACH ROW WHEN (cardinality(NEW.images) > 0)
+  EXECUTE FUNCTION public.notify_property_images_change();
+
+DROP TRIGGER IF EXISTS notify_property_images_update ON public.properties;
+CREATE TRIGGER notify_property_images_update
+  AFTER UPDATE OF images ON public.properties
+  FOR EACH ROW WHEN (cardinality(NEW.images) > 0 AND OLD.images IS DISTINCT FROM NEW.images)
+  EXECUTE FUNCTION public.notify_property_images_change();
+
+-- 3. Batched writes from the job: [{"id": ..., "placeholders": {"<url>": {...}}}, ...].
+-- Merged into what is there; the trigger above drops URLs removed meanwhile.
+CREATE OR REPLACE FUNCTION public.set_image_placeholders(updates jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  updated integer;
+BEGIN
+  IF jsonb_typeof(updates) IS DISTINCT FROM 'array' THEN
+    RAISE EXCEPTION 'updates must be a JSON array' USING ERRCODE = '22023';
+  END IF;
+
+  UPDATE public.properties p
+  SET image_placeholders = p.image_placeholders || u.placeholders
+  FROM jsonb_to_recordset(updates) AS u(id uuid, placeholders jsonb)
+  WHERE p.id = u.id
+    AND jsonb_typeof(u.placeholders) = 'object'
+    AND NOT p.image_placeholders @> u.placeholders;
+  GET DIAGNOSTICS updated = ROW_COUNT;
+  RETURN updated;
+END;
+$$;
+
+-- 4. Search functions return the column next to images. Bodies are unchanged from
+-- 20251222190000_geo_text_search_page.sql; the row type changes, so drop and recreate.
+DROP FUNCTION IF EXISTS public.search_properties_page(text, text, text, text, text, numeric, numeric, text, text, integer, double precision, double precision, double precision);
+DROP FUNCTION IF EXISTS public.search_properties_matches(text, text, text, text, text, numeric, numeric, double precision, double precision, double precision);
+
+CREATE FUNCTION public.search_properties_matches(
+  query_text text,
+  category_filter text,
+  city_filter text,
+  area_filter text,
+  pincode_filter text,
+  min_price numeric,
+  max_price numeric,
+  origin_lat double precision,
+  origin_lng double precision,
+  radius_km double precision
+)
+RETURNS TABLE (
+  id uuid,
+  title text,
+  description text,
+  price numeric,
+  price_type text,
+  property_type text,
+  status text,
+  available boolean,
+  images text[],
+  image_placeholders jsonb,
+  bedrooms integer,
+  bathrooms integer,
+  area_sqft numeric,
+  address text,
+  city text,
+  area text,
+  pin_code text,
+  latitude numeric,
+  longitude numeric,
+  amenities text[],
+  user_id uuid,
+  created_at timestamptz,
+  updated_at timestamptz,
+  views integer,
+  verified boolean,
+  featured boolean,
+  relevance_score double precision,
+  distance_m double precision
+)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT
+    p.id, p.title, p.description, p.price, p.price_type, p.property_type, p.status, p.available,
+    p.images, p.image_placeholders, p.bedrooms, p.bathrooms, p.area_sqft::numeric, p.address, p.city, p.area,
+    p.pin_code,
+    p.latitude, p.longitude, p.amenities, p.user_id, p.created_at, p.updated_at, p.views,
+    p.verified, p.featured,
+    CASE WHEN nullif(trim(query_text), '') IS NULL THEN 0
+         ELSE public.search_score(p.fts, p.search_text, query_text) END,
+    CASE WHEN origin_lat IS NULL OR origin_lng IS NULL THEN NULL::double precision
+         ELSE p.location <-> ST_SetSRID(ST_MakePoint(origin_lng, origin_lat), 4326)::geography END
+  FROM public.properties p
+  WHERE
+    p.status = 'active'
+    AND p.available = true
+    -- Word/prefix match on the fts GIN index, or a close spelling on the trigram index
+    AND (
+      nullif(trim(query_text), '') IS NULL
+      OR p.fts @@ public.search_tsquery(query_text)
+      OR lower(query_text) <% p.search_text
+    )
+    AND (category_filter IS NULL OR p.property_type = category_filter)
+    AND (city_filter IS NULL OR p.city ILIKE '%' || city_filter || '%')
+    AND (area_filter IS NULL OR p.area ILIKE '%' || area_filter || '%')
+    -- A full 6-digit PIN matches exactly; a shorter one matches as a prefix.
+    AND (pincode_filter IS NULL OR p.pin_code LIKE pincode_filter || '%')
+    AND (min_price IS NULL OR p.price >= min_price)
+    AND (max_price IS NULL OR p.price <= max_price)
+    -- Radius on idx_properties_location_active_gist (sphere distance, as `<->`)
+    AND (
+      origin_lat IS NULL OR origin_lng IS NULL
+      OR (
+        p.location IS NOT NULL
+        AND ST_DWithin(
+          p.location,
+          ST_SetSRID(ST_MakePoint(origin_lng, origin_lat), 4326)::geography,
+          least(greatest(coalesce(radius_km, 10), 0), 100) * 1000,
+          false
+        )
+      )
+    )
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.search_properties_matches(text, text, text, text, text, numeric, numeric, double precision, double precision, double precision) FROM PUBLIC, anon, authenticated;
+
+CREATE FUNCTION public.search_properties_page(
+  query_text text DEFAULT NULL,
+  category_filter text DEFAULT NULL,
+  city_filter text DEFAULT NULL,
+  area_filter text DEFAULT NULL,
+  pincode_filter text DEFAULT NULL,
+  min_price numeric DEFAULT NULL,
+  max_price numeric DEFAULT NULL,
+  sort_by text DEFAULT 'recent',
+  after_cursor text DEFAULT NULL,
+  page_size integer DEFAULT 24,
+  origin_lat double precision DEFAULT NULL,
+  origin_lng double precision DEFAULT NULL,
+  radius_km double precision DEFAULT NULL
+)
+RETURNS TABLE (
+  id uuid,
+  title text,
+  description text,
+  price numeric,
+  price_type text,
+  property_type text,
+  status text,
+  available boolean,
+  images text[],
+  image_placeholders jsonb,
+  bedrooms integer,
+  bathrooms integer,
+  area_sqft numeric,
+  address text,
+  city text,
+  area text,
+  pin_code text,
+  latitude numeric,
+  longitude numeric,
+  amenities text[],
+  user_id uuid,
+  created_at timestamptz,
+  updated_at timestamptz,
+  views integer,
+  verified boolean,
+  featured boolean,
+  relevance_score double precision,
+  distance_m double precision,
+  distance_km numeric,
+  cursor text
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+-- Plan each call with its actual arguments so the `x IS NULL OR ...` filters fold
+-- away and the matching index is chosen; a cached generic plan cannot do either.
+SET plan_cache_mode = force_custom_plan
+-- One-letter typos in short words ("mumbay") score about 0.55; the default is 0.6.
+SET pg_trgm.word_similarity_threshold = 0.5
+AS $$
+DECLARE
+  page_limit integer := least(greatest(coalesce(page_size, 24), 1), 100);
+  sort_key text := coalesce(sort_by, 'recent');
+  after_key jsonb;
+  after_id uuid;
+BEGIN
+  IF sort_key NOT IN ('recent', 'relevance', 'price-low', 'price-high', 'distance') THEN
+    RAISE EXCEPTION 'Unknown sort_by %', sort_by USING ERRCODE = '22023';
+  END IF;
+  IF sort_key = 'relevance' AND nullif(trim(query_text), '') IS NULL THEN
+    sort_key := 'recent';
+  END IF;
+  IF sort_key = 'distance' AND (origin_lat IS NULL OR origin_lng IS NULL) THEN
+    sort_key := 'recent';
+  END IF;
+
+  IF after_cursor IS NOT NULL THEN
+    after_key := public.decode_cursor(after_cursor);
+    IF after_key->>'sort' IS DISTINCT FROM sort_key OR after_key->>'id' IS NULL THEN
+      RAISE EXCEPTION 'Cursor does not belong to this search' USING ERRCODE = '22023';
+    END IF;
+    after_id := (after_key->>'id')::uuid;
+  END IF;
+
+  IF sort_key = 'recent' THEN
+    RETURN QUERY
+    SELECT m.*, round((m.distance_m / 1000)::numeric, 2),
+           public.encode_cursor(jsonb_build_object('sort', sort_key, 'at', m.created_at, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price, origin_lat, origin_lng, radius_km) m
+    WHERE after_key IS NULL OR (m.created_at, m.id) < ((after_key->>'at')::timestamptz, after_id)
+    ORDER BY m.created_at DESC, m.id DESC
+    LIMIT page_limit;
+  ELSIF sort_key = 'relevance' THEN
+    -- Scores are computed for every match, but there is no OFFSET to re-read.
+    RETURN QUERY
+    SELECT m.*, round((m.distance_m / 1000)::numeric, 2),
+           public.encode_cursor(jsonb_build_object('sort', sort_key, 'score', m.relevance_score, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price, origin_lat, origin_lng, radius_km) m
+    WHERE after_key IS NULL OR (m.relevance_score, m.id) < ((after_key->>'score')::double precision, after_id)
+    ORDER BY m.relevance_score DESC, m.id DESC
+    LIMIT page_limit;
+  ELSIF sort_key = 'distance' THEN
+    -- Nearest first from the KNN scan, pruned by the radius.
+    RETURN QUERY
+    SELECT m.*, round((m.distance_m / 1000)::numeric, 2),
+           public.encode_cursor(jsonb_build_object('sort', sort_key, 'dist', m.distance_m, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price, origin_lat, origin_lng, radius_km) m
+    WHERE after_key IS NULL OR (m.distance_m, m.id) > ((after_key->>'dist')::double precision, after_id)
+    ORDER BY m.distance_m ASC, m.id ASC
+    LIMIT page_limit;
+  ELSIF sort_key = 'price-low' THEN
+    RETURN QUERY
+    SELECT m.*, round((m.distance_m / 1000)::numeric, 2),
+           public.encode_cursor(jsonb_build_object('sort', sort_key, 'price', m.price, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price, origin_lat, origin_lng, radius_km) m
+    WHERE after_key IS NULL OR (m.price, m.id) > ((after_key->>'price')::numeric, after_id)
+    ORDER BY m.price ASC, m.id ASC
+    LIMIT page_limit;
+  ELSE
+    RETURN QUERY
+    SELECT m.*, round((m.distance_m / 1000)::numeric, 2),
+           public.encode_cursor(jsonb_build_object('sort', sort_key, 'price', m.price, 'id', m.id))
+    FROM public.search_properties_matches(query_text, category_filter, city_filter, area_filter, pincode_filter, min_price, max_price, origin_lat, origin_lng, radius_km) m
+    WHERE after_key IS NULL OR (m.price, m.id) < ((after_key->>'price')::numeric, after_id)
+    ORDER BY m.price DESC, m.id DESC
+    LIMIT page_limit;
+  END IF;
+END;
+$$;
+
+-- 5. So do the map and sponsored-row functions. Bodies are unchanged from
+-- 20251203000001_add_viewport_search.sql and 20251215170000_fix_rpc_and_messages.sql.
+DROP FUNCTION IF EXISTS public.search_properties_in_view(numeric, numeric, numeric, numeric, text, numeric, numeric, integer, integer, numeric, numeric);
+DROP FUNCTION IF EXISTS public.get_sponsored_properties(text, text, text, double precision, double precision, double precision);
+
+CREATE FUNCTION public.search_properties_in_view(
+  min_lat numeric,
+  min_lng numeric,
+  max_lat numeric,
+  max_lng numeric,
+  property_type_filter text DEFAULT NULL,
+  min_price numeric DEFAULT NULL,
+  max_price numeric DEFAULT NULL,
+  min_bedrooms integer DEFAULT NULL,
+  min_bathrooms integer DEFAULT NULL,
+  user_lat numeric DEFAULT NULL,
+  user_lng numeric DEFAULT NULL
+)
+RETURNS TABLE (
+  id uuid,
+  title text,
+  description text,
+  price numeric,
+  price_type text,
+  property_type text,
+  status text,
+  available boolean,
+  images text[],
+  image_placeholders jsonb,
+  bedrooms integer,
+  bathrooms integer,
+  area_sqft numeric,
+  address text,
+  city text,
+  area text,
+  pin_code text,
+  latitude numeric,
+  longitude numeric,
+  amenities text[],
+  user_id uuid,
+  created_at timestamptz,
+  updated_at timestamptz,
+  views integer,
+  verified boolean,
+  featured boolean,
+  distance_km numeric,
+  relevance_score numeric,
+  total_count bigint
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+  RETURN QUERY
+  SELECT 
+    p.id,
+    p.title,
+    p.description,
+    p.price,
+    p.price_type,
+    p.property_type,
+    p.status,
+    p.available,
+    p.images,
+    p.image_placeholders,
+    p.bedrooms,
+    p.bathrooms,
+    p.area_sqft,
+    p.address,
+    p.city,
+    p.area,
+    p.pin_code,
+    p.latitude,
+    p.longitude,
+    p.amenities,
+    p.user_id,
+    p.created_at,
+    p.updated_at,
+    p.views,
+    p.verified,
+    p.featured,
+    -- Calculate distance if user location is provided
+    CASE 
+      WHEN user_lat IS NOT NULL AND user_lng IS NOT NULL THEN
+        (point(p.longitude, p.latitude) <@> point(user_lng, user_lat)) * 1.60934
+      ELSE NULL
+    END as distance_km,
+    0.0 as relevance_score,
+    COUNT(*) OVER() as total_count
+  FROM properties p
+  WHERE
+    p.status = 'active'
+    AND p.available = true
+    AND p.latitude BETWEEN min_lat AND max_lat
+    AND p.longitude BETWEEN min_lng AND max_lng
+    AND (property_type_filter IS NULL OR p.property_type = property_type_filter)
+    AND (min_price IS NULL OR p.price >= min_price)
+    AND (max_price IS NULL OR p.price <= max_price)
+    AND (min_bedrooms IS NULL OR p.bedrooms >= min_bedrooms)
+    AND (min_bathrooms IS NULL OR p.bathrooms >= min_bathrooms)
+  ORDER BY p.created_at DESC
+  LIMIT 100;
+END;
+$$;
+
+CREATE FUNCTION public.get_sponsored_properties(
+  filter_city text DEFAULT NULL,
+  filter_area text DEFAULT NULL,
+  filter_pin_code text DEFAULT NULL,
+  filter_lat float DEFAULT NULL,
+  filter_lng float DEFAULT NULL,
+  radius_km float DEFAULT 10
+)
+RETURNS TABLE (
+  id uuid,
+  title text,
+  description text,
+  price numeric,
+  price_type text,
+  property_type text,
+  status text,
+  available boolean,
+  verified boolean,
+  images text[],
+  image_placeholders jsonb,
+  bedrooms numeric,
+  bathrooms numeric,
+  area_sqft numeric,
+  city text,
+  area text,
+  pin_code text,
+  latitude float,
+  longitude float,
+  user_id uuid,
+  created_at timestamptz,
+  updated_at timestamptz,
+  views numeric,
+  campaign_id uuid
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+  RETURN QUERY
+  SELECT 
+    p.id,
+    p.title,
+    p.description,
+    p.price,
+    p.price_type,
+    p.property_type,
+    p.status,
+    p.available,
+    p.verified,
+    p.images,
+    p.image_placeholders,
+    p.bedrooms,
+    p.bathrooms,
+    p.area_sqft,
+    p.city,
+    p.area,
+    p.pin_code,
+    p.latitude,
+    p.longitude,
+    p.user_id,
+    p.created_at,
+    p.updated_at,
+    p.views,
+    ac.id as campaign_id
+  FROM properties p
+  JOIN ad_campaigns ac ON p.id = ac.property_id
+  WHERE 
+    ac.status = 'active'
+    AND ac.start_date <= now()
+    AND ac.end_date >= now()
+    AND p.status = 'active'
+    AND p.available = true
+    AND (
+      -- Filter by City
+      (filter_city IS NULL OR p.city ILIKE '%' || filter_city || '%')
+      AND
+      -- Filter by Area
+      (filter_area IS NULL OR p.area ILIKE '%' || filter_area || '%')
+      AND
+      -- Filter by Pin Code
+      (filter_pin_code IS NULL OR p.pin_code = filter_pin_code)
+      AND
+      -- Filter by Location (Radius)
+      (
+        filter_lat IS NULL 
+        OR filter_lng IS NULL 
+        OR (
+          p.latitude IS NOT NULL 
+          AND p.longitude IS NOT NULL 
+          AND (
+            6371 * acos(
+              cos(radians(filter_lat)) * cos(radians(p.latitude)) * cos(radians(p.longitude) - radians(filter_lng)) +
+              sin(radians(filter_lat)) * sin(radians(p.latitude))
+            )
+          ) <= radius_km
+        )
+      )
+    )
+  ORDER BY ac.created_at DESC;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.prune_image_placeholders() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.notify_property_images_change() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.set_image_placeholders(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.set_image_placeholders(jsonb) TO service_role;
+GRANT EXECUTE ON FUNCTION public.search_properties_page(text, text, text, text, text, numeric, numeric, text, text, integer, double precision, double precision, double precision) TO authenticated, anon;
+GRANT EXECUTE ON FUNCTION public.search_properties_in_view(numeric, numeric, numeric, numeric, text, numeric, numeric, integer, integer, numeric, numeric) TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.get_sponsored_properties(text, text, text, double precision, double precision, double precision) TO anon, authenticated;
+
+COMMENT ON COLUMN public.properties.image_placeholders IS
+  'Per image URL: {lqip, color, aspect_ratio} (width / height) for painting a card before its photo loads. Written by services/image_placeholders.';
+COMMENT ON FUNCTION public.set_image_placeholders(jsonb) IS
+  'Merges [{id, placeholders}] into properties.image_placeholders; returns the rows changed. Service only.';
+COMMENT ON FUNCTION public.search_properties_page(text, text, text, text, text, numeric, numeric, text, text, integer, double precision, double precision, double precision) IS
+  'Cursor-paginated listing search, optionally within radius_km of (origin_lat, origin_lng). sort_by: recent | relevance | price-low | price-high | distance. Pass the last row''s cursor as after_cursor for the next page.';
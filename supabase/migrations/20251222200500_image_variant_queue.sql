@@ -0,0 +1,173 @@
+-- Migration: Queue and row data for listing image variants
+-- Description: services/image_variants found new uploads by listing the whole bucket,
+-- one Storage API call per folder (and variants/ has a folder per photo), every 30 s;
+-- and cards fetched each photo's manifest.json before they could pick a size, a serial
+-- round trip that 404ed for every photo without variants. Now:
+--   * an upload into property-images is announced on channel 'image_variants'
+--     (payload: the object name), and the worker's catch-up pass is one indexed query
+--     over storage.objects instead of a bucket listing;
+--   * set_image_variants() records what was rendered per object in image_variants and
+--     copies it onto the listings showing that photo, as
+--       image_placeholders = {"<url>": {..., "variants": {"formats": ["webp", "avif"],
+--                             "widths": {"thumbnail": 300, "medium": 900, "large": 1600}}}}
+--     A listing saved after its photos were rendered picks the entry up on write.
+-- Variant URLs follow from the photo's own (variants/<object name>/<size>.<format>), so
+-- the card builds its srcset from the row it already has and requests nothing else.
+
+-- 1. Rendered variants per object name (<user id>/<file name>)
+CREATE TABLE IF NOT EXISTS public.image_variants (
+  key text PRIMARY KEY,
+  variants jsonb NOT NULL,
+  updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+-- Written and read by the SECURITY DEFINER functions below only.
+ALTER TABLE public.image_variants ENABLE ROW LEVEL SECURITY;
+REVOKE ALL ON public.image_variants FROM anon, authenticated;
+
+-- Object name of a public property-images URL, or NULL for any other URL.
+CREATE OR REPLACE FUNCTION public.listing_image_key(url text)
+RETURNS text
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT substring(url FROM '/storage/v1/object/public/property-images/([^?#]+)');
+$$;
+
+-- 2. Announce uploads. Variants the worker writes back are skipped.
+CREATE OR REPLACE FUNCTION public.notify_listing_image_upload()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  PERFORM pg_notify('image_variants', NEW.name);
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS notify_listing_image_upload ON storage.objects;
+CREATE TRIGGER notify_listing_image_upload
+  AFTER INSERT ON storage.objects
+  FOR EACH ROW WHEN (NEW.bucket_id = 'property-images' AND NEW.name NOT LIKE 'variants/%')
+  EXECUTE FUNCTION public.notify_listing_image_upload();
+
+-- 3. Listings written after their photos were rendered (AddProperty uploads first,
+-- then inserts the row) copy the entries in on the way in.
+CREATE OR REPLACE FUNCTION public.attach_image_variants()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  found jsonb;
+BEGIN
+  SELECT jsonb_object_agg(
+    img.url, coalesce(NEW.image_placeholders -> img.url, '{}'::jsonb) || jsonb_build_object('variants', v.variants)
+  )
+  INTO found
+  FROM unnest(NEW.images) AS img(url)
+  JOIN image_variants v ON v.key = listing_image_key(img.url);
+
+  IF found IS NOT NULL THEN
+    NEW.image_placeholders := NEW.image_placeholders || found;
+  END IF;
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS attach_image_variants ON public.properties;
+CREATE TRIGGER attach_image_variants
+  BEFORE INSERT OR UPDATE OF images ON public.properties
+  FOR EACH ROW WHEN (cardinality(NEW.images) > 0)
+  EXECUTE FUNCTION public.attach_image_variants();
+
+-- 4. Batched writes from the worker: [{"key": "<object name>", "variants": {...}}, ...].
+-- Photos are uploaded under their owner's folder, so the listings to update are found
+-- through idx_properties_user_id rather than by scanning every images array.
+CREATE OR REPLACE FUNCTION public.set_image_variants(updates jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  updated integer;
+BEGIN
+  IF jsonb_typeof(updates) IS DISTINCT FROM 'array' THEN
+    RAISE EXCEPTION 'updates must be a JSON array' USING ERRCODE = '22023';
+  END IF;
+
+  INSERT INTO image_variants AS v (key, variants)
+  SELECT DISTINCT ON (u.key) u.key, u.variants
+  FROM jsonb_to_recordset(updates) AS u(key text, variants jsonb)
+  WHERE u.key IS NOT NULL AND jsonb_typeof(u.variants) = 'object'
+  ORDER BY u.key
+  ON CONFLICT (key) DO UPDATE SET variants = EXCLUDED.variants, updated_at = now();
+
+  WITH merged AS (
+    SELECT p.id, jsonb_object_agg(
+      img.url, coalesce(p.image_placeholders -> img.url, '{}'::jsonb) || jsonb_build_object('variants', v.variants)
+    ) AS entries
+    FROM jsonb_to_recordset(updates) AS u(key text)
+    JOIN image_variants v ON v.key = u.key
+    JOIN properties p ON p.user_id = CASE
+      WHEN u.key ~ '^[0-9a-fA-F-]{36}/' THEN split_part(u.key, '/', 1)::uuid
+    END
+    CROSS JOIN LATERAL unnest(p.images) AS img(url)
+    WHERE listing_image_key(img.url) = u.key
+    GROUP BY p.id
+  )
+  UPDATE properties p
+  SET image_placeholders = p.image_placeholders || m.entries
+  FROM merged m
+  WHERE p.id = m.id
+    AND NOT p.image_placeholders @> m.entries;
+  GET DIAGNOSTICS updated = ROW_COUNT;
+  RETURN updated;
+END;
+$$;
+
+-- 5. Placeholders and variants now share each URL's entry: merge per URL, so writing
+-- one never drops the other.
+CREATE OR REPLACE FUNCTION public.set_image_placeholders(updates jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  updated integer;
+BEGIN
+  IF jsonb_typeof(updates) IS DISTINCT FROM 'array' THEN
+    RAISE EXCEPTION 'updates must be a JSON array' USING ERRCODE = '22023';
+  END IF;
+
+  UPDATE public.properties p
+  SET image_placeholders = p.image_placeholders || (
+    SELECT jsonb_object_agg(e.key, coalesce(p.image_placeholders -> e.key, '{}'::jsonb) || e.value)
+    FROM jsonb_each(u.placeholders) e
+  )
+  FROM jsonb_to_recordset(updates) AS u(id uuid, placeholders jsonb)
+  WHERE p.id = u.id
+    AND jsonb_typeof(u.placeholders) = 'object'
+    AND u.placeholders <> '{}'::jsonb
+    AND NOT p.image_placeholders @> u.placeholders;
+  GET DIAGNOSTICS updated = ROW_COUNT;
+  RETURN updated;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.notify_listing_image_upload() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.attach_image_variants() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.set_image_variants(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.set_image_variants(jsonb) TO service_role;
+
+COMMENT ON TABLE public.image_variants IS
+  'Variants services/image_variants rendered per property-images object: {formats, widths}. Copied onto listings by set_image_variants and attach_image_variants.';
+COMMENT ON COLUMN public.properties.image_placeholders IS
+  'Per image URL: {lqip, color, aspect_ratio} (width / height) for painting a card before its photo loads, written by services/image_placeholders, and {variants: {formats, widths}} once services/image_variants has rendered it.';
+COMMENT ON FUNCTION public.set_image_variants(jsonb) IS
+  'Records [{key, variants}] and merges them into image_placeholders of the listings showing those photos; returns the listings changed. Service only.';
@@ -0,0 +1,236 @@
+-- Migration: Monthly audit_logs partitions and per-statement deletion logging
+-- Description: log_deletion() ran BEFORE DELETE FOR EACH ROW, so deleting an account
+-- (cascading to hundreds of properties, messages and campaigns) made one audit INSERT
+-- per row, and purge_old_audit_logs() then removed old entries with one large DELETE.
+--   * audit_logs is range-partitioned by month (UTC), audit_logs_YYYY_MM, with a
+--     default partition for anything outside the months that exist;
+--   * log_deletions() runs once per statement and writes every deleted row from the
+--     transition table in a single INSERT;
+--   * purge_old_audit_logs() drops whole months past the retention window and deletes
+--     only the remainder of the month the cutoff falls in;
+--   * run_purge_audit_logs() adds the coming months and purges, daily through pg_cron
+--     where the extension is installed. Without it, call it from any scheduler at least
+--     monthly; the migration creates a year of partitions so a missed run only sends
+--     rows to the default partition, which the next run moves into their month.
+-- The user_id foreign key goes: with ON DELETE SET NULL, deleting an account rewrote
+-- every audit row of that user (including the ones the deletion just wrote), and an
+-- audit trail should keep the id of the account that was removed.
+-- Live databases may carry extra columns (old_data, new_data, ...); the new table is
+-- created LIKE the old one, so they are kept.
+
+-- 1. Partitioned table with the old one's columns
+DROP TRIGGER IF EXISTS trigger_log_property_deletion ON public.properties;
+DROP TRIGGER IF EXISTS trigger_log_campaign_deletion ON public.ad_campaigns;
+DROP TRIGGER IF EXISTS trigger_log_message_deletion ON public.messages;
+DROP FUNCTION IF EXISTS public.log_deletion();
+
+ALTER TABLE public.audit_logs ADD COLUMN IF NOT EXISTS record_data jsonb;
+UPDATE public.audit_logs SET created_at = now() WHERE created_at IS NULL;
+ALTER TABLE public.audit_logs RENAME TO audit_logs_unpartitioned;
+
+CREATE TABLE public.audit_logs (LIKE public.audit_logs_unpartitioned INCLUDING DEFAULTS)
+  PARTITION BY RANGE (created_at);
+
+ALTER TABLE public.audit_logs
+  ALTER COLUMN id SET DEFAULT gen_random_uuid(),
+  ALTER COLUMN created_at SET DEFAULT now(),
+  ALTER COLUMN created_at SET NOT NULL,
+  ADD PRIMARY KEY (id, created_at);
+
+CREATE TABLE public.audit_logs_default PARTITION OF public.audit_logs DEFAULT;
+ALTER TABLE public.audit_logs_default ENABLE ROW LEVEL SECURITY;
+
+-- 2. Monthly partitions from first_month to months_ahead months past the current one.
+-- Rows already in the default partition for a new month are moved into it first, since
+-- ATTACH refuses a range the default partition still holds rows for.
+CREATE OR REPLACE FUNCTION public.ensure_audit_log_partitions(first_month date DEFAULT NULL, months_ahead integer DEFAULT 2)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  this_month date := date_trunc('month', now() AT TIME ZONE 'UTC')::date;
+  month date;
+  part text;
+  lower_bound timestamptz;
+  upper_bound timestamptz;
+  created integer := 0;
+BEGIN
+  IF months_ahead IS NULL OR months_ahead < 0 OR months_ahead > 24 THEN
+    RAISE EXCEPTION 'months_ahead must be between 0 and 24' USING ERRCODE = '22023';
+  END IF;
+
+  month := date_trunc('month', coalesce(first_month, this_month))::date;
+  WHILE month <= this_month + make_interval(months => months_ahead) LOOP
+    part := 'audit_logs_' || to_char(month, 'YYYY_MM');
+    IF to_regclass(format('public.%I', part)) IS NULL THEN
+      lower_bound := month::timestamp AT TIME ZONE 'UTC';
+      upper_bound := (month + interval '1 month') AT TIME ZONE 'UTC';
+
+      EXECUTE format('CREATE TABLE public.%I (LIKE public.audit_logs INCLUDING DEFAULTS)', part);
+      EXECUTE format(
+        'WITH moved AS (
+           DELETE FROM public.audit_logs_default WHERE created_at >= $1 AND created_at < $2 RETURNING *
+         )
+         INSERT INTO public.%I SELECT * FROM moved',
+        part
+      ) USING lower_bound, upper_bound;
+      EXECUTE format(
+        'ALTER TABLE public.audit_logs ATTACH PARTITION public.%I FOR VALUES FROM (%L) TO (%L)',
+        part, lower_bound, upper_bound
+      );
+      -- Reads go through audit_logs and its policies; no policies here means no direct access.
+      EXECUTE format('ALTER TABLE public.%I ENABLE ROW LEVEL SECURITY', part);
+      created := created + 1;
+    END IF;
+    month := (month + interval '1 month')::date;
+  END LOOP;
+
+  RETURN created;
+END;
+$$;
+
+-- 3. Copy the history into its months and drop the old table (with its policies, indexes
+-- and the user_id foreign key). A year of months ahead, so nothing depends on the
+-- daily job running from day one.
+SELECT public.ensure_audit_log_partitions(
+  (SELECT min(created_at) AT TIME ZONE 'UTC' FROM public.audit_logs_unpartitioned)::date,
+  12
+);
+
+INSERT INTO public.audit_logs SELECT * FROM public.audit_logs_unpartitioned;
+
+DROP TABLE public.audit_logs_unpartitioned;
+
+-- idx_audit_logs_user_id and idx_audit_logs_table_name are prefixes of these two.
+CREATE INDEX idx_audit_logs_created_at ON public.audit_logs (created_at DESC);
+CREATE INDEX idx_audit_logs_user_action ON public.audit_logs (user_id, action, created_at DESC);
+CREATE INDEX idx_audit_logs_table_record ON public.audit_logs (table_name, record_id);
+
+ALTER TABLE public.audit_logs ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Admins can view all audit logs"
+  ON public.audit_logs
+  FOR SELECT
+  USING (has_role(auth.uid(), 'admin'::app_role));
+
+CREATE POLICY "Admins have full control of audit_logs"
+  ON public.audit_logs
+  FOR ALL
+  USING (is_management_role(auth.uid()))
+  WITH CHECK (is_management_role(auth.uid()));
+
+-- 4. One INSERT per deleting statement. A cascade from auth.users deletes each table's
+-- rows for that user in one statement, so an account deletion writes one audit INSERT
+-- per table. Messages have no user_id; the sender is recorded instead.
+CREATE OR REPLACE FUNCTION public.log_deletions()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  INSERT INTO public.audit_logs (user_id, action, table_name, record_id, record_data)
+  SELECT
+    coalesce((r.data->>'user_id')::uuid, (r.data->>'sender_id')::uuid, auth.uid()),
+    'DELETE',
+    TG_TABLE_NAME,
+    (r.data->>'id')::uuid,
+    r.data
+  FROM (SELECT to_jsonb(o) AS data FROM old_rows o) r;
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trigger_log_property_deletion
+  AFTER DELETE ON public.properties
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.log_deletions();
+
+CREATE TRIGGER trigger_log_campaign_deletion
+  AFTER DELETE ON public.ad_campaigns
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.log_deletions();
+
+CREATE TRIGGER trigger_log_message_deletion
+  AFTER DELETE ON public.messages
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.log_deletions();
+
+-- 5. Purge by dropping months. Only the month the cutoff falls in (and the default
+-- partition) still needs a DELETE, and partition pruning confines it to those.
+CREATE OR REPLACE FUNCTION public.purge_old_audit_logs(retention_days integer DEFAULT 90)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  cutoff timestamptz;
+  part record;
+BEGIN
+  IF retention_days IS NULL OR retention_days < 1 THEN
+    RAISE EXCEPTION 'retention_days must be at least 1' USING ERRCODE = '22023';
+  END IF;
+  cutoff := now() - make_interval(days => retention_days);
+
+  FOR part IN
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'public.audit_logs'::regclass
+      AND c.relname ~ '^audit_logs_[0-9]{4}_[0-9]{2}$'
+      AND (to_date(substr(c.relname, 12), 'YYYY_MM') + interval '1 month') AT TIME ZONE 'UTC' <= cutoff
+  LOOP
+    EXECUTE format('ALTER TABLE public.audit_logs DETACH PARTITION public.%I', part.relname);
+    EXECUTE format('DROP TABLE public.%I', part.relname);
+  END LOOP;
+
+  DELETE FROM public.audit_logs WHERE created_at < cutoff;
+END;
+$$;
+
+-- 6. Daily maintenance: the next three months' partitions, then the 90-day purge.
+DROP FUNCTION IF EXISTS public.run_purge_audit_logs();
+
+CREATE FUNCTION public.run_purge_audit_logs()
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  PERFORM public.ensure_audit_log_partitions(NULL, 3);
+  PERFORM public.purge_old_audit_logs(90);
+END;
+$$;
+
+-- pg_cron is optional (enable it under Database > Extensions); see the header for
+-- running the job without it.
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+    PERFORM cron.schedule('audit-logs-maintenance', '17 3 * * *', 'SELECT public.run_purge_audit_logs()');
+  END IF;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.ensure_audit_log_partitions(date, integer) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.log_deletions() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.purge_old_audit_logs(integer) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.run_purge_audit_logs() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.ensure_audit_log_partitions(date, integer) TO service_role;
+GRANT EXECUTE ON FUNCTION public.purge_old_audit_logs(integer) TO service_role;
+GRANT EXECUTE ON FUNCTION public.run_purge_audit_logs() TO service_role;
+
+COMMENT ON TABLE public.audit_logs IS
+  'Deleted rows of properties, ad_campaigns and messages. Partitioned by month (UTC); see ensure_audit_log_partitions.';
+COMMENT ON FUNCTION public.ensure_audit_log_partitions(date, integer) IS
+  'Creates audit_logs_YYYY_MM partitions from first_month (default: this month) to months_ahead months ahead; returns how many it created.';
+COMMENT ON FUNCTION public.log_deletions() IS
+  'AFTER DELETE statement trigger: writes every deleted row to audit_logs in one INSERT.';
+COMMENT ON FUNCTION public.purge_old_audit_logs(integer) IS
+  'Drops audit_logs months older than retention_days and deletes the rest of the boundary month.';
+COMMENT ON FUNCTION public.run_purge_audit_logs() IS
+  'Daily audit_logs maintenance (pg_cron job audit-logs-maintenance): creates the next three months of partitions, then purges past 90 days.';
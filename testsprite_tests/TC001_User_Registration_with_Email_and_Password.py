@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,126 +51,126 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Sign in' link to go to login/registration page
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click on 'Continue with Email' button to proceed with email registration.
         frame = context.pages[-1]
         # Click on 'Continue with Email' button to start email registration
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click on 'Sign Up' tab to switch to registration form.
         frame = context.pages[-1]
         # Click on 'Sign Up' tab to switch to registration form
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click on 'Continue with Email' button to try to reach the email login/sign-up form with registration option.
         frame = context.pages[-1]
         # Click on 'Continue with Email' button to open email login/sign-up form
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click on 'Sign Up' tab to switch to registration form.
         frame = context.pages[-1]
         # Click on 'Sign Up' tab to switch to registration form
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input valid Full Name, Email, Phone (optional), and Password, then click 'Create Account' to submit the registration form.
         frame = context.pages[-1]
         # Input valid full name in Full Name field
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[3]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
+        await actions.fill(page, elem, 'Test User')
         
 
         frame = context.pages[-1]
         # Input valid email address in Email field
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[3]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(page, elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Input valid phone number in Phone (Optional) field
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[3]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1234567890')
+        await actions.fill(page, elem, '1234567890')
         
 
         frame = context.pages[-1]
         # Input valid password in Password field
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[3]/form/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPassword123!')
+        await actions.fill(page, elem, 'StrongPassword123!')
         
 
         # -> Click on 'Continue with Email' button to proceed to email login/sign-up form.
         frame = context.pages[-1]
         # Click on 'Continue with Email' button to proceed to email login/sign-up form
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click on 'Sign Up' tab to switch to registration form.
         frame = context.pages[-1]
         # Click on 'Sign Up' tab to switch to registration form
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click on 'Continue with Email' button to proceed to email login/sign-up form.
         frame = context.pages[-1]
         # Click on 'Continue with Email' button to proceed to email login/sign-up form
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click on 'Sign Up' tab to switch to registration form.
         frame = context.pages[-1]
         # Click on 'Sign Up' tab to switch to registration form
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input valid Full Name, Email, Phone (optional), and Password, then click 'Create Account' to submit the registration form.
         frame = context.pages[-1]
         # Input valid full name in Full Name field
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[3]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
+        await actions.fill(page, elem, 'Test User')
         
 
         frame = context.pages[-1]
         # Input valid email address in Email field
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[3]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(page, elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Input valid phone number in Phone (Optional) field
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[3]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1234567890')
+        await actions.fill(page, elem, '1234567890')
         
 
         frame = context.pages[-1]
         # Input valid password in Password field
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[3]/form/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPassword123!')
+        await actions.fill(page, elem, 'StrongPassword123!')
         
 
         frame = context.pages[-1]
         # Click 'Create Account' button to submit the registration form
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click on 'Continue with Email' button to proceed to email login/sign-up form.
         frame = context.pages[-1]
         # Click on 'Continue with Email' button to proceed to email login/sign-up form
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # --> Assertions to verify final state
@@ -178,7 +179,7 @@ async def run_test():
             await expect(frame.locator('text=Registration Complete! Welcome to Your New Account').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The registration process did not complete successfully as expected. The user did not receive the email verification prompt, was not prompted to complete profile setup, or was not redirected to the homepage after registration.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,27 +51,27 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Sign in' link to go to the login page.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click on 'Continue with Google' button to initiate Google OAuth login.
         frame = context.pages[-1]
         # Click on 'Continue with Google' button to start Google OAuth login.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input the email address for Google OAuth login.
         frame = context.pages[-1]
         # Input email address for Google OAuth login.
         elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[2]/div/div/div/form/span/section/div/div/div/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(page, elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Click 'Next' button to proceed with Google OAuth login.
         elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[3]/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # --> Assertions to verify final state
@@ -79,7 +80,7 @@ async def run_test():
             await expect(frame.locator('text=Login Successful').first).to_be_visible(timeout=30000)
         except AssertionError:
             raise AssertionError('Test case failed: User login via Google OAuth was not successful, or user was not redirected to the homepage as expected.')
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
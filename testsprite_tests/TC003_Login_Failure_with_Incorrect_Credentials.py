@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,46 +51,46 @@ async def run_test():
         frame = context.pages[-1]
         # Click the 'Sign in' link to navigate to the login page.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click 'Continue with Email' to proceed to email/password login form.
         frame = context.pages[-1]
         # Click the 'Continue with Email' button to open the email/password login form.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click 'Continue with Email' button to open the email/password login form.
         frame = context.pages[-1]
         # Click the 'Continue with Email' button to open the email/password login form.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input incorrect email and password, then click the 'Sign In' button.
         frame = context.pages[-1]
         # Input incorrect email in the email field.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('wrongemail@example.com')
+        await actions.fill(page, elem, 'wrongemail@example.com')
         
 
         frame = context.pages[-1]
         # Input incorrect password in the password field.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('wrongpassword')
+        await actions.fill(page, elem, 'wrongpassword')
         
 
         frame = context.pages[-1]
         # Click the 'Sign In' button to attempt login with incorrect credentials.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Invalid login credentials').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions, locators
 
 async def run_test():
     pw = None
@@ -49,76 +50,76 @@ async def run_test():
         # -> Enter search keywords and select a category filter.
         frame = context.pages[-1]
         # Select 'Homes' category filter
-        elem = frame.locator('xpath=html/body/div/div[2]/div/main/div/div/div[2]/section/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = await locators.locate(frame, "TC004.homes_category")
+        await actions.click(page, elem, response="rpc/search_properties_page")
         
 
         # -> Set location filter via location selector.
         frame = context.pages[-1]
         # Click 'All cities' to open location selector
-        elem = frame.locator('xpath=html/body/div/div[2]/div/main/div/div/div/div/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = await locators.locate(frame, "TC004.location_selector")
+        await actions.click(page, elem)
         
 
         # -> Select 'City' as location filter method.
         frame = context.pages[-1]
         # Select 'City' to search by city name
-        elem = frame.locator('xpath=html/body/div[3]/div[2]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = await locators.locate(frame, "TC004.location_method_city")
+        await actions.click(page, elem)
         
 
         # -> Open city dropdown to select a city.
         frame = context.pages[-1]
         # Open city dropdown to select a city
-        elem = frame.locator('xpath=html/body/div/div[2]/div/main/div/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = await locators.locate(frame, "TC004.city_dropdown")
+        await actions.click(page, elem)
         
 
         # -> Set price range filter.
         frame = context.pages[-1]
         # Click 'Most Recent' dropdown to open sorting and filter options
-        elem = frame.locator('xpath=html/body/div/div[2]/div/main/div/div/div/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = await locators.locate(frame, "TC004.sort_menu")
+        await actions.click(page, elem)
         
 
         # -> Select 'Price: Low to High' to apply price range filter.
         frame = context.pages[-1]
         # Select 'Price: Low to High' from sorting options
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = await locators.locate(frame, "TC004.sort_price_low")
+        await actions.click(page, elem, response="rpc/search_properties_page")
         
 
         # -> Refresh the page to attempt to resolve the loading spinner and reapply filters.
         await page.goto('http://127.0.0.1:8080', timeout=10000)
-        await asyncio.sleep(3)
+        await actions.settle(page)
         
 
         # -> Apply category filter 'Homes' again.
         frame = context.pages[-1]
         # Click 'Homes' category filter
-        elem = frame.locator('xpath=html/body/div/div[2]/div/main/div/div/div[2]/section/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = await locators.locate(frame, "TC004.homes_category")
+        await actions.click(page, elem, response="rpc/search_properties_page")
         
 
         # -> Set location filter via location selector again.
         frame = context.pages[-1]
         # Click 'All cities' to open location selector
-        elem = frame.locator('xpath=html/body/div/div[2]/div/main/div/div/div/div/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = await locators.locate(frame, "TC004.location_selector")
+        await actions.click(page, elem)
         
 
         # -> Select 'City' as location filter method again.
         frame = context.pages[-1]
         # Select 'City' to search by city name
-        elem = frame.locator('xpath=html/body/div[3]/div[2]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = await locators.locate(frame, "TC004.location_method_city")
+        await actions.click(page, elem)
         
 
         # -> Retry opening the city dropdown to select a city.
         frame = context.pages[-1]
         # Retry opening city dropdown to select a city
-        elem = frame.locator('xpath=html/body/div/div[2]/div/main/div/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = await locators.locate(frame, "TC004.city_dropdown")
+        await actions.click(page, elem)
         
 
         # --> Assertions to verify final state
@@ -144,7 +145,7 @@ async def run_test():
         await expect(frame.locator('text=house').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=HSR Layout, Bangalore').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=₹30,903/month').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,7 +51,7 @@ async def run_test():
         frame = context.pages[-1]
         # Allow geolocation permission for the app if a prompt appears.
         elem = frame.locator('xpath=html/body/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # --> Assertions to verify final state
@@ -59,7 +60,7 @@ async def run_test():
             await expect(frame.locator('text=Listings within 100 km radius').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The 'Near Me' filter did not return listings within the specified radius based on user geolocation as expected.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,53 +51,53 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Sign in' link to start login process as listing owner.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click on 'Continue with Email' to proceed with email login.
         frame = context.pages[-1]
         # Click on 'Continue with Email' button to proceed with email login.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input email and password, then click 'Sign In' to login as listing owner.
         frame = context.pages[-1]
         # Input email for listing owner login.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('owner@example.com')
+        await actions.fill(page, elem, 'owner@example.com')
         
 
         frame = context.pages[-1]
         # Input password for listing owner login.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('OwnerPass123')
+        await actions.fill(page, elem, 'OwnerPass123')
         
 
         frame = context.pages[-1]
         # Click 'Sign In' button to submit login form.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click on 'Continue with Google' to attempt login as listing owner using Google authentication.
         frame = context.pages[-1]
         # Click on 'Continue with Google' button to attempt login using Google authentication.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input Google account email and click 'Next' to proceed with Google authentication.
         frame = context.pages[-1]
         # Input Google account email for listing owner login.
         elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[2]/div/div/div/form/span/section/div/div/div/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('owner@gmail.com')
+        await actions.fill(page, elem, 'owner@gmail.com')
         
 
         frame = context.pages[-1]
         # Click 'Next' button to proceed with Google authentication.
         elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[3]/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # --> Assertions to verify final state
@@ -105,7 +106,7 @@ async def run_test():
             await expect(frame.locator('text=Listing created successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The listing creation process did not complete successfully as required by the test plan. The listing owner was unable to create a new listing with all required fields and image compression.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
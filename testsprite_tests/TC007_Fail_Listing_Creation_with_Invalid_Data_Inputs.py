@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,106 +51,106 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Add Property' to go to create listing form
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div[5]/div/ul/li/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click 'Continue with Email' to proceed with login.
         frame = context.pages[-1]
         # Click 'Continue with Email' button to start login process
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input valid email and password, then click 'Sign In' to authenticate.
         frame = context.pages[-1]
         # Input valid email for login
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(page, elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Input valid password for login
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123')
+        await actions.fill(page, elem, 'TestPassword123')
         
 
         # -> Click 'Continue with Email' button to proceed to email login form.
         frame = context.pages[-1]
         # Click 'Continue with Email' button to proceed to email login form
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input valid email and password, then click 'Sign In' to authenticate.
         frame = context.pages[-1]
         # Input valid email for login
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(page, elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Input valid password for login
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123')
+        await actions.fill(page, elem, 'TestPassword123')
         
 
         frame = context.pages[-1]
         # Click 'Sign In' button to submit login form
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Try to proceed with 'Continue with Google' or explore alternative ways to access create listing form.
         frame = context.pages[-1]
         # Click 'Continue with Google' button to attempt alternative login method
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input email or phone and click 'Next' to proceed with Google sign-in.
         frame = context.pages[-1]
         # Input email for Google sign-in
         elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[2]/div/div/div/form/span/section/div/div/div/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(page, elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Click 'Next' button to proceed with Google sign-in
         elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[3]/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click 'Try again' to attempt to restart the sign-in process or return to the app to explore alternative login methods.
         frame = context.pages[-1]
         # Click 'Try again' link to restart Google sign-in process
         elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[3]/div/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input invalid or blank email to test validation errors on Google sign-in page.
         frame = context.pages[-1]
         # Leave email input blank to test validation error
         elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[2]/div/div/div/form/span/section/div/div/div/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await actions.fill(page, elem, '')
         
 
         frame = context.pages[-1]
         # Click 'Next' button to trigger validation error for blank email
         elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[3]/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input invalid email to test validation error on Google sign-in page.
         frame = context.pages[-1]
         # Input invalid email to test validation error
         elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[2]/div/div/div/form/span/section/div/div/div/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalid-email')
+        await actions.fill(page, elem, 'invalid-email')
         
 
         frame = context.pages[-1]
         # Click 'Next' button to trigger validation error for invalid email
         elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[3]/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # --> Assertions to verify final state
@@ -157,7 +158,7 @@ async def run_test():
         await expect(frame.locator('text=Forgot email?').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Next').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Create account').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,47 +51,47 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'My Listings' to check for available listings to view details
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div[5]/div/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Attempt to login using 'Continue with Email' to access listings.
         frame = context.pages[-1]
         # Click 'Continue with Email' to start login process
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click 'Continue with Email' button to proceed to email login form.
         frame = context.pages[-1]
         # Click 'Continue with Email' button to reveal email login form
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input email and password, then click Sign In to authenticate.
         frame = context.pages[-1]
         # Input email address for login
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(page, elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Input password for login
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123')
+        await actions.fill(page, elem, 'TestPassword123')
         
 
         frame = context.pages[-1]
         # Click Sign In button to submit login form
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Try to navigate back to the main page or home page to find a listing details page accessible without login.
         frame = context.pages[-1]
         # Click on the logo or header to navigate back to the main page
         elem = frame.locator('xpath=html/body/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # --> Assertions to verify final state
@@ -99,7 +100,7 @@ async def run_test():
             await expect(frame.locator('text=Exclusive Luxury Villa with Private Beach').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The test plan execution has failed. User cannot view listing details including image gallery, pricing markers, verified badges, and aggregated reviews as expected.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
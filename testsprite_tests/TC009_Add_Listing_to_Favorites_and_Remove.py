@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,53 +51,53 @@ async def run_test():
         frame = context.pages[-1]
         # Click 'Sign in' link to login as user.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click 'Continue with Email' to proceed with email login.
         frame = context.pages[-1]
         # Click 'Continue with Email' button to proceed with email login.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input email and password, then click 'Sign In' button.
         frame = context.pages[-1]
         # Input email for login.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(page, elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Input password for login.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123')
+        await actions.fill(page, elem, 'TestPassword123')
         
 
         frame = context.pages[-1]
         # Click 'Sign In' button to submit login form.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click 'Continue with Email' button to proceed to email login form.
         frame = context.pages[-1]
         # Click 'Continue with Email' button to proceed to email login form.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input email and password, then click 'Sign In' button.
         frame = context.pages[-1]
         # Input email for login.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(page, elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Input password for login.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123')
+        await actions.fill(page, elem, 'TestPassword123')
         
 
         # --> Assertions to verify final state
@@ -105,7 +106,7 @@ async def run_test():
             await expect(frame.locator('text=Listing successfully added to favorites!').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The test plan execution failed because the listing could not be added to the favorites list as expected.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,53 +51,53 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Sign in' link to start login process as user.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click 'Continue with Email' to proceed with email login.
         frame = context.pages[-1]
         # Click 'Continue with Email' button to start email login.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input user email and password, then click 'Sign In'.
         frame = context.pages[-1]
         # Input user email in email field.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('user@example.com')
+        await actions.fill(page, elem, 'user@example.com')
         
 
         frame = context.pages[-1]
         # Input user password in password field.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('userpassword')
+        await actions.fill(page, elem, 'userpassword')
         
 
         frame = context.pages[-1]
         # Click 'Sign In' button to login as user.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Attempt login using 'Continue with Google' as alternative to email login.
         frame = context.pages[-1]
         # Click 'Continue with Google' button to attempt login as user via Google.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input Google account email to proceed with OAuth login.
         frame = context.pages[-1]
         # Input Google account email for OAuth login.
         elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[2]/div/div/div/form/span/section/div/div/div/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@gmail.com')
+        await actions.fill(page, elem, 'testuser@gmail.com')
         
 
         frame = context.pages[-1]
         # Click 'Next' button to proceed with Google sign-in.
         elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[3]/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # --> Assertions to verify final state
@@ -105,7 +106,7 @@ async def run_test():
             await expect(frame.locator('text=Lead Creation Successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: The test plan execution failed because the new lead was not auto-created and linked correctly on the owner's dashboard after contacting the listing owner via chat or call.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,59 +51,59 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Sign in' link to start login process as eligible user
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click 'Continue with Email' to login as eligible user.
         frame = context.pages[-1]
         # Click 'Continue with Email' button to proceed with email login
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input eligible user email and password, then click 'Sign In'.
         frame = context.pages[-1]
         # Input eligible user email
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('eligibleuser@example.com')
+        await actions.fill(page, elem, 'eligibleuser@example.com')
         
 
         frame = context.pages[-1]
         # Input eligible user password
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('correctpassword')
+        await actions.fill(page, elem, 'correctpassword')
         
 
         frame = context.pages[-1]
         # Click 'Sign In' button to login as eligible user
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click 'Continue with Email' button to proceed with email login.
         frame = context.pages[-1]
         # Click 'Continue with Email' button to proceed with email login
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input eligible user email and password, then click 'Sign In' button.
         frame = context.pages[-1]
         # Input eligible user email
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('eligibleuser@example.com')
+        await actions.fill(page, elem, 'eligibleuser@example.com')
         
 
         frame = context.pages[-1]
         # Input eligible user password
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('correctpassword')
+        await actions.fill(page, elem, 'correctpassword')
         
 
         frame = context.pages[-1]
         # Click 'Sign In' button to login as eligible user
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # --> Assertions to verify final state
@@ -111,7 +112,7 @@ async def run_test():
             await expect(frame.locator('text=Review submission successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: Review submission did not succeed or is not displayed after moderation as required by the test plan.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions, sessions
 
 async def run_test():
     pw = None
@@ -46,57 +47,34 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Click on 'Sign in' to login as user.
-        frame = context.pages[-1]
-        # Click on 'Sign in' link to login as user.
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click 'Continue with Email' to proceed with email login.
-        frame = context.pages[-1]
-        # Click 'Continue with Email' button to login with email.
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input user email and password, then click Sign In.
-        frame = context.pages[-1]
-        # Input user email for login.
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('user@example.com')
-        
-
-        frame = context.pages[-1]
-        # Input user password for login.
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('userpassword')
-        
-
-        frame = context.pages[-1]
-        # Click Sign In button to login as user.
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        # -> Sign in as user using the cached session instead of the login form.
+        try:
+            await sessions.sign_in(page, "user")
+        except sessions.SessionError:
+            # -> The email sign-in failed; fall back to 'Continue with Google' as the recorded run did.
+            frame = context.pages[-1]
+            # Click on 'Sign in' link to open the login page.
+            elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div/div/a').nth(0)
+            await actions.click(page, elem)
+            
 
-        # -> Attempt login using 'Continue with Google' button to bypass email login failure.
-        frame = context.pages[-1]
-        # Click 'Continue with Google' button to attempt login with Google.
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+            frame = context.pages[-1]
+            # Click 'Continue with Google' button to attempt login with Google.
+            elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button').nth(0)
+            await actions.click(page, elem)
+            
 
-        # -> Input Google account email to proceed with OAuth login.
-        frame = context.pages[-1]
-        # Input Google account email for OAuth login.
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[2]/div/div/div/form/span/section/div/div/div/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@gmail.com')
-        
+            # -> Input Google account email to proceed with OAuth login.
+            frame = context.pages[-1]
+            # Input Google account email for OAuth login.
+            elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[2]/div/div/div/form/span/section/div/div/div/div/div/div/div/input').nth(0)
+            await actions.fill(page, elem, 'testuser@gmail.com')
+            
 
-        frame = context.pages[-1]
-        # Click 'Next' button to proceed with Google OAuth login.
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[3]/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+            frame = context.pages[-1]
+            # Click 'Next' button to proceed with Google OAuth login.
+            elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[3]/div/div/div/div/button').nth(0)
+            await actions.click(page, elem)
         
 
         # --> Assertions to verify final state
@@ -105,7 +83,7 @@ async def run_test():
             await expect(frame.locator('text=Report Submission Successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: The test plan execution has failed because the report submission and enforcement actions could not be verified as successful.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
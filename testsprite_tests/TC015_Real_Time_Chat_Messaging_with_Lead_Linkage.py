@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions, sessions
 
 async def run_test():
     pw = None
@@ -46,44 +47,8 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Click on Sign in to login as user
-        frame = context.pages[-1]
-        # Click on Sign in to login as user
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click 'Continue with Email' to proceed with user login
-        frame = context.pages[-1]
-        # Click 'Continue with Email' to login as user
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click 'Continue with Email' button to proceed to email login form
-        frame = context.pages[-1]
-        # Click 'Continue with Email' button to proceed to email login form
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input user email and password, then click Sign In button to login as user
-        frame = context.pages[-1]
-        # Input user email
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('user@example.com')
-        
-
-        frame = context.pages[-1]
-        # Input user password
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('userpassword')
-        
-
-        frame = context.pages[-1]
-        # Click Sign In button to login as user
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Sign in as user using the cached session instead of the login form.
+        await sessions.sign_in(page, "user")
         
 
         # --> Assertions to verify final state
@@ -92,7 +57,7 @@ async def run_test():
             await expect(frame.locator('text=Chat session successfully established with lead ID 12345').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: Real-time chat functionality verification failed. The chat session was not successfully established or linked to the correct lead as required by the test plan.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions, sessions
 
 async def run_test():
     pw = None
@@ -46,89 +47,8 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Click on 'Sign in' to start login as admin user with limited permissions.
-        frame = context.pages[-1]
-        # Click on 'Sign in' to initiate login process for admin user with limited permissions.
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'Continue with Email' to proceed with email login for admin user with limited permissions.
-        frame = context.pages[-1]
-        # Click on 'Continue with Email' to proceed with email login for admin user with limited permissions.
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input admin user email and password, then click Sign In to login.
-        frame = context.pages[-1]
-        # Input admin user email with limited permissions
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin_limited@example.com')
-        
-
-        frame = context.pages[-1]
-        # Input admin user password with limited permissions
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
-
-        frame = context.pages[-1]
-        # Click Sign In button to submit login form for admin user with limited permissions
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'Continue with Email' to proceed with email login for admin user with limited permissions.
-        frame = context.pages[-1]
-        # Click on 'Continue with Email' to proceed with email login for admin user with limited permissions.
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input admin user email and password, then click Sign In to login.
-        frame = context.pages[-1]
-        # Input admin user email with limited permissions
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin_limited@example.com')
-        
-
-        frame = context.pages[-1]
-        # Input admin user password with limited permissions
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
-
-        frame = context.pages[-1]
-        # Click Sign In button to submit login form for admin user with limited permissions
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'Continue with Email' to proceed with email login for admin user with limited permissions.
-        frame = context.pages[-1]
-        # Click on 'Continue with Email' to proceed with email login for admin user with limited permissions.
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input correct admin user email and password, then click Sign In to login.
-        frame = context.pages[-1]
-        # Input correct admin user email with limited permissions
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin_limited_correct@example.com')
-        
-
-        frame = context.pages[-1]
-        # Input correct admin user password with limited permissions
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('correct_password123')
-        
-
-        frame = context.pages[-1]
-        # Click Sign In button to submit login form for admin user with limited permissions
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Sign in as admin user using the cached session instead of the login form.
+        await sessions.sign_in(page, "admin")
         
 
         # --> Assertions to verify final state
@@ -137,7 +57,7 @@ async def run_test():
             await expect(frame.locator('text=Access to all admin dashboard modules granted').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: Admin users should have restricted access based on roles and permissions, but full access was not granted as expected.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,27 +51,27 @@ async def run_test():
         frame = context.pages[-1]
         # Click on Profile to check for location permission request or settings.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div[3]/div/ul/li[5]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Attempt to login using 'Continue with Google' to proceed and trigger location permission request.
         frame = context.pages[-1]
         # Click 'Continue with Google' to login and proceed.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Input email to proceed with Google login and continue testing permission requests.
         frame = context.pages[-1]
         # Input email for Google sign-in.
         elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[2]/div/div/div/form/span/section/div/div/div/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(page, elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Click Next button to proceed with Google sign-in.
         elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/c-wiz/main/div[3]/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # --> Assertions to verify final state
@@ -79,7 +80,7 @@ async def run_test():
             await expect(frame.locator('text=Permission Granted for GPS, Camera, and Sharing').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The mobile app did not correctly request and handle native permissions for GPS, camera, and sharing features as required by the test plan.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions, sessions
 
 async def run_test():
     pw = None
@@ -50,40 +51,18 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'My Listings' to attempt access as unauthenticated user.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div[5]/div/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # -> Click on 'Lead Management' to verify access denial for unauthenticated users.
         frame = context.pages[-1]
         # Click on 'Lead Management' to attempt access as unauthenticated user.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div[5]/div/ul/li[5]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
-        # -> Click 'Continue with Email' to proceed with normal user login.
-        frame = context.pages[-1]
-        # Click 'Continue with Email' to start normal user login.
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input normal user email and password, then click 'Sign In' to login.
-        frame = context.pages[-1]
-        # Input normal user email
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('normaluser@example.com')
-        
-
-        frame = context.pages[-1]
-        # Input normal user password
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('normalpassword')
-        
-
-        frame = context.pages[-1]
-        # Click 'Sign In' button to login as normal user
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Sign in as normal user using the cached session instead of the login form.
+        await sessions.sign_in(page, "normal_user")
         
 
         # --> Assertions to verify final state
@@ -92,7 +71,7 @@ async def run_test():
             await expect(frame.locator('text=Unauthorized Data Access Detected').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: Row level security policies and data access controls are not enforced properly. Unauthorized data access was not denied as expected.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,14 +51,15 @@ async def run_test():
         frame = context.pages[-1]
         # Click on the 'Map View' link to navigate to the map view page.
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div/div[2]/div/div[2]/div[3]/div/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # search_properties, or search_properties_in_view once the map has bounds
+        await actions.click(page, elem, response="rpc/search_properties")
         
 
         # -> Click on the 'Filters' button to open filter options and apply category and price range filters.
         frame = context.pages[-1]
         # Click on the 'Filters' button to open filter options.
         elem = frame.locator('xpath=html/body/div/div[2]/div/main/div/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(page, elem)
         
 
         # --> Assertions to verify final state
@@ -66,7 +68,7 @@ async def run_test():
             await expect(frame.locator('text=No Listings Available for $9999').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The map view did not display clustered listings with accurate price markers or failed to update in real-time as filters were changed.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
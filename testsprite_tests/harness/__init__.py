@@ -0,0 +1,32 @@
+"""Shared runner for the generated TestSprite scripts (TC001-TC020).
+
+Run from the ``testsprite_tests`` directory::
+
+    python -m harness                 # every TC*.py, 4 at a time
+    python -m harness TC004 TC011 -j 8
+
+Each script is loaded without its trailing ``asyncio.run(run_test())`` and
+pointed at a shared browser, so a full run pays for one Chromium launch
+instead of twenty. The scripts still run standalone; their steps go through
+``harness.actions`` instead of fixed pauses.
+
+Playwright is only imported with the runner, so ``harness.results`` and
+``harness.report`` work without it (see ``requirements.txt``).
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
+
+from .loader import TestCase, discover
+
+__all__ = ["RunnerConfig", "TestCase", "TestResult", "discover", "run_suite"]
+
+_RUNNER = ("RunnerConfig", "TestResult", "run_suite")
+
+
+def __getattr__(name: str) -> Any:
+    if name in _RUNNER:
+        return getattr(import_module(".runner", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
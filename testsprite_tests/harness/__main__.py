@@ -0,0 +1,115 @@
+"""Command line entrypoint: ``python -m harness [TC ids...]``."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from . import actions, config, locators, recording, results as results_store, sessions, vitals
+from .loader import discover
+from .runner import Plugin, RunnerConfig, TestResult, run_suite
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m harness", description="Run the TestSprite TC scripts against shared browsers.")
+    parser.add_argument("tests", nargs="*", help="TC ids or file name fragments to run (default: all)")
+    parser.add_argument("-j", "--concurrency", type=int, default=4, help="tests running at once (default: 4)")
+    parser.add_argument("--browsers", type=int, default=1, help="shared Chromium instances (default: 1)")
+    parser.add_argument("--headed", action="store_true", help="show the browser windows")
+    parser.add_argument("--timeout", type=float, default=300.0, help="per-test timeout in seconds")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    parser.add_argument("--no-store", action="store_true", help="do not record this run in the results store")
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument("--standin", action="store_true", help="serve Supabase from the local in-memory stand-in")
+    backend.add_argument("--record", action="store_true", help="record Supabase traffic per test")
+    backend.add_argument("--replay", action="store_true", help="replay recorded Supabase traffic, no network")
+    parser.add_argument("--fixtures", type=Path, help="JSON dataset for --standin (default: built-in fixtures)")
+    parser.add_argument(
+        "--recordings", type=Path, default=recording.ARCHIVE_DIR, help="archive directory for --record/--replay"
+    )
+    parser.add_argument("--no-sessions", action="store_true", help="do not pre-inject cached role sessions")
+    parser.add_argument("--fresh-sessions", action="store_true", help="discard cached sessions and sign in again")
+    parser.add_argument("--no-vitals", action="store_true", help="do not collect Core Web Vitals per navigation")
+    parser.add_argument(
+        "--legacy-pacing", action="store_true", help="restore the fixed 3s pause before every step"
+    )
+    return parser
+
+
+def build_plugins(args: argparse.Namespace) -> list[Plugin]:
+    plugins: list[Plugin] = []
+    if args.standin:
+        from .standin import StandinApp, build_dataset, load_dataset
+        from .standin.plugin import StandinPlugin
+
+        dataset = load_dataset(args.fixtures) if args.fixtures else build_dataset()
+        plugins.append(StandinPlugin(StandinApp(dataset)))
+    elif args.record:
+        plugins.append(recording.RecordPlugin(args.recordings))
+    elif args.replay:
+        plugins.append(recording.ReplayPlugin(args.recordings))
+        sessions.set_offline(True)
+    if not args.no_sessions:
+        plugins.append(sessions.SessionPlugin())
+    if not args.no_vitals:
+        plugins.append(vitals.VitalsPlugin())
+    plugins.append(locators.LocatorPlugin())
+    return plugins
+
+
+def build_config(args: argparse.Namespace) -> RunnerConfig:
+    return RunnerConfig(
+        concurrency=args.concurrency,
+        browsers=args.browsers,
+        headless=not args.headed,
+        timeout=args.timeout,
+        plugins=build_plugins(args),
+    )
+
+
+def print_summary(results: list[TestResult], wall: float) -> None:
+    width = max((len(r.title) for r in results), default=10)
+    for result in results:
+        print(f"{result.status:<7} {result.duration:7.1f}s  {result.title:<{width}}")
+        if result.error:
+            print(f"        {result.error.splitlines()[0]}")
+    passed = sum(r.passed for r in results)
+    serial = sum(r.duration for r in results)
+    print(f"\n{passed}/{len(results)} passed in {wall:.1f}s wall ({serial:.1f}s of test time)")
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if not config.SUPABASE_URL:
+        print("VITE_SUPABASE_URL is not set; put it in the repo's .env or the environment", file=sys.stderr)
+        return 2
+    if args.legacy_pacing:
+        actions.set_legacy_pacing(True)
+    if args.fresh_sessions:
+        for path in sessions.SESSIONS_DIR.glob("*.json"):
+            path.unlink()
+    cases = discover(only=args.tests)
+    if not cases:
+        print("No matching TC scripts found", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    results = asyncio.run(run_suite(cases, build_config(args)))
+    print_summary(results, time.perf_counter() - started)
+
+    if not args.no_store:
+        with results_store.ResultsStore() as store:
+            for result in results:
+                store.record_run(result.test_id, result.title, result.status, result.error, result.duration, result.extra)
+    if args.json:
+        args.json.write_text(json.dumps([asdict(r) for r in results], indent=2), encoding="utf-8")
+    return 0 if all(r.passed for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Condition-based step helpers for the TC scripts.
+
+The generated scripts used to pause ``wait_for_timeout(3000)`` before every
+step. Playwright's ``click``/``fill`` already wait for the element to be
+attached, visible, stable and enabled, so these helpers act as soon as the
+element is ready and give it the same total budget the pause + action had.
+
+Legacy pacing (the old fixed pause before each step) can be switched back on
+for flaky pages, globally with ``TESTSPRITE_LEGACY_PACING=1`` or
+``python -m harness --legacy-pacing``, or for a single step with ``pace=True``.
+"""
+
+from __future__ import annotations
+
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from playwright import async_api
+from playwright.async_api import Locator, Page, Response
+
+LEGACY_PACING_ENV = "TESTSPRITE_LEGACY_PACING"
+LEGACY_STEP_DELAY_MS = 3000
+LEGACY_SETTLE_MS = 5000
+
+# Old pause (3s) + old action timeout (5s): a slow element gets as long as before.
+ACTION_TIMEOUT_MS = 8000
+SETTLE_TIMEOUT_MS = 5000
+
+_legacy_pacing = os.environ.get(LEGACY_PACING_ENV, "").lower() in ("1", "true", "yes")
+
+
+def set_legacy_pacing(enabled: bool) -> None:
+    global _legacy_pacing
+    _legacy_pacing = enabled
+
+
+def legacy_pacing() -> bool:
+    return _legacy_pacing
+
+
+async def _pace(page: Page, pace: bool) -> None:
+    if pace or _legacy_pacing:
+        await page.wait_for_timeout(LEGACY_STEP_DELAY_MS)
+
+
+def _is_supabase_call(endpoint: str):
+    """Match PostgREST/RPC responses such as ``rpc/search_properties`` or ``favorites``."""
+    needle = "/rest/v1/" + endpoint.lstrip("/")
+
+    def predicate(response: Response) -> bool:
+        return needle in response.url and response.request.method != "OPTIONS"
+
+    return predicate
+
+
+@asynccontextmanager
+async def supabase_response(page: Page, endpoint: str, timeout: float = ACTION_TIMEOUT_MS) -> AsyncIterator[None]:
+    """Wait for a Supabase REST/RPC response triggered inside the block."""
+    async with page.expect_response(_is_supabase_call(endpoint), timeout=timeout):
+        yield
+
+
+async def click(
+    page: Page,
+    locator: Locator,
+    *,
+    timeout: float = ACTION_TIMEOUT_MS,
+    response: str | None = None,
+    pace: bool = False,
+) -> None:
+    """Click once ``locator`` is actionable.
+
+    ``response`` names a Supabase endpoint (``rpc/search_properties``) the
+    click is expected to trigger; the helper returns once it has answered.
+    The name matches as a prefix, so ``rpc/search_properties`` also accepts
+    ``rpc/search_properties_page`` and ``rpc/search_properties_in_view``.
+    """
+    await _pace(page, pace)
+    if response is None:
+        await locator.click(timeout=timeout)
+        return
+    async with supabase_response(page, response, timeout=timeout):
+        await locator.click(timeout=timeout)
+
+
+async def fill(
+    page: Page,
+    locator: Locator,
+    value: str,
+    *,
+    timeout: float = ACTION_TIMEOUT_MS,
+    pace: bool = False,
+) -> None:
+    """Fill ``locator`` with ``value`` once it is editable."""
+    await _pace(page, pace)
+    await locator.fill(value, timeout=timeout)
+
+
+async def settle(page: Page, timeout: float = SETTLE_TIMEOUT_MS) -> None:
+    """Let in-flight requests finish, returning early once the network is idle."""
+    if _legacy_pacing:
+        await page.wait_for_timeout(LEGACY_SETTLE_MS)
+        return
+    try:
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+    except async_api.Error:
+        # Realtime channels can keep the network busy; that is not a failure.
+        pass
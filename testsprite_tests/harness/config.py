@@ -0,0 +1,68 @@
+"""Locations and endpoints shared by the harness modules.
+
+Everything can be overridden from the environment; the Supabase defaults are
+read from the repo's ``.env`` the same way Vite does for the app.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from .loader import SUITE_DIR
+
+REPO_ROOT = SUITE_DIR.parent
+TMP_DIR = SUITE_DIR / "tmp"
+
+# Key used by src/integrations/supabase/client.ts for the persisted session.
+AUTH_STORAGE_KEY = "citylifes-auth-token"
+
+# Role -> (email, password); overridable with TESTSPRITE_<ROLE>_EMAIL / _PASSWORD.
+# The accounts the TC scripts sign in with, as created by scripts/seed_users.ts.
+DEFAULT_CREDENTIALS = {
+    "user": ("user@example.com", "password123"),
+    "normal_user": ("normaluser@example.com", "normalpassword"),
+    "owner": ("owner@example.com", "securePassword123"),
+    "listing_owner": ("listingowner@example.com", "securepassword123"),
+    "admin": ("admin_limited@example.com", "password123"),
+}
+
+
+def _dotenv(path: Path) -> dict[str, str]:
+    values: dict[str, str] = {}
+    if not path.exists():
+        return values
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        values[key.strip()] = value.strip().strip('"').strip("'")
+    return values
+
+
+_env = {**_dotenv(REPO_ROOT / ".env"), **os.environ}
+
+BASE_URL = _env.get("TESTSPRITE_BASE_URL", "http://127.0.0.1:8080").rstrip("/")
+SUPABASE_URL = _env.get("VITE_SUPABASE_URL", "").rstrip("/")
+SUPABASE_ANON_KEY = _env.get("VITE_SUPABASE_PUBLISHABLE_KEY") or _env.get("VITE_SUPABASE_ANON_KEY", "")
+# Where sessions are minted; the local stand-in points this at itself. Empty
+# when VITE_SUPABASE_URL is unset, which ``python -m harness`` refuses to run with.
+GOTRUE_URL = f"{SUPABASE_URL}/auth/v1" if SUPABASE_URL else ""
+
+
+def _project(url: str) -> str:
+    host = urlsplit(url).netloc
+    if host.endswith(".supabase.co"):
+        return host.split(".", 1)[0]
+    return re.sub(r"[^A-Za-z0-9]+", "-", host).strip("-") or "unset"
+
+
+# Names the project cached sessions belong to; the stand-in sets "standin".
+AUTH_PROJECT = _project(SUPABASE_URL)
+
+
+def env(name: str, default: str = "") -> str:
+    return _env.get(name, default)
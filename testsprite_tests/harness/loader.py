@@ -0,0 +1,74 @@
+"""Discovery and loading of the generated ``TCxxx_*.py`` scripts."""
+
+from __future__ import annotations
+
+import ast
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+
+_TC_FILE = re.compile(r"^(TC\d{3})_(.+)\.py$")
+
+
+@dataclass
+class TestCase:
+    test_id: str
+    title: str
+    path: Path
+
+    @property
+    def module_name(self) -> str:
+        return self.path.stem
+
+
+def discover(suite_dir: Path = SUITE_DIR, only: Iterable[str] = ()) -> list[TestCase]:
+    """Return the TC scripts in ``suite_dir`` sorted by id.
+
+    ``only`` filters by id prefix (``TC004``) or any substring of the file name.
+    """
+    wanted = [w.lower() for w in only]
+    cases = []
+    for path in sorted(suite_dir.glob("TC*.py")):
+        match = _TC_FILE.match(path.name)
+        if not match:
+            continue
+        if wanted and not any(w in path.stem.lower() for w in wanted):
+            continue
+        test_id, slug = match.groups()
+        cases.append(TestCase(test_id=test_id, title=f"{test_id}-{slug.replace('_', ' ')}", path=path))
+    return cases
+
+
+def _is_entrypoint(node: ast.stmt) -> bool:
+    """Match the module-level ``asyncio.run(run_test())`` every script ends with."""
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "run"
+        and isinstance(func.value, ast.Name)
+        and func.value.id == "asyncio"
+    )
+
+
+def load_namespace(case: TestCase) -> dict[str, Any]:
+    """Execute ``case`` without its entrypoint and return the module globals."""
+    source = case.path.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(case.path))
+    tree.body = [node for node in tree.body if not _is_entrypoint(node)]
+    namespace: dict[str, Any] = {"__name__": case.module_name, "__file__": str(case.path)}
+    exec(compile(tree, str(case.path), "exec"), namespace)
+    if not callable(namespace.get("run_test")):
+        raise LookupError(f"{case.path.name} does not define run_test()")
+    return namespace
+
+
+def load_run_test(case: TestCase, async_api: Any) -> Callable[[], Awaitable[None]]:
+    """Load ``case`` with ``async_api`` swapped in for ``playwright.async_api``."""
+    namespace = load_namespace(case)
+    namespace["async_api"] = async_api
+    return namespace["run_test"]
@@ -0,0 +1,135 @@
+"""Ranked locators for logical test steps, remembering what worked last.
+
+The generated scripts address elements with absolute XPaths
+(``html/body/div/div[2]/div/main/...``) that break on any layout change.
+Steps converted to ``await locators.locate(page, "TC004.homes_category")`` use
+the candidates in ``STEPS`` instead: role and text selectors first, the
+original XPath as the last resort.
+
+All candidates are raced in a single wait (``Locator.or_``), so a stale
+candidate never costs a timeout. The first visible one in rank order wins.
+The candidate that resolved the step on the last passing run is tried first.
+That choice lives in ``tmp/locators.json`` and is only updated, by
+:class:`LocatorPlugin`, when the test passes.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from playwright.async_api import Locator, Page
+
+from . import config
+from .actions import ACTION_TIMEOUT_MS
+from .loader import TestCase
+from .runner import Plugin, TestResult
+
+CACHE_PATH = config.TMP_DIR / "locators.json"
+
+# "<TC id>.<step>" -> candidates, best first.
+STEPS: dict[str, tuple[str, ...]] = {
+    "TC004.homes_category": (
+        'section:has(h2:has-text("Browse by Category")) >> role=button[name=/Homes/]',
+        "role=button[name=/Homes/]",
+        "xpath=html/body/div/div[2]/div/main/div/div/div[2]/section/div[2]/button",
+    ),
+    "TC004.location_selector": (
+        "main >> role=button[name=/All cities|Live Location/]",
+        'main button:has(svg.lucide-map-pin)',
+        "xpath=html/body/div/div[2]/div/main/div/div/div/div/div[3]/button",
+    ),
+    "TC004.location_method_city": (
+        'role=dialog >> button:has-text("Search by city name")',
+        'role=dialog >> role=button[name=/^City/]',
+        "xpath=html/body/div[3]/div[2]/div/button[2]",
+    ),
+    "TC004.city_dropdown": (
+        'role=dialog >> role=combobox',
+        'role=combobox[name=/Select city/i]',
+        "xpath=html/body/div/div[2]/div/main/div/div/div/div/div[2]/button",
+    ),
+    "TC004.sort_menu": (
+        "main button[role=combobox]",
+        "xpath=html/body/div/div[2]/div/main/div/div/div/div/div[3]/button[2]",
+    ),
+    "TC004.sort_price_low": (
+        'role=option[name="Price: Low to High"]',
+        'role=listbox >> text="Price: Low to High"',
+        "xpath=html/body/div[2]/div/div/div[2]",
+    ),
+}
+
+
+class SelectorCache:
+    """Last winning candidate per step; new winners are held until the test passes."""
+
+    def __init__(self, path: Path = CACHE_PATH):
+        self.path = path
+        self._winners: dict[str, str] = {}
+        self._pending: dict[str, str] = {}
+        if path.exists():
+            try:
+                self._winners = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                self._winners = {}
+
+    def ranked(self, step: str) -> list[str]:
+        if step not in STEPS:
+            raise KeyError(f"Unknown step {step!r}; add its candidates to harness.locators.STEPS")
+        candidates = list(STEPS[step])
+        winner = self._winners.get(step)
+        if winner in candidates:
+            candidates.remove(winner)
+            candidates.insert(0, winner)
+        return candidates
+
+    def resolved(self, step: str, selector: str) -> None:
+        self._pending[step] = selector
+
+    def pending(self, test_id: str) -> dict[str, str]:
+        return {step: s for step, s in self._pending.items() if step.startswith(f"{test_id}.")}
+
+    def commit(self, test_id: str) -> None:
+        winners = self.pending(test_id)
+        for step in winners:
+            del self._pending[step]
+        if any(self._winners.get(step) != selector for step, selector in winners.items()):
+            self._winners.update(winners)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self._winners, indent=2, sort_keys=True), encoding="utf-8")
+
+    def discard(self, test_id: str) -> None:
+        for step in self.pending(test_id):
+            del self._pending[step]
+
+
+_cache = SelectorCache()
+
+
+async def locate(page: Page, step: str, *, timeout: float = ACTION_TIMEOUT_MS) -> Locator:
+    """Wait for any candidate of ``step`` and return the best-ranked visible one."""
+    candidates = _cache.ranked(step)
+    combined = page.locator(candidates[0])
+    for selector in candidates[1:]:
+        combined = combined.or_(page.locator(selector))
+    await combined.first.wait_for(state="visible", timeout=timeout)
+    for selector in candidates:
+        locator = page.locator(selector).first
+        if await locator.is_visible():
+            _cache.resolved(step, selector)
+            return locator
+    # The match disappeared between the wait and the check; let the action wait again.
+    return combined.first
+
+
+class LocatorPlugin(Plugin):
+    async def on_finish(self, case: TestCase, result: TestResult) -> None:
+        winners = _cache.pending(case.test_id)
+        fallbacks = {step: s for step, s in winners.items() if s != STEPS[step][0]}
+        if fallbacks:
+            result.extra["selector_fallbacks"] = fallbacks
+        if result.passed:
+            _cache.commit(case.test_id)
+        else:
+            _cache.discard(case.test_id)
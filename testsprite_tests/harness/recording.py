@@ -0,0 +1,200 @@
+"""Record Supabase traffic per test and replay it offline through ``context.route``.
+
+``python -m harness --record`` lets REST/RPC, auth and storage requests through
+to the real backend and writes every exchange to
+``tmp/recordings/<TC>.json.gz``. ``--replay`` serves those responses back with
+no network at all, which makes timings comparable between runs and lets CI run
+without Supabase credentials.
+
+Requests are matched on method, path, sorted query string and the JSON body
+with keys sorted. Bodies that embed volatile values (``updated_at: new Date()``)
+fall back to a method + path + query match. Both lookups are dict hits, and
+repeated identical requests are answered in recorded order.
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import json
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from playwright.async_api import BrowserContext, Route
+
+from . import config
+from .loader import TestCase
+from .runner import Plugin, TestResult
+
+ARCHIVE_DIR = config.TMP_DIR / "recordings"
+ARCHIVE_VERSION = 1
+ROUTED_PREFIXES = ("/rest/v1/", "/auth/v1/", "/storage/v1/")
+
+# Recomputed by the browser when the fulfilled body is served.
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def normalize_query(query: str) -> str:
+    return urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+
+
+def normalize_body(body: bytes | None) -> str:
+    if not body:
+        return ""
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        return "sha1:" + hashlib.sha1(body).hexdigest()
+
+
+@dataclass
+class Exchange:
+    method: str
+    path: str
+    query: str
+    body_key: str
+    status: int
+    headers: dict[str, str]
+    body: str  # base64
+
+    @property
+    def exact_key(self) -> tuple[str, str, str, str]:
+        return self.method, self.path, self.query, self.body_key
+
+    @property
+    def loose_key(self) -> tuple[str, str, str]:
+        return self.method, self.path, self.query
+
+    def payload(self) -> bytes:
+        return base64.b64decode(self.body)
+
+
+class Archive:
+    def __init__(self, exchanges: list[Exchange] | None = None):
+        self.exchanges: list[Exchange] = []
+        self._exact: dict[tuple, list[Exchange]] = defaultdict(list)
+        self._loose: dict[tuple, list[Exchange]] = defaultdict(list)
+        self._cursor: dict[tuple, int] = defaultdict(int)
+        for exchange in exchanges or []:
+            self.add(exchange)
+
+    def add(self, exchange: Exchange) -> None:
+        self.exchanges.append(exchange)
+        self._exact[exchange.exact_key].append(exchange)
+        self._loose[exchange.loose_key].append(exchange)
+
+    def _next(self, index: dict[tuple, list[Exchange]], key: tuple) -> Exchange | None:
+        candidates = index.get(key)
+        if not candidates:
+            return None
+        cursor = self._cursor[key]
+        self._cursor[key] = cursor + 1
+        return candidates[min(cursor, len(candidates) - 1)]
+
+    def match(self, method: str, url: str, body: bytes | None) -> Exchange | None:
+        parts = urlsplit(url)
+        query = normalize_query(parts.query)
+        exchange = self._next(self._exact, (method, parts.path, query, normalize_body(body)))
+        return exchange or self._next(self._loose, (method, parts.path, query))
+
+    @staticmethod
+    def path_for(test_id: str, directory: Path = ARCHIVE_DIR) -> Path:
+        return directory / f"{test_id}.json.gz"
+
+    @classmethod
+    def load(cls, path: Path) -> "Archive":
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            data = json.load(fh)
+        if data.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"{path}: unsupported archive version {data.get('version')}")
+        return cls([Exchange(**entry) for entry in data["entries"]])
+
+    def save(self, path: Path, test_id: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": ARCHIVE_VERSION, "test_id": test_id, "entries": [asdict(e) for e in self.exchanges]}
+        with gzip.open(path, "wt", encoding="utf-8") as fh:
+            json.dump(data, fh, separators=(",", ":"))
+
+
+def _route_patterns() -> list[str]:
+    return [f"{config.SUPABASE_URL}{prefix}**" for prefix in ROUTED_PREFIXES]
+
+
+class RecordPlugin(Plugin):
+    def __init__(self, directory: Path = ARCHIVE_DIR):
+        self.directory = directory
+        self._archives: dict[str, Archive] = {}
+
+    async def on_context(self, context: BrowserContext, case: TestCase, result: TestResult) -> None:
+        archive = self._archives.setdefault(case.test_id, Archive())
+
+        async def record(route: Route) -> None:
+            request = route.request
+            response = await route.fetch()
+            body = await response.body()
+            parts = urlsplit(request.url)
+            archive.add(
+                Exchange(
+                    method=request.method,
+                    path=parts.path,
+                    query=normalize_query(parts.query),
+                    body_key=normalize_body(request.post_data_buffer),
+                    status=response.status,
+                    headers={k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS},
+                    body=base64.b64encode(body).decode(),
+                )
+            )
+            await route.fulfill(response=response, body=body)
+
+        for pattern in _route_patterns():
+            await context.route(pattern, record)
+
+    async def on_finish(self, case: TestCase, result: TestResult) -> None:
+        archive = self._archives.pop(case.test_id, None)
+        if archive is not None:
+            path = Archive.path_for(case.test_id, self.directory)
+            archive.save(path, case.test_id)
+            result.extra["recording"] = {"path": str(path), "exchanges": len(archive.exchanges)}
+
+
+class ReplayPlugin(Plugin):
+    def __init__(self, directory: Path = ARCHIVE_DIR):
+        self.directory = directory
+        self._archives: dict[str, Archive] = {}
+
+    def _archive(self, case: TestCase) -> Archive:
+        if case.test_id not in self._archives:
+            path = Archive.path_for(case.test_id, self.directory)
+            if not path.exists():
+                raise FileNotFoundError(f"No recording for {case.test_id}; run with --record first ({path})")
+            self._archives[case.test_id] = Archive.load(path)
+        return self._archives[case.test_id]
+
+    async def on_context(self, context: BrowserContext, case: TestCase, result: TestResult) -> None:
+        archive = self._archive(case)
+        misses: list[str] = result.extra.setdefault("replay_misses", [])
+
+        async def replay(route: Route) -> None:
+            request = route.request
+            exchange = archive.match(request.method, request.url, request.post_data_buffer)
+            if exchange is None:
+                misses.append(f"{request.method} {urlsplit(request.url).path}")
+                await route.fulfill(
+                    status=404,
+                    headers={"Access-Control-Allow-Origin": "*", "Content-Type": "application/json"},
+                    body=json.dumps({"message": "not in recording"}),
+                )
+                return
+            await route.fulfill(status=exchange.status, headers=exchange.headers, body=exchange.payload())
+
+        for pattern in _route_patterns():
+            await context.route(pattern, replay)
+
+    async def on_finish(self, case: TestCase, result: TestResult) -> None:
+        self._archives.pop(case.test_id, None)
+        if not result.extra.get("replay_misses"):
+            result.extra.pop("replay_misses", None)
+
@@ -0,0 +1,284 @@
+"""Build the test report from the results store in one streaming pass.
+
+The TestSprite ``raw_report.md`` repeats every browser console message under
+every test, so the same React Router warnings and ``fetchPriority`` stack make
+up most of the file. Here each message is fingerprinted by level, first line
+and source location, with ``?v=``/``?t=`` cache busters and the dev-server
+origin removed from its own URLs (other URLs are kept as logged). Each test
+section only references its messages (``C1``, ``C2``, ...). Every unique
+message is printed once at the end, with its count and the tests that logged
+it.
+
+    python -m harness.report                     # tmp/report.md
+    python -m harness.report --format html -o tmp/report.html
+
+Tests are read from the store row by row and written out immediately. Memory
+grows with the number of distinct console messages, not with the number of
+tests or log lines.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import html
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+from urllib.parse import urlsplit
+
+from . import config
+from .loader import discover
+from .results import DB_PATH, ResultsStore
+
+REPORT_PATH = config.TMP_DIR / "report.md"
+CONSOLE_MARKER = "Browser Console Logs:"
+
+_ENTRY = re.compile(r"^\[(?P<level>[A-Z]+)\] ")
+_LOCATION = re.compile(r" \(at (?P<location>\S+)\)$")
+_DEV_HOSTS = sorted({"localhost", "127.0.0.1", "[::1]", urlsplit(config.BASE_URL).hostname or "localhost"})
+_DEV_URL = re.compile(
+    r"https?://(?:" + "|".join(map(re.escape, _DEV_HOSTS)) + r")(?::\d+)?(/[^\s?)#]*)(?:\?[^\s)#:]*)?"
+)
+_STACK_FRAME = re.compile(r"^\s+at\s")
+
+
+def normalize_location(text: str) -> str:
+    """Drop the origin and query string from dev-server URLs (``/src/App.tsx:102:5``)."""
+    return _DEV_URL.sub(r"\1", text)
+
+
+def normalize_stack(text: str) -> str:
+    """``normalize_location`` on stack-frame lines only; the message itself is kept."""
+    return "\n".join(normalize_location(line) if _STACK_FRAME.match(line) else line for line in text.split("\n"))
+
+
+@dataclass
+class ConsoleEntry:
+    level: str
+    text: str  # full message, stack included
+    location: str
+
+    @property
+    def headline(self) -> str:
+        return self.text.split("\n", 1)[0].strip()
+
+    @property
+    def fingerprint(self) -> str:
+        key = "\0".join((self.level, normalize_location(self.headline), normalize_location(self.location)))
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+def split_error(error: str | None) -> tuple[str, Iterator[ConsoleEntry]]:
+    """The error text before the console block, and the console entries after it."""
+    error = error or ""
+    head, marker, logs = error.partition(CONSOLE_MARKER)
+    return head.strip(), parse_console(logs.splitlines() if marker else ())
+
+
+def parse_console(lines: Iterable[str]) -> Iterator[ConsoleEntry]:
+    level, buffer = None, []
+    for line in lines:
+        match = _ENTRY.match(line)
+        if match:
+            if level:
+                yield _entry(level, buffer)
+            level, buffer = match["level"], [line[match.end() :]]
+        elif level:
+            buffer.append(line)
+    if level:
+        yield _entry(level, buffer)
+
+
+def _entry(level: str, lines: list[str]) -> ConsoleEntry:
+    text = "\n".join(lines).rstrip()
+    match = _LOCATION.search(text)
+    if match:
+        return ConsoleEntry(level, text[: match.start()], match["location"])
+    return ConsoleEntry(level, text, "")
+
+
+@dataclass
+class MessageStats:
+    ref: str
+    entry: ConsoleEntry
+    count: int = 0
+    tests: dict[str, int] = field(default_factory=dict)
+
+
+class ConsoleIndex:
+    """Unique console messages in first-seen order."""
+
+    def __init__(self) -> None:
+        self.messages: dict[str, MessageStats] = {}
+
+    def add(self, test: str, entry: ConsoleEntry) -> MessageStats:
+        stats = self.messages.get(entry.fingerprint)
+        if stats is None:
+            stats = self.messages[entry.fingerprint] = MessageStats(f"C{len(self.messages) + 1}", entry)
+        stats.count += 1
+        stats.tests[test] = stats.tests.get(test, 0) + 1
+        return stats
+
+
+@dataclass
+class TestSection:
+    tc: str
+    name: str
+    code_file: str | None
+    status: str | None
+    error: str
+    visualization: str | None
+    # (ref, level, occurrences in this test)
+    console: list[tuple[str, str, int]]
+
+
+class MarkdownWriter:
+    def __init__(self, out: IO[str]):
+        self.out = out
+
+    def header(self, project: str) -> None:
+        self.out.write(
+            f"# TestSprite Test Report\n\n- **Project Name:** {project}\n- **Date:** {date.today()}\n\n---\n\n"
+            "## Requirement Validation Summary\n\n"
+        )
+
+    def test(self, section: TestSection) -> None:
+        w = self.out.write
+        w(f"#### Test {section.tc}\n- **Test Name:** {section.name}\n")
+        if section.code_file:
+            w(f"- **Test Code:** [{section.code_file}](./{section.code_file})\n")
+        if section.error:
+            w(f"- **Test Error:** {section.error}\n")
+        if section.console:
+            refs = ", ".join(f"{ref} ({level.lower()}{f' x{n}' if n > 1 else ''})" for ref, level, n in section.console)
+            w(f"- **Console:** {refs}\n")
+        if section.visualization:
+            w(f"- **Test Visualization and Result:** {section.visualization}\n")
+        w(f"- **Status:** {_status_label(section.status)}\n---\n\n")
+
+    def footer(self, passed: int, total: int, index: ConsoleIndex) -> None:
+        w = self.out.write
+        rate = 100 * passed / total if total else 0
+        w(f"## Coverage\n\n- **{passed}/{total}** tests passed ({rate:.2f}%)\n\n---\n\n")
+        w(f"## Browser Console Messages\n\n{len(index.messages)} unique messages.\n\n")
+        for stats in index.messages.values():
+            entry = stats.entry
+            tests = ", ".join(f"{tc}" + (f" x{n}" if n > 1 else "") for tc, n in stats.tests.items())
+            w(f"#### {stats.ref} [{entry.level}] x{stats.count} in {len(stats.tests)} tests\n")
+            w(f"- **Tests:** {tests}\n")
+            if entry.location:
+                w(f"- **Source:** `{normalize_location(entry.location)}`\n")
+            w(f"\n```\n{normalize_stack(entry.text)}\n```\n\n")
+
+
+class HtmlWriter:
+    def __init__(self, out: IO[str]):
+        self.out = out
+
+    def header(self, project: str) -> None:
+        title = html.escape(f"TestSprite Test Report - {project}")
+        self.out.write(
+            f"<!doctype html>\n<html><head><meta charset=\"utf-8\"><title>{title}</title>"
+            "<style>body{font-family:sans-serif;max-width:70rem;margin:auto}pre{white-space:pre-wrap;"
+            "background:#f5f5f5;padding:.5rem}.PASSED{color:#15803d}.FAILED{color:#b91c1c}</style></head>\n"
+            f"<body><h1>{title}</h1><p>{date.today()}</p>\n<h2>Requirement Validation Summary</h2>\n"
+        )
+
+    def test(self, section: TestSection) -> None:
+        w = self.out.write
+        w(f"<section id=\"{section.tc}\"><h4>{section.tc} {html.escape(section.name)}</h4><ul>\n")
+        if section.code_file:
+            name = html.escape(section.code_file)
+            w(f"<li>Test Code: <a href=\"./{name}\">{name}</a></li>\n")
+        if section.error:
+            w(f"<li>Test Error: {html.escape(section.error)}</li>\n")
+        if section.console:
+            refs = ", ".join(
+                f"<a href=\"#{ref}\">{ref}</a> ({level.lower()}{f' x{n}' if n > 1 else ''})"
+                for ref, level, n in section.console
+            )
+            w(f"<li>Console: {refs}</li>\n")
+        if section.visualization:
+            url = html.escape(section.visualization)
+            w(f"<li>Test Visualization and Result: <a href=\"{url}\">{url}</a></li>\n")
+        w(f"<li>Status: <span class=\"{section.status}\">{_status_label(section.status)}</span></li></ul></section>\n")
+
+    def footer(self, passed: int, total: int, index: ConsoleIndex) -> None:
+        w = self.out.write
+        rate = 100 * passed / total if total else 0
+        w(f"<h2>Coverage</h2><p><b>{passed}/{total}</b> tests passed ({rate:.2f}%)</p>\n")
+        w(f"<h2>Browser Console Messages</h2><p>{len(index.messages)} unique messages.</p>\n")
+        for stats in index.messages.values():
+            entry = stats.entry
+            tests = ", ".join(
+                f"<a href=\"#{tc}\">{tc}</a>" + (f" x{n}" if n > 1 else "") for tc, n in stats.tests.items()
+            )
+            w(f"<h4 id=\"{stats.ref}\">{stats.ref} [{entry.level}] x{stats.count} in {len(stats.tests)} tests</h4>\n")
+            w(f"<p>Tests: {tests}</p>\n")
+            if entry.location:
+                w(f"<p>Source: <code>{html.escape(normalize_location(entry.location))}</code></p>\n")
+            w(f"<pre>{html.escape(normalize_stack(entry.text))}</pre>\n")
+        w("</body></html>\n")
+
+
+WRITERS = {"md": MarkdownWriter, "html": HtmlWriter}
+
+
+def _status_label(status: str | None) -> str:
+    return {"PASSED": "✅ Passed", "FAILED": "❌ Failed"}.get(status or "", status or "Not run")
+
+
+def build_report(records: Iterable[dict[str, Any]], out: IO[str], fmt: str = "md", project: str = "city-lifes") -> ConsoleIndex:
+    """Write the report for ``records`` (legacy-shaped dicts) to ``out`` as they arrive."""
+    writer = WRITERS[fmt](out)
+    files = {case.test_id: case.path.name for case in discover()}
+    index = ConsoleIndex()
+    passed = total = 0
+    writer.header(project)
+    for record in records:
+        tc, _, name = record["title"].partition("-")
+        error, entries = split_error(record.get("testError"))
+        seen: dict[str, tuple[str, int]] = {}
+        for entry in entries:
+            stats = index.add(tc, entry)
+            level, count = seen.get(stats.ref, (entry.level, 0))
+            seen[stats.ref] = (level, count + 1)
+        writer.test(
+            TestSection(
+                tc=tc,
+                name=name,
+                code_file=files.get(tc),
+                status=record.get("testStatus"),
+                error=error,
+                visualization=record.get("testVisualization"),
+                console=[(ref, level, n) for ref, (level, n) in seen.items()],
+            )
+        )
+        total += 1
+        passed += record.get("testStatus") == "PASSED"
+    writer.footer(passed, total, index)
+    return index
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.report", description="Write the deduplicated test report.")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help=f"results store (default: {DB_PATH})")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="md")
+    parser.add_argument("-o", "--out", type=Path, help="output file (default: tmp/report.<format>)")
+    parser.add_argument("--project", default="city-lifes")
+    args = parser.parse_args(argv)
+
+    out_path = args.out or REPORT_PATH.with_suffix(f".{args.format}")
+    with ResultsStore(args.db) as store, out_path.open("w", encoding="utf-8") as out:
+        index = build_report(store.iter_legacy_records(), out, args.format, args.project)
+    total = sum(stats.count for stats in index.messages.values())
+    print(f"Wrote {out_path} ({total} console messages, {len(index.messages)} unique)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""SQLite store for TestSprite results, with per-test run history.
+
+``tmp/test_results.json`` used to be edited by loading all of it, patching one
+record and writing everything back. Here each test is one row keyed by its TC
+id, so changing a test's code, status or error touches only that row. Every
+harness run is appended to ``runs``. The legacy JSON is still produced, but
+only on request (``export``).
+
+    python -m harness.results sync              # pull code from every TC*.py
+    python -m harness.results sync TC014
+    python -m harness.results set TC014 --status PASSED
+    python -m harness.results history TC014
+    python -m harness.results export            # rewrite tmp/test_results.json
+
+The first time it is opened, the store imports the legacy JSON if that file
+exists.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from . import config
+from .loader import TestCase, discover
+
+DB_PATH = config.TMP_DIR / "results.db"
+LEGACY_JSON = config.TMP_DIR / "test_results.json"
+
+# Legacy record key -> column, in the order the legacy file lists them.
+LEGACY_COLUMNS = {
+    "projectId": "project_id",
+    "testId": "test_id",
+    "userId": "user_id",
+    "title": "title",
+    "description": "description",
+    "code": "code",
+    "testStatus": "status",
+    "testError": "error",
+    "testType": "test_type",
+    "createFrom": "create_from",
+    "testVisualization": "visualization",
+    "created": "created",
+    "modified": "modified",
+}
+# Run extras copied onto the test record so the legacy export carries them.
+ATTACHED_EXTRAS = ("vitals",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tests (
+    tc TEXT PRIMARY KEY,
+    project_id TEXT,
+    test_id TEXT,
+    user_id TEXT,
+    title TEXT NOT NULL,
+    description TEXT,
+    code TEXT,
+    code_sha1 TEXT,
+    status TEXT,
+    error TEXT,
+    test_type TEXT,
+    create_from TEXT,
+    visualization TEXT,
+    created TEXT,
+    modified TEXT,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tc TEXT NOT NULL REFERENCES tests(tc),
+    status TEXT NOT NULL,
+    error TEXT,
+    duration REAL,
+    finished TEXT NOT NULL,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS runs_by_test ON runs (tc, id);
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _sha1(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class ResultsStore:
+    def __init__(self, path: Path = DB_PATH, legacy_json: Path | None = LEGACY_JSON):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        if legacy_json is not None and legacy_json.exists() and not self._count():
+            self.import_legacy(legacy_json)
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def _count(self) -> int:
+        return self.db.execute("SELECT count(*) FROM tests").fetchone()[0]
+
+    def import_legacy(self, path: Path) -> int:
+        records = json.loads(path.read_text(encoding="utf-8"))
+        with self.db:
+            for record in records:
+                extra = {k: v for k, v in record.items() if k not in LEGACY_COLUMNS}
+                values = {LEGACY_COLUMNS[k]: v for k, v in record.items() if k in LEGACY_COLUMNS}
+                values.update(tc=record["title"][:5], extra=json.dumps(extra))
+                if values.get("code") is not None:
+                    values["code_sha1"] = _sha1(values["code"])
+                self._write(values)
+        return len(records)
+
+    def _write(self, values: dict[str, Any]) -> None:
+        columns = list(values)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c not in ("tc", "created"))
+        self.db.execute(
+            f"INSERT INTO tests ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT (tc) DO UPDATE SET {updates}",
+            [values[c] for c in columns],
+        )
+
+    def get(self, tc: str) -> sqlite3.Row | None:
+        return self.db.execute("SELECT * FROM tests WHERE tc = ?", (tc,)).fetchone()
+
+    def upsert(self, tc: str, *, title: str | None = None, **fields: Any) -> None:
+        """Set the given columns (``code``, ``status``, ``error``, ...) on one test."""
+        unknown = set(fields) - set(LEGACY_COLUMNS.values())
+        if unknown:
+            raise ValueError(f"Unknown result fields {sorted(unknown)}")
+        if title is None and self.get(tc) is None:
+            raise KeyError(f"{tc} is not in the store; pass a title to create it")
+        values: dict[str, Any] = {"tc": tc, **fields, "modified": _now()}
+        if title is not None:
+            values["title"] = title
+        if fields.get("code") is not None:
+            values["code_sha1"] = _sha1(fields["code"])
+        with self.db:
+            if title is None:
+                assignments = ", ".join(f"{c} = ?" for c in values if c != "tc")
+                self.db.execute(
+                    f"UPDATE tests SET {assignments} WHERE tc = ?", [*(v for c, v in values.items() if c != "tc"), tc]
+                )
+            else:
+                values.setdefault("created", values["modified"])
+                self._write(values)
+
+    def sync_code(self, cases: Iterable[TestCase]) -> list[str]:
+        """Store each script's source when it differs from the stored copy; return the TC ids changed."""
+        stored = dict(self.db.execute("SELECT tc, code_sha1 FROM tests"))
+        changed = []
+        for case in cases:
+            code = case.path.read_text(encoding="utf-8")
+            if stored.get(case.test_id) == _sha1(code):
+                continue
+            self.upsert(case.test_id, title=None if case.test_id in stored else case.title, code=code)
+            changed.append(case.test_id)
+        return changed
+
+    def attach(self, tc: str, key: str, value: Any) -> None:
+        """Store ``value`` under ``key`` in the test's extra fields (exported as a top-level key)."""
+        with self.db:
+            row = self.db.execute("SELECT extra FROM tests WHERE tc = ?", (tc,)).fetchone()
+            if row is None:
+                raise KeyError(f"{tc} is not in the store")
+            extra = json.loads(row["extra"])
+            extra[key] = value
+            self.db.execute("UPDATE tests SET extra = ? WHERE tc = ?", (json.dumps(extra), tc))
+
+    def record_run(self, tc: str, title: str, status: str, error: str | None, duration: float, extra: dict) -> None:
+        finished = _now()
+        with self.db:
+            if self.get(tc) is None:
+                self._write({"tc": tc, "title": title, "created": finished, "modified": finished})
+            self.db.execute(
+                "INSERT INTO runs (tc, status, error, duration, finished, extra) VALUES (?, ?, ?, ?, ?, ?)",
+                (tc, status, error, duration, finished, json.dumps(extra, default=str)),
+            )
+            self.db.execute(
+                "UPDATE tests SET status = ?, error = ?, modified = ? WHERE tc = ?", (status, error, finished, tc)
+            )
+        for key in ATTACHED_EXTRAS:
+            if key in extra:
+                self.attach(tc, key, extra[key])
+
+    def history(self, tc: str, limit: int = 20) -> list[sqlite3.Row]:
+        return self.db.execute(
+            "SELECT * FROM runs WHERE tc = ? ORDER BY id DESC LIMIT ?", (tc, limit)
+        ).fetchall()
+
+    def iter_legacy_records(self) -> Iterator[dict[str, Any]]:
+        """Yield the legacy records in TC order, one row in memory at a time."""
+        for row in self.db.execute("SELECT * FROM tests ORDER BY tc"):
+            record = {key: row[column] for key, column in LEGACY_COLUMNS.items()}
+            record.update(json.loads(row["extra"]))
+            yield record
+
+    def legacy_records(self) -> list[dict[str, Any]]:
+        return list(self.iter_legacy_records())
+
+    def export_legacy(self, path: Path = LEGACY_JSON) -> int:
+        records = self.legacy_records()
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(records, indent=2, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+        return len(records)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m harness.results", description="TestSprite results store.")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help=f"SQLite file (default: {DB_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync = commands.add_parser("sync", help="store the current source of TC scripts")
+    sync.add_argument("tests", nargs="*", help="TC ids or file name fragments (default: all)")
+
+    update = commands.add_parser("set", help="update one test's status, error or code")
+    update.add_argument("test")
+    update.add_argument("--status", choices=("PASSED", "FAILED"))
+    update.add_argument("--error")
+    update.add_argument("--code-from", type=Path, help="read the code from this file")
+
+    history = commands.add_parser("history", help="recent harness runs of one test")
+    history.add_argument("test")
+    history.add_argument("-n", type=int, default=20)
+
+    export = commands.add_parser("export", help="write the legacy test_results.json")
+    export.add_argument("--out", type=Path, default=LEGACY_JSON)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    with ResultsStore(args.db) as store:
+        if args.command == "sync":
+            changed = store.sync_code(discover(only=args.tests))
+            print(f"Updated code for {', '.join(changed)}" if changed else "All scripts up to date")
+        elif args.command == "set":
+            fields: dict[str, Any] = {}
+            if args.status:
+                fields["status"] = args.status
+            if args.error is not None:
+                fields["error"] = args.error or None
+            if args.code_from:
+                fields["code"] = args.code_from.read_text(encoding="utf-8")
+            if not fields:
+                print("Nothing to set", file=sys.stderr)
+                return 2
+            store.upsert(args.test, **fields)
+        elif args.command == "history":
+            for run in store.history(args.test, args.n):
+                print(f"{run['finished']}  {run['status']:<7} {run['duration'] or 0:7.1f}s  {run['error'] or ''}")
+        else:
+            print(f"Wrote {store.export_legacy(args.out)} records to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
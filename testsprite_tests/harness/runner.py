@@ -0,0 +1,213 @@
+"""Concurrent execution of TC scripts against a small pool of shared browsers."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+from playwright import async_api
+from playwright.async_api import Browser, BrowserContext
+
+from .loader import TestCase, load_run_test
+
+BROWSER_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+]
+
+
+@dataclass
+class RunnerConfig:
+    concurrency: int = 4
+    browsers: int = 1
+    headless: bool = True
+    timeout: float = 300.0
+    plugins: Sequence["Plugin"] = ()
+
+
+@dataclass
+class TestResult:
+    test_id: str
+    title: str
+    status: str = "PASSED"
+    duration: float = 0.0
+    error: str | None = None
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def passed(self) -> bool:
+        return self.status == "PASSED"
+
+
+class Plugin:
+    """Extension point for run-wide setup and per-context instrumentation.
+
+    Every method is optional; the runner calls them in registration order.
+    """
+
+    async def start(self, browser: Browser) -> None:
+        """Called once, after the first browser is up and before any test runs."""
+
+    async def stop(self) -> None:
+        """Called once after the last test has finished."""
+
+    async def context_options(self, case: TestCase) -> dict[str, Any]:
+        """Extra ``browser.new_context()`` keyword arguments for ``case``."""
+        return {}
+
+    async def on_context(self, context: BrowserContext, case: TestCase, result: TestResult) -> None:
+        """Called right after a context is created for ``case``."""
+
+    async def before_close(self, context: BrowserContext, case: TestCase, result: TestResult) -> None:
+        """Called before a context created for ``case`` is closed."""
+
+    async def on_finish(self, case: TestCase, result: TestResult) -> None:
+        """Called once ``case`` has finished and its status is final."""
+
+
+class _SharedBrowser:
+    """Stands in for ``pw.chromium.launch()``: contexts are real, close() is not."""
+
+    def __init__(self, runner: "_SuiteRunner", browser: Browser, case: TestCase, result: TestResult):
+        self._runner = runner
+        self._browser = browser
+        self._case = case
+        self._result = result
+        self.contexts: list[BrowserContext] = []
+
+    async def launch(self, **_options: Any) -> "_SharedBrowser":
+        return self
+
+    async def new_context(self, **options: Any) -> BrowserContext:
+        context = await self._runner.open_context(self._browser, self._case, self._result, options)
+        self.contexts.append(context)
+        return context
+
+    async def close(self) -> None:
+        for context in self.contexts:
+            await _close_quietly(context)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._browser, name)
+
+
+class _SharedPlaywright:
+    def __init__(self, browser: _SharedBrowser):
+        self.chromium = browser
+
+    async def start(self) -> "_SharedPlaywright":
+        return self
+
+    async def stop(self) -> None:
+        pass
+
+    async def __aenter__(self) -> "_SharedPlaywright":
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        pass
+
+
+class _AsyncApiShim:
+    """``playwright.async_api`` as seen by one test: everything but the launch is real."""
+
+    def __init__(self, playwright: _SharedPlaywright):
+        self._playwright = playwright
+
+    def async_playwright(self) -> _SharedPlaywright:
+        return self._playwright
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(async_api, name)
+
+
+async def _close_quietly(context: BrowserContext) -> None:
+    try:
+        await context.close()
+    except async_api.Error:
+        pass
+
+
+class _SuiteRunner:
+    def __init__(self, config: RunnerConfig):
+        self.config = config
+        self._browsers: list[Browser] = []
+        self._next_browser: itertools.cycle | None = None
+
+    async def open_context(
+        self, browser: Browser, case: TestCase, result: TestResult, options: dict[str, Any]
+    ) -> BrowserContext:
+        merged: dict[str, Any] = {}
+        for plugin in self.config.plugins:
+            merged.update(await plugin.context_options(case))
+        merged.update(options)
+        context = await browser.new_context(**merged)
+
+        original_close = context.close
+        closed = False
+
+        async def close(**kwargs: Any) -> None:
+            nonlocal closed
+            if closed:
+                return
+            closed = True
+            for plugin in self.config.plugins:
+                try:
+                    await plugin.before_close(context, case, result)
+                except Exception as exc:  # instrumentation must never fail a test
+                    result.extra.setdefault("plugin_errors", []).append(f"{type(plugin).__name__}: {exc}")
+            await original_close(**kwargs)
+
+        context.close = close  # type: ignore[method-assign]
+        for plugin in self.config.plugins:
+            await plugin.on_context(context, case, result)
+        return context
+
+    async def run_case(self, case: TestCase, semaphore: asyncio.Semaphore) -> TestResult:
+        result = TestResult(test_id=case.test_id, title=case.title)
+        async with semaphore:
+            browser = next(self._next_browser)
+            shared = _SharedBrowser(self, browser, case, result)
+            started = time.perf_counter()
+            try:
+                run_test = load_run_test(case, _AsyncApiShim(_SharedPlaywright(shared)))
+                await asyncio.wait_for(run_test(), timeout=self.config.timeout)
+            except asyncio.TimeoutError:
+                result.status = "FAILED"
+                result.error = f"Timed out after {self.config.timeout:.0f}s"
+            except Exception as exc:
+                result.status = "FAILED"
+                result.error = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+            finally:
+                await shared.close()
+                result.duration = time.perf_counter() - started
+        for plugin in self.config.plugins:
+            await plugin.on_finish(case, result)
+        return result
+
+    async def run(self, cases: Sequence[TestCase]) -> list[TestResult]:
+        async with async_api.async_playwright() as pw:
+            for _ in range(max(1, self.config.browsers)):
+                self._browsers.append(
+                    await pw.chromium.launch(headless=self.config.headless, args=BROWSER_ARGS)
+                )
+            self._next_browser = itertools.cycle(self._browsers)
+            for plugin in self.config.plugins:
+                await plugin.start(self._browsers[0])
+            try:
+                semaphore = asyncio.Semaphore(max(1, self.config.concurrency))
+                return list(await asyncio.gather(*(self.run_case(case, semaphore) for case in cases)))
+            finally:
+                for plugin in self.config.plugins:
+                    await plugin.stop()
+                for browser in self._browsers:
+                    await browser.close()
+
+
+async def run_suite(cases: Sequence[TestCase], config: RunnerConfig | None = None) -> list[TestResult]:
+    """Run ``cases`` concurrently and return one result per case, in order."""
+    return await _SuiteRunner(config or RunnerConfig()).run(cases)
@@ -0,0 +1,170 @@
+"""Cached Supabase sessions per role, injected instead of replaying the login UI.
+
+Each role signs in once against GoTrue (``/auth/v1/token?grant_type=password``)
+and the resulting session is written as a Playwright ``storage_state`` file under
+``tmp/sessions/<role>.<project>.json`` (git-ignored: it holds live tokens). The file
+is reused across tests and runs until the access token is within ``EXPIRY_MARGIN``
+seconds of expiring.
+
+Credentials come from ``TESTSPRITE_<ROLE>_EMAIL`` / ``TESTSPRITE_<ROLE>_PASSWORD``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from playwright.async_api import APIRequestContext, Browser, BrowserContext, Page
+
+from . import config
+from .loader import TestCase
+from .runner import Plugin
+
+SESSIONS_DIR = config.TMP_DIR / "sessions"
+EXPIRY_MARGIN = 300
+
+# Tests that start signed in. TC019 checks anonymous access first and signs in mid-test.
+ROLE_BY_TEST = {
+    "TC011": "listing_owner",
+    "TC012": "owner",
+    "TC014": "user",
+    "TC015": "user",
+    "TC016": "admin",
+}
+
+
+class SessionError(RuntimeError):
+    pass
+
+
+def credentials(role: str) -> tuple[str, str]:
+    if role not in config.DEFAULT_CREDENTIALS:
+        raise SessionError(f"Unknown role {role!r}; expected one of {sorted(config.DEFAULT_CREDENTIALS)}")
+    email, password = config.DEFAULT_CREDENTIALS[role]
+    prefix = f"TESTSPRITE_{role.upper()}_"
+    return config.env(prefix + "EMAIL", email), config.env(prefix + "PASSWORD", password)
+
+
+def state_path(role: str) -> Path:
+    # Keyed by project so stand-in and real sessions never mix.
+    return SESSIONS_DIR / f"{role}.{config.AUTH_PROJECT}.json"
+
+
+def _stored_session(state: dict[str, Any]) -> dict[str, Any] | None:
+    for origin in state.get("origins", []):
+        for item in origin.get("localStorage", []):
+            if item.get("name") == config.AUTH_STORAGE_KEY:
+                return json.loads(item["value"])
+    return None
+
+
+def _is_fresh(path: Path) -> bool:
+    try:
+        session = _stored_session(json.loads(path.read_text(encoding="utf-8")))
+    except (OSError, ValueError, KeyError):
+        return False
+    return bool(session) and session.get("expires_at", 0) - EXPIRY_MARGIN > time.time()
+
+
+async def _password_grant(request: APIRequestContext, role: str) -> dict[str, Any]:
+    if not config.GOTRUE_URL:
+        raise SessionError("VITE_SUPABASE_URL is not set; put it in the repo's .env or the environment")
+    email, password = credentials(role)
+    response = await request.post(
+        f"{config.GOTRUE_URL}/token?grant_type=password",
+        headers={"apikey": config.SUPABASE_ANON_KEY, "Content-Type": "application/json"},
+        data={"email": email, "password": password},
+    )
+    if not response.ok:
+        raise SessionError(f"Sign-in for {role} ({email}) failed: HTTP {response.status} {await response.text()}")
+    session = await response.json()
+    session.setdefault("expires_at", int(time.time()) + int(session.get("expires_in", 3600)))
+    return session
+
+
+def _write_state(role: str, session: dict[str, Any]) -> Path:
+    state = {
+        "cookies": [],
+        "origins": [
+            {
+                "origin": config.BASE_URL,
+                "localStorage": [{"name": config.AUTH_STORAGE_KEY, "value": json.dumps(session)}],
+            }
+        ],
+    }
+    path = state_path(role)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+_locks: dict[str, asyncio.Lock] = {}
+_offline = False
+
+
+def set_offline(enabled: bool) -> None:
+    """Never sign in over the network; reuse cached sessions even when stale (replay mode)."""
+    global _offline
+    _offline = enabled
+
+
+async def storage_state(request: APIRequestContext, role: str) -> Path:
+    """Return a fresh storage_state file for ``role``, signing in at most once."""
+    lock = _locks.setdefault(role, asyncio.Lock())
+    async with lock:
+        path = state_path(role)
+        if _offline:
+            if not path.exists():
+                raise SessionError(f"No cached session for {role} at {path}; record with --record first")
+            return path
+        if not _is_fresh(path):
+            _write_state(role, await _password_grant(request, role))
+        return path
+
+
+async def sign_in(page: Page, role: str) -> None:
+    """Make ``page`` signed in as ``role`` without going through the login UI.
+
+    A no-op when the context already carries that role's session (the runner
+    injects it up front for tests listed in ``ROLE_BY_TEST``).
+    """
+    path = await storage_state(page.context.request, role)
+    session = _stored_session(json.loads(path.read_text(encoding="utf-8")))
+    current = await page.evaluate("key => localStorage.getItem(key)", config.AUTH_STORAGE_KEY)
+    if current and json.loads(current).get("user", {}).get("id") == session["user"]["id"]:
+        return
+    await page.evaluate(
+        "([key, value]) => localStorage.setItem(key, value)", [config.AUTH_STORAGE_KEY, json.dumps(session)]
+    )
+    await page.reload(wait_until="domcontentloaded")
+
+
+class SessionPlugin(Plugin):
+    """Starts the tests in ``ROLE_BY_TEST`` with their role's cached session."""
+
+    def __init__(self) -> None:
+        self._request: APIRequestContext | None = None
+        self._context: BrowserContext | None = None
+
+    async def start(self, browser: Browser) -> None:
+        self._context = await browser.new_context()
+        self._request = self._context.request
+
+    async def stop(self) -> None:
+        if self._context:
+            await self._context.close()
+
+    async def context_options(self, case: TestCase) -> dict[str, Any]:
+        role = ROLE_BY_TEST.get(case.test_id)
+        if role is None or self._request is None:
+            return {}
+        try:
+            return {"storage_state": str(await storage_state(self._request, role))}
+        except SessionError:
+            # The script's own sign_in() raises the same error, or falls back to the login UI.
+            return {}
@@ -0,0 +1,20 @@
+"""Offline Supabase stand-in for hermetic TC runs.
+
+Implements the PostgREST tables and RPCs the app calls (``search_properties``,
+``search_properties_page``/``_count``, ``search_properties_in_view``,
+``get_map_clusters``, ``get_sponsored_properties``, ``favorites``, ``leads``,
+``messages``, ...) plus GoTrue email login, all over an in-memory fixture
+dataset.
+
+Inside the runner: ``python -m harness --standin``. As a standalone server for
+``npm run dev``::
+
+    python -m harness.standin --port 54321
+    VITE_SUPABASE_URL=http://127.0.0.1:54321 npm run dev
+"""
+
+from .app import StandinApp
+from .fixtures import build_dataset, load_dataset
+from .server import StandinServer
+
+__all__ = ["StandinApp", "StandinServer", "build_dataset", "load_dataset"]
@@ -0,0 +1,32 @@
+"""``python -m harness.standin``: serve the fixture dataset over HTTP."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from .app import StandinApp
+from .fixtures import build_dataset, load_dataset
+from .server import StandinServer
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m harness.standin", description="Local Supabase stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--fixtures", type=Path, help="JSON dataset to serve instead of the built-in one")
+    parser.add_argument("--listings", type=int, default=60, help="generated listings in the built-in dataset")
+    args = parser.parse_args(argv)
+
+    dataset = load_dataset(args.fixtures) if args.fixtures else build_dataset(generated=args.listings)
+    server = StandinServer(StandinApp(dataset), args.host, args.port)
+    print(f"Supabase stand-in listening on {server.url}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
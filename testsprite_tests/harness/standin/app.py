@@ -0,0 +1,111 @@
+"""Request routing for the Supabase stand-in: ``/rest/v1`` and ``/auth/v1``."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from .auth import GoTrue
+from .http import Request, Response
+from .postgrest import Database, PostgrestError, parse_select
+from .rpc import call
+
+SINGLE_OBJECT = "application/vnd.pgrst.object+json"
+
+
+def _prefer(request: Request) -> dict[str, str]:
+    prefs = {}
+    for item in request.header("prefer").split(","):
+        key, _, value = item.strip().partition("=")
+        if key:
+            prefs[key] = value
+    return prefs
+
+
+def _content_range(offset: int, count: int, total: int | None) -> str:
+    span = f"{offset}-{offset + count - 1}" if count else "*"
+    return f"{span}/{total if total is not None else '*'}"
+
+
+class StandinApp:
+    def __init__(self, dataset: dict[str, list[dict[str, Any]]]):
+        self.db = Database({name: list(rows) for name, rows in dataset.items()})
+        self.auth = GoTrue(self.db)
+
+    def handle(self, request: Request) -> Response:
+        if request.method == "OPTIONS":
+            return Response.empty().with_cors()
+        try:
+            if request.path.startswith("/auth/v1/"):
+                response = self.auth.handle(request, request.path[len("/auth/v1/") :].strip("/"))
+            elif request.path.startswith("/rest/v1/rpc/"):
+                response = self._rpc(request, request.path[len("/rest/v1/rpc/") :])
+            elif request.path.startswith("/rest/v1/"):
+                response = self._table(request, request.path[len("/rest/v1/") :].strip("/"))
+            else:
+                response = Response.json({"message": f"No stand-in route for {request.path}"}, 404)
+        except PostgrestError as exc:
+            response = Response.json(exc.payload(), exc.status)
+        except (ValueError, KeyError, TypeError) as exc:
+            response = Response.json({"code": "PGRST100", "message": str(exc), "details": None, "hint": None}, 400)
+        return response.with_cors()
+
+    def _rpc(self, request: Request, name: str) -> Response:
+        if request.method == "GET":
+            args: dict[str, Any] = dict(request.query)
+        else:
+            args = request.json() or {}
+        result = call(self.db, name, args, self.auth.user_for(request))
+        if isinstance(result, list):
+            return self._rows(request, result, len(result), 0)
+        return Response.json(result)
+
+    def _rows(self, request: Request, rows: list[dict[str, Any]], total: int, offset: int, status: int = 200) -> Response:
+        if SINGLE_OBJECT in request.header("accept"):
+            if len(rows) != 1:
+                raise PostgrestError(
+                    406, "PGRST116", "JSON object requested, multiple (or no) rows returned",
+                    f"The result contains {len(rows)} rows",
+                )  # fmt: skip
+            return Response.json(rows[0], status)
+        counted = _prefer(request).get("count") in ("exact", "planned", "estimated")
+        headers = {"Content-Range": _content_range(offset, len(rows), total if counted else None)}
+        if request.method == "HEAD":
+            return Response.empty(200, headers)
+        return Response.json(rows, status, headers)
+
+    def _table(self, request: Request, table: str) -> Response:
+        if table.startswith("auth."):
+            raise PostgrestError(404, "42P01", f'relation "{table}" does not exist')
+        prefer = _prefer(request)
+        returning = prefer.get("return") == "representation"
+
+        if request.method in ("GET", "HEAD"):
+            rows, total = self.db.select(table, request.query, request.header("range"))
+            offset = int(request.param("offset") or 0)
+            if request.header("range"):
+                offset = int(request.header("range").split("-", 1)[0] or 0)
+            return self._rows(request, rows, total, offset)
+
+        if request.method == "POST":
+            on_conflict = request.param("on_conflict") if prefer.get("resolution") == "merge-duplicates" else None
+            written = self.db.insert(table, request.json() or {}, on_conflict)
+            status = 201
+        elif request.method == "PATCH":
+            written = self.db.update(table, request.query, request.json() or {})
+            status = 200
+        elif request.method == "DELETE":
+            written = self.db.delete(table, request.query)
+            status = 200
+        else:
+            return Response.json({"message": f"Method {request.method} not allowed"}, 405)
+
+        if not returning:
+            return Response.empty(201 if status == 201 else 204)
+        fields = parse_select(request.param("select"))
+        projected = [self.db.project(table, row, fields) for row in written]
+        return self._rows(request, projected, len(projected), 0, status)
+
+    def snapshot(self) -> str:
+        """Current dataset as JSON, e.g. to save a fixture after a scripted session."""
+        return json.dumps(self.db.tables, indent=2, default=str)
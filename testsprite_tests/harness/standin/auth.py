@@ -0,0 +1,155 @@
+"""Minimal GoTrue: email/password and refresh-token grants, signup, user, logout."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import time
+import uuid
+from typing import Any
+
+from .http import Request, Response
+from .postgrest import Database, now_iso
+
+# Same default secret as `supabase start`, so tokens look familiar in devtools.
+JWT_SECRET = b"super-secret-jwt-token-with-at-least-32-characters-long"
+TOKEN_TTL = 3600
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _unb64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def encode_jwt(claims: dict[str, Any]) -> str:
+    header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    body = _b64(json.dumps(claims, separators=(",", ":")).encode())
+    signature = hmac.new(JWT_SECRET, f"{header}.{body}".encode(), hashlib.sha256).digest()
+    return f"{header}.{body}.{_b64(signature)}"
+
+
+def decode_jwt(token: str) -> dict[str, Any] | None:
+    try:
+        header, body, signature = token.split(".")
+    except ValueError:
+        return None
+    expected = hmac.new(JWT_SECRET, f"{header}.{body}".encode(), hashlib.sha256).digest()
+    if not hmac.compare_digest(expected, _unb64(signature)):
+        return None
+    claims = json.loads(_unb64(body))
+    return claims if claims.get("exp", 0) > time.time() else None
+
+
+def _error(status: int, error: str, description: str) -> Response:
+    return Response.json({"error": error, "error_description": description, "msg": description}, status)
+
+
+class GoTrue:
+    def __init__(self, db: Database):
+        self.db = db
+        self._refresh_tokens: dict[str, str] = {}
+
+    @property
+    def users(self) -> list[dict[str, Any]]:
+        return self.db.rows("auth.users")
+
+    def _user(self, user_id: str) -> dict[str, Any] | None:
+        return next((u for u in self.users if u["id"] == user_id), None)
+
+    @staticmethod
+    def public_user(user: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "id": user["id"],
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": user["email"],
+            "email_confirmed_at": user["created_at"],
+            "phone": "",
+            "app_metadata": {"provider": "email", "providers": ["email"]},
+            "user_metadata": user.get("user_metadata", {}),
+            "identities": [],
+            "created_at": user["created_at"],
+            "updated_at": user["created_at"],
+        }
+
+    def _session(self, user: dict[str, Any]) -> dict[str, Any]:
+        issued = int(time.time())
+        refresh_token = secrets.token_urlsafe(16)
+        self._refresh_tokens[refresh_token] = user["id"]
+        access_token = encode_jwt(
+            {
+                "sub": user["id"],
+                "email": user["email"],
+                "aud": "authenticated",
+                "role": "authenticated",
+                "iat": issued,
+                "exp": issued + TOKEN_TTL,
+            }
+        )
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "expires_in": TOKEN_TTL,
+            "expires_at": issued + TOKEN_TTL,
+            "refresh_token": refresh_token,
+            "user": self.public_user(user),
+        }
+
+    def user_for(self, request: Request) -> dict[str, Any] | None:
+        claims = decode_jwt(request.bearer or "")
+        return self._user(claims["sub"]) if claims else None
+
+    def handle(self, request: Request, route: str) -> Response:
+        if route == "token" and request.method == "POST":
+            return self._token(request)
+        if route == "signup" and request.method == "POST":
+            return self._signup(request)
+        if route == "user" and request.method == "GET":
+            user = self.user_for(request)
+            return Response.json(self.public_user(user)) if user else _error(401, "invalid_token", "Invalid JWT")
+        if route == "logout":
+            return Response.empty()
+        if route == "settings":
+            return Response.json({"external": {"email": True, "google": False}, "disable_signup": False})
+        return _error(404, "not_found", f"Unsupported auth route /{route}")
+
+    def _token(self, request: Request) -> Response:
+        body = request.json() or {}
+        grant = request.param("grant_type")
+        if grant == "password":
+            email = str(body.get("email", "")).lower()
+            user = next((u for u in self.users if u["email"].lower() == email), None)
+            if user is None or user["password"] != body.get("password"):
+                return _error(400, "invalid_grant", "Invalid login credentials")
+            return Response.json(self._session(user))
+        if grant == "refresh_token":
+            user_id = self._refresh_tokens.pop(body.get("refresh_token", ""), None)
+            user = self._user(user_id) if user_id else None
+            if user is None:
+                return _error(400, "invalid_grant", "Invalid Refresh Token: Refresh Token Not Found")
+            return Response.json(self._session(user))
+        return _error(400, "unsupported_grant_type", f"Unsupported grant_type {grant!r}")
+
+    def _signup(self, request: Request) -> Response:
+        body = request.json() or {}
+        email = str(body.get("email", "")).lower()
+        if not email or not body.get("password"):
+            return _error(422, "validation_failed", "Signup requires a valid email and password")
+        if any(u["email"].lower() == email for u in self.users):
+            return _error(422, "user_already_exists", "User already registered")
+        user = {
+            "id": str(uuid.uuid4()),
+            "email": email,
+            "password": body["password"],
+            "user_metadata": (body.get("data") or {}),
+            "created_at": now_iso(),
+        }
+        self.users.append(user)
+        self.db.insert("profiles", {"id": user["id"], "email": email, "full_name": user["user_metadata"].get("full_name")})
+        return Response.json(self._session(user))
@@ -0,0 +1,221 @@
+"""Deterministic in-memory dataset for the stand-in.
+
+The named listings are the ones TC004 asserts on; the rest are generated from a
+fixed seed so every run sees identical rows. ``--fixtures file.json`` replaces
+the whole dataset with ``{"table": [rows...]}`` (``auth.users`` holds logins).
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from .. import config
+
+NAMESPACE = uuid.UUID("4f1f6b0e-7c1d-4d7a-9d7c-2f3c9a1b8e55")
+EPOCH = datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+# city -> (lat, lng, areas)
+CITIES = {
+    "Mumbai": (19.076, 72.8777, ["Andheri", "Bandra", "Powai", "Worli"]),
+    "Delhi": (28.6139, 77.209, ["Dwarka", "Saket", "Rohini", "Karol Bagh"]),
+    "Bangalore": (12.9716, 77.5946, ["Whitefield", "Koramangala", "HSR Layout", "Indiranagar"]),
+    "Hyderabad": (17.385, 78.4867, ["Hitech City", "Jubilee Hills", "Gachibowli", "Madhapur"]),
+    "Chennai": (13.0827, 80.2707, ["Anna Nagar", "T Nagar", "Adyar", "Velachery"]),
+    "Pune": (18.5204, 73.8567, ["Kothrud", "Hinjewadi", "Baner", "Viman Nagar"]),
+    "Ahmedabad": (23.0225, 72.5714, ["Anna Nagar", "Andheri", "Satellite", "Navrangpura"]),
+    "Allahabad": (25.4358, 81.8463, ["Ballygunge", "Civil Lines", "George Town"]),
+}
+
+PROPERTY_TYPES = ["house", "apartment", "flat", "commercial", "office", "pg", "business", "cafe", "warehouse"]
+
+NAMED_LISTINGS = [
+    # title, property_type, city, area, price, price_type, verified
+    ("Test Business", "business", "Hyderabad", "Hitech City", 250000, "sale", True),
+    ("Test JS Force", "apartment", "Bangalore", "Whitefield", 15000, "monthly", True),
+    ("sjbnjcnwe", "house", "Hyderabad", "Jubilee Hills", 42000, "monthly", False),
+    ("testing", "house", "Allahabad", "Ballygunge", 733, "sale", False),
+    ("jkhjdscr", "flat", "Ahmedabad", "Anna Nagar", 1200, "monthly", False),
+    ("kbadsc", "house", "Ahmedabad", "Andheri", 923, "sale", False),
+    ("house", "house", "Bangalore", "HSR Layout", 30903, "monthly", False),
+]
+
+
+def stable_id(*parts: str) -> str:
+    return str(uuid.uuid5(NAMESPACE, "/".join(parts)))
+
+
+def _iso(offset_hours: float) -> str:
+    return (EPOCH - timedelta(hours=offset_hours)).isoformat()
+
+
+def _users() -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+    users, profiles, roles = [], [], []
+    for index, (role, (email, password)) in enumerate(config.DEFAULT_CREDENTIALS.items()):
+        user_id = stable_id("user", role)
+        created = _iso(24 * 30 + index)
+        name = f"Test {role.replace('_', ' ').title()}"
+        users.append(
+            {"id": user_id, "email": email, "password": password, "user_metadata": {"full_name": name}, "created_at": created}
+        )
+        profiles.append(
+            {"id": user_id, "email": email, "full_name": name, "phone": f"+9190000000{index:02d}", "created_at": created, "updated_at": created}
+        )
+        if role == "admin":
+            roles.append({"id": stable_id("role", role), "user_id": user_id, "role": "admin", "created_at": created})
+    return users, profiles, roles
+
+
+def _property(index: int, owner_id: str, title: str, kind: str, city: str, area: str, price: float, price_type: str, verified: bool, rng: random.Random) -> dict[str, Any]:
+    lat, lng, _ = CITIES[city]
+    created = _iso(index * 3)
+    return {
+        "id": stable_id("property", str(index)),
+        "title": title,
+        "description": f"{title} in {area}, {city}.",
+        "price": price,
+        "price_type": price_type,
+        "property_type": kind,
+        "status": "active",
+        "available": True,
+        "images": [f"https://picsum.photos/seed/citylifes{index}/900/600"],
+        "bedrooms": rng.randint(1, 4) if kind in ("house", "apartment", "flat") else None,
+        "bathrooms": rng.randint(1, 3) if kind in ("house", "apartment", "flat") else None,
+        "area_sqft": rng.randint(400, 3000),
+        "address": f"{rng.randint(1, 200)} Main Road, {area}",
+        "city": city,
+        "area": area,
+        "pin_code": f"{rng.randint(400001, 700099)}",
+        "latitude": round(lat + rng.uniform(-0.08, 0.08), 6),
+        "longitude": round(lng + rng.uniform(-0.08, 0.08), 6),
+        "amenities": rng.sample(["parking", "wifi", "gym", "lift", "security", "power_backup"], 3),
+        "user_id": owner_id,
+        "contact_name": "Test Owner",
+        "contact_phone": "+919000000001",
+        "created_at": created,
+        "updated_at": created,
+        "views": rng.randint(0, 500),
+        "verified": verified,
+        "featured": False,
+        "campaign_id": None,
+    }
+
+
+def build_dataset(generated: int = 60, seed: int = 2025) -> dict[str, list[dict[str, Any]]]:
+    rng = random.Random(seed)
+    users, profiles, roles = _users()
+    owner_id = stable_id("user", "owner")
+    listing_owner_id = stable_id("user", "listing_owner")
+    user_id = stable_id("user", "user")
+
+    # The first listing belongs to the TC011 owner so its lead board is not empty.
+    properties = [
+        _property(i, listing_owner_id if i == 0 else owner_id, title, kind, city, area, price, price_type, verified, rng)
+        for i, (title, kind, city, area, price, price_type, verified) in enumerate(NAMED_LISTINGS)
+    ]
+    for i in range(len(NAMED_LISTINGS), len(NAMED_LISTINGS) + generated):
+        city = rng.choice(list(CITIES))
+        kind = rng.choice(PROPERTY_TYPES)
+        area = rng.choice(CITIES[city][2])
+        price_type = rng.choice(["monthly", "sale"])
+        price = rng.randint(5, 80) * 1000 if price_type == "monthly" else rng.randint(20, 300) * 100000
+        properties.append(
+            _property(i, owner_id, f"{kind.title()} in {area}", kind, city, area, price, price_type, rng.random() < 0.4, rng)
+        )
+
+    sponsored = properties[1]
+    campaign = {
+        "id": stable_id("campaign", "1"),
+        "property_id": sponsored["id"],
+        "user_id": owner_id,
+        "title": f"Promote {sponsored['title']}",
+        "status": "active",
+        "budget": 5000,
+        "spent": 1200,
+        "impressions": 340,
+        "clicks": 21,
+        "leads_generated": 2,
+        "start_date": _iso(24 * 7),
+        "end_date": "2099-12-31T00:00:00+00:00",
+        "created_at": _iso(24 * 7),
+        "updated_at": _iso(24 * 7),
+    }
+    sponsored["campaign_id"] = campaign["id"]
+
+    favorites = [
+        {"id": stable_id("favorite", "1"), "user_id": user_id, "property_id": properties[2]["id"], "created_at": _iso(5)}
+    ]
+    leads = [
+        {
+            "id": stable_id("lead", "1"),
+            "listing_id": sponsored["id"],
+            "owner_id": owner_id,
+            "user_id": user_id,
+            "campaign_id": campaign["id"],
+            "name": "Test User",
+            "phone": "+919000000000",
+            "email": config.DEFAULT_CREDENTIALS["user"][0],
+            "message": "Is this still available?",
+            "status": "new",
+            "source": "campaign",
+            "lead_type": "inquiry",
+            "category": sponsored["property_type"],
+            "created_at": _iso(4),
+            "updated_at": _iso(4),
+        },
+        {
+            "id": stable_id("lead", "2"),
+            "listing_id": properties[0]["id"],
+            "owner_id": listing_owner_id,
+            "user_id": user_id,
+            "campaign_id": None,
+            "name": "Test User",
+            "phone": "+919000000000",
+            "email": config.DEFAULT_CREDENTIALS["user"][0],
+            "message": "Can I visit this weekend?",
+            "status": "new",
+            "source": "listing",
+            "lead_type": "inquiry",
+            "category": properties[0]["property_type"],
+            "created_at": _iso(6),
+            "updated_at": _iso(6),
+        },
+    ]
+    messages = [
+        {
+            "id": stable_id("message", str(i)),
+            "sender_id": sender,
+            "receiver_id": receiver,
+            "property_id": sponsored["id"],
+            "content": content,
+            "read": i == 0,
+            "created_at": _iso(3 - i),
+        }
+        for i, (sender, receiver, content) in enumerate(
+            [(user_id, owner_id, "Hi, is the flat available?"), (owner_id, user_id, "Yes, you can visit tomorrow.")]
+        )
+    ]
+
+    return {
+        "auth.users": users,
+        "profiles": profiles,
+        "user_roles": roles,
+        "properties": properties,
+        "ad_campaigns": [campaign],
+        "favorites": favorites,
+        "leads": leads,
+        "messages": messages,
+        "reviews": [],
+        "reports": [],
+    }
+
+
+def load_dataset(path: Path) -> dict[str, list[dict[str, Any]]]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must contain an object of table name -> rows")
+    return data
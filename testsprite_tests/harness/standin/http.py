@@ -0,0 +1,72 @@
+"""Transport-neutral request/response types shared by the server and the route plugin."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, PATCH, PUT, DELETE, OPTIONS",
+    "Access-Control-Allow-Headers": "*",
+    "Access-Control-Expose-Headers": "Content-Range, Content-Location",
+}
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: list[tuple[str, str]] = field(default_factory=list)
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    @classmethod
+    def from_url(cls, method: str, url: str, headers: dict[str, str], body: bytes = b"") -> "Request":
+        parts = urlsplit(url)
+        return cls(
+            method=method.upper(),
+            path=parts.path,
+            query=parse_qsl(parts.query, keep_blank_values=True),
+            headers={k.lower(): v for k, v in headers.items()},
+            body=body,
+        )
+
+    def header(self, name: str, default: str = "") -> str:
+        return self.headers.get(name.lower(), default)
+
+    def param(self, name: str, default: str | None = None) -> str | None:
+        for key, value in self.query:
+            if key == name:
+                return value
+        return default
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+    @property
+    def bearer(self) -> str | None:
+        value = self.header("authorization")
+        return value[7:] if value.lower().startswith("bearer ") else None
+
+
+@dataclass
+class Response:
+    status: int = 200
+    body: bytes = b""
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def json(cls, data: Any, status: int = 200, headers: dict[str, str] | None = None) -> "Response":
+        body = json.dumps(data, separators=(",", ":"), default=str).encode()
+        return cls(status, body, {"Content-Type": "application/json; charset=utf-8", **(headers or {})})
+
+    @classmethod
+    def empty(cls, status: int = 204, headers: dict[str, str] | None = None) -> "Response":
+        return cls(status, b"", dict(headers or {}))
+
+    def with_cors(self) -> "Response":
+        self.headers = {**CORS_HEADERS, **self.headers}
+        return self
@@ -0,0 +1,49 @@
+"""Runner plugin: answer the browser's Supabase calls from the stand-in in-process."""
+
+from __future__ import annotations
+
+from playwright.async_api import Browser, BrowserContext, Route
+
+from .. import config
+from ..loader import TestCase
+from ..runner import Plugin, TestResult
+from .app import StandinApp
+from .http import Request
+from .server import StandinServer
+
+
+class StandinPlugin(Plugin):
+    """Routes ``VITE_SUPABASE_URL`` to a fresh :class:`StandinApp` per run.
+
+    Browser traffic is fulfilled straight from the app (no socket). The HTTP
+    server still starts on a free port so out-of-browser callers, such as the
+    session cache signing roles in, hit the same dataset.
+    """
+
+    def __init__(self, app: StandinApp):
+        self.app = app
+        self.server = StandinServer(app, port=0)
+        self._real_gotrue = config.GOTRUE_URL
+        self._real_project = config.AUTH_PROJECT
+
+    async def start(self, browser: Browser) -> None:
+        await self.server.start()
+        config.GOTRUE_URL = f"{self.server.url}/auth/v1"
+        # The port changes every run; the fixtures' users and JWT secret do not.
+        config.AUTH_PROJECT = "standin"
+
+    async def stop(self) -> None:
+        config.GOTRUE_URL = self._real_gotrue
+        config.AUTH_PROJECT = self._real_project
+        await self.server.stop()
+
+    async def _fulfill(self, route: Route) -> None:
+        request = route.request
+        body = request.post_data_buffer or b""
+        response = self.app.handle(Request.from_url(request.method, request.url, await request.all_headers(), body))
+        await route.fulfill(status=response.status, headers=response.headers, body=response.body)
+
+    async def on_context(self, context: BrowserContext, case: TestCase, result: TestResult) -> None:
+        await context.route(f"{config.SUPABASE_URL}/rest/v1/**", self._fulfill)
+        await context.route(f"{config.SUPABASE_URL}/auth/v1/**", self._fulfill)
+        result.extra["backend"] = "standin"
@@ -0,0 +1,347 @@
+"""The slice of PostgREST the app uses, over plain lists of dicts.
+
+Supported: ``select`` with many-to-one / one-to-many embedding, horizontal
+filters (``eq``, ``neq``, ``gt(e)``, ``lt(e)``, ``like``, ``ilike``, ``is``,
+``in``, ``cs``, ``not.*``, ``or=(...)``, ``and=(...)``), ``order``,
+``limit``/``offset``/``Range``, ``Prefer: count=exact`` and single-object
+responses. Row level security is not modelled.
+"""
+
+from __future__ import annotations
+
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable
+
+Row = dict[str, Any]
+Predicate = Callable[[Row], bool]
+
+# table -> {fk column -> referenced table}
+FOREIGN_KEYS: dict[str, dict[str, str]] = {
+    "properties": {"user_id": "profiles"},
+    "favorites": {"property_id": "properties", "user_id": "profiles"},
+    "leads": {"listing_id": "properties", "owner_id": "profiles", "user_id": "profiles", "campaign_id": "ad_campaigns"},
+    "messages": {"sender_id": "profiles", "receiver_id": "profiles", "property_id": "properties"},
+    "ad_campaigns": {"property_id": "properties", "user_id": "profiles"},
+    "reviews": {"property_id": "properties", "reviewer_id": "profiles", "reviewed_user_id": "profiles"},
+    "reports": {"reporter_id": "profiles", "reported_property_id": "properties", "reported_user_id": "profiles"},
+    "user_roles": {"user_id": "profiles"},
+}
+
+UNIQUE: dict[str, list[tuple[str, ...]]] = {
+    "favorites": [("user_id", "property_id")],
+    "profiles": [("email",)],
+}
+
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+class PostgrestError(Exception):
+    def __init__(self, status: int, code: str, message: str, details: str | None = None, hint: str | None = None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.details = details
+        self.hint = hint
+
+    def payload(self) -> dict[str, Any]:
+        return {"code": self.code, "message": self.message, "details": self.details, "hint": self.hint}
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# -- select ---------------------------------------------------------------------------
+
+
+@dataclass
+class Field:
+    name: str
+    alias: str
+    children: list["Field"] | None = None
+    hint: str | None = None
+
+
+def _split_top(text: str, sep: str = ",") -> list[str]:
+    parts, depth, current, quoted = [], 0, [], False
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == sep and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    parts.append("".join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+
+def parse_select(text: str | None) -> list[Field]:
+    text = re.sub(r"\s+", "", text or "*")
+    fields = []
+    for item in _split_top(text):
+        children = None
+        if item.endswith(")") and "(" in item:
+            head, inner = item.split("(", 1)
+            children = parse_select(inner[:-1])
+        else:
+            head = item
+        head = head.split("::", 1)[0]
+        alias, _, name = head.rpartition(":")
+        name, _, hint = name.partition("!")
+        fields.append(Field(name=name, alias=alias or name, children=children, hint=hint or None))
+    return fields
+
+
+# -- filters --------------------------------------------------------------------------
+
+
+def _coerce(arg: str, sample: Any) -> Any:
+    if isinstance(sample, bool):
+        return arg.lower() == "true"
+    if isinstance(sample, (int, float)):
+        try:
+            return float(arg)
+        except ValueError:
+            return arg
+    return arg
+
+
+def _like(pattern: str, flags: int = 0) -> re.Pattern[str]:
+    parts = [re.escape(p) for p in re.split(r"[*%]", pattern)]
+    return re.compile("^" + ".*".join(parts) + "$", flags | re.DOTALL)
+
+
+def _list_arg(arg: str) -> list[str]:
+    inner = arg.strip()[1:-1]
+    return [v.strip().strip('"') for v in _split_top(inner)] if inner else []
+
+
+def _compare(op: str, value: Any, arg: str) -> bool:
+    if op == "is":
+        target = {"null": None, "true": True, "false": False}.get(arg.lower(), arg)
+        return value is target
+    if op == "in":
+        return any(value == _coerce(v, value) or str(value) == v for v in _list_arg(arg))
+    if op == "cs":
+        wanted = _list_arg(arg)
+        return value is not None and set(wanted) <= {str(v) for v in value}
+    if op in ("fts", "plfts", "phfts", "wfts"):
+        text = str(value or "").lower()
+        return all(token in text for token in arg.lower().split())
+    if value is None:
+        return False
+    if op in ("like", "ilike"):
+        return bool(_like(arg, re.IGNORECASE if op == "ilike" else 0).match(str(value)))
+    target = _coerce(arg, value)
+    if isinstance(value, (int, float)) and not isinstance(target, (int, float)):
+        value = str(value)
+    if op == "eq":
+        return value == target or str(value) == arg
+    if op == "neq":
+        return not (value == target or str(value) == arg)
+    try:
+        return {"gt": value > target, "gte": value >= target, "lt": value < target, "lte": value <= target}[op]
+    except KeyError:
+        raise PostgrestError(400, "PGRST100", f"Unsupported operator {op!r}") from None
+    except TypeError:
+        return False
+
+
+def _condition(column: str, expression: str) -> Predicate:
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op, _, arg = expression.partition(".")
+    # Handle fts(english).term style operators.
+    op = op.split("(", 1)[0]
+
+    def predicate(row: Row) -> bool:
+        return _compare(op, row.get(column), arg) != negate
+
+    return predicate
+
+
+def _logic(expression: str, combine: Callable[[Iterable[bool]], bool]) -> Predicate:
+    inner = expression.strip()
+    if inner.startswith("(") and inner.endswith(")"):
+        inner = inner[1:-1]
+    predicates = []
+    for part in _split_top(inner):
+        if part.startswith(("or(", "and(", "not.or(", "not.and(")):
+            negate = part.startswith("not.")
+            name, _, rest = part.removeprefix("not.").partition("(")
+            sub = _logic("(" + rest, any if name == "or" else all)
+            predicates.append((lambda s, n: (lambda row: s(row) != n))(sub, negate))
+        else:
+            column, _, expr = part.partition(".")
+            predicates.append(_condition(column, expr))
+    return lambda row: combine(p(row) for p in predicates)
+
+
+def build_filter(query: list[tuple[str, str]]) -> Predicate:
+    predicates: list[Predicate] = []
+    for key, value in query:
+        if key in RESERVED_PARAMS:
+            continue
+        if key in ("or", "and"):
+            predicates.append(_logic(value, any if key == "or" else all))
+        elif key in ("not.or", "not.and"):
+            sub = _logic(value, any if key == "not.or" else all)
+            predicates.append(lambda row, s=sub: not s(row))
+        else:
+            predicates.append(_condition(key, value))
+    return lambda row: all(p(row) for p in predicates)
+
+
+# -- ordering / paging ----------------------------------------------------------------
+
+
+def sort_rows(rows: list[Row], order: str | None) -> list[Row]:
+    if not order:
+        return rows
+    for term in reversed(_split_top(order)):
+        column, *mods = term.split(".")
+        descending = "desc" in mods
+        nulls_first = "nullsfirst" in mods or ("nullslast" not in mods and descending)
+        present = [r for r in rows if r.get(column) is not None]
+        missing = [r for r in rows if r.get(column) is None]
+        present.sort(key=lambda r: r[column], reverse=descending)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+
+def page_bounds(query_limit: str | None, query_offset: str | None, range_header: str) -> tuple[int, int | None]:
+    offset, limit = int(query_offset or 0), int(query_limit) if query_limit else None
+    match = re.match(r"^(\d+)-(\d*)$", range_header.strip())
+    if match:
+        offset = int(match.group(1))
+        if match.group(2):
+            end_limit = int(match.group(2)) - offset + 1
+            limit = end_limit if limit is None else min(limit, end_limit)
+    return offset, limit
+
+
+# -- database -------------------------------------------------------------------------
+
+
+@dataclass
+class Database:
+    tables: dict[str, list[Row]] = field(default_factory=dict)
+
+    def rows(self, table: str) -> list[Row]:
+        return self.tables.setdefault(table, [])
+
+    def by_id(self, table: str, row_id: Any) -> Row | None:
+        for row in self.rows(table):
+            if row.get("id") == row_id:
+                return row
+        return None
+
+    # select ----------------------------------------------------------------------
+
+    def _embed(self, table: str, row: Row, item: Field) -> Any:
+        fks = FOREIGN_KEYS.get(table, {})
+        column = item.hint if item.hint in fks else item.name if item.name in fks else None
+        if column is None and item.hint:
+            # constraint-name hints such as profiles!fk_messages_sender_profiles
+            column = next((c for c in fks if c.removesuffix("_id") in item.hint), None)
+        if column is None:
+            # alias:table(...) pointing at a many-to-one relation
+            column = next((c for c, t in fks.items() if t == item.name), None)
+        if column is not None:
+            target = self.by_id(fks[column], row.get(column))
+            return self.project(fks[column], target, item.children or []) if target else None
+        # one-to-many: find an FK in the embedded table pointing back at this one
+        back = next((c for c, t in FOREIGN_KEYS.get(item.name, {}).items() if t == table), None)
+        if back is None:
+            raise PostgrestError(
+                400, "PGRST200", f"Could not find a relationship between '{table}' and '{item.name}'"
+            )
+        children = [r for r in self.rows(item.name) if r.get(back) == row.get("id")]
+        return [self.project(item.name, r, item.children or []) for r in children]
+
+    def project(self, table: str, row: Row, fields: list[Field]) -> Row:
+        out: Row = {}
+        for item in fields or [Field("*", "*")]:
+            if item.children is not None:
+                out[item.alias] = self._embed(table, row, item)
+            elif item.name == "*":
+                out.update(row)
+            else:
+                out[item.alias] = row.get(item.name)
+        return out
+
+    def select(self, table: str, query: list[tuple[str, str]], range_header: str = "") -> tuple[list[Row], int]:
+        params = dict(query)
+        matched = [r for r in self.rows(table) if build_filter(query)(r)]
+        matched = sort_rows(matched, params.get("order"))
+        offset, limit = page_bounds(params.get("limit"), params.get("offset"), range_header)
+        page = matched[offset : offset + limit if limit is not None else None]
+        fields = parse_select(params.get("select"))
+        return [self.project(table, r, fields) for r in page], len(matched)
+
+    # writes ----------------------------------------------------------------------
+
+    def _check_unique(self, table: str, row: Row, ignore: Row | None = None) -> None:
+        for columns in UNIQUE.get(table, []):
+            key = tuple(row.get(c) for c in columns)
+            if None in key:
+                continue
+            for other in self.rows(table):
+                if other is not ignore and tuple(other.get(c) for c in columns) == key:
+                    raise PostgrestError(
+                        409, "23505", f'duplicate key value violates unique constraint "{table}_{"_".join(columns)}_key"'
+                    )
+
+    def _check_references(self, table: str, row: Row) -> None:
+        for column, target in FOREIGN_KEYS.get(table, {}).items():
+            value = row.get(column)
+            if value is not None and target in self.tables and self.by_id(target, value) is None:
+                raise PostgrestError(409, "23503", f'insert or update on table "{table}" violates foreign key constraint')
+
+    def insert(self, table: str, payload: Row | list[Row], on_conflict: str | None = None) -> list[Row]:
+        items = payload if isinstance(payload, list) else [payload]
+        inserted = []
+        for item in items:
+            row = {"id": str(uuid.uuid4()), "created_at": now_iso(), **item}
+            row.setdefault("updated_at", row["created_at"])
+            if on_conflict:
+                keys = [c.strip() for c in on_conflict.split(",")]
+                existing = next((r for r in self.rows(table) if all(r.get(k) == row.get(k) for k in keys)), None)
+                if existing is not None:
+                    existing.update(item)
+                    inserted.append(existing)
+                    continue
+            self._check_unique(table, row)
+            self._check_references(table, row)
+            self.rows(table).append(row)
+            inserted.append(row)
+        return inserted
+
+    def update(self, table: str, query: list[tuple[str, str]], patch: Row) -> list[Row]:
+        predicate = build_filter(query)
+        updated = []
+        for row in self.rows(table):
+            if predicate(row):
+                candidate = {**row, **patch}
+                self._check_unique(table, candidate, ignore=row)
+                row.update(patch)
+                updated.append(row)
+        return updated
+
+    def delete(self, table: str, query: list[tuple[str, str]]) -> list[Row]:
+        predicate = build_filter(query)
+        kept, removed = [], []
+        for row in self.rows(table):
+            (removed if predicate(row) else kept).append(row)
+        self.tables[table] = kept
+        return removed
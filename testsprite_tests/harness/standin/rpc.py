@@ -0,0 +1,688 @@
+"""Python versions of the Postgres functions the app calls through ``/rest/v1/rpc``.
+
+Each mirrors the filtering, ordering and output columns of the latest
+definition under ``supabase/migrations``.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import math
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from .postgrest import Database, PostgrestError, Row, now_iso
+
+RpcFunction = Callable[[Database, dict[str, Any], "Row | None"], Any]
+
+REGISTRY: dict[str, RpcFunction] = {}
+
+SEARCH_COLUMNS = (
+    "id", "title", "description", "price", "price_type", "property_type", "status", "available",
+    "images", "bedrooms", "bathrooms", "area_sqft", "address", "city", "area", "pin_code",
+    "latitude", "longitude", "amenities", "user_id", "created_at", "updated_at", "views",
+    "verified", "featured",
+)  # fmt: skip
+
+# tsvector weights used by the properties.fts column
+TEXT_WEIGHTS = (("title", 1.0), ("city", 1.0), ("area", 0.4), ("pin_code", 0.4), ("description", 0.2))
+# properties.search_text, matched by trigram word similarity
+TRIGRAM_COLUMNS = ("title", "area", "city")
+# pg_trgm.word_similarity_threshold the search functions set
+WORD_SIMILARITY_THRESHOLD = 0.5
+
+# search_properties_page sort -> (cursor key, column, descending); ties break on id
+PAGE_SORTS: dict[str, tuple[str, str, bool]] = {
+    "recent": ("at", "created_at", True),
+    "price-low": ("price", "price", False),
+    "price-high": ("price", "price", True),
+    "relevance": ("score", "relevance_score", True),
+    "distance": ("dist", "distance_m", False),
+}
+# search_properties_matches radius_km: default and cap
+DEFAULT_RADIUS_KM = 10
+MAX_RADIUS_KM = 100
+
+
+def rpc(name: str) -> Callable[[RpcFunction], RpcFunction]:
+    def register(func: RpcFunction) -> RpcFunction:
+        REGISTRY[name] = func
+        return func
+
+    return register
+
+
+def call(db: Database, name: str, args: dict[str, Any], user: Row | None) -> Any:
+    func = REGISTRY.get(name)
+    if func is None:
+        raise PostgrestError(404, "PGRST202", f"Could not find the function public.{name} in the schema cache")
+    return func(db, args, user)
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi, d_lambda = phi2 - phi1, math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 6371.0088 * 2 * math.asin(math.sqrt(a))
+
+
+def _distance(row: Row, lat: Any, lng: Any) -> float | None:
+    if lat is None or lng is None or row.get("latitude") is None or row.get("longitude") is None:
+        return None
+    return haversine_km(float(lat), float(lng), float(row["latitude"]), float(row["longitude"]))
+
+
+def _listed(db: Database) -> list[Row]:
+    return [p for p in db.rows("properties") if p.get("status") == "active" and p.get("available") is not False]
+
+
+def _words(text: Any) -> list[str]:
+    return re.findall(r"[^\W_]+", str(text or "").lower())
+
+
+def _trigrams(words: list[str]) -> set[str]:
+    grams = set()
+    for word in words:
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(query: str, text: str) -> float:
+    """pg_trgm ``word_similarity``: the share of the query's trigrams found in the
+    closest run of as many words of ``text``."""
+    query_words, text_words = _words(query), _words(text)
+    wanted = _trigrams(query_words)
+    if not wanted or not text_words:
+        return 0.0
+    span = min(len(query_words), len(text_words))
+    return max(
+        len(wanted & _trigrams(text_words[i : i + span])) / len(wanted) for i in range(len(text_words) - span + 1)
+    )
+
+
+def _prefix_rank(row: Row, tokens: list[str]) -> float:
+    """Weighted share of ``search_tsquery`` prefix terms in the fts columns; 0 unless all match."""
+    score = 0.0
+    for token in tokens:
+        hit = [w for column, w in TEXT_WEIGHTS if any(word.startswith(token) for word in _words(row.get(column)))]
+        if not hit:
+            return 0.0
+        score += max(hit)
+    return score / len(tokens)
+
+
+def _text_score(row: Row, query: str) -> float | None:
+    """``search_score`` for rows the query matches (every word as a prefix, or a close
+    spelling of the title/area/city), None for the rest."""
+    rank = _prefix_rank(row, _words(query))
+    similarity = word_similarity(query, " ".join(str(row.get(c) or "") for c in TRIGRAM_COLUMNS))
+    if rank == 0.0 and similarity < WORD_SIMILARITY_THRESHOLD:
+        return None
+    return rank + similarity
+
+
+def _ieq(value: Any, wanted: Any) -> bool:
+    return wanted is None or str(value or "").lower() == str(wanted).lower()
+
+
+def _icontains(value: Any, wanted: Any) -> bool:
+    return wanted is None or str(wanted).lower() in str(value or "").lower()
+
+
+def _price_ok(row: Row, low: Any, high: Any) -> bool:
+    price = float(row.get("price") or 0)
+    return (low is None or price >= float(low)) and (high is None or price <= float(high))
+
+
+def _sorted_desc(rows: list[Row], key: str) -> list[Row]:
+    return sorted(rows, key=lambda r: r.get(key) or "", reverse=True)
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """``public.encode_cursor``: base64 JSON, opaque to the client."""
+    return base64.b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(token: str) -> dict[str, Any]:
+    try:
+        payload = json.loads(base64.b64decode(token, validate=True).decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        payload = None
+    if not isinstance(payload, dict):
+        raise PostgrestError(400, "22023", "Invalid pagination cursor")
+    return payload
+
+
+def _clamp(value: Any, default: int, low: int, high: int) -> int:
+    return min(max(int(value) if value is not None else default, low), high)
+
+
+def _search_matches(db: Database, args: dict[str, Any]) -> list[Row]:
+    """``search_properties_matches``: the filters search_properties_page and _count share.
+
+    With ``origin_lat``/``origin_lng``, only listings within ``radius_km`` are kept and
+    ``distance_m`` is set; otherwise it is None.
+    """
+    query = str(args.get("query_text") or "").strip()
+    pincode = args.get("pincode_filter")
+    lat, lng = args.get("origin_lat"), args.get("origin_lng")
+    origin = lat is not None and lng is not None
+    radius = args.get("radius_km")
+    radius_km = min(max(float(radius) if radius is not None else DEFAULT_RADIUS_KM, 0), MAX_RADIUS_KM)
+    scored = (
+        (row, _text_score(row, query) if query else 0.0, _distance(row, lat, lng) if origin else None)
+        for row in _listed(db)
+    )
+    return [
+        {
+            **{c: row.get(c) for c in SEARCH_COLUMNS},
+            "image_placeholders": row.get("image_placeholders") or {},
+            "relevance_score": score,
+            "distance_m": distance * 1000 if distance is not None else None,
+        }
+        for row, score, distance in scored
+        if score is not None
+        and (not origin or (distance is not None and distance <= radius_km))
+        and (args.get("category_filter") is None or row.get("property_type") == args["category_filter"])
+        and _icontains(row.get("city"), args.get("city_filter"))
+        and _icontains(row.get("area"), args.get("area_filter"))
+        # A full 6-digit PIN matches exactly; a shorter one matches as a prefix.
+        and (pincode is None or str(row.get("pin_code") or "").startswith(str(pincode)))
+        and _price_ok(row, args.get("min_price"), args.get("max_price"))
+    ]
+
+
+@rpc("search_properties")
+def search_properties(db: Database, args: dict[str, Any], _user: Row | None) -> list[Row]:
+    query = str(args.get("query_text") or "").strip()
+    lat, lng, radius = args.get("user_lat"), args.get("user_lng"), args.get("radius_km")
+    page_number, page_size = int(args.get("page_number") or 1), int(args.get("page_size") or 20)
+
+    matched = []
+    for row in _listed(db):
+        relevance = _text_score(row, query) if query else 0.0
+        if relevance is None:
+            continue
+        if not (
+            (args.get("category_filter") is None or row.get("property_type") == args["category_filter"])
+            and _ieq(row.get("city"), args.get("city_filter"))
+            and _ieq(row.get("area"), args.get("area_filter"))
+            and (args.get("pincode_filter") is None or row.get("pin_code") == args["pincode_filter"])
+            and _price_ok(row, args.get("min_price"), args.get("max_price"))
+        ):
+            continue
+        distance = _distance(row, lat, lng)
+        if radius is not None and lat is not None and lng is not None:
+            if distance is None or distance > float(radius):
+                continue
+        matched.append((row, distance, relevance))
+
+    matched = sorted(matched, key=lambda m: m[0].get("created_at") or "", reverse=True)
+    matched.sort(key=lambda m: m[1] if m[1] is not None else 0.0)
+    matched.sort(key=lambda m: (m[2], bool(m[0].get("featured")), bool(m[0].get("verified"))), reverse=True)
+
+    start = (page_number - 1) * page_size
+    return [
+        {
+            **{c: row.get(c) for c in SEARCH_COLUMNS},
+            "distance_km": round(distance, 2) if distance is not None else None,
+            "relevance_score": relevance,
+            "total_count": len(matched),
+        }
+        for row, distance, relevance in matched[start : start + page_size]
+    ]
+
+
+@rpc("search_properties_page")
+def search_properties_page(db: Database, args: dict[str, Any], _user: Row | None) -> list[Row]:
+    page_limit = _clamp(args.get("page_size"), 24, 1, 100)
+    sort = args.get("sort_by") or "recent"
+    if sort not in PAGE_SORTS:
+        raise PostgrestError(400, "22023", f"Unknown sort_by {sort}")
+    if sort == "relevance" and not str(args.get("query_text") or "").strip():
+        sort = "recent"
+    if sort == "distance" and (args.get("origin_lat") is None or args.get("origin_lng") is None):
+        sort = "recent"
+    key, column, descending = PAGE_SORTS[sort]
+
+    after = None
+    if args.get("after_cursor") is not None:
+        cursor = decode_cursor(str(args["after_cursor"]))
+        if cursor.get("sort") != sort or cursor.get("id") is None:
+            raise PostgrestError(400, "22023", "Cursor does not belong to this search")
+        after = (cursor.get(key), str(cursor["id"]))
+
+    def sort_key(row: Row) -> tuple[Any, str]:
+        return row.get(column), str(row["id"])
+
+    rows = sorted(_search_matches(db, args), key=sort_key, reverse=descending)
+    if after is not None:
+        rows = [r for r in rows if (sort_key(r) < after if descending else sort_key(r) > after)]
+    return [
+        {
+            **row,
+            "distance_km": round(row["distance_m"] / 1000, 2) if row["distance_m"] is not None else None,
+            "cursor": encode_cursor({"sort": sort, key: row.get(column), "id": row["id"]}),
+        }
+        for row in rows[:page_limit]
+    ]
+
+
+@rpc("search_properties_count")
+def search_properties_count(db: Database, args: dict[str, Any], _user: Row | None) -> list[Row]:
+    cap = _clamp(args.get("count_cap"), 1000, 1, 10000)
+    matched = len(_search_matches(db, args))
+    return [{"total_count": min(matched, cap), "capped": matched > cap}]
+
+
+@rpc("search_properties_in_view")
+def search_properties_in_view(db: Database, args: dict[str, Any], _user: Row | None) -> list[Row]:
+    lat, lng = args.get("user_lat"), args.get("user_lng")
+    matched = [
+        row
+        for row in _listed(db)
+        if row.get("latitude") is not None
+        and float(args["min_lat"]) <= float(row["latitude"]) <= float(args["max_lat"])
+        and float(args["min_lng"]) <= float(row["longitude"]) <= float(args["max_lng"])
+        and (args.get("property_type_filter") is None or row.get("property_type") == args["property_type_filter"])
+        and _price_ok(row, args.get("min_price"), args.get("max_price"))
+        and (args.get("min_bedrooms") is None or (row.get("bedrooms") or 0) >= int(args["min_bedrooms"]))
+        and (args.get("min_bathrooms") is None or (row.get("bathrooms") or 0) >= int(args["min_bathrooms"]))
+    ]
+    matched = _sorted_desc(matched, "created_at")
+    return [
+        {
+            **{c: row.get(c) for c in SEARCH_COLUMNS},
+            "image_placeholders": row.get("image_placeholders") or {},
+            "distance_km": _distance(row, lat, lng),
+            "relevance_score": 0.0,
+            "total_count": len(matched),
+        }
+        for row in matched[:100]
+    ]
+
+
+@rpc("search_properties_by_location")
+def search_properties_by_location(db: Database, args: dict[str, Any], _user: Row | None) -> list[Row]:
+    lat, lng = args.get("search_latitude"), args.get("search_longitude")
+    radius = float(args.get("radius_km") or 10)
+    matched = []
+    for row in _listed(db):
+        if not (
+            _icontains(row.get("city"), args.get("search_city"))
+            and _icontains(row.get("area"), args.get("search_area"))
+            and (args.get("search_pin_code") is None or row.get("pin_code") == args["search_pin_code"])
+            and (args.get("property_type_filter") is None or row.get("property_type") == args["property_type_filter"])
+        ):
+            continue
+        distance = _distance(row, lat, lng)
+        if distance is not None and distance > radius:
+            continue
+        matched.append((row, distance))
+    matched = sorted(matched, key=lambda m: m[0].get("created_at") or "", reverse=True)
+    matched.sort(key=lambda m: m[1] if m[1] is not None else 0.0)
+    return [{**row, "distance_km": round(d, 2) if d is not None else None} for row, d in matched]
+
+
+# get_map_clusters property_ids cap
+MAP_CLUSTER_SAMPLE = 16
+
+
+@rpc("get_map_clusters")
+def get_map_clusters(db: Database, args: dict[str, Any], _user: Row | None) -> list[Row]:
+    scale = 2 ** int(args.get("zoom_level") or 10)
+    cells: dict[tuple[int, int], list[Row]] = defaultdict(list)
+    for row in _listed(db):
+        if row.get("latitude") is None:
+            continue
+        lat, lng = float(row["latitude"]), float(row["longitude"])
+        if not (float(args["min_lat"]) <= lat <= float(args["max_lat"])):
+            continue
+        if not (float(args["min_lng"]) <= lng <= float(args["max_lng"])):
+            continue
+        if args.get("category_filter") is not None and row.get("property_type") != args["category_filter"]:
+            continue
+        cells[(math.floor(lat * scale), math.floor(lng * scale))].append(row)
+    clusters = []
+    for rows in cells.values():
+        lat = sum(float(r["latitude"]) for r in rows) / len(rows)
+        lng = sum(float(r["longitude"]) for r in rows) / len(rows)
+        prices = [float(r["price"]) for r in rows if r.get("price") is not None]
+        nearest = sorted(rows, key=lambda r: haversine_km(lat, lng, float(r["latitude"]), float(r["longitude"])))
+        clusters.append(
+            {
+                "cluster_lat": lat,
+                "cluster_lng": lng,
+                "property_count": len(rows),
+                "avg_price": round(sum(prices) / len(prices), 2) if prices else None,
+                "property_ids": [r["id"] for r in nearest[:MAP_CLUSTER_SAMPLE]],
+            }
+        )
+    return clusters
+
+
+@rpc("get_sponsored_properties")
+def get_sponsored_properties(db: Database, args: dict[str, Any], _user: Row | None) -> list[Row]:
+    now = now_iso()
+    radius = float(args.get("radius_km") or 10)
+    listed = {row["id"]: row for row in _listed(db)}
+    results = []
+    for campaign in _sorted_desc(db.rows("ad_campaigns"), "created_at"):
+        row = listed.get(campaign.get("property_id"))
+        if row is None or campaign.get("status") != "active":
+            continue
+        if not (str(campaign.get("start_date")) <= now <= str(campaign.get("end_date"))):
+            continue
+        if not (
+            _icontains(row.get("city"), args.get("filter_city"))
+            and _icontains(row.get("area"), args.get("filter_area"))
+            and (args.get("filter_pin_code") is None or row.get("pin_code") == args["filter_pin_code"])
+        ):
+            continue
+        distance = _distance(row, args.get("filter_lat"), args.get("filter_lng"))
+        if args.get("filter_lat") is not None and args.get("filter_lng") is not None:
+            if distance is None or distance > radius:
+                continue
+        results.append({**row, "image_placeholders": row.get("image_placeholders") or {}, "campaign_id": campaign["id"]})
+    return results
+
+
+# record_campaign_events caps per entry and per call
+CAMPAIGN_EVENT_CAP = 100
+CAMPAIGN_EVENTS_PER_CALL = 200
+
+
+def _is_admin(db: Database, user: Row | None) -> bool:
+    return user is not None and any(
+        r.get("user_id") == user.get("id") and r.get("role") == "admin" for r in db.rows("user_roles")
+    )
+
+
+@rpc("record_campaign_events")
+def record_campaign_events(db: Database, args: dict[str, Any], _user: Row | None) -> None:
+    """Counts go straight onto ad_campaigns: the stand-in has no queue to fold."""
+    events = args.get("events")
+    if not isinstance(events, list):
+        raise PostgrestError(400, "22023", "events must be a JSON array")
+    recorded = 0
+    for event in events:
+        if recorded == CAMPAIGN_EVENTS_PER_CALL:
+            break
+        impressions = min(max(int(event.get("impressions") or 0), 0), CAMPAIGN_EVENT_CAP)
+        clicks = min(max(int(event.get("clicks") or 0), 0), CAMPAIGN_EVENT_CAP)
+        campaign = db.by_id("ad_campaigns", event.get("campaign_id"))
+        if campaign is None or not (impressions or clicks):
+            continue
+        campaign["impressions"] = (campaign.get("impressions") or 0) + impressions
+        campaign["clicks"] = (campaign.get("clicks") or 0) + clicks
+        recorded += 1
+
+
+@rpc("increment_campaign_impressions")
+def increment_campaign_impressions(db: Database, args: dict[str, Any], user: Row | None) -> None:
+    record_campaign_events(db, {"events": [{"campaign_id": args.get("campaign_id"), "impressions": 1}]}, user)
+
+
+@rpc("increment_campaign_clicks")
+def increment_campaign_clicks(db: Database, args: dict[str, Any], user: Row | None) -> None:
+    record_campaign_events(db, {"events": [{"campaign_id": args.get("campaign_id"), "clicks": 1}]}, user)
+
+
+@rpc("get_campaign_counters")
+def get_campaign_counters(db: Database, args: dict[str, Any], user: Row | None) -> list[Row]:
+    wanted = set(args.get("campaign_ids") or [])
+    admin = _is_admin(db, user)
+    return [
+        {"campaign_id": c["id"], "impressions": c.get("impressions") or 0, "clicks": c.get("clicks") or 0}
+        for c in db.rows("ad_campaigns")
+        if c["id"] in wanted and user is not None and (admin or c.get("user_id") == user.get("id"))
+    ]
+
+
+# get_campaign_stats buckets follow India time, which has no DST
+IST = timezone(timedelta(hours=5, minutes=30))
+CAMPAIGN_STATS_SPAN = {"hour": timedelta(days=31), "day": timedelta(days=3660)}
+
+
+def _timestamp(value: Any) -> datetime:
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _bucket_start(at: datetime, granularity: str) -> datetime:
+    local = at.astimezone(IST).replace(minute=0, second=0, microsecond=0)
+    return local.replace(hour=0) if granularity == "day" else local
+
+
+@rpc("get_campaign_stats")
+def get_campaign_stats(db: Database, args: dict[str, Any], user: Row | None) -> list[Row]:
+    """Built from the campaign row and its leads, the way backfill_campaign_stats seeds
+    the rollups: leads in the bucket they were created, impressions, clicks and spend
+    at the campaign's start (the stand-in has no event history)."""
+    if user is None:
+        raise PostgrestError(401, "42501", "permission denied for function get_campaign_stats")
+    granularity = args.get("granularity") or "day"
+    if granularity not in CAMPAIGN_STATS_SPAN:
+        raise PostgrestError(400, "22023", f"Unknown granularity {granularity}")
+    if args.get("from_ts") is None:
+        raise PostgrestError(400, "22023", f"Invalid range for granularity {granularity}")
+    from_ts = _timestamp(args["from_ts"])
+    to_ts = _timestamp(args["to_ts"]) if args.get("to_ts") is not None else datetime.now(timezone.utc)
+    if to_ts <= from_ts or to_ts - from_ts > CAMPAIGN_STATS_SPAN[granularity]:
+        raise PostgrestError(400, "22023", f"Invalid range for granularity {granularity}")
+    campaign = db.by_id("ad_campaigns", args.get("p_campaign_id"))
+    if campaign is None or not (campaign.get("user_id") == user.get("id") or _is_admin(db, user)):
+        return []
+
+    step = timedelta(hours=1) if granularity == "hour" else timedelta(days=1)
+    buckets: dict[datetime, Row] = {}
+    bucket = _bucket_start(from_ts, granularity)
+    while bucket < to_ts:
+        buckets[bucket] = {"impressions": 0, "clicks": 0, "leads": 0, "paid_leads": 0, "spend": 0}
+        bucket = _bucket_start(bucket + step, granularity)
+
+    def book(at: Any, **counts: Any) -> None:
+        row = buckets.get(_bucket_start(_timestamp(at), granularity)) if at is not None else None
+        if row is not None:
+            for name, value in counts.items():
+                row[name] += value
+
+    book(
+        campaign.get("start_date"),
+        impressions=campaign.get("impressions") or 0,
+        clicks=campaign.get("clicks") or 0,
+        spend=campaign.get("spent") or 0,
+    )
+    for lead in db.rows("leads"):
+        if lead.get("campaign_id") == campaign["id"]:
+            book(lead.get("created_at"), leads=1, paid_leads=int(lead.get("lead_type") == "paid"))
+    return [{"bucket": at.astimezone(timezone.utc).isoformat(), **counts} for at, counts in buckets.items()]
+
+
+def _require_user(user: Row | None) -> Row:
+    if user is None:
+        raise PostgrestError(400, "P0001", "Authentication required")
+    return user
+
+
+def _thread(db: Database, me: Any, peer: Any) -> list[Row]:
+    """Messages between ``me`` and ``peer``, newest first."""
+    rows = [
+        m
+        for m in db.rows("messages")
+        if (m.get("sender_id"), m.get("receiver_id")) in ((me, peer), (peer, me))
+    ]
+    return sorted(rows, key=lambda m: (str(m.get("created_at")), str(m["id"])), reverse=True)
+
+
+@rpc("get_conversations_page")
+def get_conversations_page(db: Database, args: dict[str, Any], user: Row | None) -> list[Row]:
+    """Built from messages on each call: the stand-in has no conversations table."""
+    me = _require_user(user)["id"]
+    page_limit = _clamp(args.get("page_size"), 20, 1, 100)
+    after = None
+    if args.get("after_cursor") is not None:
+        cursor = decode_cursor(str(args["after_cursor"]))
+        if cursor.get("at") is None or cursor.get("peer") is None:
+            raise PostgrestError(400, "22023", "Cursor does not belong to this inbox")
+        after = (str(cursor["at"]), str(cursor["peer"]))
+
+    peers = {
+        m["receiver_id"] if m.get("sender_id") == me else m["sender_id"]
+        for m in db.rows("messages")
+        if me in (m.get("sender_id"), m.get("receiver_id"))
+    }
+    inbox = []
+    for peer in peers:
+        thread = _thread(db, me, peer)
+        last = thread[0]
+        key = (str(last.get("created_at")), str(peer))
+        if after is not None and not key < after:
+            continue
+        profile = db.by_id("profiles", peer) or {}
+        inbox.append(
+            {
+                "peer_id": peer,
+                "peer_name": profile.get("full_name"),
+                "peer_email": profile.get("email"),
+                "unread_count": sum(1 for m in thread if m.get("receiver_id") == me and not m.get("read")),
+                "last_message_id": last["id"],
+                "last_message_at": last.get("created_at"),
+                "last_sender_id": last.get("sender_id"),
+                "last_content": last.get("content"),
+                "last_property_id": last.get("property_id"),
+                "cursor": encode_cursor({"at": last.get("created_at"), "peer": peer}),
+            }
+        )
+    inbox.sort(key=lambda c: (str(c["last_message_at"]), str(c["peer_id"])), reverse=True)
+    return inbox[:page_limit]
+
+
+@rpc("get_conversation_messages")
+def get_conversation_messages(db: Database, args: dict[str, Any], user: Row | None) -> list[Row]:
+    me = _require_user(user)["id"]
+    page_limit = _clamp(args.get("page_size"), 50, 1, 200)
+    thread = _thread(db, me, args.get("other_user_id"))
+    if args.get("after_cursor") is not None:
+        cursor = decode_cursor(str(args["after_cursor"]))
+        if cursor.get("at") is None or cursor.get("id") is None:
+            raise PostgrestError(400, "22023", "Cursor does not belong to this thread")
+        after = (str(cursor["at"]), str(cursor["id"]))
+        thread = [m for m in thread if (str(m.get("created_at")), str(m["id"])) < after]
+    columns = ("id", "sender_id", "receiver_id", "property_id", "content", "read", "edited", "edited_at", "created_at")
+    return [
+        {
+            **{c: m.get(c) for c in columns},
+            "edited": bool(m.get("edited")),
+            "cursor": encode_cursor({"at": m.get("created_at"), "id": m["id"]}),
+        }
+        for m in thread[:page_limit]
+    ]
+
+
+@rpc("mark_conversation_read")
+def mark_conversation_read(db: Database, args: dict[str, Any], user: Row | None) -> int:
+    me = _require_user(user)["id"]
+    marked = 0
+    for m in db.rows("messages"):
+        if m.get("receiver_id") == me and m.get("sender_id") == args.get("other_user_id") and m.get("read") is False:
+            m["read"] = True
+            marked += 1
+    return marked
+
+
+@rpc("has_role")
+def has_role(db: Database, args: dict[str, Any], _user: Row | None) -> bool:
+    return any(
+        r.get("user_id") == args.get("_user_id") and r.get("role") == args.get("_role") for r in db.rows("user_roles")
+    )
+
+
+@rpc("get_user_role")
+def get_user_role(db: Database, args: dict[str, Any], user: Row | None) -> str:
+    user_id = args.get("_user_id") or (user or {}).get("id")
+    roles = {r.get("role") for r in db.rows("user_roles") if r.get("user_id") == user_id}
+    return "admin" if "admin" in roles else "user"
+
+
+# admin_stats counters: metric -> (table, row filter)
+ADMIN_COUNTERS: dict[str, tuple[str, Callable[[Row], bool]]] = {
+    "total_users": ("profiles", lambda r: True),
+    "total_properties": ("properties", lambda r: True),
+    "active_properties": ("properties", lambda r: r.get("status") == "active"),
+    "pending_properties": ("properties", lambda r: r.get("verified") is False),
+    "verified_properties": ("properties", lambda r: r.get("verified") is True),
+    "total_messages": ("messages", lambda r: True),
+    "unread_messages": ("messages", lambda r: r.get("read") is False),
+    "total_favorites": ("favorites", lambda r: True),
+    "total_inquiries": ("inquiries", lambda r: True),
+    "pending_reports": ("reports", lambda r: r.get("status") == "new"),
+    "total_campaigns": ("ad_campaigns", lambda r: True),
+    "active_campaigns": ("ad_campaigns", lambda r: r.get("status") == "active"),
+}
+# admin_stats snapshots counted per day: metric -> (table, days back from CURRENT_DATE)
+ADMIN_RECENT: dict[str, tuple[str, int]] = {
+    "new_users_today": ("profiles", 0),
+    "new_users_this_week": ("profiles", 7),
+    "new_properties_today": ("properties", 0),
+    "messages_today": ("messages", 0),
+    "favorites_today": ("favorites", 0),
+    "inquiries_today": ("inquiries", 0),
+}
+
+
+def _require_admin(db: Database, user: Row | None, function: str, message: str) -> None:
+    if user is None:
+        raise PostgrestError(401, "42501", f"permission denied for function {function}")
+    if not _is_admin(db, user):
+        raise PostgrestError(403, "42501", message)
+
+
+def _top_counts(rows: list[Row], column: str) -> dict[str, int]:
+    counts: dict[str, int] = defaultdict(int)
+    for row in rows:
+        counts[row.get(column)] += 1
+    return dict(sorted(counts.items(), key=lambda item: item[1], reverse=True)[:10])
+
+
+@rpc("get_admin_dashboard_stats")
+def get_admin_dashboard_stats(db: Database, _args: dict[str, Any], user: Row | None) -> dict[str, Any]:
+    """Every metric is computed on each call, so every ``as_of`` is now."""
+    _require_admin(db, user, "get_admin_dashboard_stats", "Only admins can read dashboard stats")
+    stats: dict[str, Any] = {
+        metric: sum(1 for row in db.rows(table) if keep(row)) for metric, (table, keep) in ADMIN_COUNTERS.items()
+    }
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    for metric, (table, days) in ADMIN_RECENT.items():
+        since = today - timedelta(days=days)
+        stats[metric] = sum(
+            1 for row in db.rows(table) if row.get("created_at") is not None and _timestamp(row["created_at"]) >= since
+        )
+    properties = db.rows("properties")
+    active = [row for row in properties if row.get("status") == "active"]
+    stats["total_views"] = sum(row.get("views") or 0 for row in properties)
+    prices = [float(row["price"]) for row in active if row.get("price") is not None]
+    stats["avg_property_price"] = round(sum(prices) / len(prices), 2) if prices else 0
+    stats["properties_by_type"] = _top_counts(active, "property_type")
+    stats["top_cities"] = _top_counts(active, "city")
+
+    now = now_iso()
+    stats["as_of"] = {metric: now for metric in stats}
+    stats["recent_activity"] = [
+        {"type": "property", "description": row.get("title"), "created_at": row.get("created_at"), "user_id": row.get("user_id")}
+        for row in _sorted_desc(properties, "created_at")[:10]
+    ] or None
+    return stats
+
+
+@rpc("refresh_admin_stats")
+def refresh_admin_stats(db: Database, args: dict[str, Any], user: Row | None) -> int:
+    """Nothing is stored to recompute; returns how many metrics were named, like the real one."""
+    _require_admin(db, user, "refresh_admin_stats", "Only admins can refresh dashboard stats")
+    known = [*ADMIN_COUNTERS, *ADMIN_RECENT, "total_views", "avg_property_price", "properties_by_type", "top_cities"]
+    metrics = args.get("metrics")
+    return len(known) if metrics is None else sum(1 for metric in known if metric in metrics)
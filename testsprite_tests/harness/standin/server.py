@@ -0,0 +1,85 @@
+"""Small HTTP/1.1 front end for :class:`StandinApp` on asyncio streams."""
+
+from __future__ import annotations
+
+import asyncio
+from http import HTTPStatus
+
+from .app import StandinApp
+from .http import Request, Response
+
+MAX_BODY = 16 * 1024 * 1024
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Request | None:
+    line = await reader.readline()
+    if not line:
+        return None
+    method, target, _version = line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+    headers: dict[str, str] = {}
+    while True:
+        raw = await reader.readline()
+        if raw in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = raw.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length") or 0)
+    if length > MAX_BODY:
+        raise ValueError("request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return Request.from_url(method, target, headers, body)
+
+
+def _encode(response: Response, keep_alive: bool) -> bytes:
+    reason = HTTPStatus(response.status).phrase
+    headers = {
+        **response.headers,
+        "Content-Length": str(len(response.body)),
+        "Connection": "keep-alive" if keep_alive else "close",
+    }
+    head = f"HTTP/1.1 {response.status} {reason}\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+    return head.encode("latin-1") + b"\r\n" + response.body
+
+
+class StandinServer:
+    def __init__(self, app: StandinApp, host: str = "127.0.0.1", port: int = 54321):
+        self.app = app
+        self.host = host
+        self.port = port
+        self._server: asyncio.base_events.Server | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                keep_alive = request.header("connection").lower() != "close"
+                writer.write(_encode(self.app.handle(request), keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> "StandinServer":
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        # Port 0 asks the OS for a free port; report the real one.
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
@@ -0,0 +1,80 @@
+// Core Web Vitals collector. Installed as an init script on every document the
+// runner opens, and evaluated late by vitals.snapshot() when running standalone
+// (the buffered observers still see what happened before it was installed).
+(() => {
+  if (window !== window.top || window.__citylifesVitals) return;
+
+  const vitals = (window.__citylifesVitals = {
+    url: location.href,
+    timeOrigin: performance.timeOrigin,
+    ttfb: null,
+    fcp: null,
+    lcp: null,
+    cls: 0,
+    inp: null,
+    longTasks: 0,
+    totalBlockingTime: 0,
+    jsHeapUsed: null,
+  });
+
+  const observe = (type, onEntry, options = {}) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(onEntry)).observe({ type, buffered: true, ...options });
+    } catch {
+      // Entry type not supported by this browser.
+    }
+  };
+
+  observe('navigation', (entry) => {
+    vitals.ttfb = entry.responseStart;
+  });
+  observe('paint', (entry) => {
+    if (entry.name === 'first-contentful-paint') vitals.fcp = entry.startTime;
+  });
+  observe('largest-contentful-paint', (entry) => {
+    vitals.lcp = entry.startTime;
+  });
+
+  // CLS: largest session window (shifts < 1s apart, window capped at 5s).
+  let windowValue = 0;
+  let windowStart = 0;
+  let lastShift = 0;
+  observe('layout-shift', (entry) => {
+    if (entry.hadRecentInput) return;
+    if (entry.startTime - lastShift > 1000 || entry.startTime - windowStart > 5000) {
+      windowValue = 0;
+      windowStart = entry.startTime;
+    }
+    windowValue += entry.value;
+    lastShift = entry.startTime;
+    vitals.cls = Math.max(vitals.cls, windowValue);
+  });
+
+  // INP: p98 of the slowest event per interaction.
+  const interactions = new Map();
+  observe(
+    'event',
+    (entry) => {
+      if (!entry.interactionId) return;
+      interactions.set(entry.interactionId, Math.max(interactions.get(entry.interactionId) || 0, entry.duration));
+      const durations = [...interactions.values()].sort((a, b) => b - a);
+      vitals.inp = durations[Math.min(durations.length - 1, Math.floor(durations.length / 50))];
+    },
+    { durationThreshold: 16 },
+  );
+
+  observe('longtask', (entry) => {
+    vitals.longTasks += 1;
+    vitals.totalBlockingTime += Math.max(0, entry.duration - 50);
+  });
+
+  const read = () => {
+    if (performance.memory) vitals.jsHeapUsed = performance.memory.usedJSHeapSize;
+    return { ...vitals };
+  };
+  window.__citylifesReadVitals = read;
+
+  addEventListener('pagehide', () => {
+    if (typeof window.__citylifesReportVitals === 'function') window.__citylifesReportVitals(read());
+  });
+})();
@@ -0,0 +1,69 @@
+"""Core Web Vitals and navigation timing for every document a test opens.
+
+The runner installs ``vitals.js`` in each context. Every main-frame document
+reports TTFB, FCP, LCP, CLS, INP, long tasks / total blocking time and JS heap
+size when it is unloaded, and whatever is still open is read before the
+context closes. The numbers go into the test's result extras, which the
+results store keeps per run and exports under ``"vitals"``.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from playwright import async_api
+from playwright.async_api import BrowserContext, Page
+
+from .loader import TestCase
+from .runner import Plugin, TestResult
+
+COLLECTOR_JS = Path(__file__).with_name("vitals.js").read_text(encoding="utf-8")
+
+# "Good" thresholds from web.dev (ms, except CLS).
+BUDGETS = {"ttfb": 800, "fcp": 1800, "lcp": 2500, "cls": 0.1, "inp": 200}
+
+
+async def snapshot(page: Page) -> dict[str, Any]:
+    """Current vitals of ``page``'s document, installing the collector if needed."""
+    await page.evaluate(COLLECTOR_JS)
+    return await page.evaluate("() => window.__citylifesReadVitals()")
+
+
+def over_budget(metrics: dict[str, Any], budgets: dict[str, float] = BUDGETS) -> list[str]:
+    failures = []
+    for name, limit in budgets.items():
+        value = metrics.get(name)
+        if value is None and name in ("fcp", "lcp"):
+            failures.append(f"{name.upper()} was never reported")
+        elif value is not None and value > limit:
+            failures.append(f"{name.upper()} {value:.3g} > {limit:g}")
+    return failures
+
+
+class VitalsPlugin(Plugin):
+    def __init__(self):
+        self._navigations: dict[str, dict[float, dict[str, Any]]] = {}
+
+    def _record(self, test_id: str, metrics: dict[str, Any]) -> None:
+        # Keyed by timeOrigin: the pagehide report and the final read of one document collapse.
+        self._navigations.setdefault(test_id, {})[metrics["timeOrigin"]] = metrics
+
+    async def on_context(self, context: BrowserContext, case: TestCase, result: TestResult) -> None:
+        await context.add_init_script(script=COLLECTOR_JS)
+        await context.expose_binding(
+            "__citylifesReportVitals", lambda _source, metrics: self._record(case.test_id, metrics)
+        )
+
+    async def before_close(self, context: BrowserContext, case: TestCase, result: TestResult) -> None:
+        for page in context.pages:
+            try:
+                self._record(case.test_id, await page.evaluate("() => window.__citylifesReadVitals?.()") or {})
+            except (async_api.Error, KeyError):
+                continue
+
+    async def on_finish(self, case: TestCase, result: TestResult) -> None:
+        navigations = self._navigations.pop(case.test_id, {})
+        if navigations:
+            result.extra["vitals"] = [navigations[key] for key in sorted(navigations)]
+
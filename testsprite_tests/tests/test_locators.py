@@ -0,0 +1,62 @@
+"""harness.locators.SelectorCache: ranking and when winners are persisted."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from harness.locators import STEPS, SelectorCache
+
+STEP = "TC004.sort_price_low"
+FIRST, SECOND, XPATH = STEPS[STEP]
+
+
+class SelectorCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "locators.json"
+
+    def test_declared_order_without_a_cache_file(self) -> None:
+        self.assertEqual(SelectorCache(self.path).ranked(STEP), [FIRST, SECOND, XPATH])
+
+    def test_last_winner_is_tried_first(self) -> None:
+        self.path.write_text(json.dumps({STEP: XPATH}), encoding="utf-8")
+        self.assertEqual(SelectorCache(self.path).ranked(STEP), [XPATH, FIRST, SECOND])
+
+    def test_stale_or_unreadable_cache_falls_back_to_declared_order(self) -> None:
+        self.path.write_text(json.dumps({STEP: "role=button[name=Gone]"}), encoding="utf-8")
+        self.assertEqual(SelectorCache(self.path).ranked(STEP), [FIRST, SECOND, XPATH])
+        self.path.write_text("{not json", encoding="utf-8")
+        self.assertEqual(SelectorCache(self.path).ranked(STEP), [FIRST, SECOND, XPATH])
+
+    def test_unknown_step(self) -> None:
+        with self.assertRaises(KeyError):
+            SelectorCache(self.path).ranked("TC004.nope")
+
+    def test_winner_is_written_only_when_the_test_commits(self) -> None:
+        cache = SelectorCache(self.path)
+        cache.resolved(STEP, SECOND)
+        cache.resolved("TC020.other", XPATH)
+        self.assertEqual(cache.pending("TC004"), {STEP: SECOND})
+        self.assertFalse(self.path.exists())
+        cache.commit("TC004")
+        self.assertEqual(json.loads(self.path.read_text(encoding="utf-8")), {STEP: SECOND})
+        self.assertEqual(cache.pending("TC004"), {})
+        self.assertEqual(cache.pending("TC020"), {"TC020.other": XPATH})
+        self.assertEqual(SelectorCache(self.path).ranked(STEP)[0], SECOND)
+
+    def test_discard_keeps_the_previous_winner(self) -> None:
+        self.path.write_text(json.dumps({STEP: SECOND}), encoding="utf-8")
+        cache = SelectorCache(self.path)
+        cache.resolved(STEP, XPATH)
+        cache.discard("TC004")
+        cache.commit("TC004")
+        self.assertEqual(cache.ranked(STEP)[0], SECOND)
+        self.assertEqual(json.loads(self.path.read_text(encoding="utf-8")), {STEP: SECOND})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""recording.Archive: exact and loose request matching, replay order, round trip.
+
+    cd testsprite_tests
+    python -m unittest discover tests
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from harness.recording import Archive, Exchange, normalize_body, normalize_query
+
+REST = "https://example.supabase.co/rest/v1"
+
+
+def exchange(method: str, path: str, query: str = "", body: bytes | None = None, payload: str = "[]") -> Exchange:
+    return Exchange(
+        method=method,
+        path=path,
+        query=normalize_query(query),
+        body_key=normalize_body(body),
+        status=200,
+        headers={"content-type": "application/json"},
+        body=base64.b64encode(payload.encode()).decode(),
+    )
+
+
+def rpc_body(**args: object) -> bytes:
+    return json.dumps(args).encode()
+
+
+class NormalizeTest(unittest.TestCase):
+    def test_query_order_and_json_key_order_do_not_matter(self) -> None:
+        self.assertEqual(normalize_query("b=2&a=1"), normalize_query("a=1&b=2"))
+        self.assertEqual(normalize_body(b'{"b": 1, "a": [1, 2]}'), normalize_body(b'{"a":[1,2],"b":1}'))
+
+    def test_non_json_bodies_are_hashed(self) -> None:
+        self.assertTrue(normalize_body(b"\x89PNG").startswith("sha1:"))
+        self.assertEqual(normalize_body(None), "")
+
+
+class MatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.archive = Archive(
+            [
+                exchange("POST", "/rest/v1/rpc/search_properties", body=rpc_body(city="Pune"), payload='["pune"]'),
+                exchange("POST", "/rest/v1/rpc/search_properties", body=rpc_body(city="Goa"), payload='["goa"]'),
+                exchange("GET", "/rest/v1/properties", "select=*&id=eq.1", payload='["first"]'),
+                exchange("GET", "/rest/v1/properties", "select=*&id=eq.1", payload='["second"]'),
+            ]
+        )
+
+    def payload(self, method: str, url: str, body: bytes | None = None) -> str | None:
+        found = self.archive.match(method, url, body)
+        return found.payload().decode() if found else None
+
+    def test_exact_match_on_body(self) -> None:
+        url = f"{REST}/rpc/search_properties"
+        self.assertEqual(self.payload("POST", url, b'{ "city": "Goa" }'), '["goa"]')
+        self.assertEqual(self.payload("POST", url, rpc_body(city="Pune")), '["pune"]')
+
+    def test_unknown_body_falls_back_to_the_loose_key(self) -> None:
+        url = f"{REST}/rpc/search_properties"
+        self.assertEqual(self.payload("POST", url, rpc_body(city="Pune", updated_at="now")), '["pune"]')
+        self.assertIsNone(self.payload("POST", f"{REST}/rpc/get_map_clusters", rpc_body()))
+
+    def test_repeats_replay_in_order_then_stick_to_the_last(self) -> None:
+        url = f"{REST}/properties?id=eq.1&select=*"
+        self.assertEqual(
+            [self.payload("GET", url) for _ in range(3)], ['["first"]', '["second"]', '["second"]']
+        )
+
+    def test_method_and_query_are_part_of_the_key(self) -> None:
+        self.assertIsNone(self.payload("DELETE", f"{REST}/properties?select=*&id=eq.1"))
+        self.assertIsNone(self.payload("GET", f"{REST}/properties?select=*&id=eq.2"))
+
+
+class ArchiveFileTest(unittest.TestCase):
+    def test_save_and_load_round_trip(self) -> None:
+        archive = Archive([exchange("GET", "/auth/v1/user", payload='{"id": "u1"}')])
+        with tempfile.TemporaryDirectory() as root:
+            path = Archive.path_for("TC015", Path(root))
+            archive.save(path, "TC015")
+            loaded = Archive.load(path)
+        self.assertEqual(path.name, "TC015.json.gz")
+        self.assertEqual(loaded.exchanges, archive.exchanges)
+        self.assertEqual(loaded.match("GET", "https://x.supabase.co/auth/v1/user", None).payload(), b'{"id": "u1"}')
+
+
+if __name__ == "__main__":
+    unittest.main()
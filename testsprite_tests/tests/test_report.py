@@ -0,0 +1,89 @@
+"""harness.report: console log parsing, fingerprints and the deduplicated report."""
+
+from __future__ import annotations
+
+import io
+import unittest
+
+from harness.report import ConsoleIndex, build_report, normalize_location, normalize_stack, split_error
+
+ROUTER_WARNING = (
+    "[WARNING] ⚠️ React Router Future Flag Warning: v7_startTransition "
+    "(at http://localhost:5173/node_modules/.vite/deps/react-router-dom.js?v=1a2b3c:4392:12)"
+)
+FETCH_PRIORITY = (
+    "[ERROR] Warning: React does not recognize the `fetchPriority` prop on a DOM element.\n"
+    "    at img\n"
+    "    at OptimizedImage (http://localhost:5173/src/components/OptimizedImage.tsx?t=1700000000:21:3) "
+    "(at http://localhost:5173/node_modules/.vite/deps/chunk-ABC.js?v={v}:521:37)"
+)
+
+
+def error(*entries: str, head: str = "Timeout 5000ms exceeded.") -> str:
+    return f"{head}\nBrowser Console Logs:\n" + "\n".join(entries)
+
+
+class ParseTest(unittest.TestCase):
+    def test_head_entries_and_locations(self) -> None:
+        head, entries = split_error(error(ROUTER_WARNING, FETCH_PRIORITY.format(v="1")))
+        entries = list(entries)
+        self.assertEqual(head, "Timeout 5000ms exceeded.")
+        self.assertEqual([e.level for e in entries], ["WARNING", "ERROR"])
+        self.assertTrue(entries[0].location.endswith("react-router-dom.js?v=1a2b3c:4392:12"))
+        self.assertIn("at OptimizedImage", entries[1].text)
+
+    def test_error_without_console_block(self) -> None:
+        head, entries = split_error("Assertion failed")
+        self.assertEqual((head, list(entries)), ("Assertion failed", []))
+        self.assertEqual(split_error(None)[0], "")
+
+    def test_only_dev_server_urls_are_normalized(self) -> None:
+        self.assertEqual(
+            normalize_location("http://localhost:5173/src/App.tsx?t=123:102:5"), "/src/App.tsx:102:5"
+        )
+        cdn = "https://cdn.example.com/lib.js?v=2:1:1"
+        self.assertEqual(normalize_location(cdn), cdn)
+        message = "Failed to load http://localhost:5173/api?x=1\n    at f (http://localhost:5173/src/a.ts?t=9:1:2)"
+        self.assertEqual(
+            normalize_stack(message), "Failed to load http://localhost:5173/api?x=1\n    at f (/src/a.ts:1:2)"
+        )
+
+
+class DedupeTest(unittest.TestCase):
+    def test_cache_busters_do_not_split_a_message(self) -> None:
+        index = ConsoleIndex()
+        for test, v in (("TC001", "1"), ("TC001", "2"), ("TC002", "3")):
+            for entry in split_error(error(FETCH_PRIORITY.format(v=v)))[1]:
+                index.add(test, entry)
+        (stats,) = index.messages.values()
+        self.assertEqual((stats.ref, stats.count, stats.tests), ("C1", 3, {"TC001": 2, "TC002": 1}))
+
+    def test_report_lists_each_message_once_and_references_it_per_test(self) -> None:
+        records = [
+            {"title": "TC001-Registration", "testStatus": "FAILED", "testError": error(ROUTER_WARNING, ROUTER_WARNING)},
+            {
+                "title": "TC002-Login",
+                "testStatus": "PASSED",
+                "testError": error(ROUTER_WARNING, FETCH_PRIORITY.format(v="9"), head=""),
+            },
+        ]
+        out = io.StringIO()
+        index = build_report(records, out)
+        report = out.getvalue()
+        self.assertEqual(len(index.messages), 2)
+        self.assertEqual(report.count("React Router Future Flag Warning"), 1)
+        self.assertIn("- **Console:** C1 (warning x2)\n", report)
+        self.assertIn("- **Console:** C1 (warning), C2 (error)\n", report)
+        self.assertIn("#### C1 [WARNING] x3 in 2 tests\n- **Tests:** TC001 x2, TC002\n", report)
+        self.assertIn("- **1/2** tests passed (50.00%)", report)
+        self.assertNotIn("?v=", report)
+
+    def test_html_report_escapes_messages(self) -> None:
+        out = io.StringIO()
+        build_report([{"title": "TC003-Bad login", "testError": error("[ERROR] <script> tag")}], out, fmt="html")
+        self.assertIn("&lt;script&gt; tag", out.getvalue())
+        self.assertIn('<a href="#C1">C1</a> (error)', out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
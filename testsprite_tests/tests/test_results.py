@@ -0,0 +1,86 @@
+"""harness.results: legacy import and export, per-test updates and run history."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from harness.loader import TestCase
+from harness.results import ResultsStore
+
+LEGACY = [
+    {
+        "projectId": "p1",
+        "testId": "t1",
+        "userId": "u1",
+        "title": "TC001-User Registration",
+        "description": "Register.",
+        "code": "print('tc001')",
+        "testStatus": "FAILED",
+        "testError": "timeout",
+        "testType": "FRONTEND",
+        "createFrom": "mcp",
+        "testVisualization": "https://example.com/tc001.mp4",
+        "created": "2025-01-01T00:00:00Z",
+        "modified": "2025-01-01T00:00:00Z",
+        "priority": "High",
+    }
+]
+
+
+class ResultsStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.legacy = self.root / "test_results.json"
+        self.legacy.write_text(json.dumps(LEGACY), encoding="utf-8")
+        self.store = ResultsStore(self.root / "results.db", self.legacy)
+        self.addCleanup(self.store.close)
+
+    def test_legacy_round_trip_keeps_unknown_keys(self) -> None:
+        self.assertEqual(self.store.get("TC001")["status"], "FAILED")
+        out = self.root / "export.json"
+        self.assertEqual(self.store.export_legacy(out), 1)
+        self.assertEqual(json.loads(out.read_text(encoding="utf-8")), LEGACY)
+
+    def test_legacy_file_is_only_imported_into_an_empty_store(self) -> None:
+        self.store.upsert("TC001", status="PASSED")
+        self.store.close()
+        self.store = ResultsStore(self.root / "results.db", self.legacy)
+        self.assertEqual(self.store.get("TC001")["status"], "PASSED")
+
+    def test_upsert_touches_one_row_and_rejects_unknown_fields(self) -> None:
+        self.store.upsert("TC002", title="TC002-Login", status="PASSED")
+        self.store.upsert("TC001", error=None)
+        self.assertIsNone(self.store.get("TC001")["error"])
+        self.assertEqual(self.store.get("TC001")["created"], "2025-01-01T00:00:00Z")
+        self.assertEqual(self.store.get("TC002")["title"], "TC002-Login")
+        with self.assertRaises(ValueError):
+            self.store.upsert("TC001", colour="red")
+        with self.assertRaises(KeyError):
+            self.store.upsert("TC099", status="PASSED")
+
+    def test_sync_code_only_rewrites_changed_scripts(self) -> None:
+        script = self.root / "TC001_User_Registration.py"
+        script.write_text("print('tc001')", encoding="utf-8")
+        case = TestCase("TC001", "TC001-User Registration", script)
+        self.assertEqual(self.store.sync_code([case]), [])
+        script.write_text("print('changed')", encoding="utf-8")
+        self.assertEqual(self.store.sync_code([case]), ["TC001"])
+        self.assertEqual(self.store.get("TC001")["code"], "print('changed')")
+
+    def test_runs_are_appended_and_update_the_test(self) -> None:
+        self.store.record_run("TC001", "TC001-User Registration", "FAILED", "boom", 3.0, {})
+        self.store.record_run("TC001", "TC001-User Registration", "PASSED", None, 2.5, {"vitals": {"lcp": 900}})
+        self.store.record_run("TC020", "TC020-Map View", "PASSED", None, 1.0, {})
+        self.assertEqual([run["status"] for run in self.store.history("TC001")], ["PASSED", "FAILED"])
+        self.assertEqual(self.store.get("TC001")["status"], "PASSED")
+        self.assertEqual(json.loads(self.store.get("TC001")["extra"])["vitals"], {"lcp": 900})
+        self.assertEqual(self.store.get("TC020")["title"], "TC020-Map View")
+
+
+if __name__ == "__main__":
+    unittest.main()